@@ -7,7 +7,19 @@ class AcademiaCoreConfig(AppConfig):
 
     def ready(self):
         # Importa las signals cuando la app se carga
-        from . import signals  # noqa: F401
+        from . import (
+            fotos,
+            kpis,
+            referencia_cache,
+            regularidades,
+            signals,  # noqa: F401
+            tareas,  # noqa: F401  (registra las tareas de jobs)
+        )
+
+        referencia_cache.conectar_signals()
+        kpis.conectar_signals()
+        regularidades.conectar_signals()
+        fotos.conectar_signals()
 
         # Importa los archivos admin.py para registrar los modelos
         # import academia_core.admin_config  # noqa: F401
@@ -0,0 +1,161 @@
+# academia_core/auditoria.py
+"""
+Registro de `Actividad` en lotes.
+
+`registrar()` no escribe: agrega el evento a un buffer del proceso (con la
+hora real del evento) y lo vuelca con un único `bulk_create` cuando:
+
+- se juntan `AUDITORIA_LOTE` eventos o pasaron `AUDITORIA_INTERVALO`
+  segundos desde el último volcado (nunca dentro de una transacción abierta:
+  un rollback de la vista no debe llevarse la auditoría ni viceversa);
+- termina el request (`request_finished`, ya enviada la respuesta);
+- termina el proceso (`atexit`).
+
+Así una carga de actas de cientos de filas suma un INSERT por lote, no uno
+por fila. Si el volcado falla se registra en el log y se descarta: la
+auditoría nunca rompe la operación auditada.
+
+`Actividad.periodo` (AAAAMM) es la partición lógica por mes: `depurar()`
+borra meses completos por ese índice y `consultar()` filtra por usuario,
+acción y rango de fechas sobre los índices (user, creado) y (accion, creado).
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import time
+from datetime import date, datetime
+from datetime import time as dtime
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_buffer: list = []
+_lock = threading.Lock()
+_ultimo_volcado = time.monotonic()
+
+
+def periodo(momento: datetime | date) -> int:
+    return momento.year * 100 + momento.month
+
+
+def _lote() -> int:
+    return getattr(settings, "AUDITORIA_LOTE", 200)
+
+
+def _intervalo() -> float:
+    return getattr(settings, "AUDITORIA_INTERVALO", 5.0)
+
+
+def _rol_de(user) -> str:
+    perfil = getattr(user, "perfil", None)
+    return getattr(perfil, "rol", "") or ""
+
+
+# ---------- escritura ----------
+def registrar(accion: str, user=None, detalle: str = "", rol: str | None = None) -> None:
+    """Encola un evento de auditoría (no toca la base salvo que toque volcar)."""
+    from academia_core.models import Actividad
+
+    ahora = timezone.now()
+    evento = Actividad(
+        user_id=getattr(user, "pk", None),
+        rol_cache=(rol if rol is not None else _rol_de(user))[:20],
+        accion=accion,
+        detalle=detalle,
+        creado=ahora,
+        periodo=periodo(timezone.localtime(ahora)),
+    )
+    with _lock:
+        _buffer.append(evento)
+        lleno = len(_buffer) >= _lote()
+        vencido = time.monotonic() - _ultimo_volcado >= _intervalo()
+    if (lleno or vencido) and not _en_transaccion():
+        vaciar()
+
+
+def _en_transaccion() -> bool:
+    from academia_core.models import Actividad
+
+    return connections[router.db_for_write(Actividad)].in_atomic_block
+
+
+def pendientes() -> int:
+    return len(_buffer)
+
+
+def vaciar() -> int:
+    """Vuelca el buffer con un bulk_create. Devuelve cuántos eventos escribió."""
+    global _ultimo_volcado
+    from academia_core.models import Actividad
+
+    with _lock:
+        eventos = _buffer[:]
+        _buffer.clear()
+        _ultimo_volcado = time.monotonic()
+    if not eventos:
+        return 0
+    try:
+        with transaction.atomic(using=router.db_for_write(Actividad)):
+            Actividad.objects.bulk_create(eventos, batch_size=500)
+    except Exception:
+        logger.exception("No se pudieron guardar %s eventos de auditoría", len(eventos))
+        return 0
+    return len(eventos)
+
+
+def descartar() -> None:
+    """Vacía el buffer sin escribir (tests)."""
+    with _lock:
+        _buffer.clear()
+
+
+def _al_terminar_request(sender, **kwargs):
+    if _buffer:
+        vaciar()
+
+
+request_finished.connect(_al_terminar_request, dispatch_uid="auditoria:vaciar")
+atexit.register(lambda: _buffer and vaciar())
+
+
+# ---------- consulta y retención ----------
+def consultar(user_id=None, accion=None, desde: date | None = None, hasta: date | None = None):
+    """Actividad filtrada por usuario, acción y fechas (inclusive), más reciente primero."""
+    from academia_core.models import Actividad
+
+    qs = Actividad.objects.all()
+    if user_id:
+        qs = qs.filter(user_id=user_id)
+    if accion:
+        qs = qs.filter(accion=accion)
+    tz = timezone.get_current_timezone()
+    if desde:
+        qs = qs.filter(creado__gte=datetime.combine(desde, dtime.min, tzinfo=tz))
+    if hasta:
+        qs = qs.filter(creado__lte=datetime.combine(hasta, dtime.max, tzinfo=tz))
+    return qs.order_by("-creado", "-pk")
+
+
+def depurar(meses: int | None = None, hoy: date | None = None, lote: int = 5000) -> int:
+    """
+    Borra los meses anteriores a los últimos `meses` (default
+    `AUDITORIA_RETENCION_MESES`), en tandas por el índice de `periodo`.
+    """
+    from academia_core.models import Actividad
+
+    meses = meses if meses is not None else getattr(settings, "AUDITORIA_RETENCION_MESES", 24)
+    hoy = hoy or timezone.localdate()
+    total_meses = hoy.year * 12 + hoy.month - 1 - meses
+    corte = (total_meses // 12) * 100 + total_meses % 12 + 1
+    viejos = Actividad.objects.filter(periodo__lt=corte).order_by()
+    borrados = 0
+    while ids := list(viejos.values_list("pk", flat=True)[:lote]):
+        borrados += Actividad.objects.filter(pk__in=ids).delete()[0]
+    return borrados
@@ -0,0 +1 @@
+"""Backends de Django con métricas de conexión y pool opcional (academia_core.conexiones)."""
@@ -0,0 +1,12 @@
+from django.db.backends.sqlite3 import base
+
+from academia_core.conexiones import ConexionMedida
+
+
+class DatabaseWrapper(ConexionMedida, base.DatabaseWrapper):
+    def cruda_usable(self, cruda) -> bool:
+        try:
+            cruda.execute("SELECT 1")
+        except base.Database.Error:
+            return False
+        return True
@@ -0,0 +1,446 @@
+# academia_core/carga_correlatividades.py
+"""
+Carga masiva de correlatividades (comando `correlatividades import`).
+
+1. `leer_archivo()` convierte CSV/JSON en `ReglaFuente` (referencias por
+   nombre o por id, todavía sin resolver). Un archivo puede traer reglas de
+   varios planes.
+2. `importar()` resuelve planes y espacios con un índice precargado por plan
+   (nombre normalizado de la materia + año), arma el conjunto deseado de
+   reglas, verifica que el grafo resultante sea un DAG y aplica la diferencia
+   contra lo que ya hay (alta / actualización de observaciones / baja con
+   `reemplazar`), en una transacción por plan.
+
+Un plan con referencias que no resuelven o con un ciclo no se toca.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import re
+import unicodedata
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from django.db import transaction
+
+from academia_core import referencia_cache
+from academia_core.plan_grafo import anio_numero, buscar_ciclo
+
+TIPOS = ("CURSAR", "RENDIR")
+REQUISITOS = ("REGULARIZADA", "APROBADA")
+_CLAVES_JSON = (("REGULARIZADA", "regularizadas"), ("APROBADA", "aprobadas"))
+_FORMATO_RE = re.compile(r"\s*\([A-Z]\)$")  # "Pedagogía (A)" -> formato, no nombre
+_ORDINALES = {
+    "primer": 1,
+    "primero": 1,
+    "segundo": 2,
+    "tercer": 3,
+    "tercero": 3,
+    "cuarto": 4,
+    "quinto": 5,
+}
+
+
+class ErrorCarga(ValueError):
+    """El archivo no tiene el formato esperado."""
+
+
+def normalizar(texto: Any) -> str:
+    """Sin acentos, minúsculas y sólo alfanuméricos ('Didáctica  I' -> 'didactica i')."""
+    s = _FORMATO_RE.sub("", str(texto or "").strip())
+    s = unicodedata.normalize("NFKD", s).encode("ascii", "ignore").decode("ascii")
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", s.lower()).split())
+
+
+def anio_desde_texto(texto: Any) -> int | None:
+    """'2°', '2', 'Segundo Año' -> 2."""
+    n = anio_numero(str(texto or ""))
+    if n is not None:
+        return n
+    palabras = normalizar(texto).split()
+    return _ORDINALES.get(palabras[0]) if palabras else None
+
+
+# --- referencias sin resolver -------------------------------------------------
+
+
+@dataclass(frozen=True)
+class RefPlan:
+    plan_id: int | None = None
+    carrera: str = ""  # normalizado (sirve nombre o slug)
+    resolucion: str = ""
+
+    def __str__(self) -> str:
+        if self.plan_id:
+            return f"plan {self.plan_id}"
+        return f"plan {self.resolucion} ({self.carrera or 'sin carrera'})"
+
+
+@dataclass(frozen=True)
+class RefEspacio:
+    espacio_id: int | None = None
+    nombre: str = ""  # normalizado
+    anio: int | None = None
+
+    def __str__(self) -> str:
+        if self.espacio_id:
+            return f"espacio {self.espacio_id}"
+        return f"'{self.nombre}'" + (f" ({self.anio}°)" if self.anio else "")
+
+
+@dataclass
+class ReglaFuente:
+    plan: RefPlan
+    espacio: RefEspacio
+    tipo: str
+    requisito: str
+    requiere: RefEspacio | None = None
+    hasta_anio: int | None = None
+    observaciones: str | None = None
+    origen: str = ""
+
+
+def _id(valor: Any) -> int | None:
+    valor = str(valor or "").strip()
+    return int(valor) if valor.isdigit() else None
+
+
+def _campo_observaciones():
+    from academia_core.models import Correlatividad
+
+    return Correlatividad._meta.get_field("observaciones")
+
+
+def _regla(d: dict[str, Any], plan: RefPlan | None, origen: str) -> ReglaFuente:
+    """Regla desde un dict plano (fila CSV o ítem de `reglas` en JSON)."""
+    d = {str(k).strip().lower(): v for k, v in d.items() if k is not None}
+    if plan is None:
+        plan = RefPlan(
+            plan_id=_id(d.get("plan_id")),
+            carrera=normalizar(d.get("carrera") or d.get("profesorado_slug") or ""),
+            resolucion=str(d.get("plan_resolucion") or d.get("resolucion") or "").strip(),
+        )
+    espacio = RefEspacio(
+        espacio_id=_id(d.get("espacio_id")),
+        nombre=normalizar(d.get("espacio_nombre") or d.get("espacio") or ""),
+        anio=anio_desde_texto(d.get("anio")),
+    )
+    requiere = None
+    if _id(d.get("requiere_espacio_id")) or normalizar(d.get("requiere_espacio_nombre")):
+        requiere = RefEspacio(
+            espacio_id=_id(d.get("requiere_espacio_id")),
+            nombre=normalizar(d.get("requiere_espacio_nombre")),
+            anio=anio_desde_texto(d.get("requiere_espacio_anio")),
+        )
+    obs = d.get("observaciones")
+    obs = str(obs).strip() if obs is not None else None
+    maximo = _campo_observaciones().max_length
+    if obs and len(obs) > maximo:
+        # en MySQL estricto abortaría toda la importación con un DataError
+        raise ErrorCarga(f"{origen}: observaciones de {len(obs)} caracteres (máximo {maximo}).")
+    return ReglaFuente(
+        plan=plan,
+        espacio=espacio,
+        tipo=str(d.get("tipo") or "").strip().upper(),
+        requisito=str(d.get("requisito") or "").strip().upper(),
+        requiere=requiere,
+        hasta_anio=_id(d.get("requiere_todos_hasta_anio")),
+        observaciones=obs,
+        origen=origen,
+    )
+
+
+def _reglas_por_anio(doc: dict[str, Any], plan: RefPlan, origen: str) -> list[ReglaFuente]:
+    """Formato `years[].espacios[].correlativas_{cursar,rendir}.{aprobadas,regularizadas}`."""
+    out = []
+    for anio_doc in doc.get("years") or []:
+        anio = anio_desde_texto(anio_doc.get("year_name"))
+        for esp in anio_doc.get("espacios") or []:
+            espacio = RefEspacio(nombre=normalizar(esp.get("name")), anio=anio)
+            for tipo in TIPOS:
+                bloque = esp.get(f"correlativas_{tipo.lower()}") or {}
+                for requisito, clave in _CLAVES_JSON:
+                    for req in bloque.get(clave) or []:
+                        nombre = req.get("name") if isinstance(req, dict) else req
+                        out.append(
+                            ReglaFuente(
+                                plan=plan,
+                                espacio=espacio,
+                                tipo=tipo,
+                                requisito=requisito,
+                                requiere=RefEspacio(nombre=normalizar(nombre)),
+                                origen=f"{origen} [{esp.get('name')}]",
+                            )
+                        )
+    return out
+
+
+def _leer_json(datos: Any, origen: str) -> list[ReglaFuente]:
+    docs = datos if isinstance(datos, list) else [datos]
+    out = []
+    for i, doc in enumerate(docs, start=1):
+        if not isinstance(doc, dict):
+            raise ErrorCarga(f"{origen}: el ítem {i} no es un objeto.")
+        if "years" not in doc and "reglas" not in doc:
+            out.append(_regla(doc, None, f"{origen}#{i}"))
+            continue
+        plan = RefPlan(
+            plan_id=_id(doc.get("plan_id")),
+            carrera=normalizar(doc.get("carrera") or doc.get("profesorado") or ""),
+            resolucion=str(doc.get("plan_resolucion") or doc.get("resolucion") or "").strip(),
+        )
+        out.extend(_reglas_por_anio(doc, plan, origen))
+        out.extend(
+            _regla(r, plan, f"{origen}#{i}.{j}") for j, r in enumerate(doc.get("reglas") or [], 1)
+        )
+    return out
+
+
+def leer_archivo(ruta: str | Path, delimitador: str | None = None) -> list[ReglaFuente]:
+    ruta = Path(ruta)
+    try:
+        texto = ruta.read_text(encoding="utf-8-sig")
+    except FileNotFoundError as e:
+        raise ErrorCarga(f"No se encontró el archivo: {ruta}") from e
+
+    if ruta.suffix.lower() == ".json":
+        try:
+            return _leer_json(json.loads(texto), ruta.name)
+        except json.JSONDecodeError as e:
+            raise ErrorCarga(f"{ruta.name}: JSON inválido ({e})") from e
+
+    if not delimitador:
+        try:
+            delimitador = csv.Sniffer().sniff(texto.split("\n", 1)[0], ",;\t").delimiter
+        except csv.Error:
+            delimitador = ","
+    filas = csv.DictReader(texto.splitlines(), delimiter=delimitador)
+    # encabezado = fila 1
+    return [_regla(f, None, f"{ruta.name}:{i}") for i, f in enumerate(filas, start=2)]
+
+
+# --- resolución e importación ---------------------------------------------------
+
+
+@dataclass
+class IndiceEspacios:
+    """Espacios de un plan por id, por (nombre, año) y por nombre."""
+
+    anios: dict[int, int | None] = field(default_factory=dict)
+    nombres: dict[int, str] = field(default_factory=dict)
+    por_nombre_anio: dict[tuple[str, int | None], list[int]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    por_nombre: dict[str, list[int]] = field(default_factory=lambda: defaultdict(list))
+
+    def resolver(self, ref: RefEspacio) -> tuple[int | None, str | None]:
+        """(espacio_id, None) o (None, motivo del error)."""
+        if ref.espacio_id:
+            if ref.espacio_id in self.anios:
+                return ref.espacio_id, None
+            return None, f"{ref} no pertenece al plan"
+        if ref.anio is not None:
+            ids = self.por_nombre_anio.get((ref.nombre, ref.anio), [])
+        else:
+            ids = self.por_nombre.get(ref.nombre, [])
+        if len(ids) == 1:
+            return ids[0], None
+        return None, f"{ref} {'es ambiguo' if ids else 'no existe en el plan'}"
+
+
+def indexar_espacios(plan_ids: Iterable[int]) -> dict[int, IndiceEspacios]:
+    from academia_core.models import EspacioCurricular
+
+    indices: dict[int, IndiceEspacios] = {pk: IndiceEspacios() for pk in plan_ids}
+    filas = (
+        EspacioCurricular.objects.filter(plan_id__in=list(indices))
+        .order_by()
+        .values_list("id", "plan_id", "anio", "materia__nombre")
+    )
+    for pk, plan_id, anio_txt, nombre in filas:
+        idx = indices[plan_id]
+        anio = anio_numero(anio_txt)
+        clave = normalizar(nombre)
+        idx.anios[pk] = anio
+        idx.nombres[pk] = nombre or str(pk)
+        idx.por_nombre_anio[(clave, anio)].append(pk)
+        idx.por_nombre[clave].append(pk)
+    return indices
+
+
+def _resolver_planes(refs: Iterable[RefPlan]) -> dict[RefPlan, tuple[int | None, str | None]]:
+    from academia_core.models import PlanEstudios
+
+    refs = set(refs)
+    ids = {r.plan_id for r in refs if r.plan_id}
+    resols = {r.resolucion for r in refs if not r.plan_id}
+    planes = list(
+        PlanEstudios.objects.filter(pk__in=ids).values_list("pk", "resolucion", "carrera__nombre")
+    ) + list(
+        PlanEstudios.objects.filter(resolucion__in=resols).values_list(
+            "pk", "resolucion", "carrera__nombre"
+        )
+    )
+    existentes = {pk for pk, _, _ in planes}
+    out = {}
+    for ref in refs:
+        if ref.plan_id:
+            ok = ref.plan_id in existentes
+            out[ref] = (ref.plan_id, None) if ok else (None, f"No existe el {ref}")
+            continue
+        candidatos = {
+            pk
+            for pk, resol, carrera in planes
+            if resol == ref.resolucion and (not ref.carrera or normalizar(carrera) == ref.carrera)
+        }
+        if len(candidatos) == 1:
+            out[ref] = (candidatos.pop(), None)
+        else:
+            out[ref] = (None, f"{ref}: {'ambiguo' if candidatos else 'no existe'}")
+    return out
+
+
+# (espacio, tipo, requisito, requiere_espacio, requiere_todos_hasta_anio)
+Clave = tuple[int, str, str, int | None, int | None]
+
+
+@dataclass
+class ResultadoPlan:
+    plan_id: int | None
+    etiqueta: str
+    creadas: int = 0
+    actualizadas: int = 0
+    eliminadas: int = 0
+    sin_cambios: int = 0
+    errores: list[str] = field(default_factory=list)
+    ciclo: list[str] | None = None
+
+    @property
+    def aplicable(self) -> bool:
+        return not self.errores and not self.ciclo
+
+
+def _aristas(claves: Iterable[Clave], idx: IndiceEspacios) -> dict[int, set[int]]:
+    """espacio -> espacios que requiere (con `requiere_todos_hasta_anio` expandido)."""
+    aristas: dict[int, set[int]] = defaultdict(set)
+    for esp, _tipo, _req, req_esp, hasta in claves:
+        if req_esp:
+            aristas[esp].add(req_esp)
+        elif hasta:
+            aristas[esp].update(pk for pk, a in idx.anios.items() if a is not None and a <= hasta)
+    return aristas
+
+
+def _importar_plan(
+    plan_id: int,
+    reglas: list[ReglaFuente],
+    idx: IndiceEspacios,
+    res: ResultadoPlan,
+    reemplazar: bool,
+    simular: bool,
+) -> None:
+    from academia_core.models import Correlatividad
+
+    deseadas: dict[Clave, str | None] = {}
+    for r in reglas:
+        if r.tipo not in TIPOS or r.requisito not in REQUISITOS:
+            res.errores.append(f"{r.origen}: tipo/requisito inválido ({r.tipo}/{r.requisito})")
+            continue
+        esp, err = idx.resolver(r.espacio)
+        req = None
+        if not err and r.requiere is not None:
+            req, err = idx.resolver(r.requiere)
+        elif not err and not r.hasta_anio:
+            err = "falta requiere_espacio o requiere_todos_hasta_anio"
+        if err:
+            res.errores.append(f"{r.origen}: {err}")
+            continue
+        deseadas[(esp, r.tipo, r.requisito, req, None if req else r.hasta_anio)] = r.observaciones
+    if res.errores:
+        return
+
+    existentes: dict[Clave, Any] = {}
+    for c in Correlatividad.objects.filter(plan_id=plan_id).order_by("pk"):
+        clave = (
+            c.espacio_id,
+            c.tipo,
+            c.requisito,
+            c.requiere_espacio_id,
+            c.requiere_todos_hasta_anio,
+        )
+        existentes.setdefault(clave, c)
+
+    sobrantes = [c for k, c in existentes.items() if k not in deseadas] if reemplazar else []
+    finales = set(deseadas) | (set() if reemplazar else set(existentes))
+    ciclo = buscar_ciclo(_aristas(finales, idx))
+    if ciclo:
+        res.ciclo = [idx.nombres.get(pk, str(pk)) for pk in ciclo]
+        return
+
+    crear, actualizar = [], []
+    for (esp, tipo, requisito, req, hasta), obs in deseadas.items():
+        actual = existentes.get((esp, tipo, requisito, req, hasta))
+        if actual is None:
+            crear.append(
+                Correlatividad(
+                    plan_id=plan_id,
+                    espacio_id=esp,
+                    tipo=tipo,
+                    requisito=requisito,
+                    requiere_espacio_id=req,
+                    requiere_todos_hasta_anio=hasta,
+                    observaciones=obs or "",
+                )
+            )
+        elif obs is not None and actual.observaciones != obs:
+            actual.observaciones = obs
+            actualizar.append(actual)
+        else:
+            res.sin_cambios += 1
+    res.creadas, res.actualizadas, res.eliminadas = len(crear), len(actualizar), len(sobrantes)
+    if simular:
+        return
+
+    with transaction.atomic():
+        if sobrantes:
+            Correlatividad.objects.filter(pk__in=[c.pk for c in sobrantes]).delete()
+        Correlatividad.objects.bulk_create(crear)
+        if actualizar:
+            Correlatividad.objects.bulk_update(actualizar, ["observaciones"])
+    if crear or actualizar:
+        # bulk_create/bulk_update no disparan signals (el delete sí)
+        referencia_cache.invalidar("correlatividades")
+
+
+def importar(
+    reglas: Iterable[ReglaFuente], reemplazar: bool = False, simular: bool = False
+) -> list[ResultadoPlan]:
+    """
+    Aplica las reglas agrupadas por plan. Con `reemplazar`, las correlatividades
+    del plan que no vienen en el archivo se borran; sin él sólo se agregan o
+    actualizan. Devuelve un resultado por plan (en orden de aparición).
+    """
+    por_ref: dict[RefPlan, list[ReglaFuente]] = defaultdict(list)
+    for r in reglas:
+        por_ref[r.plan].append(r)
+
+    resueltos = _resolver_planes(por_ref)
+    por_plan: dict[int, list[ReglaFuente]] = defaultdict(list)
+    resultados: dict[int | RefPlan, ResultadoPlan] = {}
+    for ref, lista in por_ref.items():
+        plan_id, err = resueltos[ref]
+        if err:
+            resultados[ref] = ResultadoPlan(None, str(ref), errores=[err])
+            continue
+        por_plan[plan_id].extend(lista)
+        resultados.setdefault(plan_id, ResultadoPlan(plan_id, str(ref)))
+
+    indices = indexar_espacios(por_plan)
+    for plan_id, lista in por_plan.items():
+        _importar_plan(plan_id, lista, indices[plan_id], resultados[plan_id], reemplazar, simular)
+    return list(resultados.values())
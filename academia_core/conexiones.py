@@ -0,0 +1,410 @@
+# academia_core/conexiones.py
+"""
+Conexiones a la base: métricas de adquisición, pool opcional y réplica.
+
+- Los backends `academia_core.backends.mysql` y `academia_core.backends.sqlite3`
+  son los de Django más dos cosas: miden cuánto tarda cada `connect()` (por
+  alias, ver `estadisticas()`) y, con `OPTIONS["pool"]`, reusan las conexiones
+  físicas desde un pool por proceso en lugar de abrir una por request:
+
+      "ENGINE": "academia_core.backends.mysql",
+      "CONN_MAX_AGE": 0,            # el pool reemplaza a la conexión persistente
+      "CONN_HEALTH_CHECKS": True,   # la conexión que sale del pool se verifica
+      "OPTIONS": {"pool": {"max_size": 10, "reciclar": 1800}, ...},
+
+  Sin pool conviene `CONN_MAX_AGE` > 0: cada hilo del worker conserva su
+  conexión entre requests y Django la verifica antes de reusarla.
+
+- `RouterReplica` manda las lecturas hechas dentro de `en_replica()` (o de
+  una vista con `@usar_replica`) al alias `reporting`, si está configurado y
+  su atraso no pasa de DB_REPORTING_RETRASO_MAX. Las escrituras van siempre a
+  `default`, también las de objetos leídos de la réplica, y después de
+  escribir se vuelve a leer de `default`: en el mismo bloque o request, y por
+  DB_REPORTING_PEGADO segundos en los requests siguientes del mismo
+  navegador (`PrimarioTrasEscrituraMiddleware`).
+
+Una conexión del pool conserva su estado de sesión (variables, tablas
+temporales): la app no los usa, y lo que quede de una transacción abierta se
+descarta con un rollback al devolverla.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+REPLICA = "reporting"
+
+_lock = threading.Lock()
+_contadores: dict[str, dict] = defaultdict(
+    lambda: {"conexiones": 0, "nuevas": 0, "del_pool": 0, "ms_total": 0.0, "ms_max": 0.0}
+)
+_pools: dict[str, Pool] = {}
+
+
+# ---------- métricas ----------
+def registrar(alias: str, ms: float, nueva: bool) -> None:
+    with _lock:
+        c = _contadores[alias]
+        c["conexiones"] += 1
+        c["nuevas" if nueva else "del_pool"] += 1
+        c["ms_total"] += ms
+        c["ms_max"] = max(c["ms_max"], ms)
+    umbral = getattr(settings, "DB_CONEXION_LENTA_MS", 0)
+    if umbral and ms > umbral:
+        logger.warning("Conexión lenta a %s: %.1f ms (%s)", alias, ms, "nueva" if nueva else "pool")
+
+
+def estadisticas() -> dict[str, dict]:
+    """Adquisiciones por alias desde el arranque del proceso, más el estado del pool."""
+    with _lock:
+        snapshot = {alias: dict(c) for alias, c in _contadores.items()}
+    out = {}
+    for alias, c in sorted(snapshot.items()):
+        out[alias] = {
+            **c,
+            "ms_total": round(c["ms_total"], 3),
+            "ms_max": round(c["ms_max"], 3),
+            "ms_promedio": round(c["ms_total"] / c["conexiones"], 3) if c["conexiones"] else None,
+            "pool": _pools[alias].estado() if alias in _pools else None,
+        }
+    return out
+
+
+def reiniciar_estadisticas() -> None:
+    with _lock:
+        _contadores.clear()
+        _desvios.clear()
+        _retrasos.clear()
+
+
+# ---------- pool ----------
+class Pool:
+    """
+    Conexiones físicas ociosas de un alias (LIFO: la más reciente sale primero
+    y las viejas envejecen hasta reciclarse). No limita cuántas hay abiertas:
+    si no hay ociosas se abre una nueva, y al devolverla con el pool lleno se
+    cierra.
+    """
+
+    def __init__(self, max_size: int = 10, reciclar: float = 1800):
+        self.max_size = max_size
+        self.reciclar = reciclar
+        self._ociosas: queue.LifoQueue = queue.LifoQueue()
+        self._creada: dict[int, float] = {}
+
+    def tomar(self, usable=None):
+        """Una conexión ociosa (None si no hay); descarta las viejas o rotas."""
+        while True:
+            try:
+                cruda = self._ociosas.get_nowait()
+            except queue.Empty:
+                return None
+            vieja = time.monotonic() - self._creada.get(id(cruda), 0) > self.reciclar
+            if vieja or (usable is not None and not usable(cruda)):
+                self._cerrar(cruda)
+                continue
+            return cruda
+
+    def devolver(self, cruda) -> None:
+        self._creada.setdefault(id(cruda), time.monotonic())
+        if self._ociosas.qsize() >= self.max_size:
+            self._cerrar(cruda)
+        else:
+            self._ociosas.put(cruda)
+
+    def vaciar(self) -> None:
+        while (cruda := self.tomar()) is not None:
+            self._cerrar(cruda)
+
+    def estado(self) -> dict:
+        return {"ociosas": self._ociosas.qsize(), "max_size": self.max_size}
+
+    def _cerrar(self, cruda) -> None:
+        self._creada.pop(id(cruda), None)
+        try:
+            cruda.close()
+        except Exception:
+            pass
+
+
+def pool_para(alias: str, opciones: dict) -> Pool:
+    with _lock:
+        if alias not in _pools:
+            _pools[alias] = Pool(**opciones)
+        return _pools[alias]
+
+
+def cerrar_pools() -> None:
+    """Cierra las conexiones ociosas de todos los pools (tests, fin del worker)."""
+    with _lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for p in pools:
+        p.vaciar()
+
+
+class ConexionMedida:
+    """
+    Mixin para el `DatabaseWrapper` de un backend: mide `get_new_connection`
+    y, con `OPTIONS["pool"]` (True o dict con `max_size`/`reciclar`), toma y
+    devuelve las conexiones físicas de un `Pool`.
+    """
+
+    def _opciones_pool(self):
+        opciones = self.settings_dict["OPTIONS"].get("pool")
+        if not opciones:
+            return None
+        return opciones if isinstance(opciones, dict) else {}
+
+    @property
+    def pool(self) -> Pool | None:
+        opciones = self._opciones_pool()
+        return None if opciones is None else pool_para(self.alias, opciones)
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop("pool", None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        t0 = time.perf_counter()
+        pool = self.pool
+        usable = self.cruda_usable if self.settings_dict.get("CONN_HEALTH_CHECKS") else None
+        cruda = pool.tomar(usable) if pool is not None else None
+        nueva = cruda is None
+        if nueva:
+            cruda = super().get_new_connection(conn_params)
+        registrar(self.alias, (time.perf_counter() - t0) * 1000, nueva)
+        return cruda
+
+    def cruda_usable(self, cruda) -> bool:
+        """
+        Verificación barata de una conexión física antes de reusarla. Los
+        backends la redefinen (ping); por defecto se confía en la conexión y,
+        si falló, `errors_occurred` hace que se cierre en vez de volver al pool.
+        """
+        return True
+
+    def _close(self):
+        pool = self.pool
+        if pool is None or self.connection is None:
+            return super()._close()
+        cruda = self.connection
+        if self.errors_occurred:
+            return super()._close()
+        with self.wrap_database_errors:
+            if self.in_atomic_block or not self.autocommit:
+                cruda.rollback()
+        pool.devolver(cruda)
+
+
+# ---------- réplica ----------
+COOKIE_PRIMARIO = "db_primario"
+
+_alias_lectura: ContextVar[str | None] = ContextVar("alias_lectura", default=None)
+# {"escribio": bool} del request (o del bloque en_replica) en curso; es un dict
+# para que lo marcado en un hilo de sync_to_async se vea desde el middleware
+_escrituras: ContextVar[dict | None] = ContextVar("escrituras", default=None)
+_retrasos: dict[str, tuple[float, float | None]] = {}
+_desvios: Counter[str] = Counter()
+
+
+def retraso_replica(alias: str = REPLICA) -> float | None:
+    """
+    Segundos de atraso de la réplica según el servidor; None si no se puede
+    saber (caída, replicación detenida o sin permiso para consultarla). Un
+    servidor que no es réplica (o una copia SQLite) no tiene atraso.
+    """
+    conexion = connections[alias]
+    if conexion.vendor != "mysql":
+        return 0.0
+    try:
+        with conexion.cursor() as c:
+            try:
+                c.execute("SHOW REPLICA STATUS")
+            except DatabaseError:  # MySQL < 8.0.22
+                c.execute("SHOW SLAVE STATUS")
+            fila = c.fetchone()
+            if fila is None:
+                return 0.0
+            datos = dict(zip([d[0] for d in c.description], fila, strict=True))
+    except DatabaseError as exc:
+        logger.warning("No se pudo medir el atraso de %s: %s", alias, exc)
+        return None
+    retraso = datos.get("Seconds_Behind_Source", datos.get("Seconds_Behind_Master"))
+    return None if retraso is None else float(retraso)
+
+
+def replica_disponible(alias: str = REPLICA) -> bool:
+    """
+    True si `alias` está configurado y atrasa a lo sumo DB_REPORTING_RETRASO_MAX
+    segundos. El atraso se consulta como mucho cada DB_REPORTING_RETRASO_CACHE.
+    """
+    if alias not in settings.DATABASES:
+        return False
+    ahora = time.monotonic()
+    medido = _retrasos.get(alias)
+    if medido is None or ahora - medido[0] > settings.DB_REPORTING_RETRASO_CACHE:
+        medido = _retrasos[alias] = (ahora, retraso_replica(alias))
+    retraso = medido[1]
+    return retraso is not None and retraso <= settings.DB_REPORTING_RETRASO_MAX
+
+
+def estadisticas_replica() -> dict:
+    """Bloques servidos por la réplica y desvíos a default (por atraso o escritura)."""
+    with _lock:
+        out = dict(_desvios)
+    out["retraso"] = {alias: r for alias, (_, r) in _retrasos.items()}
+    return out
+
+
+def _contar(motivo: str) -> None:
+    with _lock:
+        _desvios[motivo] += 1
+
+
+@contextmanager
+def en_replica(alias: str = REPLICA):
+    """
+    Las lecturas del bloque van a `alias` si está configurado y al día; si no,
+    a `default` como siempre. Una vez que el bloque (o el request) escribió,
+    el resto de sus lecturas vuelve a `default` para leer lo escrito.
+    """
+    usar = replica_disponible(alias)
+    if alias in settings.DATABASES:
+        _contar("replica" if usar else "primario_por_retraso")
+    token = _alias_lectura.set(alias if usar else None)
+    token_esc = _escrituras.set({"escribio": False}) if _escrituras.get() is None else None
+    try:
+        yield
+    finally:
+        _alias_lectura.reset(token)
+        if token_esc is not None:
+            _escrituras.reset(token_esc)
+
+
+@contextmanager
+def en_primario():
+    """
+    Las lecturas del bloque van a `default` aunque se esté dentro de `en_replica()`:
+    para lo que se guarda en cachés compartidas, que no deben quedar con datos
+    atrasados de la réplica bajo una versión nueva.
+    """
+    token = _alias_lectura.set(None)
+    try:
+        yield
+    finally:
+        _alias_lectura.reset(token)
+
+
+def usar_replica(vista=None, *, alias: str = REPLICA):
+    """
+    Decorador de vistas de sólo lectura (reportes, exportaciones, listados de
+    la API): los GET/HEAD corren dentro de `en_replica()`, incluido el render
+    de un TemplateResponse y el contenido de una respuesta streaming. Los
+    demás métodos, y los usuarios que escribieron hace menos de
+    DB_REPORTING_PEGADO segundos (cookie del middleware), van a `default`.
+
+        @login_required
+        @require_GET
+        @usar_replica
+        def api_reporte(request): ...
+    """
+
+    def decorador(func):
+        @wraps(func)
+        def _vista(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return func(request, *args, **kwargs)
+            if COOKIE_PRIMARIO in request.COOKIES:
+                _contar("primario_por_escritura")
+                return func(request, *args, **kwargs)
+            with en_replica(alias):
+                respuesta = func(request, *args, **kwargs)
+                if hasattr(respuesta, "render") and not respuesta.is_rendered:
+                    respuesta.render()
+            if getattr(respuesta, "streaming", False):
+                respuesta.streaming_content = _iterar_en_replica(respuesta.streaming_content, alias)
+            return respuesta
+
+        return _vista
+
+    return decorador if vista is None else decorador(vista)
+
+
+def _iterar_en_replica(contenido, alias):
+    with en_replica(alias):
+        yield from contenido
+
+
+class PrimarioTrasEscrituraMiddleware:
+    """
+    Lectura tras escritura: si el request escribió (o no fue GET/HEAD), deja
+    una cookie por DB_REPORTING_PEGADO segundos para que `usar_replica` mande
+    los requests siguientes de ese navegador a `default`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        escrituras = {"escribio": False}
+        token = _escrituras.set(escrituras)
+        try:
+            respuesta = self.get_response(request)
+        finally:
+            _escrituras.reset(token)
+        pegado = settings.DB_REPORTING_PEGADO
+        escribio = escrituras["escribio"] or request.method not in ("GET", "HEAD", "OPTIONS")
+        if escribio and pegado and REPLICA in settings.DATABASES:
+            respuesta.set_cookie(
+                COOKIE_PRIMARIO, "1", max_age=pegado, httponly=True, samesite="Lax"
+            )
+        return respuesta
+
+
+class RouterReplica:
+    """
+    Lecturas dentro de `en_replica()` a la réplica, salvo que el bloque o el
+    request ya hayan escrito; las escrituras, siempre a `default`.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = _alias_lectura.get()
+        if alias is None:
+            return None
+        escrituras = _escrituras.get()
+        if escrituras is not None and escrituras["escribio"]:
+            return None
+        return alias
+
+    def db_for_write(self, model, **hints):
+        escrituras = _escrituras.get()
+        if escrituras is not None:
+            escrituras["escribio"] = True
+        instancia = hints.get("instance")
+        if instancia is not None and instancia._state.db == REPLICA:
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, REPLICA}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA:
+            return False
+        return None
@@ -1,23 +1,16 @@
 from __future__ import annotations
 
+from functools import cache
 from typing import Any
 
-from django.apps import apps
-from django.db.models import Model, Q
+from django.db.models import Q
 
-from academia_core.models import Correlatividad, EspacioCurricular
-
-
-# ---------- utilidades de introspección ----------
-def _first_model(candidates: list[str]) -> Model | None:
-    for name in candidates:
-        try:
-            return apps.get_model("academia_core", name)
-        except Exception:
-            continue
-    return None
+from academia_core.modelos import modelos
+from academia_core.models import Correlatividad, EspacioCurricular, Estudiante, PlanEstudios
 
 
+# ---------- utilidades de introspección (memoizadas por modelo) ----------
+@cache
 def _fk_name_to(model, related_model_cls) -> str | None:
     for f in model._meta.get_fields():
         if (
@@ -29,6 +22,7 @@ def _fk_name_to(model, related_model_cls) -> str | None:
     return None
 
 
+@cache
 def _has_field(model, *names) -> str | None:
     fields = {f.name for f in model._meta.get_fields()}
     for n in names:
@@ -37,20 +31,23 @@ def _has_field(model, *names) -> str | None:
     return None
 
 
-# ---------- detección de modelos frecuentes ----------
-Estudiante = apps.get_model("academia_core", "Estudiante")
-PlanEstudios = apps.get_model("academia_core", "PlanEstudios")
-
-# ResultadoFinal / ActaFinal / Aprobacion
-ResultadoFinal = _first_model(["ResultadoFinal", "ActaFinal", "Aprobacion", "CalificacionFinal"])
-# Regularidad de cursada
-Regularidad = _first_model(["Regularidad", "Cursada", "CondicionCursada"])
-# Inscripción a cursada (estudiante + espacio [+ ciclo])
-InscripcionEspacio = _first_model(
-    ["InscripcionEspacio", "InscripcionCursada", "InscripcionMateria"]
-)
-# Inscripción a final (opcional)
-InscripcionFinal = _first_model(["InscripcionFinal", "MesaInscripcion"])
+# ---------- detección de modelos frecuentes (al primer uso) ----------
+def _modelos_estado():
+    """(ResultadoFinal, Regularidad, InscripcionEspacio, InscripcionFinal) o None cada uno."""
+    return (
+        # ResultadoFinal / ActaFinal / Aprobacion
+        modelos.primero(
+            "academia_core", "ResultadoFinal", "ActaFinal", "Aprobacion", "CalificacionFinal"
+        ),
+        # Regularidad de cursada
+        modelos.primero("academia_core", "Regularidad", "Cursada", "CondicionCursada"),
+        # Inscripción a cursada (estudiante + espacio [+ ciclo])
+        modelos.primero(
+            "academia_core", "InscripcionEspacio", "InscripcionCursada", "InscripcionMateria"
+        ),
+        # Inscripción a final (opcional)
+        modelos.primero("academia_core", "InscripcionFinal", "MesaInscripcion"),
+    )
 
 
 # ---------- estado académico sets ----------
@@ -62,6 +59,7 @@ def estado_sets_para_estudiante(
     regular_ids: set[int] = set()
     insc_cursada_ids: set[int] = set()
     insc_final_ids: set[int] = set()
+    ResultadoFinal, Regularidad, InscripcionEspacio, InscripcionFinal = _modelos_estado()
 
     # Aprobadas (final/promoción)
     if ResultadoFinal:
@@ -0,0 +1,237 @@
+# academia_core/finales.py
+"""
+Inscripción a mesas de final por ventana.
+
+Validar cada pedido con `Movimiento.clean` cuesta varias consultas por
+espacio (regularidad vigente, aprobada, intentos previos, correlativas para
+RENDIR). Al abrir la ventana se calcula todo eso una vez, en bloque, y se
+guarda en `HabilitacionFinal` una fila por (inscripción, materia) rendible:
+
+- regularidad vigente a `mesas_desde`, o libre en un espacio que lo habilita
+  (ver `mesas.rendibles`);
+- legajo completo;
+- sin el espacio aprobado (tampoco por un final libre) y con menos de tres
+  intentos de final (las ausencias justificadas no cuentan);
+- correlatividades para RENDIR cumplidas (`PlanGrafo.faltantes`).
+
+La inscripción a una mesa sólo busca su fila por el índice único
+(ventana, inscripción, materia) y hace un INSERT idempotente.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.utils import timezone
+
+from academia_core import referencia_cache
+from academia_core.inscripciones import Resultado, insertar_ignorando_conflicto
+from academia_core.mesas import rendibles
+
+MAX_INTENTOS = 3
+NOTA_APROBADO = 6
+
+
+@dataclass
+class ResultadoVentana:
+    habilitadas: int = 0
+    inscripciones: int = 0
+    descartadas: Counter = field(default_factory=Counter)  # motivo -> cantidad
+
+
+def ventana_abierta(hoy=None):
+    """La ventana abierta (y ya calculada) más reciente, o None."""
+    from academia_core.models import VentanaFinal
+
+    hoy = hoy or timezone.localdate()
+    return (
+        VentanaFinal.objects.filter(abre__lte=hoy, cierra__gte=hoy, calculada__isnull=False)
+        .order_by("-abre", "-pk")
+        .first()
+    )
+
+
+def _intentos(insc_ids: list[int], fecha, lote: int = 1000):
+    """({(insc, esp): intentos}, {(insc, esp) aprobados por final}) a `fecha`."""
+    from academia_core.models import Movimiento
+
+    intentos: Counter = Counter()
+    aprobados = set()
+    for i in range(0, len(insc_ids), lote):
+        filas = (
+            Movimiento.objects.filter(
+                tipo="FIN", inscripcion_id__in=insc_ids[i : i + lote], fecha__lte=fecha
+            )
+            .exclude(ausente=True, ausencia_justificada=True)
+            .order_by()
+            .values_list("inscripcion_id", "espacio_id", "nota_num", "ausente")
+        )
+        for insc, esp, nota, ausente in filas:
+            intentos[(insc, esp)] += 1
+            if not ausente and (nota or 0) >= NOTA_APROBADO:
+                aprobados.add((insc, esp))
+    return intentos, aprobados
+
+
+def precalcular(ventana, plan_ids=None, batch_size: int = 1000, progreso=None):
+    """
+    Recalcula las habilitaciones de `ventana` (reemplaza las anteriores) y la
+    marca como calculada. `progreso(hecho, total)` se llama por lote guardado.
+    """
+    from academia_core.models import (
+        EspacioCurricular,
+        EstudianteProfesorado,
+        HabilitacionFinal,
+        LegajoEstado,
+    )
+
+    fecha = ventana.mesas_desde
+    res = ResultadoVentana()
+    pares, estados = rendibles(fecha, plan_ids)
+    insc_ids = sorted({i for i, _ in pares})
+
+    datos_insc = {}
+    for i in range(0, len(insc_ids), batch_size):
+        datos_insc.update(
+            (pk, (plan, legajo))
+            for pk, plan, legajo in EstudianteProfesorado.objects.filter(
+                pk__in=insc_ids[i : i + batch_size]
+            )
+            .order_by()
+            .values_list("pk", "plan_id", "legajo_estado")
+        )
+    materia_de = dict(
+        EspacioCurricular.objects.filter(pk__in={e for _, e in pares})
+        .order_by()
+        .values_list("pk", "materia_id")
+    )
+    intentos, aprobados = _intentos(insc_ids, fecha, batch_size)
+
+    filas, vistas = [], set()
+    for (insc, esp), libre in sorted(pares.items()):
+        plan, legajo = datos_insc[insc]
+        if legajo != LegajoEstado.COMPLETO:
+            motivo = "legajo"
+        elif (insc, esp) in aprobados:
+            motivo = "aprobado"
+        elif intentos[(insc, esp)] >= MAX_INTENTOS:
+            motivo = "intentos"
+        elif plan and referencia_cache.get_plan_grafo(plan).faltantes(
+            esp, "RENDIR", *estados[insc]
+        ):
+            motivo = "correlativas"
+        else:
+            motivo = None
+        if motivo:
+            res.descartadas[motivo] += 1
+            continue
+        if (insc, materia_de[esp]) in vistas:
+            continue  # dos espacios del plan con la misma materia: una sola mesa
+        vistas.add((insc, materia_de[esp]))
+        filas.append(
+            HabilitacionFinal(
+                ventana_id=ventana.pk,
+                inscripcion_id=insc,
+                espacio_id=esp,
+                materia_id=materia_de[esp],
+                libre=libre,
+                intentos=intentos[(insc, esp)],
+            )
+        )
+
+    with transaction.atomic():
+        HabilitacionFinal.objects.filter(ventana_id=ventana.pk).delete()
+        total = (len(filas) + batch_size - 1) // batch_size
+        for n, i in enumerate(range(0, len(filas), batch_size), start=1):
+            HabilitacionFinal.objects.bulk_create(filas[i : i + batch_size])
+            if progreso:
+                progreso(n, total)
+        ventana.calculada = timezone.now()
+        ventana.save(update_fields=["calculada"])
+
+    res.habilitadas = len(filas)
+    res.inscripciones = len({h.inscripcion_id for h in filas})
+    return res
+
+
+def abrir_ventana(nombre, abre, cierra, mesas_desde, mesas_hasta, plan_ids=None):
+    """Crea la ventana y precalcula sus habilitaciones. Devuelve (ventana, resultado)."""
+    from academia_core.models import VentanaFinal
+
+    ventana = VentanaFinal.objects.create(
+        nombre=nombre, abre=abre, cierra=cierra, mesas_desde=mesas_desde, mesas_hasta=mesas_hasta
+    )
+    return ventana, precalcular(ventana, plan_ids)
+
+
+def habilitados(ventana, inscripcion_id: int) -> list[dict]:
+    """Lo que `inscripcion_id` puede rendir en la ventana, con las mesas del turno."""
+    from academia_core.models import HabilitacionFinal, Mesa
+
+    filas = list(
+        HabilitacionFinal.objects.filter(ventana=ventana, inscripcion_id=inscripcion_id)
+        .order_by("espacio_id")
+        .values("espacio_id", "materia_id", "libre", "intentos")
+    )
+    mesas: dict[int, list[dict]] = {}
+    qs = Mesa.objects.filter(
+        materia_id__in=[f["materia_id"] for f in filas],
+        fecha__gte=ventana.mesas_desde,
+        fecha__lte=ventana.mesas_hasta,
+    ).order_by("fecha", "turno", "pk")
+    for pk, materia, fecha, turno in qs.values_list("pk", "materia_id", "fecha", "turno"):
+        mesas.setdefault(materia, []).append({"id": pk, "fecha": fecha.isoformat(), "turno": turno})
+    return [{**f, "mesas": mesas.get(f["materia_id"], [])} for f in filas]
+
+
+def inscribir(ventana, inscripcion_id: int, mesa_id: int, llamada: str = "", hoy=None):
+    """
+    Inscribe a la mesa si la ventana está abierta, la mesa es del turno y la
+    inscripción tiene la materia habilitada. Seguro ante reintentos: el alta
+    es un INSERT idempotente sobre `uniq_insc_mesa_est_mesa`.
+    """
+    from academia_core.models import HabilitacionFinal, InscripcionMesa, Mesa
+
+    if not ventana.abierta(hoy):
+        return Resultado(False, 409, {"error": "ventana_cerrada"})
+    materia = (
+        Mesa.objects.filter(
+            pk=mesa_id, fecha__gte=ventana.mesas_desde, fecha__lte=ventana.mesas_hasta
+        )
+        .values_list("materia_id", flat=True)
+        .first()
+    )
+    if materia is None:
+        return Resultado(False, 404, {"error": "mesa_fuera_de_turno"})
+    hab = (
+        HabilitacionFinal.objects.filter(
+            ventana=ventana, inscripcion_id=inscripcion_id, materia_id=materia
+        )
+        .values("libre", "inscripcion__estudiante_id")
+        .first()
+    )
+    if hab is None:
+        return Resultado(False, 400, {"error": "no_habilitado"})
+
+    estudiante = hab["inscripcion__estudiante_id"]
+    creada = insertar_ignorando_conflicto(
+        InscripcionMesa,
+        {
+            "estudiante": estudiante,
+            "mesa": mesa_id,
+            "condicion": "libre" if hab["libre"] else "regular",
+            "llamada": llamada[:20],
+            "fecha_inscripcion": timezone.localdate(),
+            "estado": "confirmada",
+        },
+    )
+    pk = (
+        InscripcionMesa.objects.filter(estudiante_id=estudiante, mesa_id=mesa_id)
+        .values_list("pk", flat=True)
+        .first()
+    )
+    if not creada:
+        return Resultado(False, 409, {"error": "ya_inscripto", "id": pk})
+    return Resultado(True, 201, {"id": pk, "condicion": "libre" if hab["libre"] else "regular"})
@@ -3,6 +3,7 @@ from django import forms
 from django.urls import reverse
 from django.utils import timezone
 
+from . import opciones
 from .models import EstudianteProfesorado
 
 # Estos imports pueden no existir aún; los “try” evitan que truene la importación.
@@ -114,6 +115,7 @@ if InscripcionEspacio and EspacioCurricular:
 
             # Hasta elegir inscripcion: sin opciones
             self.fields["espacio"].queryset = EspacioCurricular.objects.none()
+            self.fields["espacio"].choices = opciones.con_vacio([])
 
             # Estado: choices + initial defensivo
             estado_field = self.fields.get("estado")
@@ -122,32 +124,39 @@ if InscripcionEspacio and EspacioCurricular:
                 if not getattr(self.instance, "pk", None) and not self.initial.get("estado"):
                     estado_field.initial = getattr(EstadoInscripcion, "EN_CURSO", "EN_CURSO")
 
-            # Data-attribute para el fetch dinámico de espacios
-            url_base = reverse("api_espacios_por_inscripcion", args=[0])
+            insc_id = opciones.elegido(self, "inscripcion")
             if "inscripcion" in self.fields:
-                self.fields["inscripcion"].widget.attrs.update({"data-espacios-url": url_base})
-
-            # Si ya conocemos la inscripción, completar queryset de espacios
-            insc_id = None
-            if self.is_bound:
-                insc_id = self.data.get("inscripcion")
-            elif getattr(self.instance, "pk", None):
-                insc_id = self.instance.inscripcion_id
+                opciones.autocompletar(
+                    self.fields["inscripcion"],
+                    "academia_core:api_autocompletar_inscripciones",
+                    insc_id,
+                    opciones.inscripciones,
+                )
+                # Data-attribute para el fetch dinámico de espacios
+                self.fields["inscripcion"].widget.attrs.update(
+                    {"data-espacios-url": reverse("academia_core:api_autocompletar_espacios")}
+                )
 
-            if insc_id:
+            # Si ya conocemos la inscripción, completar los espacios (proyectados, sin __str__)
+            if str(insc_id or "").isdigit():
                 try:
-                    est_prof = EstudianteProfesorado.objects.select_related("profesorado").get(
-                        pk=insc_id
-                    )
+                    est_prof = EstudianteProfesorado.objects.select_related(
+                        "estudiante", "carrera"
+                    ).get(pk=insc_id)
+                except EstudianteProfesorado.DoesNotExist:
+                    est_prof = None
+                if est_prof is not None:
+                    ids = None
                     if espacios_habilitados_para:
                         # Pasa la inscripción real (con estudiante/carrera) al helper
-                        self.fields["espacio"].queryset = espacios_habilitados_para(est_prof)
+                        qs = espacios_habilitados_para(est_prof)
+                        ids = qs.values_list("pk", flat=True)
                     else:
-                        self.fields["espacio"].queryset = EspacioCurricular.objects.filter(
-                            profesorado=est_prof.profesorado
-                        )
-                except EstudianteProfesorado.DoesNotExist:
-                    pass
+                        qs = EspacioCurricular.objects.filter(plan_id=est_prof.plan_id)
+                    self.fields["espacio"].queryset = qs
+                    self.fields["espacio"].choices = opciones.con_vacio(
+                        opciones.espacios_plan(est_prof.plan_id, ids)
+                    )
 
         # --- Validaciones defensivas ---
         def clean_estado(self):
@@ -202,38 +211,30 @@ class CargaNotaForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields["inscripcion"].queryset = EstudianteProfesorado.objects.all().select_related(
-            "estudiante", "profesorado"
+        # Nada de iterar inscripciones/espacios: el render no depende de cuántas haya
+        insc_id = opciones.elegido(self, "inscripcion")
+        opciones.autocompletar(
+            self.fields["inscripcion"],
+            "academia_core:api_autocompletar_inscripciones",
+            insc_id,
+            opciones.inscripciones,
         )
-        self.fields["espacio"].queryset = EspacioCurricular.objects.none()
-        self.fields["condicion"].queryset = Condicion.objects.none()
-
-        if "inscripcion" in self.data:
-            try:
-                inscripcion_id = int(self.data.get("inscripcion"))
-                inscripcion = EstudianteProfesorado.objects.get(id=inscripcion_id)
-                self.fields["espacio"].queryset = EspacioCurricular.objects.filter(
-                    plan=inscripcion.plan
-                ).order_by("nombre")
-            except (ValueError, TypeError, EstudianteProfesorado.DoesNotExist):
-                pass
-        elif self.instance.pk and self.instance.inscripcion:
-            self.fields["espacio"].queryset = EspacioCurricular.objects.filter(
-                plan=self.instance.inscripcion.plan
-            ).order_by("nombre")
-
-        if "tipo" in self.data:
-            try:
-                tipo = self.data.get("tipo")
-                self.fields["condicion"].queryset = Condicion.objects.filter(tipo=tipo).order_by(
-                    "nombre"
-                )
-            except (ValueError, TypeError):
-                pass
-        elif self.instance.pk and self.instance.tipo:
-            self.fields["condicion"].queryset = Condicion.objects.filter(
-                tipo=self.instance.tipo
-            ).order_by("nombre")
+
+        plan_id = opciones.plan_de_inscripcion(insc_id)
+        espacio = self.fields["espacio"]
+        espacio.queryset = (
+            EspacioCurricular.objects.filter(plan_id=plan_id)
+            if plan_id
+            else EspacioCurricular.objects.none()
+        )
+        espacio.choices = opciones.con_vacio(opciones.espacios_plan(plan_id))
+
+        tipo = opciones.elegido(self, "tipo")
+        condicion = self.fields["condicion"]
+        condicion.queryset = (
+            Condicion.objects.filter(tipo=tipo) if tipo else Condicion.objects.none()
+        )
+        condicion.choices = opciones.con_vacio(opciones.condiciones(tipo))
 
 
 # --- FORMULARIO FALTANTE ---
@@ -1,6 +1,7 @@
 from django import forms
 from django.forms import ModelChoiceField, ModelMultipleChoiceField
 
+from academia_core import opciones
 from academia_core.models import Carrera as Profesorado
 from academia_core.models import Correlatividad, EspacioCurricular, PlanEstudios
 
@@ -40,34 +41,33 @@ class CorrelatividadForm(forms.Form):
         # Get data from either self.data (POST) or initial (GET)
         data_source = self.data if self.data else self.initial
 
-        # If a profesorado is selected, filter plans
-        if "profesorado" in data_source:
-            try:
-                profesorado_id = int(data_source.get("profesorado"))
-                self.fields["plan"].queryset = PlanEstudios.objects.filter(
-                    carrera_id=profesorado_id
-                ).order_by("resolucion")
-            except (ValueError, TypeError):
-                pass  # Invalid input, leave queryset empty
+        # Choices proyectadas desde referencia_cache: renderizar no consulta la base
+        profesorado_id = data_source.get("profesorado")
+        plan_id = data_source.get("plan")
+        if not str(profesorado_id or "").isdigit():
+            profesorado_id = None
+        if not str(plan_id or "").isdigit():
+            plan_id = None
 
-        # If a plan is selected, filter materias and correlativas
-        if "plan" in data_source:
-            try:
-                plan_id = int(data_source.get("plan"))
-                # Filter materias for the main selection
-                self.fields["materia_principal"].queryset = EspacioCurricular.objects.filter(
-                    plan_id=plan_id
-                ).order_by("nombre")
+        campo = self.fields["profesorado"]
+        campo.choices = opciones.con_vacio(opciones.carreras(), campo.empty_label)
 
-                # Filter correlativas (all other spaces in the same plan)
-                all_other_spaces_in_plan = EspacioCurricular.objects.filter(
-                    plan_id=plan_id
-                ).order_by("nombre")
-                self.fields["correlativas_regulares"].queryset = all_other_spaces_in_plan
-                self.fields["correlativas_aprobadas"].queryset = all_other_spaces_in_plan
+        # If a profesorado is selected, filter plans
+        if profesorado_id:
+            campo = self.fields["plan"]
+            campo.queryset = PlanEstudios.objects.filter(carrera_id=profesorado_id)
+            campo.choices = opciones.con_vacio(opciones.planes(profesorado_id), campo.empty_label)
 
-            except (ValueError, TypeError):
-                pass  # Invalid input, leave querysets empty
+        # If a plan is selected, filter materias and correlativas (una sola lista para los tres)
+        if plan_id:
+            espacios = opciones.espacios_plan(plan_id)
+            qs = EspacioCurricular.objects.filter(plan_id=plan_id)
+            campo = self.fields["materia_principal"]
+            campo.queryset = qs
+            campo.choices = opciones.con_vacio(espacios, campo.empty_label)
+            for nombre in ("correlativas_regulares", "correlativas_aprobadas"):
+                self.fields[nombre].queryset = qs
+                self.fields[nombre].choices = espacios
 
     def save(self, commit=True):
         # This is a custom form, not a ModelForm, so we need to handle saving manually
@@ -3,6 +3,7 @@ from __future__ import annotations
 from django import forms
 from django.contrib.auth.models import User
 
+from . import opciones
 from .label_utils import espacio_etiqueta
 from .models import (
     EspacioCurricular,
@@ -54,22 +55,18 @@ class StudentInscripcionEspacioForm(forms.ModelForm):
 
         # 1) restringir inscripciones al estudiante logueado
         qs_insc = _q_inscripciones_del_usuario(getattr(self.request, "user", None))
-        self.fields["inscripcion"].queryset = qs_insc.order_by("profesorado__nombre")
+        self.fields["inscripcion"].queryset = qs_insc.order_by("carrera__nombre")
 
         # Si tiene una sola inscripción, la fijamos y (opcional) podrías hacerla read-only
         if qs_insc.count() == 1:
             self.fields["inscripcion"].initial = qs_insc.first()
 
-        # 2) etiqueta normalizada para espacio
-        if "espacio" in self.fields:
-            self.fields["espacio"].label_from_instance = espacio_etiqueta
-
         # 3) si ya hay inscripción elegida, filtramos los espacios
         insc_id = self.data.get(self.add_prefix("inscripcion")) or self.initial.get("inscripcion")
         if insc_id:
             try:
-                insc = EstudianteProfesorado.objects.select_related("profesorado").get(pk=insc_id)
-            except EstudianteProfesorado.DoesNotExist:
+                insc = EstudianteProfesorado.objects.get(pk=insc_id)
+            except (EstudianteProfesorado.DoesNotExist, ValueError, TypeError):
                 insc = None
         else:
             insc = (
@@ -77,16 +74,21 @@ class StudentInscripcionEspacioForm(forms.ModelForm):
             )
 
         if insc:
-            qs = EspacioCurricular.objects.filter(profesorado=insc.profesorado)
+            qs = EspacioCurricular.objects.filter(plan_id=insc.plan_id)
             # Excluir ya inscriptos por esta inscripción
-            ya_ids = list(
+            ya_ids = set(
                 InscripcionEspacio.objects.filter(inscripcion=insc).values_list(
                     "espacio_id", flat=True
                 )
             )
             if ya_ids:
                 qs = qs.exclude(pk__in=ya_ids)
-            self.fields["espacio"].queryset = qs.order_by("anio", "cuatrimestre", "nombre")
+            self.fields["espacio"].queryset = qs
+            # 2) etiqueta normalizada, precalculada por plan (sin regex ni Materia por fila)
+            disponibles = opciones.espacios_plan(insc.plan_id)
+            self.fields["espacio"].choices = opciones.con_vacio(
+                [(pk, label) for pk, label in disponibles if pk not in ya_ids]
+            )
         else:
             self.fields["espacio"].queryset = EspacioCurricular.objects.none()
             self.fields["espacio"].help_text = "Elegí primero una inscripción (legajo)."
@@ -129,4 +131,6 @@ class StudentInscripcionFinalForm(forms.ModelForm):
             else:
                 qs_curs = InscripcionEspacio.objects.none()
 
-            self.fields[fk].queryset = qs_curs.order_by("-fecha", "espacio__nombre")
+            self.fields[fk].queryset = qs_curs.select_related("espacio").order_by(
+                "-fecha_inscripcion", "espacio__materia__nombre"
+            )
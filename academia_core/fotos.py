@@ -0,0 +1,170 @@
+# academia_core/fotos.py
+"""
+Fotos de estudiantes direccionadas por contenido, con miniatura.
+
+- Al guardar un Estudiante con foto nueva (`pre_save`) se calcula el SHA-256
+  del archivo: la foto va a `estudiantes/fotos/<ab>/<sha256>.<ext>` y, si ese
+  archivo ya existe (la misma foto subida dos veces), se reutiliza sin
+  volver a escribirlo.
+- La miniatura (cuadrada, `FOTO_MINIATURA_LADO` px, WebP o JPEG si Pillow no
+  trae WebP) se genera en segundo plano: `post_save` encola la tarea
+  `generar_miniaturas` al confirmar la transacción. Si ya existe la de ese
+  hash se asigna directamente.
+- Como el nombre depende del contenido, la vista `foto_miniatura` la sirve
+  con caché de un año (`immutable`): una foto nueva es otro nombre.
+
+Las fotos cargadas antes de esto se completan con
+`manage.py generar_miniaturas`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models.signals import post_save, pre_save
+
+logger = logging.getLogger(__name__)
+
+CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+def _lado() -> int:
+    return getattr(settings, "FOTO_MINIATURA_LADO", 160)
+
+
+def _formato() -> tuple[str, str]:
+    """(formato de Pillow, extensión) de las miniaturas."""
+    from PIL import features
+
+    pedido = getattr(settings, "FOTO_MINIATURA_FORMATO", "WEBP").upper()
+    if pedido == "WEBP" and features.check("webp"):
+        return "WEBP", ".webp"
+    return "JPEG", ".jpg"
+
+
+def hash_archivo(archivo) -> str:
+    """SHA-256 del contenido (lee en bloques y deja el archivo al principio)."""
+    h = hashlib.sha256()
+    for bloque in archivo.chunks():
+        h.update(bloque)
+    archivo.seek(0)
+    return h.hexdigest()
+
+
+def ruta_foto(digest: str, filename: str) -> str:
+    ext = os.path.splitext(filename or "")[1].lower() or ".jpg"
+    return f"estudiantes/fotos/{digest[:2]}/{digest}{ext}"
+
+
+def ruta_miniatura(digest: str) -> str:
+    return f"estudiantes/miniaturas/{digest[:2]}/{digest}_{_lado()}{_formato()[1]}"
+
+
+def es_miniatura(nombre: str) -> bool:
+    return nombre.startswith("estudiantes/miniaturas/") and ".." not in nombre.split("/")
+
+
+# ---------- alta de la foto ----------
+def preparar(estudiante) -> None:
+    """
+    Antes de guardar: calcula el hash de una foto recién subida, reutiliza el
+    archivo si ya está almacenado y deja marcada la miniatura pendiente.
+    """
+    foto = estudiante.foto
+    if not foto:
+        estudiante.foto_hash = estudiante.foto_miniatura = ""
+        return
+    if foto._committed:
+        return
+    digest = hash_archivo(foto.file)
+    estudiante.foto_hash = digest
+    nombre = ruta_foto(digest, foto.name)
+    if foto.storage.exists(nombre):
+        estudiante.foto = nombre  # ya está: no se vuelve a escribir
+    miniatura = ruta_miniatura(digest)
+    estudiante.foto_miniatura = miniatura if foto.storage.exists(miniatura) else ""
+    estudiante._miniatura_pendiente = not estudiante.foto_miniatura
+
+
+def generar_miniatura(estudiante) -> str:
+    """Genera (si falta) la miniatura de la foto y la asigna. Devuelve su nombre."""
+    from PIL import Image, ImageOps
+
+    from academia_core.models import Estudiante
+
+    foto = estudiante.foto
+    if not foto:
+        return ""
+    digest = estudiante.foto_hash
+    if not digest:
+        with foto.open("rb") as f:
+            digest = hash_archivo(f)
+    nombre = ruta_miniatura(digest)
+    if not foto.storage.exists(nombre):
+        formato = _formato()[0]
+        with foto.open("rb") as f, Image.open(f) as img:
+            img = ImageOps.exif_transpose(img).convert("RGB")
+            img = ImageOps.fit(img, (_lado(), _lado()), Image.Resampling.LANCZOS)
+        buf = BytesIO()
+        img.save(buf, formato, quality=80)
+        nombre = foto.storage.save(nombre, ContentFile(buf.getvalue()))
+    Estudiante.objects.filter(pk=estudiante.pk).update(foto_hash=digest, foto_miniatura=nombre)
+    # quien comparta la misma foto usa la misma miniatura
+    Estudiante.objects.filter(foto_hash=digest, foto_miniatura="").update(foto_miniatura=nombre)
+    estudiante.foto_hash, estudiante.foto_miniatura = digest, nombre
+    return nombre
+
+
+def generar_pendientes(estudiante_ids=None, progreso=None) -> dict:
+    """Miniaturas de las fotos que no la tienen (todas o las de esos ids)."""
+    from academia_core.models import Estudiante
+
+    qs = Estudiante.objects.exclude(foto="").exclude(foto__isnull=True).filter(foto_miniatura="")
+    if estudiante_ids is not None:
+        qs = qs.filter(pk__in=list(estudiante_ids))
+    pendientes = list(qs.order_by("pk").only("pk", "foto", "foto_hash", "foto_miniatura"))
+    generadas = errores = 0
+    hechos: set[str] = set()
+    for n, est in enumerate(pendientes, start=1):
+        if est.foto_hash not in hechos:
+            try:
+                generar_miniatura(est)
+                generadas += 1
+                hechos.add(est.foto_hash)
+            except (OSError, ValueError):
+                logger.exception("No se pudo generar la miniatura del estudiante %s", est.pk)
+                errores += 1
+        if progreso:
+            progreso(n, len(pendientes))
+    return {"generadas": generadas, "errores": errores}
+
+
+# ---------- signals ----------
+def _antes_de_guardar(sender, instance, raw=False, **kwargs):
+    if not raw:
+        preparar(instance)
+
+
+def _despues_de_guardar(sender, instance, raw=False, **kwargs):
+    if raw or not instance.__dict__.pop("_miniatura_pendiente", False):
+        return
+    from academia_core import jobs
+
+    pk = instance.pk
+    transaction.on_commit(
+        lambda: jobs.encolar("generar_miniaturas", {"estudiante_ids": [pk]}, max_intentos=2)
+    )
+
+
+def conectar_signals() -> None:
+    """Conecta los receivers (se llama desde AppConfig.ready)."""
+    from academia_core.models import Estudiante
+
+    pre_save.connect(_antes_de_guardar, sender=Estudiante, dispatch_uid="fotos:preparar")
+    post_save.connect(_despues_de_guardar, sender=Estudiante, dispatch_uid="fotos:miniatura")
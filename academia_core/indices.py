@@ -0,0 +1,325 @@
+# academia_core/indices.py
+"""
+Asesor de índices a partir de las consultas reales.
+
+1. Captura: `benchmarks/captura_consultas.py` (plugin de pytest) junta, por
+   huella (el SQL con los parámetros y listas IN normalizados), cuántas veces
+   corrió, cuánto tardó y el plan (`EXPLAIN QUERY PLAN` en SQLite, `EXPLAIN`
+   en MySQL) de la primera ejecución, con los datos del test a mano.
+2. Análisis: `sugerir()` cruza cada plan con las columnas del WHERE (igualdad
+   e IN primero, después un rango), el ORDER BY y, si son pocas, las columnas
+   leídas, y propone un índice compuesto (o cubriente) para las tablas que se
+   recorren enteras, usan un índice que cubre menos columnas de las que se
+   filtran u ordenan en un B-tree temporal. Se descartan las propuestas que
+   ya son prefijo de un índice existente (según los modelos).
+
+`manage.py sugerir_indices` corre las dos cosas e imprime el reporte.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+# columnas leídas que se suman a un índice para volverlo cubriente
+MAX_COLUMNAS_CUBRIENTE = 3
+
+_CADENA = re.compile(r"'(?:[^']|'')*'")
+_NUMERO = re.compile(r"(?<![\w\".])-?\d+(?:\.\d+)?\b")
+_LISTA_IN = re.compile(r"\bIN \((?:\s*(?:%s|\?)\s*,?)+\)", re.IGNORECASE)
+_ESPACIOS = re.compile(r"\s+")
+
+_COL = r'(?:"(?P<t{n}>[^"]+)"|(?P<a{n}>T\d+))\."(?P<c{n}>[^"]+)"'
+_TABLA_ALIAS = re.compile(r'(?:FROM|JOIN)\s+"(?P<tabla>[^"]+)"(?:\s+(?P<alias>T\d+))?')
+_IGUALDAD = re.compile(_COL.format(n=1) + r"\s*(?:=\s*(?:%s|\?)|IN \(|IS NULL)")
+_RANGO = re.compile(_COL.format(n=1) + r"\s*(?:>=|<=|<|>|BETWEEN|LIKE)")
+_SOLO_COL = re.compile(_COL.format(n=1))
+
+
+def huella(sql: str) -> str:
+    """El SQL sin valores concretos: dos consultas que sólo cambian en ellos, una huella."""
+    sql = _CADENA.sub("?", sql)
+    sql = _NUMERO.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = _LISTA_IN.sub("IN (...)", sql)
+    return _ESPACIOS.sub(" ", sql).strip()
+
+
+def _es_candidata(sql: str) -> bool:
+    inicio = sql.lstrip()[:6].upper()
+    return inicio in ("SELECT", "UPDATE", "DELETE") and " WHERE " in sql.upper()
+
+
+# ---------- planes ----------
+def explicar(conexion, sql: str, params) -> list[dict]:
+    """
+    Plan normalizado de una consulta: [{"tabla", "acceso", "indice", "columnas"}].
+    `acceso` es scan | indice | cubriente | pk | orden (B-tree temporal / filesort).
+    Usa un cursor crudo: no pasa por execute_wrapper ni queda en connection.queries.
+    """
+    cursor = conexion.create_cursor()
+    try:
+        if conexion.vendor == "sqlite":
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params or ())
+            return _plan_sqlite([fila[-1] for fila in cursor.fetchall()], sql)
+        if conexion.vendor == "mysql":
+            cursor.execute("EXPLAIN " + sql, params or ())
+            nombres = [d[0].lower() for d in cursor.description]
+            return _plan_mysql(
+                [dict(zip(nombres, fila, strict=True)) for fila in cursor.fetchall()], sql
+            )
+        return []
+    finally:
+        cursor.close()
+
+
+def _alias(sql: str) -> dict[str, str]:
+    return {m["alias"]: m["tabla"] for m in _TABLA_ALIAS.finditer(sql) if m["alias"]}
+
+
+_PASO_SQLITE = re.compile(
+    r"^(?P<op>SCAN|SEARCH) (?P<tabla>\S+)(?: AS (?P<alias>\S+))?"
+    r"(?: USING (?P<tipo>COVERING INDEX|INDEX|INTEGER PRIMARY KEY|PRIMARY KEY)"
+    r"(?: (?P<indice>[^\s(]\S*))?(?: ?\((?P<cols>[^)]*)\))?)?"
+)
+
+
+def _plan_sqlite(detalles: list[str], sql: str) -> list[dict]:
+    alias = _alias(sql)
+    plan = []
+    for detalle in detalles:
+        if detalle.startswith("USE TEMP B-TREE"):
+            plan.append({"tabla": None, "acceso": "orden", "indice": None, "columnas": 0})
+            continue
+        m = _PASO_SQLITE.match(detalle)
+        if not m:
+            continue
+        tabla = alias.get(m["alias"] or m["tabla"], m["tabla"])
+        tipo = m["tipo"] or ""
+        if not tipo:
+            acceso = "scan"
+        elif "PRIMARY KEY" in tipo:
+            acceso = "pk"
+        elif tipo.startswith("COVERING"):
+            acceso = "cubriente"
+        else:
+            acceso = "indice"
+        columnas = len(re.findall(r"\w+[=<>]", m["cols"] or ""))
+        plan.append({"tabla": tabla, "acceso": acceso, "indice": m["indice"], "columnas": columnas})
+    return plan
+
+
+def _plan_mysql(filas: list[dict], sql: str) -> list[dict]:
+    alias = _alias(sql)
+    plan = []
+    for fila in filas:
+        tabla = alias.get(fila.get("table") or "", fila.get("table"))
+        extra = fila.get("extra") or ""
+        if fila.get("type") in ("ALL", "index") and not fila.get("key"):
+            acceso = "scan"
+        elif fila.get("key") == "PRIMARY":
+            acceso = "pk"
+        elif "Using index" in extra and "condition" not in extra:
+            acceso = "cubriente"
+        else:
+            acceso = "indice"
+        columnas = len([r for r in (fila.get("ref") or "").split(",") if r])
+        plan.append(
+            {"tabla": tabla, "acceso": acceso, "indice": fila.get("key"), "columnas": columnas}
+        )
+        if "filesort" in extra or "temporary" in extra:
+            plan.append({"tabla": tabla, "acceso": "orden", "indice": None, "columnas": 0})
+    return plan
+
+
+# ---------- columnas de cada consulta ----------
+@dataclass
+class UsoTabla:
+    igualdad: list[str] = field(default_factory=list)
+    rango: list[str] = field(default_factory=list)
+    orden: list[str] = field(default_factory=list)
+    leidas: list[str] = field(default_factory=list)
+
+
+def _agregar(lista: list[str], col: str) -> None:
+    if col not in lista:
+        lista.append(col)
+
+
+def columnas_por_tabla(sql: str) -> dict[str, UsoTabla]:
+    """Columnas por tabla del WHERE (igualdad, rango), del ORDER BY y del SELECT."""
+    alias = _alias(sql)
+    usos: dict[str, UsoTabla] = defaultdict(UsoTabla)
+
+    def _tabla(m, n):
+        return m[f"t{n}"] or alias.get(m[f"a{n}"], m[f"a{n}"])
+
+    arriba = sql.upper()
+    desde = arriba.find(" FROM ")
+    donde = arriba.find(" WHERE ")
+    orden = arriba.rfind(" ORDER BY ")
+    if donde > 0:
+        # sólo el WHERE: las columnas de los JOIN ya tienen el índice de la FK
+        filtro = sql[donde : orden if orden > donde else len(sql)]
+        for m in _IGUALDAD.finditer(filtro):
+            _agregar(usos[_tabla(m, 1)].igualdad, m["c1"])
+        for m in _RANGO.finditer(filtro):
+            if m["c1"] not in usos[_tabla(m, 1)].igualdad:
+                _agregar(usos[_tabla(m, 1)].rango, m["c1"])
+    if orden > desde:
+        ordenadas = [(_tabla(m, 1), m["c1"]) for m in _SOLO_COL.finditer(sql[orden:])]
+        # un índice sólo evita el ordenamiento si todo el ORDER BY es de una tabla
+        if len({t for t, _ in ordenadas}) == 1:
+            for t, c in ordenadas:
+                _agregar(usos[t].orden, c)
+    if desde > 0:
+        for m in _SOLO_COL.finditer(sql[:desde]):
+            _agregar(usos[_tabla(m, 1)].leidas, m["c1"])
+    return dict(usos)
+
+
+# ---------- propuestas ----------
+@dataclass
+class Propuesta:
+    tabla: str
+    columnas: tuple[str, ...]
+    motivo: str
+    cubriente: bool = False
+    veces: int = 0
+    ms: float = 0.0
+    huellas: list[str] = field(default_factory=list)
+
+    def nombre(self) -> str:
+        """Nombre de índice válido (≤ 30) y estable para estas columnas."""
+        corta = self.tabla.split("_", 2)[-1][:10]
+        cols = "_".join(c.removesuffix("_id")[:4] for c in self.columnas)
+        firma = hashlib.md5(",".join(self.columnas).encode()).hexdigest()[:4]
+        return f"idx_{corta}_{cols}"[:25] + f"_{firma}"
+
+
+def _problema(paso: dict, uso: UsoTabla) -> str | None:
+    if paso["acceso"] == "scan" and (uso.igualdad or uso.rango):
+        return "recorre la tabla"
+    if paso["acceso"] == "indice" and len(uso.igualdad) > paso["columnas"]:
+        return f"el índice usa {paso['columnas']} de {len(uso.igualdad)} columnas"
+    if paso["acceso"] == "orden" and uso.orden and not uso.rango:
+        return "ordena en una tabla temporal"
+    return None
+
+
+def sugerir(capturas: dict, existentes: dict[str, list[tuple[str, ...]]]) -> list[Propuesta]:
+    """
+    Propuestas de índices a partir de las capturas
+    ({huella: {"veces", "ms", "sql", "plan"}}), ordenadas por tiempo total.
+
+    Las consultas con un plan mejorable se agrupan por tabla y columnas de
+    igualdad (ordenadas por cuántas ejecuciones filtran por cada una). El rango
+    u orden se agrega sólo si todo el grupo coincide, y las columnas leídas si
+    son pocas (índice cubriente). Un grupo cuyas columnas son prefijo de las
+    de otro se resuelve con el índice del otro.
+    """
+    problemas = []  # (tabla, huella, motivo, uso)
+    frecuencia: dict[str, Counter] = defaultdict(Counter)
+    for h, dato in capturas.items():
+        if not dato.get("plan") or not _es_candidata(dato["sql"]):
+            continue
+        usos = columnas_por_tabla(dato["sql"])
+        for tabla, uso in usos.items():
+            # la PK no se agrega a un índice secundario (ya va implícita)
+            pk = existentes.get(tabla, [("id",)])[0]
+            for lista in (uso.igualdad, uso.rango, uso.orden, uso.leidas):
+                lista[:] = [c for c in lista if c not in pk]
+        base = next((p["tabla"] for p in dato["plan"] if p.get("tabla")), None)
+        vistos = set()
+        for paso in dato["plan"]:
+            tabla = paso.get("tabla") or base
+            uso = usos.get(tabla)
+            if uso is None or tabla not in existentes or tabla in vistos:
+                continue
+            motivo = _problema(paso, uso)
+            if motivo:
+                vistos.add(tabla)
+                problemas.append((tabla, h, motivo, uso))
+                frecuencia[tabla].update({c: dato["veces"] for c in uso.igualdad})
+
+    grupos: dict[tuple, list] = defaultdict(list)
+    for tabla, h, motivo, uso in problemas:
+        grupos[(tabla, frozenset(uso.igualdad))].append((h, motivo, uso))
+
+    propuestas = []
+    for (tabla, igualdad), miembros in grupos.items():
+        cols = sorted(igualdad, key=lambda c: (-frecuencia[tabla][c], c))
+        colas = {
+            tuple(u.rango[:1] or [c for c in u.orden if c not in cols]) for _, _, u in miembros
+        }
+        if len(colas) == 1:
+            cols += list(colas.pop())
+        leidas = {c for _, _, u in miembros for c in u.leidas if c not in cols}
+        cubriente = bool(cols) and 0 < len(leidas) <= MAX_COLUMNAS_CUBRIENTE
+        if cubriente:
+            cols += sorted(leidas)
+        if not cols:
+            continue
+        veces = sum(capturas[h]["veces"] for h, _, _ in miembros)
+        motivo = max(miembros, key=lambda m: capturas[m[0]]["veces"])[1]
+        p = Propuesta(tabla, tuple(cols), motivo, cubriente, veces)
+        p.ms = sum(capturas[h]["ms"] for h, _, _ in miembros)
+        p.huellas = [h for h, _, _ in miembros]
+        propuestas.append(p)
+
+    # de más corta a más larga: la que es prefijo de otra se suma a esa
+    propuestas.sort(key=lambda p: (p.tabla, len(p.columnas)))
+    elegidas = []
+    for i, p in enumerate(propuestas):
+        mayor = next(
+            (
+                o
+                for o in propuestas[i + 1 :]
+                if o.tabla == p.tabla and o.columnas[: len(p.columnas)] == p.columnas
+            ),
+            None,
+        )
+        if mayor is not None:
+            mayor.veces += p.veces
+            mayor.ms += p.ms
+            mayor.huellas += p.huellas
+        elif not _cubierta(p.columnas, existentes.get(p.tabla, [])):
+            elegidas.append(p)
+    return sorted(elegidas, key=lambda p: (-p.ms, -p.veces, p.tabla))
+
+
+def _cubierta(cols: tuple[str, ...], indices: list[tuple[str, ...]]) -> bool:
+    """True si algún índice existente empieza con esas columnas (en cualquier orden)."""
+    return any(len(idx) >= len(cols) and set(idx[: len(cols)]) == set(cols) for idx in indices)
+
+
+def indices_existentes() -> dict[str, list[tuple[str, ...]]]:
+    """
+    {tabla: [columnas de cada índice]} según los modelos (Meta, únicos y FKs).
+    El primero de cada tabla es la clave primaria.
+    """
+    from django.apps import apps
+
+    out: dict[str, list[tuple[str, ...]]] = {}
+    for modelo in apps.get_models(include_auto_created=True):
+        meta = modelo._meta
+
+        def _cols(nombres, meta=meta):
+            return tuple(meta.get_field(n.lstrip("-")).column for n in nombres)
+
+        idx = [(meta.pk.column,)]
+        for f in meta.local_fields:
+            if f.db_index or f.unique:
+                idx.append((f.column,))
+        for i in meta.indexes:
+            if i.fields:
+                idx.append(_cols(i.fields))
+        for c in meta.constraints:
+            if getattr(c, "fields", None) and getattr(c, "condition", None) is None:
+                idx.append(_cols(c.fields))
+        for ut in meta.unique_together:
+            idx.append(_cols(ut))
+        out[meta.db_table] = idx
+    return out
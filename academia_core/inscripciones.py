@@ -0,0 +1,360 @@
+# academia_core/inscripciones.py
+"""
+Inscripción a cursada (InscripcionEspacio) apta para alta concurrencia.
+
+Cuando abre la ventana de inscripción cientos de estudiantes inscriben a la
+vez. En vez de `exists()` + `create()` (carrera entre el chequeo y el alta)
+hacemos un único `INSERT ... ON CONFLICT DO NOTHING` / `INSERT IGNORE`
+apoyado en la restricción `uniq_insc_est_esp_ciclo`: la base decide quién
+gana y `rowcount` dice si la fila es nueva.
+
+Opcionalmente se descuenta cupo de una Comisión con un UPDATE condicional
+(`inscriptos = inscriptos + 1 WHERE cupo = 0 OR inscriptos < cupo`), en la
+misma transacción que el alta.
+
+`inscribir_cohorte()` es el camino masivo (inicio de ciclo): evalúa la
+elegibilidad de toda la cohorte contra el grafo compilado del plan y da de
+alta con `bulk_create(ignore_conflicts=True)` por lotes.
+
+Las claves de idempotencia (`SolicitudIdempotente`) permiten que un cliente
+reintente sin duplicar efectos: se reserva la clave con el mismo INSERT
+idempotente y se guarda la respuesta final. Son por usuario y endpoint, y
+`depurar_idempotencia()` borra las viejas.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import F, Q
+from django.db.models.constants import OnConflict
+from django.utils import timezone
+
+from academia_core import kpis
+from academia_core.models import (
+    EspacioCurricular,
+    EstadoInscripcion,
+    EstudianteProfesorado,
+    InscripcionEspacio,
+    InscripcionEspacioEstadoLog,
+    SolicitudIdempotente,
+)
+from academia_core.plan_grafo import compilar_plan
+from academia_core.utils_inscripciones import cumple_correlativas, estados_academicos
+
+
+@dataclass
+class Resultado:
+    ok: bool
+    status: int = 200
+    datos: dict[str, Any] = field(default_factory=dict)
+
+    def payload(self) -> dict[str, Any]:
+        return {"ok": self.ok, **self.datos}
+
+
+# código de error de MySQL para una clave única duplicada
+_MYSQL_ER_DUP_ENTRY = 1062
+
+
+class _SinCupo(Exception):
+    pass
+
+
+def insertar_ignorando_conflicto(modelo, valores: dict[str, Any]) -> bool:
+    """
+    INSERT que ignora violaciones de unicidad. Devuelve True si insertó.
+
+    Usa la sintaxis del backend (`INSERT OR IGNORE` en SQLite, `ON CONFLICT DO
+    NOTHING` en PostgreSQL). En MySQL `INSERT IGNORE` también se traga NOT NULL,
+    FK y truncamientos, así que ahí va un INSERT común en un savepoint y sólo el
+    duplicado (ER_DUP_ENTRY) cuenta como "ya existe". Columnas y tabla salen de
+    `_meta` (sin introspección por request). No dispara signals ni completa
+    defaults: `valores` debe traer todas las columnas NOT NULL.
+    """
+    alias = router.db_for_write(modelo)
+    conn = connections[alias]
+    campos = [modelo._meta.get_field(nombre) for nombre in valores]
+    columnas = ", ".join(conn.ops.quote_name(f.column) for f in campos)
+    params = [f.get_db_prep_save(valores[f.name], conn) for f in campos]
+    marcadores = ", ".join(["%s"] * len(campos))
+    tabla = f"{conn.ops.quote_name(modelo._meta.db_table)} ({columnas}) VALUES ({marcadores})"
+    if conn.vendor == "mysql":
+        try:
+            with transaction.atomic(using=alias), conn.cursor() as cursor:
+                cursor.execute(f"INSERT INTO {tabla}", params)
+        except IntegrityError as exc:
+            if exc.args and exc.args[0] == _MYSQL_ER_DUP_ENTRY:
+                return False
+            raise
+        return True
+
+    sql = f"{conn.ops.insert_statement(on_conflict=OnConflict.IGNORE)} {tabla}"
+    sufijo = conn.ops.on_conflict_suffix_sql(campos, OnConflict.IGNORE, None, None)
+    if sufijo:
+        sql = f"{sql} {sufijo}"
+    with conn.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount == 1
+
+
+def _ocupar_cupo(comision_id: int) -> None:
+    from academia_horarios.models import Comision
+
+    ocupado = (
+        Comision.objects.filter(pk=comision_id)
+        .filter(Q(cupo=0) | Q(inscriptos__lt=F("cupo")))
+        .update(inscriptos=F("inscriptos") + 1)
+    )
+    if not ocupado:
+        raise _SinCupo
+
+
+def liberar_cupo(comision_id: int) -> None:
+    """Devuelve un lugar (p. ej. al dar de baja una cursada)."""
+    from academia_horarios.models import Comision
+
+    Comision.objects.filter(pk=comision_id, inscriptos__gt=0).update(inscriptos=F("inscriptos") - 1)
+
+
+def inscribir_espacio(
+    inscripcion: EstudianteProfesorado,
+    espacio: EspacioCurricular,
+    anio_academico: int,
+    comision_id: int | None = None,
+    validar_correlativas: bool = True,
+) -> Resultado:
+    if inscripcion.carrera_id != espacio.plan.carrera_id:
+        return Resultado(False, 400, {"error": "otro_profesorado"})
+    # la restricción única es por ciclo: recursar lo regularizado o aprobado se veta acá
+    regularizadas, aprobadas = estados_academicos(
+        [inscripcion.pk], hasta_fecha=timezone.localdate()
+    )[inscripcion.pk]
+    if espacio.pk in aprobadas:  # una promoción también cuenta como regularizada
+        return Resultado(False, 400, {"error": "ya_aprobado"})
+    if espacio.pk in regularizadas:
+        return Resultado(False, 400, {"error": "ya_regular"})
+    if validar_correlativas:
+        ok, faltan = cumple_correlativas(inscripcion, espacio, "CURSAR")
+        if not ok:
+            return Resultado(
+                False,
+                400,
+                {
+                    "error": "correlativas",
+                    "faltan": [{"id": req.id, "nombre": req.nombre} for _, req in faltan],
+                },
+            )
+
+    ahora = timezone.now()
+    try:
+        with transaction.atomic():
+            creada = insertar_ignorando_conflicto(
+                InscripcionEspacio,
+                {
+                    "inscripcion": inscripcion.pk,
+                    "espacio": espacio.pk,
+                    "anio_academico": anio_academico,
+                    "fecha_inscripcion": timezone.localdate(),
+                    "estado": EstadoInscripcion.EN_CURSO,
+                    "fecha_baja": None,
+                    "motivo_baja": "",
+                    "created_at": ahora,
+                    "updated_at": ahora,
+                },
+            )
+            if creada and comision_id:
+                _ocupar_cupo(comision_id)
+            if creada:
+                # el INSERT directo no dispara post_save
+                kpis.sumar("inscripciones_materia", 1)
+    except _SinCupo:
+        return Resultado(False, 409, {"error": "sin_cupo"})
+
+    pk = (
+        InscripcionEspacio.objects.filter(
+            inscripcion=inscripcion, espacio=espacio, anio_academico=anio_academico
+        )
+        .values_list("pk", flat=True)
+        .first()
+    )
+    if not creada:
+        return Resultado(False, 409, {"error": "ya_inscripto", "id": pk})
+    return Resultado(True, 201, {"id": pk})
+
+
+# ---------- inscripción masiva ----------
+@dataclass
+class ResultadoCohorte:
+    estudiantes: int = 0
+    espacios: list[int] = field(default_factory=list)
+    inscriptas: int = 0
+    existentes: int = 0
+    bloqueadas: Counter = field(default_factory=Counter)  # espacio_id -> cantidad
+
+
+def inscribir_cohorte(
+    plan_id: int,
+    cohorte: int,
+    anio: int,
+    anio_academico: int,
+    usuario=None,
+    batch_size: int = 1000,
+    simular: bool = False,
+) -> ResultadoCohorte:
+    """
+    Inscribe a la cohorte del plan en todos los espacios de `anio`.
+
+    Las correlatividades para CURSAR se evalúan contra `compilar_plan()` y
+    `estados_academicos()` (a la fecha de hoy, como `InscripcionEspacio.clean`).
+    Cada lote va en una transacción: alta con `bulk_create(ignore_conflicts)`
+    y un `InscripcionEspacioEstadoLog` por fila creada. Reejecutar es seguro:
+    lo ya inscripto se cuenta en `existentes`.
+    """
+    grafo = compilar_plan(plan_id)
+    espacios = grafo.espacios_de_anio(anio)
+    inscs = list(
+        EstudianteProfesorado.objects.filter(
+            plan_id=plan_id, cohorte=cohorte, estudiante__activo=True
+        )
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    res = ResultadoCohorte(estudiantes=len(inscs), espacios=espacios)
+    if not espacios:
+        return res
+    hoy = timezone.localdate()
+    nota = f"Inscripción masiva cohorte {cohorte}"
+
+    for i in range(0, len(inscs), batch_size):
+        lote = inscs[i : i + batch_size]
+        del_lote = InscripcionEspacio.objects.filter(
+            inscripcion_id__in=lote, espacio_id__in=espacios, anio_academico=anio_academico
+        ).order_by()
+        existentes = set(del_lote.values_list("inscripcion_id", "espacio_id"))
+        estados = estados_academicos(lote, hasta_fecha=hoy)
+
+        nuevas = []
+        for insc_id in lote:
+            regularizadas, aprobadas = estados[insc_id]
+            for esp_id in espacios:
+                if (insc_id, esp_id) in existentes:
+                    res.existentes += 1
+                elif grafo.faltantes(esp_id, "CURSAR", regularizadas, aprobadas):
+                    res.bloqueadas[esp_id] += 1
+                else:
+                    nuevas.append(
+                        InscripcionEspacio(
+                            inscripcion_id=insc_id,
+                            espacio_id=esp_id,
+                            anio_academico=anio_academico,
+                            estado=EstadoInscripcion.EN_CURSO,
+                        )
+                    )
+        if simular or not nuevas:
+            res.inscriptas += len(nuevas)
+            continue
+
+        with transaction.atomic():
+            InscripcionEspacio.objects.bulk_create(
+                nuevas, batch_size=batch_size, ignore_conflicts=True
+            )
+            # ignore_conflicts no devuelve pks: releemos las filas del lote
+            creadas = [
+                pk
+                for pk, insc_id, esp_id in del_lote.values_list(
+                    "pk", "inscripcion_id", "espacio_id"
+                )
+                if (insc_id, esp_id) not in existentes
+            ]
+            InscripcionEspacioEstadoLog.objects.bulk_create(
+                [
+                    InscripcionEspacioEstadoLog(
+                        insc_espacio_id=pk,
+                        estado=EstadoInscripcion.EN_CURSO,
+                        usuario=usuario,
+                        nota=nota,
+                    )
+                    for pk in creadas
+                ],
+                batch_size=batch_size,
+            )
+            kpis.sumar("inscripciones_materia", len(creadas))
+        res.inscriptas += len(creadas)
+    return res
+
+
+# ---------- idempotencia ----------
+def con_idempotencia(clave: str | None, endpoint: str, usuario, operacion) -> Resultado:
+    """
+    Ejecuta `operacion()` una sola vez por (`usuario`, `endpoint`, `clave`).
+
+    - clave nueva: se reserva (status 0), se ejecuta y se guarda la respuesta.
+    - clave ya resuelta: devuelve la respuesta guardada sin ejecutar.
+    - clave reservada por otra solicitud todavía en curso: 409.
+    - reserva sin respuesta hace más de `IDEMPOTENCIA_RESERVA_SEGUNDOS` (el
+      proceso que la tomó murió): se la toma y se ejecuta de nuevo.
+    """
+    if not clave:
+        return operacion()
+    usuario_id = getattr(usuario, "pk", None)
+    solicitud = SolicitudIdempotente.objects.filter(
+        usuario_id=usuario_id, endpoint=endpoint, clave=clave[:64]
+    )
+    ahora = timezone.now()
+    reservada = insertar_ignorando_conflicto(
+        SolicitudIdempotente,
+        {
+            "clave": clave[:64],
+            "endpoint": endpoint,
+            "usuario": usuario_id,
+            "status": 0,
+            "respuesta": {},
+            "creado": ahora,
+        },
+    )
+    if not reservada:
+        previa = solicitud.first()
+        if previa is not None and previa.status != 0:
+            r = dict(previa.respuesta)
+            return Resultado(r.pop("ok", False), previa.status, r)
+        vencida = ahora - timedelta(seconds=getattr(settings, "IDEMPOTENCIA_RESERVA_SEGUNDOS", 120))
+        # UPDATE condicional: de varios reintentos simultáneos, uno solo la toma
+        tomada = (
+            previa is not None
+            and previa.creado < vencida
+            and solicitud.filter(status=0, creado=previa.creado).update(creado=ahora)
+        )
+        if not tomada:
+            return Resultado(False, 409, {"error": "solicitud_en_curso"})
+
+    # Si la reserva se venció y la tomó otro, estos UPDATE/DELETE no la tocan
+    propia = solicitud.filter(status=0, creado=ahora)
+    try:
+        res = operacion()
+    except Exception:
+        propia.delete()
+        raise
+    propia.update(status=res.status, respuesta=res.payload())
+    return res
+
+
+def depurar_idempotencia(horas: int | None = None, lote: int = 5000) -> int:
+    """
+    Borra las solicitudes idempotentes de más de `horas` (default
+    `IDEMPOTENCIA_RETENCION_HORAS`): pasado ese plazo un reintento ya no
+    tiene sentido. Devuelve cuántas borró.
+    """
+    horas = horas if horas is not None else getattr(settings, "IDEMPOTENCIA_RETENCION_HORAS", 48)
+    viejas = SolicitudIdempotente.objects.filter(
+        creado__lt=timezone.now() - timedelta(hours=horas)
+    ).order_by()
+    borradas = 0
+    while ids := list(viejas.values_list("pk", flat=True)[:lote]):
+        borradas += SolicitudIdempotente.objects.filter(pk__in=ids).delete()[0]
+    return borradas
@@ -0,0 +1,253 @@
+# academia_core/jobs.py
+"""
+Cola de trabajos en segundo plano respaldada por la base (modelo `Job`).
+
+- `encolar(tipo, parametros)` crea el Job; la vista responde enseguida y el
+  panel consulta el estado (`api/jobs/<id>/`).
+- `manage.py procesar_jobs` corre uno o varios workers. Cada worker toma el
+  próximo Job con `select_for_update(skip_locked=True)` (MySQL 8 / PostgreSQL)
+  más un UPDATE condicional sobre `estado`, así dos procesos nunca ejecutan el
+  mismo Job (en SQLite, sin FOR UPDATE, alcanza con el UPDATE condicional).
+- Las tareas se registran con `@tarea("nombre")` (ver academia_core/tareas.py)
+  y reciben un `Contexto` para informar progreso; si el Job fue cancelado,
+  `ctx.progreso()` levanta `JobCancelado`.
+- Un error reprograma el Job con espera exponencial hasta `max_intentos`.
+  Los Jobs EN_CURSO sin latido (worker caído) se devuelven a la cola, o
+  quedan en ERROR si ya agotaron los intentos: las tareas largas deben
+  llamar a `ctx.progreso()` al menos cada pocos minutos.
+"""
+
+from __future__ import annotations
+
+import inspect
+import logging
+import os
+import socket
+import time
+import traceback
+from collections.abc import Callable
+from datetime import timedelta
+
+from django.db import OperationalError, connections, router, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from academia_core.models import EstadoJob, Job
+
+logger = logging.getLogger(__name__)
+
+TAREAS: dict[str, Callable] = {}
+
+# Espera entre reintentos: 30s, 60s, 120s, … (tope 1h)
+REINTENTO_BASE_S = 30
+REINTENTO_MAX_S = 3600
+# Un Job EN_CURSO sin latido por más de esto se considera huérfano
+LATIDO_VENCIDO = timedelta(minutes=10)
+# Error de los que, además, ya no tienen reintentos
+SIN_LATIDO = (
+    "El worker dejó de dar señales mientras corría el último intento "
+    "(¿se quedó sin memoria o lo mataron?)."
+)
+
+
+class JobCancelado(Exception):
+    pass
+
+
+def tarea(nombre: str):
+    """Registra `fn(ctx, **parametros)` como tarea encolable."""
+
+    def deco(fn):
+        TAREAS[nombre] = fn
+        return fn
+
+    return deco
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class Contexto:
+    """Lo que recibe una tarea: el Job y cómo informar avance."""
+
+    def __init__(self, job: Job):
+        self.job = job
+
+    def progreso(self, actual: int, total: int | None = None, mensaje: str = "") -> None:
+        porcentaje = actual if total is None else int(actual * 100 / total) if total else 100
+        vivo = Job.objects.filter(pk=self.job.pk, cancelar=False).update(
+            progreso=max(0, min(porcentaje, 100)),
+            mensaje=mensaje[:255],
+            latido=timezone.now(),
+        )
+        if not vivo:
+            raise JobCancelado
+
+
+# ---------- API para vistas/comandos ----------
+def encolar(tipo: str, parametros: dict | None = None, usuario=None, max_intentos: int = 3) -> Job:
+    """Crea el Job. ValueError si la tarea no existe o los parámetros no encajan."""
+    if tipo not in TAREAS:
+        raise ValueError(f"Tarea desconocida: {tipo}")
+    parametros = parametros or {}
+    try:
+        inspect.signature(TAREAS[tipo]).bind(None, **parametros)
+    except TypeError as exc:
+        raise ValueError(f"Parámetros inválidos para {tipo}: {exc}") from exc
+    return Job.objects.create(
+        tipo=tipo,
+        parametros=parametros,
+        creado_por=usuario if getattr(usuario, "pk", None) else None,
+        max_intentos=max_intentos,
+    )
+
+
+def cancelar(job_id: int) -> bool:
+    """Cancela un Job pendiente o pide la cancelación de uno en curso."""
+    ahora = timezone.now()
+    if Job.objects.filter(pk=job_id, estado=EstadoJob.PENDIENTE).update(
+        estado=EstadoJob.CANCELADO, cancelar=True, terminado=ahora
+    ):
+        return True
+    return bool(Job.objects.filter(pk=job_id, estado=EstadoJob.EN_CURSO).update(cancelar=True))
+
+
+def resumen(job: Job) -> dict:
+    return {
+        "id": job.pk,
+        "tipo": job.tipo,
+        "estado": job.estado,
+        "progreso": job.progreso,
+        "mensaje": job.mensaje,
+        "resultado": job.resultado,
+        "error": job.error.splitlines()[-1] if job.error else "",
+        "intentos": job.intentos,
+        "creado": job.creado.isoformat() if job.creado else None,
+        "terminado": job.terminado.isoformat() if job.terminado else None,
+    }
+
+
+# ---------- worker ----------
+def tomar(worker: str, tipos=None) -> Job | None:
+    """Reserva el próximo Job disponible para `worker` (o None)."""
+    ahora = timezone.now()
+    qs = Job.objects.filter(estado=EstadoJob.PENDIENTE, disponible_desde__lte=ahora)
+    if tipos:
+        qs = qs.filter(tipo__in=tipos)
+    qs = qs.order_by("disponible_desde", "pk").values_list("pk", flat=True)
+
+    def _reservar(pk) -> bool:
+        return bool(
+            Job.objects.filter(pk=pk, estado=EstadoJob.PENDIENTE).update(
+                estado=EstadoJob.EN_CURSO,
+                worker=worker[:100],
+                iniciado=ahora,
+                latido=ahora,
+                intentos=F("intentos") + 1,
+            )
+        )
+
+    conn = connections[router.db_for_write(Job)]
+    if conn.features.has_select_for_update_skip_locked:
+        with transaction.atomic(using=conn.alias):
+            candidato = qs.select_for_update(skip_locked=True).first()
+            tomado = candidato is not None and _reservar(candidato)
+    else:
+        # SQLite: sin FOR UPDATE; leer y escribir en la misma transacción
+        # sólo agrega bloqueos. Alcanza con el UPDATE condicional.
+        candidato = qs.first()
+        tomado = candidato is not None and _reservar(candidato)
+    return Job.objects.get(pk=candidato) if tomado else None
+
+
+def ejecutar(job: Job) -> None:
+    """Corre la tarea de un Job ya tomado y registra el resultado."""
+    fn = TAREAS.get(job.tipo)
+    try:
+        if fn is None:
+            raise LookupError(f"Tarea desconocida: {job.tipo}")
+        resultado = fn(Contexto(job), **job.parametros)
+    except JobCancelado:
+        Job.objects.filter(pk=job.pk).update(
+            estado=EstadoJob.CANCELADO, mensaje="Cancelado.", terminado=timezone.now()
+        )
+        return
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception("Job %s (%s) falló", job.pk, job.tipo)
+        if job.intentos < job.max_intentos:
+            espera = min(REINTENTO_BASE_S * 2 ** (job.intentos - 1), REINTENTO_MAX_S)
+            Job.objects.filter(pk=job.pk).update(
+                estado=EstadoJob.PENDIENTE,
+                error=error,
+                mensaje=f"Reintento {job.intentos + 1} en {espera}s.",
+                disponible_desde=timezone.now() + timedelta(seconds=espera),
+            )
+        else:
+            Job.objects.filter(pk=job.pk).update(
+                estado=EstadoJob.ERROR, error=error, terminado=timezone.now()
+            )
+        return
+    Job.objects.filter(pk=job.pk).update(
+        estado=EstadoJob.OK,
+        progreso=100,
+        resultado=resultado,
+        error="",
+        terminado=timezone.now(),
+    )
+
+
+def recuperar_colgados(vencido: timedelta = LATIDO_VENCIDO) -> int:
+    """
+    Devuelve a la cola los Jobs EN_CURSO cuyo worker dejó de dar señales.
+
+    Los que ya agotaron `max_intentos` pasan a ERROR: un Job que tira abajo
+    a su worker (memoria, señal) no se reintenta para siempre.
+    """
+    ahora = timezone.now()
+    colgados = Job.objects.filter(estado=EstadoJob.EN_CURSO).filter(
+        Q(latido__lt=ahora - vencido) | Q(latido__isnull=True)
+    )
+    cancelados = colgados.filter(cancelar=True).update(estado=EstadoJob.CANCELADO, terminado=ahora)
+    agotados = colgados.filter(intentos__gte=F("max_intentos")).update(
+        estado=EstadoJob.ERROR,
+        error=SIN_LATIDO,
+        mensaje="Worker caído; sin más reintentos.",
+        terminado=ahora,
+    )
+    return cancelados + agotados + colgados.update(estado=EstadoJob.PENDIENTE, worker="")
+
+
+def trabajar(
+    worker: str | None = None,
+    tipos=None,
+    una_vez: bool = False,
+    intervalo: float = 2.0,
+    max_jobs: int | None = None,
+) -> int:
+    """
+    Bucle del worker. Con `una_vez` procesa lo disponible y termina.
+    Devuelve la cantidad de Jobs ejecutados.
+    """
+    worker = worker or worker_id()
+    hechos = 0
+    recuperar_colgados()
+    while max_jobs is None or hechos < max_jobs:
+        try:
+            job = tomar(worker, tipos)
+        except OperationalError:
+            # p. ej. "database is locked" en SQLite con varios workers
+            logger.warning("Worker %s: base ocupada, reintentando", worker, exc_info=True)
+            time.sleep(intervalo)
+            continue
+        if job is None:
+            if una_vez:
+                break
+            time.sleep(intervalo)
+            recuperar_colgados()
+            continue
+        logger.info("Worker %s ejecuta Job %s (%s)", worker, job.pk, job.tipo)
+        ejecutar(job)
+        hechos += 1
+    return hechos
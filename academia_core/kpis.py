@@ -0,0 +1,266 @@
+# academia_core/kpis.py
+"""
+KPIs del panel materializados en `KpiSnapshot`.
+
+- Totales globales (estudiantes, carreras, espacios, inscripciones): se
+  mantienen con incrementos `F("valor") ± 1` desde post_save/post_delete.
+  Si la fila todavía no existe no se crea ahí: la reconstruye la primera
+  lectura (o `manage.py recalcular_kpis`).
+- Desglose por carrera y cohorte (activos, regulares, condicionales, legajos
+  completos, distribución de promedios): los signals sólo marcan la carrera
+  como `sucio` (un UPDATE); la próxima lectura recalcula esa carrera con una
+  única consulta agrupada.
+
+`bulk_create`/`queryset.update()` no disparan signals; el comando
+`recalcular_kpis` reconstruye todo y reporta el desvío encontrado.
+"""
+
+from __future__ import annotations
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Avg, Count, F, Q
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from academia_core.models import (
+    Carrera,
+    CondicionAdmin,
+    Estudiante,
+    EstudianteProfesorado,
+    KpiSnapshot,
+    LegajoEstado,
+)
+from academia_core.referencia_cache import get_carreras
+
+GLOBAL = "global"
+RESUMEN = "resumen"
+
+# métrica -> modelo contado
+TOTALES: dict[str, str] = {
+    "estudiantes": "academia_core.Estudiante",
+    "carreras": "academia_core.Carrera",
+    "espacios": "academia_core.EspacioCurricular",
+    "inscripciones_carrera": "academia_core.EstudianteProfesorado",
+    "inscripciones_materia": "academia_core.InscripcionEspacio",
+}
+
+# contadores del desglose por carrera/cohorte
+CONTADORES = ("inscriptos", "activos", "regulares", "condicionales", "legajo_completo")
+
+# rangos de promedio_general: (clave, desde, hasta) con hasta excluido
+RANGOS_PROMEDIO = [("bajo", None, 6), ("medio", 6, 8), ("alto", 8, None)]
+
+
+def ambito_carrera(carrera_id: int) -> str:
+    return f"carrera:{carrera_id}"
+
+
+def ambito_cohorte(carrera_id: int, cohorte: int) -> str:
+    return f"carrera:{carrera_id}/cohorte:{cohorte}"
+
+
+# ---------- mantenimiento incremental ----------
+def sumar(metrica: str, delta: int) -> None:
+    KpiSnapshot.objects.filter(metrica=metrica, ambito=GLOBAL).update(
+        valor=F("valor") + delta, actualizado=timezone.now()
+    )
+
+
+def marcar_sucias(carrera_ids) -> None:
+    ids = {c for c in carrera_ids if c}
+    if ids:
+        KpiSnapshot.objects.filter(
+            metrica=RESUMEN, ambito__in=[ambito_carrera(c) for c in ids]
+        ).update(sucio=True)
+
+
+# ---------- recálculo ----------
+def reconstruir_totales() -> dict[str, tuple[int, int]]:
+    """Recuenta los totales globales. Devuelve {métrica: (antes, ahora)}."""
+    previos = dict(
+        KpiSnapshot.objects.filter(metrica__in=TOTALES, ambito=GLOBAL).values_list(
+            "metrica", "valor"
+        )
+    )
+    out = {}
+    for metrica, label in TOTALES.items():
+        valor = apps.get_model(label).objects.count()
+        KpiSnapshot.objects.update_or_create(
+            metrica=metrica, ambito=GLOBAL, defaults={"valor": valor}
+        )
+        out[metrica] = (previos.get(metrica), valor)
+    return out
+
+
+def _resumen(fila: dict) -> dict:
+    datos = {k: fila[k] for k in CONTADORES}
+    datos.update(
+        promedio={
+            "sin_notas": fila["prom_sin"],
+            **{clave: fila[f"prom_{clave}"] for clave, _, _ in RANGOS_PROMEDIO},
+        }
+    )
+    if fila.get("promedio_medio") is not None:
+        datos["promedio_medio"] = round(float(fila["promedio_medio"]), 2)
+    return datos
+
+
+def _acumular(total: dict, datos: dict) -> None:
+    for k, v in datos.items():
+        if isinstance(v, dict):
+            _acumular(total.setdefault(k, {}), v)
+        elif k != "promedio_medio":
+            total[k] = total.get(k, 0) + v
+
+
+@transaction.atomic
+def recalcular_carrera(carrera_id: int) -> dict:
+    """Recalcula el desglose de una carrera (por cohorte) con una consulta agrupada."""
+    rangos = {}
+    for clave, desde, hasta in RANGOS_PROMEDIO:
+        q = Q(promedio_general__isnull=False)
+        if desde is not None:
+            q &= Q(promedio_general__gte=desde)
+        if hasta is not None:
+            q &= Q(promedio_general__lt=hasta)
+        rangos[f"prom_{clave}"] = Count("id", filter=q)
+
+    filas = (
+        EstudianteProfesorado.objects.filter(carrera_id=carrera_id)
+        .order_by()
+        .values("cohorte")
+        .annotate(
+            inscriptos=Count("id"),
+            activos=Count("id", filter=Q(estudiante__activo=True)),
+            regulares=Count("id", filter=Q(condicion_admin=CondicionAdmin.REGULAR)),
+            condicionales=Count("id", filter=Q(condicion_admin=CondicionAdmin.CONDICIONAL)),
+            legajo_completo=Count("id", filter=Q(legajo_estado=LegajoEstado.COMPLETO)),
+            prom_sin=Count("id", filter=Q(promedio_general__isnull=True)),
+            promedio_medio=Avg("promedio_general"),
+            **rangos,
+        )
+    )
+
+    total: dict = {k: 0 for k in CONTADORES}
+    total["promedio"] = {"sin_notas": 0, **{clave: 0 for clave, _, _ in RANGOS_PROMEDIO}}
+    nuevos = []
+    for fila in filas:
+        datos = _resumen(fila)
+        _acumular(total, datos)
+        nuevos.append(
+            KpiSnapshot(
+                metrica=RESUMEN,
+                ambito=ambito_cohorte(carrera_id, fila["cohorte"]),
+                valor=fila["inscriptos"],
+                datos={"cohorte": fila["cohorte"], **datos},
+            )
+        )
+    base = ambito_carrera(carrera_id)
+    KpiSnapshot.objects.filter(metrica=RESUMEN).filter(
+        Q(ambito=base) | Q(ambito__startswith=f"{base}/")
+    ).delete()
+    nuevos.append(
+        KpiSnapshot(metrica=RESUMEN, ambito=base, valor=total.get("inscriptos", 0), datos=total)
+    )
+    # ignore_conflicts: dos lecturas simultáneas pueden recalcular la misma carrera
+    KpiSnapshot.objects.bulk_create(nuevos, ignore_conflicts=True)
+    return total
+
+
+def reconstruir() -> dict[str, tuple[int, int]]:
+    """Recalcula totales y todos los desgloses por carrera (borra los de carreras eliminadas)."""
+    desvio = reconstruir_totales()
+    ids = set(Carrera.objects.values_list("id", flat=True))
+    for cid in ids:
+        recalcular_carrera(cid)
+    huerfanos = [
+        pk
+        for pk, ambito in KpiSnapshot.objects.filter(metrica=RESUMEN).values_list("pk", "ambito")
+        if int(ambito.split("/")[0].split(":")[1]) not in ids
+    ]
+    KpiSnapshot.objects.filter(pk__in=huerfanos).delete()
+    return desvio
+
+
+# ---------- lectura (panel) ----------
+def resumen_panel() -> dict:
+    """
+    Totales + desglose por carrera/cohorte leyendo sólo `KpiSnapshot`.
+    Recalcula perezosamente lo que falte o esté marcado como sucio.
+    """
+    filas = list(KpiSnapshot.objects.values("metrica", "ambito", "valor", "datos", "sucio"))
+    totales = {f["metrica"]: f["valor"] for f in filas if f["ambito"] == GLOBAL}
+    if any(m not in totales for m in TOTALES):
+        totales = {m: v for m, (_, v) in reconstruir_totales().items()}
+
+    carreras = get_carreras()
+    por_ambito = {f["ambito"]: f for f in filas if f["metrica"] == RESUMEN}
+    pendientes = [
+        c["id"]
+        for c in carreras
+        if ambito_carrera(c["id"]) not in por_ambito or por_ambito[ambito_carrera(c["id"])]["sucio"]
+    ]
+    if pendientes:
+        for cid in pendientes:
+            recalcular_carrera(cid)
+        por_ambito = {
+            f["ambito"]: f
+            for f in KpiSnapshot.objects.filter(metrica=RESUMEN).values(
+                "ambito", "valor", "datos", "sucio"
+            )
+        }
+
+    detalle = []
+    for c in carreras:
+        base = ambito_carrera(c["id"])
+        cohortes = sorted(
+            (f["datos"] for a, f in por_ambito.items() if a.startswith(f"{base}/")),
+            key=lambda d: d.get("cohorte", 0),
+            reverse=True,
+        )
+        detalle.append(
+            {
+                "carrera_id": c["id"],
+                "nombre": c["nombre"],
+                **por_ambito.get(base, {}).get("datos", {}),
+                "cohortes": cohortes,
+            }
+        )
+    return {"totales": totales, "carreras": detalle}
+
+
+# ---------- signals ----------
+def _on_inscripcion_change(sender, instance, **kwargs):
+    marcar_sucias([instance.carrera_id])
+
+
+def _on_estudiante_save(sender, instance, created, **kwargs):
+    if not created:
+        marcar_sucias(instance.inscripciones_carrera.values_list("carrera_id", flat=True))
+
+
+def conectar_signals() -> None:
+    """Conecta los receivers (se llama desde AppConfig.ready)."""
+    for metrica, label in TOTALES.items():
+
+        def _save(sender, instance, created, metrica=metrica, **kwargs):
+            if created:
+                sumar(metrica, 1)
+
+        def _delete(sender, instance, metrica=metrica, **kwargs):
+            sumar(metrica, -1)
+
+        modelo = apps.get_model(label)
+        post_save.connect(_save, sender=modelo, weak=False, dispatch_uid=f"kpis:{metrica}:save")
+        post_delete.connect(
+            _delete, sender=modelo, weak=False, dispatch_uid=f"kpis:{metrica}:delete"
+        )
+
+    post_save.connect(
+        _on_inscripcion_change, sender=EstudianteProfesorado, dispatch_uid="kpis:insc:save"
+    )
+    post_delete.connect(
+        _on_inscripcion_change, sender=EstudianteProfesorado, dispatch_uid="kpis:insc:delete"
+    )
+    post_save.connect(_on_estudiante_save, sender=Estudiante, dispatch_uid="kpis:est:save")
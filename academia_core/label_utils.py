@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 
 
 # Conversión a ordinal con "º" (1 -> "1º")
@@ -18,6 +19,7 @@ _ROMAN = {"I": 1, "II": 2, "III": 3, "IV": 4, "V": 5}
 _WORDS = {"PRIM": 1, "SEG": 2, "TERC": 3, "CUART": 4, "QUINT": 5}
 
 
+@lru_cache(maxsize=4096)
 def _extract_year(*candidates: str) -> int | None:
     """Busca año en campos o en el nombre: dígitos, romanos o 'prim/seg/terc...'."""
     for raw in candidates:
@@ -42,6 +44,7 @@ def _extract_year(*candidates: str) -> int | None:
     return None
 
 
+@lru_cache(maxsize=4096)
 def _cuatrimestre_label(val: str | None, nombre_fallback: str | None = None) -> str:
     """Devuelve 'Anual', '1º C', '2º C' o una letra (A/B/...)."""
     # 1) "Anual"
@@ -68,7 +71,8 @@ def _cuatrimestre_label(val: str | None, nombre_fallback: str | None = None) ->
     return s
 
 
-def espacio_etiqueta(e) -> str:
+@lru_cache(maxsize=4096)
+def etiqueta(anio: str | None, cuatrimestre: str | None, nombre: str) -> str:
     """
     Etiqueta final sin la palabra 'año', como pediste:
       - '1º, 1º C Nombre'
@@ -76,11 +80,8 @@ def espacio_etiqueta(e) -> str:
       - '1º, A Nombre'
       - Si falta algo, usa lo que encuentre (también puede deducir del nombre)
     """
-    nombre = getattr(e, "nombre", "") or str(e)
-
-    y_num = _extract_year(getattr(e, "anio", None), nombre)
-    y = _to_ordinal(y_num)
-    c = _cuatrimestre_label(getattr(e, "cuatrimestre", None), nombre)
+    y = _to_ordinal(_extract_year(anio, nombre))
+    c = _cuatrimestre_label(cuatrimestre, nombre)
 
     left = []
     if y:
@@ -91,3 +92,32 @@ def espacio_etiqueta(e) -> str:
     if left:
         return f"{', '.join(left)} {nombre}".strip()
     return nombre
+
+
+def etiquetas_plan(plan_id: int) -> dict[int, str]:
+    """{espacio_id: etiqueta} del plan, precalculadas en `referencia_cache` (una consulta)."""
+    from academia_core import referencia_cache
+
+    return referencia_cache.get_plan_etiquetas(plan_id)
+
+
+def espacio_etiqueta(e) -> str:
+    """
+    `etiqueta` de un EspacioCurricular. Si la materia no está cargada y el
+    espacio tiene plan, sale de `etiquetas_plan` (sin tocar Materia).
+    """
+    if e is None:
+        return ""
+    cargada = "materia" in getattr(getattr(e, "_state", None), "fields_cache", {})
+    if not cargada and getattr(e, "plan_id", None) and getattr(e, "pk", None):
+        precalculada = etiquetas_plan(e.plan_id).get(e.pk)
+        if precalculada is not None:
+            return precalculada
+    nombre = getattr(e, "nombre", "") or str(e)
+    anio = getattr(e, "anio", None)
+    cuatrimestre = getattr(e, "cuatrimestre", None)
+    return etiqueta(
+        None if anio is None else str(anio),
+        None if cuatrimestre is None else str(cuatrimestre),
+        nombre,
+    )
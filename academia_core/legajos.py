@@ -0,0 +1,108 @@
+# academia_core/legajos.py
+"""
+Reglas de legajo / condición administrativa compartidas entre el modelo y
+el recálculo masivo.
+
+`EstudianteProfesorado.calcular_legajo_estado()` evalúa las reglas fila por
+fila (al guardar). `recalcular_legajos()` evalúa las MISMAS reglas como
+expresiones SQL sobre las columnas booleanas de documentación y actualiza
+en bloque, así que cuando cambian los requisitos se recalculan miles de
+inscripciones con unos pocos UPDATE.
+
+Este módulo no importa modelos a nivel módulo: `models.py` toma de acá las
+constantes de requisitos.
+"""
+
+from __future__ import annotations
+
+from django.db.models import Case, Q, Value, When
+
+# Documentación exigida a todos
+REQUISITOS_BASE = (
+    "doc_dni_legalizado",
+    "doc_cert_medico",
+    "doc_fotos_carnet",
+    "doc_folios_oficio",
+)
+# Adicionales según el tipo de carrera
+REQUISITOS_CERTIFICACION = ("doc_titulo_terciario_legalizado", "doc_incumbencias")
+REQUISITOS_PROFESORADO = ("doc_titulo_sec_legalizado",)
+
+
+def es_certificacion_docente(nombre: str | None) -> bool:
+    nombre = (nombre or "").lower()
+    return ("certificación docente" in nombre) or ("certificacion docente" in nombre)
+
+
+def _todos(campos) -> Q:
+    return Q(**{c: True for c in campos})
+
+
+def q_legajo_completo(carreras_certificacion: set[int]) -> Q:
+    """Q equivalente a `calcular_legajo_estado() == COMPLETO`."""
+    cert = Q(carrera_id__in=carreras_certificacion) if carreras_certificacion else Q(pk__in=[])
+    no_cert = Q(carrera__isnull=True) | ~cert
+    return (
+        _todos(REQUISITOS_BASE)
+        & Q(titulo_en_tramite=False)
+        & ((cert & _todos(REQUISITOS_CERTIFICACION)) | (no_cert & _todos(REQUISITOS_PROFESORADO)))
+    )
+
+
+def q_condicion_regular(carreras_certificacion: set[int]) -> Q:
+    """Q equivalente a `calcular_condicion_admin() == REGULAR`."""
+    return q_legajo_completo(carreras_certificacion) & Q(adeuda_materias=False)
+
+
+def carreras_certificacion() -> set[int]:
+    from academia_core.models import Carrera
+
+    return {
+        c.id for c in Carrera.objects.only("id", "nombre") if es_certificacion_docente(c.nombre)
+    }
+
+
+def recalcular_legajos(queryset=None, batch_size: int = 5000) -> int:
+    """
+    Recalcula legajo_estado y condicion_admin en bloque (UPDATE ... CASE WHEN).
+
+    Sólo toca las filas cuyo valor cambia y recorre por rangos de pk para no
+    bloquear la tabla entera. Devuelve la cantidad de filas actualizadas.
+    No dispara signals (usa `queryset.update`).
+    """
+    from academia_core.models import CondicionAdmin, EstudianteProfesorado, LegajoEstado
+
+    qs = queryset if queryset is not None else EstudianteProfesorado.objects.all()
+    qs = qs.order_by()
+    cert = carreras_certificacion()
+    completo = q_legajo_completo(cert)
+    regular = q_condicion_regular(cert)
+
+    desactualizadas = (
+        (completo & ~Q(legajo_estado=LegajoEstado.COMPLETO))
+        | (~completo & ~Q(legajo_estado=LegajoEstado.INCOMPLETO))
+        | (regular & ~Q(condicion_admin=CondicionAdmin.REGULAR))
+        | (~regular & ~Q(condicion_admin=CondicionAdmin.CONDICIONAL))
+    )
+    valores = {
+        "legajo_estado": Case(
+            When(completo, then=Value(LegajoEstado.COMPLETO)),
+            default=Value(LegajoEstado.INCOMPLETO),
+        ),
+        "condicion_admin": Case(
+            When(regular, then=Value(CondicionAdmin.REGULAR)),
+            default=Value(CondicionAdmin.CONDICIONAL),
+        ),
+    }
+
+    total = 0
+    pks = qs.values_list("pk", flat=True)
+    desde = pks.order_by("pk").first()
+    ultimo = pks.order_by("-pk").first()
+    if desde is None:
+        return 0
+    while desde <= ultimo:
+        hasta = desde + batch_size
+        total += qs.filter(pk__gte=desde, pk__lt=hasta).filter(desactualizadas).update(**valores)
+        desde = hasta
+    return total
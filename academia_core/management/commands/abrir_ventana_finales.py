@@ -0,0 +1,66 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academia_core.finales import abrir_ventana, precalcular
+from academia_core.models import VentanaFinal
+
+
+def _fecha(valor: str) -> date:
+    try:
+        return date.fromisoformat(valor)
+    except ValueError as exc:
+        raise CommandError(f"Fecha inválida: {valor} (usar AAAA-MM-DD).") from exc
+
+
+class Command(BaseCommand):
+    help = (
+        "Abre una ventana de inscripción a mesas de final y precalcula qué espacios "
+        "puede rendir cada estudiante. Con --ventana recalcula una existente."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ventana", type=int, help="Recalcular esta ventana.")
+        parser.add_argument("--nombre", help="Nombre de la ventana nueva.")
+        parser.add_argument("--abre", help="Apertura de la inscripción (AAAA-MM-DD).")
+        parser.add_argument("--cierra", help="Cierre de la inscripción (AAAA-MM-DD).")
+        parser.add_argument("--mesas-desde", help="Primer día de mesas (AAAA-MM-DD).")
+        parser.add_argument("--mesas-hasta", help="Último día de mesas (AAAA-MM-DD).")
+        parser.add_argument(
+            "--plan", type=int, action="append", help="Limitar a planes (repetible)."
+        )
+
+    def handle(self, *args, **opts):
+        t0 = time.perf_counter()
+        if opts.get("ventana"):
+            ventana = VentanaFinal.objects.filter(pk=opts["ventana"]).first()
+            if ventana is None:
+                raise CommandError(f"No existe la ventana {opts['ventana']}.")
+            res = precalcular(ventana, opts.get("plan"))
+        else:
+            faltan = [
+                f"--{k.replace('_', '-')}"
+                for k in ("nombre", "abre", "cierra", "mesas_desde", "mesas_hasta")
+                if not opts.get(k)
+            ]
+            if faltan:
+                raise CommandError(f"Faltan {', '.join(faltan)} (o usar --ventana).")
+            abre, cierra = _fecha(opts["abre"]), _fecha(opts["cierra"])
+            desde, hasta = _fecha(opts["mesas_desde"]), _fecha(opts["mesas_hasta"])
+            if cierra < abre or hasta < desde:
+                raise CommandError("Alguna fecha de cierre es anterior a la de apertura.")
+            ventana, res = abrir_ventana(
+                opts["nombre"], abre, cierra, desde, hasta, plan_ids=opts.get("plan")
+            )
+
+        dt = time.perf_counter() - t0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Ventana #{ventana.pk} {ventana.nombre}: {res.habilitadas} habilitaciones "
+                f"para {res.inscripciones} inscripciones ({dt:.2f}s)."
+            )
+        )
+        if res.descartadas:
+            detalle = ", ".join(f"{m}: {n}" for m, n in sorted(res.descartadas.items()))
+            self.stdout.write(f"Descartadas por {detalle}.")
@@ -1,34 +1,52 @@
-from decimal import Decimal
+import time
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
-from academia_core.models import EstudianteProfesorado, Movimiento
+from academia_core.promedios import auditar
 
 
 class Command(BaseCommand):
     help = "Audita notas textuales, promedios cacheados y regularidades vencidas (2 años)."
 
+    def add_arguments(self, parser):
+        parser.add_argument("--batch", type=int, default=5000, help="Filas por lote (rango de pk).")
+        parser.add_argument(
+            "--workers", type=int, default=1, help="Procesos en paralelo sobre los rangos."
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="No escribe: informa qué cambiaría (con ejemplos).",
+        )
+
     def handle(self, *args, **opts):
-        # 1) Normaliza nota_texto -> nota_num cuando sea convertible
-        corr_numeros = 0
-        movs = Movimiento.objects.all()
-        for m in movs:
-            if m.nota_num is None and m.nota_texto:
-                try:
-                    n = int("".join(ch for ch in m.nota_texto if ch.isdigit()))
-                    if 0 <= n <= 10:
-                        m.nota_num = Decimal(n)
-                        m.save(update_fields=["nota_num"])
-                        corr_numeros += 1
-                except Exception:
-                    pass
-        self.stdout.write(f"Notas textuales convertidas -> num: {corr_numeros}")
-
-        # 2) Recalcula promedios cacheados
-        recalc = 0
-        for insc in EstudianteProfesorado.objects.all():
-            insc.recalcular_promedio()
-            recalc += 1
-        self.stdout.write(f"Promedios recalculados: {recalc}")
-
-        self.stdout.write(self.style.SUCCESS("Auditoría terminada (soft)."))
+        if opts["batch"] < 1 or opts["workers"] < 1:
+            raise CommandError("--batch y --workers deben ser >= 1.")
+        simular = opts["dry_run"]
+
+        def progreso(paso, hecho, total):
+            if opts["verbosity"] >= 1:
+                self.stdout.write(f"  {paso}: lote {hecho}/{total}")
+
+        t0 = time.perf_counter()
+        res = auditar(
+            simular=simular, batch_size=opts["batch"], workers=opts["workers"], progreso=progreso
+        )
+        dt = time.perf_counter() - t0
+
+        verbo = "a convertir" if simular else "convertidas"
+        self.stdout.write(f"Notas textuales {verbo} -> num: {res.notas.cambios}")
+        if simular:
+            for pk, texto, nota in res.notas.muestras:
+                self.stdout.write(f"  movimiento {pk}: {texto!r} -> {nota}")
+
+        verbo = "a cambiar" if simular else "cambiaron"
+        self.stdout.write(
+            f"Promedios recalculados: {res.promedios.revisados} ({verbo}: {res.promedios.cambios})"
+        )
+        if simular:
+            for pk, antes, despues in res.promedios.muestras:
+                self.stdout.write(f"  inscripción {pk}: {antes} -> {despues}")
+
+        fin = "Simulación terminada (sin cambios)" if simular else "Auditoría terminada (soft)"
+        self.stdout.write(self.style.SUCCESS(f"{fin} en {dt:.1f}s."))
@@ -0,0 +1,34 @@
+import sqlite3
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from academia_core.conexiones import REPLICA
+
+
+class Command(BaseCommand):
+    help = (
+        "Copia la base SQLite de default a la del alias 'reporting' (réplica local "
+        "para probar @usar_replica sin MySQL)."
+    )
+
+    def handle(self, *args, **opts):
+        if REPLICA not in connections.databases:
+            raise CommandError("No hay alias 'reporting' (definí DB_REPORTING_NAME).")
+        origen, destino = connections["default"], connections[REPLICA]
+        if origen.vendor != "sqlite" or destino.vendor != "sqlite":
+            raise CommandError("Sólo copia SQLite -> SQLite; una réplica MySQL se replica sola.")
+        if str(origen.settings_dict["NAME"]) == str(destino.settings_dict["NAME"]):
+            raise CommandError("'reporting' apunta al mismo archivo que default.")
+        destino.close()
+        origen.ensure_connection()
+        copia = sqlite3.connect(destino.settings_dict["NAME"])
+        try:
+            origen.connection.backup(copia)
+        finally:
+            copia.close()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Copiada {origen.settings_dict['NAME']} -> {destino.settings_dict['NAME']}."
+            )
+        )
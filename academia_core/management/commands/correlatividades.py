@@ -0,0 +1,101 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academia_core import referencia_cache
+from academia_core.carga_correlatividades import ErrorCarga, importar, leer_archivo
+from academia_core.models import PlanEstudios
+
+
+class Command(BaseCommand):
+    help = "Herramientas de correlatividades por plan (import, analizar)."
+
+    def add_arguments(self, parser):
+        sub = parser.add_subparsers(dest="accion", required=True)
+
+        imp = sub.add_parser(
+            "import",
+            help="Importa correlatividades de uno o más planes desde JSON/CSV.",
+        )
+        imp.add_argument("archivos", nargs="+", help="Archivos .json o .csv")
+        imp.add_argument(
+            "--reemplazar",
+            action="store_true",
+            help="Borra las correlatividades del plan que no vienen en el archivo.",
+        )
+        imp.add_argument("--delimitador", help="Separador del CSV (por defecto se detecta).")
+        imp.add_argument("--dry-run", action="store_true", help="Informa sin escribir.")
+
+        ana = sub.add_parser(
+            "analizar",
+            help="Valida el DAG del plan y calcula el mínimo de cuatrimestres (camino crítico).",
+        )
+        ana.add_argument(
+            "--plan", type=int, action="append", help="ID de plan (repetible; default: todos)."
+        )
+        ana.add_argument("--json", action="store_true", help="Salida JSON completa.")
+
+    def handle(self, *args, **opts):
+        if opts["accion"] == "import":
+            self._importar(opts)
+        elif opts["accion"] == "analizar":
+            self._analizar(opts)
+
+    def _analizar(self, opts):
+        planes = PlanEstudios.objects.order_by("pk")
+        if opts.get("plan"):
+            planes = planes.filter(pk__in=opts["plan"])
+        ids = planes.values_list("pk", flat=True)
+        analisis = [referencia_cache.get_plan_analisis(pk) for pk in ids]
+        if opts["json"]:
+            self.stdout.write(json.dumps(analisis, ensure_ascii=False, indent=2))
+
+        con_ciclo = 0
+        for a in analisis:
+            if a["ciclo"]:
+                con_ciclo += 1
+                ciclo = " -> ".join(e["nombre"] for e in a["ciclo"])
+                self.stdout.write(self.style.ERROR(f"Plan {a['plan_id']}: ciclo {ciclo}"))
+            elif not opts["json"]:
+                camino = " -> ".join(e["nombre"] for e in a["camino_critico"])
+                self.stdout.write(
+                    f"Plan {a['plan_id']}: {len(a['espacios'])} espacios, mínimo "
+                    f"{a['cuatrimestres_minimos']} cuatrimestres"
+                    + (f" (camino crítico: {camino})" if camino else "")
+                )
+        if con_ciclo:
+            raise CommandError(f"{con_ciclo} plan(es) con correlatividades circulares.")
+
+    def _importar(self, opts):
+        reglas = []
+        try:
+            for ruta in opts["archivos"]:
+                reglas.extend(leer_archivo(ruta, opts.get("delimitador")))
+        except ErrorCarga as e:
+            raise CommandError(str(e)) from e
+
+        simular = opts["dry_run"]
+        resultados = importar(reglas, reemplazar=opts["reemplazar"], simular=simular)
+
+        rechazados = 0
+        for r in resultados:
+            if r.ciclo:
+                rechazados += 1
+                self.stdout.write(
+                    self.style.ERROR(f"{r.etiqueta}: ciclo {' -> '.join(r.ciclo)} (no se aplicó)")
+                )
+            elif r.errores:
+                rechazados += 1
+                self.stdout.write(self.style.ERROR(f"{r.etiqueta}: {len(r.errores)} errores"))
+                for err in r.errores:
+                    self.stdout.write(f"  {err}")
+            else:
+                self.stdout.write(
+                    f"{r.etiqueta}: creadas {r.creadas} | actualizadas {r.actualizadas}"
+                    f" | eliminadas {r.eliminadas} | sin cambios {r.sin_cambios}"
+                )
+
+        if rechazados:
+            raise CommandError(f"{rechazados} plan(es) con errores; no se modificaron.")
+        fin = "Simulación terminada (sin cambios)" if simular else "Correlatividades importadas"
+        self.stdout.write(self.style.SUCCESS(f"{fin}: {len(resultados)} plan(es)."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from academia_core.auditoria import depurar, vaciar
+
+
+class Command(BaseCommand):
+    help = (
+        "Borra la Actividad de los meses que exceden la retención "
+        "(AUDITORIA_RETENCION_MESES, o --meses)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--meses", type=int, help="Meses a conservar además del actual.")
+
+    def handle(self, *args, **opts):
+        if opts.get("meses") is not None and opts["meses"] < 0:
+            raise CommandError("--meses debe ser >= 0.")
+        vaciar()
+        borrados = depurar(opts.get("meses"))
+        self.stdout.write(self.style.SUCCESS(f"Eventos de auditoría borrados: {borrados}."))
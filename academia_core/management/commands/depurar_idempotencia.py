@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from academia_core.inscripciones import depurar_idempotencia
+
+
+class Command(BaseCommand):
+    help = (
+        "Borra las claves de idempotencia (y sus respuestas guardadas) más viejas que "
+        "la retención (IDEMPOTENCIA_RETENCION_HORAS, o --horas)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--horas", type=int, help="Horas a conservar.")
+
+    def handle(self, *args, **opts):
+        if opts.get("horas") is not None and opts["horas"] < 0:
+            raise CommandError("--horas debe ser >= 0.")
+        borradas = depurar_idempotencia(opts.get("horas"))
+        self.stdout.write(self.style.SUCCESS(f"Solicitudes idempotentes borradas: {borradas}."))
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academia_core import kpis
+from academia_core.models import Carrera
+from academia_core.sintetico import generar, nombre_carrera
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera una institución sintética (carreras, planes, correlatividades, cohortes, "
+        "movimientos y horarios) para pruebas de carga. Determinístico por --seed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--escala",
+            type=int,
+            default=1,
+            help="Factor de escala (1 ≈ 300 estudiantes / 10k movimientos; 10 ≈ 100k).",
+        )
+        parser.add_argument("--seed", type=int, default=42, help="Semilla (default 42).")
+        parser.add_argument(
+            "--batch", type=int, default=1000, help="Tamaño de lote para bulk_create."
+        )
+        parser.add_argument(
+            "--anio-base", type=int, default=2025, help="Ciclo lectivo más reciente."
+        )
+
+    def handle(self, *args, **opts):
+        escala, seed, batch = opts["escala"], opts["seed"], opts["batch"]
+        if escala < 1 or batch < 1:
+            raise CommandError("--escala y --batch deben ser >= 1.")
+        if Carrera.objects.filter(nombre=nombre_carrera(seed, 0)).exists():
+            raise CommandError(
+                f"Ya existen datos sintéticos con seed={seed}. Usá otra --seed o una base limpia."
+            )
+
+        t0 = time.perf_counter()
+        res = generar(escala=escala, seed=seed, batch_size=batch, anio_base=opts["anio_base"])
+        # bulk_create no dispara signals: los KPIs del panel se reconstruyen al final
+        kpis.reconstruir()
+        dt = time.perf_counter() - t0
+
+        self.stdout.write(f"Carreras/planes:   {res.carreras}")
+        self.stdout.write(f"Espacios:          {res.espacios}")
+        self.stdout.write(f"Correlatividades:  {res.correlatividades}")
+        self.stdout.write(f"Estudiantes:       {res.estudiantes}")
+        self.stdout.write(f"Movimientos:       {res.movimientos}")
+        self.stdout.write(f"Comisiones:        {res.comisiones}")
+        self.stdout.write(f"Horarios (clase):  {res.horarios_clase}")
+        self.stdout.write(self.style.SUCCESS(f"Datos sintéticos generados en {dt:.1f}s."))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from academia_core import jobs
+from academia_core.fotos import generar_pendientes
+
+
+class Command(BaseCommand):
+    help = "Genera las miniaturas que faltan de las fotos de estudiantes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ids", type=int, nargs="+", help="Sólo estos estudiantes.")
+        parser.add_argument(
+            "--encolar", action="store_true", help="Encola la tarea en lugar de correrla."
+        )
+
+    def handle(self, *args, **opts):
+        if opts["encolar"]:
+            job = jobs.encolar("generar_miniaturas", {"estudiante_ids": opts.get("ids")})
+            self.stdout.write(self.style.SUCCESS(f"Tarea encolada (Job {job.pk})."))
+            return
+        res = generar_pendientes(opts.get("ids"))
+        msg = f"Miniaturas generadas: {res['generadas']}."
+        if res["errores"]:
+            msg += f" Con error: {res['errores']} (ver el log)."
+        self.stdout.write(self.style.SUCCESS(msg))
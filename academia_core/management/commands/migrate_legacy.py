@@ -1,11 +1,31 @@
+"""
+Migra Carreras/Planes/Materias/Espacios desde la DB 'legacy'.
+
+La importación es por streaming y reanudable:
+
+- Cada tabla se lee con un cursor del lado del servidor (`fetchmany`) ordenado
+  por su PK legacy, en lotes de `--batch` filas.
+- Las FKs se resuelven con mapas en memoria (id legacy -> pk nuevo) armados
+  por clave natural: Carrera por nombre, Materia por nombre, Plan por
+  (carrera, resolución) y Espacio por (plan, materia, año, cuatrimestre).
+- Cada lote se escribe con `bulk_create` en su propia transacción y después
+  se guarda el checkpoint (último id legacy por tabla + mapas). Si el proceso
+  muere, la próxima corrida sigue desde ahí; un lote que se haya confirmado
+  sin llegar a guardar el checkpoint se repite sin duplicar (clave natural).
+"""
+
 import contextlib
-from collections.abc import Sequence
+import json
+import os
+import time
+from collections.abc import Callable, Iterator, Sequence
 from dataclasses import dataclass
 from typing import Any
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.db import connections, transaction
 from django.utils.termcolors import make_style
+from django.utils.text import slugify
 
 from academia_core.models import Carrera, EspacioCurricular, Materia, PlanEstudios
 
@@ -15,6 +35,8 @@ red = make_style(fg="red", opts=("bold",))
 cyan = make_style(fg="cyan")
 bold = make_style(opts=("bold",))
 
+CHECKPOINT_DEFAULT = "migrate_legacy.checkpoint.json"
+
 
 def _fmt(s: str) -> str:
     return s.replace("\n", " ").strip()
@@ -28,19 +50,142 @@ def _first_present(cols: Sequence[str], *candidates: str) -> str | None:
     return None
 
 
-@contextlib.contextmanager
-def legacy_cursor():
+def _conexion_legacy():
     # Usa la conexión configurada en settings.DATABASES["legacy"]
+    return connections["legacy"]
+
+
+@contextlib.contextmanager
+def legacy_cursor(servidor: bool = False):
+    """
+    Cursor sobre la DB legacy. Con `servidor=True` las filas no se traen
+    todas a memoria: SSCursor en MySQL, cursor con nombre en PostgreSQL
+    (`chunked_cursor`); SQLite ya lee de a poco con `fetchmany`.
+    """
     cursor = None
     try:
-        conn = connections["legacy"]
-        cursor = conn.cursor()
+        conn = _conexion_legacy()
+        if servidor and conn.vendor == "mysql":
+            from MySQLdb.cursors import SSCursor
+
+            conn.ensure_connection()
+            cursor = conn.connection.cursor(SSCursor)
+        elif servidor:
+            cursor = conn.chunked_cursor()
+        else:
+            cursor = conn.cursor()
         yield cursor
     finally:
         if cursor:
             cursor.close()
 
 
+def leer_por_lotes(
+    tabla: str,
+    columnas: Sequence[tuple[str, str]],
+    id_col: str | None,
+    desde: int | None = None,
+    tam: int = 1000,
+    limite: int = 0,
+) -> Iterator[list[dict[str, Any]]]:
+    """
+    Lotes de filas `{alias: valor}` de `tabla`, ordenadas por `id_col` y con
+    id mayor a `desde` (keyset). `columnas` son pares (alias, columna legacy).
+    """
+    q = _conexion_legacy().ops.quote_name
+    sql = "SELECT " + ", ".join(f"{q(col)} AS {q(alias)}" for alias, col in columnas)
+    sql += f" FROM {q(tabla)}"
+    params: list[Any] = []
+    if id_col:
+        if desde is not None:
+            sql += f" WHERE {q(id_col)} > %s"
+            params.append(desde)
+        sql += f" ORDER BY {q(id_col)}"
+    if limite > 0:
+        sql += f" LIMIT {int(limite)}"
+
+    with legacy_cursor(servidor=True) as cur:
+        cur.execute(sql, params)
+        nombres = [c[0] for c in cur.description]
+        while filas := cur.fetchmany(tam):
+            yield [dict(zip(nombres, f, strict=False)) for f in filas]
+
+
+class Checkpoint:
+    """
+    Avance persistido en JSON: por rol (carrera/planes/...) la tabla legacy,
+    el último id importado y el mapa id legacy -> pk nuevo.
+    """
+
+    def __init__(self, ruta: str | None, datos: dict | None = None):
+        self.ruta = ruta
+        self.tablas: dict[str, dict[str, Any]] = {}
+        for rol, d in (datos or {}).items():
+            self.tablas[rol] = {
+                "tabla": d.get("tabla"),
+                "ultimo": d.get("ultimo"),
+                "mapa": {int(k): v for k, v in (d.get("mapa") or {}).items()},
+            }
+
+    @classmethod
+    def cargar(cls, ruta: str) -> "Checkpoint":
+        if not os.path.exists(ruta):
+            return cls(ruta)
+        with open(ruta, encoding="utf-8") as fh:
+            return cls(ruta, json.load(fh).get("tablas"))
+
+    def _rol(self, rol: str, tabla: str) -> dict[str, Any]:
+        d = self.tablas.get(rol)
+        if d is None or d["tabla"] != tabla:
+            # otra tabla para el mismo rol (p.ej. --carrera-table): empezar de cero
+            d = self.tablas[rol] = {"tabla": tabla, "ultimo": None, "mapa": {}}
+        return d
+
+    def ultimo(self, rol: str, tabla: str) -> int | None:
+        return self._rol(rol, tabla)["ultimo"]
+
+    def mapa(self, rol: str, tabla: str) -> dict[int, int]:
+        return self._rol(rol, tabla)["mapa"]
+
+    def avanzar(self, rol: str, tabla: str, ultimo: int | None, mapa: dict[int, int]) -> None:
+        d = self._rol(rol, tabla)
+        if ultimo is not None:
+            d["ultimo"] = ultimo
+        d["mapa"].update(mapa)
+
+    def guardar(self) -> None:
+        if not self.ruta:
+            return
+        datos = {
+            "tablas": {
+                rol: {
+                    "tabla": d["tabla"],
+                    "ultimo": d["ultimo"],
+                    "mapa": {str(k): v for k, v in d["mapa"].items()},
+                }
+                for rol, d in self.tablas.items()
+            }
+        }
+        tmp = f"{self.ruta}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(datos, fh)
+        # reemplazo atómico: un corte a mitad de escritura no pierde el checkpoint
+        os.replace(tmp, self.ruta)
+
+
+@dataclass
+class Conteo:
+    leidas: int = 0
+    nuevas: int = 0
+    existentes: int = 0
+    saltadas: int = 0
+    segundos: float = 0.0
+
+    @property
+    def por_segundo(self) -> float:
+        return self.leidas / self.segundos if self.segundos else 0.0
+
+
 @dataclass
 class LegacyTables:
     carrera: str | None = None
@@ -62,13 +207,30 @@ class Command(BaseCommand):
             "--limit",
             type=int,
             default=0,
-            help="Limita filas por tabla (debug). 0 = sin límite.",
+            help="Limita filas por tabla en esta corrida (debug). 0 = sin límite.",
         )
         parser.add_argument(
             "--skip-espacios",
             action="store_true",
             help="No crea EspacioCurricular (join).",
         )
+        parser.add_argument(
+            "--batch",
+            type=int,
+            default=1000,
+            help="Filas por lote (fetchmany + bulk_create).",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=str,
+            default=CHECKPOINT_DEFAULT,
+            help="Archivo JSON con el avance (último id legacy por tabla).",
+        )
+        parser.add_argument(
+            "--reiniciar",
+            action="store_true",
+            help="Ignora el checkpoint existente y empieza desde el principio.",
+        )
 
         # NUEVOS flags para forzar nombres de tabla:
         parser.add_argument(
@@ -90,19 +252,13 @@ class Command(BaseCommand):
 
     # ----- util SQL -------
 
-    def _fetchall(self, cursor, sql: str, params: tuple[Any, ...] = ()) -> list[dict[str, Any]]:
-        cursor.execute(sql, params)
-        cols = [c[0] for c in cursor.description]
-        rows = cursor.fetchall()
-        return [dict(zip(cols, r, strict=False)) for r in rows]
-
     def _show_tables(self, cursor) -> list[str]:
-        cursor.execute("SHOW TABLES")
-        return [r[0] for r in cursor.fetchall()]
+        return _conexion_legacy().introspection.table_names(cursor)
 
     def _show_columns(self, cursor, table: str) -> list[str]:
-        cursor.execute(f"SHOW COLUMNS FROM `{table}`")
-        return [r[0] for r in cursor.fetchall()]
+        q = _conexion_legacy().ops.quote_name
+        cursor.execute(f"SELECT * FROM {q(table)} WHERE 1 = 0")
+        return [c[0] for c in cursor.description]
 
     # ----- autodetección de tablas -------
 
@@ -141,154 +297,45 @@ class Command(BaseCommand):
 
         return lt
 
-    # ----- carga/insert -------
+    # ----- detección de columnas -------
 
-    def _load_carreras(
-        self, cursor, table: str, limit: int
-    ) -> tuple[list[dict[str, Any]], dict[int, Carrera], int, int]:
-        cols = self._show_columns(cursor, table)
+    def _columnas_carreras(self, cols: list[str], table: str) -> list[tuple[str, str]]:
         id_col = _first_present(cols, "id", "pk")
         name_col = _first_present(cols, "nombre", "name", "titulo", "descripcion")
         abbr_col = _first_present(cols, "abreviatura", "shortname", "codigo")
-
         if not id_col or not name_col:
             raise RuntimeError(
                 f"No pude detectar columnas para {table}. Necesito al menos ID y NOMBRE."
             )
-
-        sql = f"SELECT `{id_col}` AS id, `{name_col}` AS nombre"
+        sel = [("id", id_col), ("nombre", name_col)]
         if abbr_col:
-            sql += f", `{abbr_col}` AS abreviatura"
-        sql += f" FROM `{table}`"
-        if limit > 0:
-            sql += f" LIMIT {limit}"
-
-        rows = self._fetchall(cursor, sql)
-        idmap: dict[int, Carrera] = {}
-        created = existed = 0
+            sel.append(("abreviatura", abbr_col))
+        return sel
 
-        for r in rows:
-            nombre = _fmt(r["nombre"] or "")
-            if not nombre:
-                continue
-            obj, was_created = Carrera.objects.get_or_create(nombre=nombre)
-            if was_created:
-                created += 1
-            else:
-                existed += 1
-            # Solo setear abreviatura si el modelo la tiene
-            abbr = _fmt(r.get("abreviatura") or "").upper()[:12] if r.get("abreviatura") else ""
-            if abbr:
-                try:
-                    if getattr(obj, "abreviatura", None) != abbr:
-                        obj.abreviatura = abbr
-                        obj.save(update_fields=["abreviatura"])
-                except Exception:
-                    pass
-            idmap[int(r["id"])] = obj
-
-        return rows, idmap, created, existed
-
-    def _load_materias(
-        self, cursor, table: str, limit: int
-    ) -> tuple[list[dict[str, Any]], dict[int, Materia], int, int]:
-        cols = self._show_columns(cursor, table)
+    def _columnas_materias(self, cols: list[str], table: str) -> list[tuple[str, str]]:
         id_col = _first_present(cols, "id", "pk")
         name_col = _first_present(cols, "nombre", "name", "titulo", "descripcion")
         if not id_col or not name_col:
             raise RuntimeError(f"No pude detectar columnas para {table} (Materias).")
+        return [("id", id_col), ("nombre", name_col)]
 
-        sql = f"SELECT `{id_col}` AS id, `{name_col}` AS nombre FROM `{table}`"
-        if limit > 0:
-            sql += f" LIMIT {limit}"
-
-        rows = self._fetchall(cursor, sql)
-        idmap: dict[int, Materia] = {}
-        created = existed = 0
-
-        for r in rows:
-            nombre = _fmt(r["nombre"] or "")
-            if not nombre:
-                continue
-            obj, was_created = Materia.objects.get_or_create(nombre=nombre)
-            if was_created:
-                created += 1
-            else:
-                existed += 1
-            idmap[int(r["id"])] = obj
-
-        return rows, idmap, created, existed
-
-    def _load_planes(
-        self, cursor, table: str, limit: int, carrera_idmap: dict[int, Carrera]
-    ) -> tuple[list[dict[str, Any]], dict[int, PlanEstudios], int, int]:
-        cols = self._show_columns(cursor, table)
+    def _columnas_planes(self, cols: list[str], table: str) -> list[tuple[str, str]]:
         id_col = _first_present(cols, "id", "pk")
         # FK a carrera/profesorado
         carrera_fk = _first_present(cols, "carrera_id", "profesorado_id")
         resol_col = _first_present(
             cols, "resolucion", "resolucion_text", "codigo", "nombre", "titulo"
         )
-
         if not id_col:
             raise RuntimeError(f"No pude detectar columna ID en {table} (Planes).")
-
-        # Seleccionar columnas mínimas
-        select_cols = [f"`{id_col}` AS id"]
+        sel = [("id", id_col)]
         if carrera_fk:
-            select_cols.append(f"`{carrera_fk}` AS carrera_id")
+            sel.append(("carrera_id", carrera_fk))
         if resol_col:
-            select_cols.append(f"`{resol_col}` AS resolucion")
-
-        sql = f"SELECT {', '.join(select_cols)} FROM `{table}`"
-        if limit > 0:
-            sql += f" LIMIT {limit}"
-
-        rows = self._fetchall(cursor, sql)
-        idmap: dict[int, PlanEstudios] = {}
-        created = existed = 0
-
-        for r in rows:
-            resol = _fmt((r.get("resolucion") or "").strip())
-            carrera_obj = None
-            if "carrera_id" in r and r["carrera_id"] is not None:
-                carrera_obj = carrera_idmap.get(int(r["carrera_id"]))
-            defaults = {}
-            # Si el modelo tiene 'vigente', setear True por defecto
-            try:
-                PlanEstudios._meta.get_field("vigente")
-                defaults["vigente"] = True
-            except Exception:
-                pass
-
-            if carrera_obj:
-                obj, was_created = PlanEstudios.objects.get_or_create(
-                    carrera=carrera_obj, resolucion=resol or "", defaults=defaults
-                )
-            else:
-                # fallback por resolucion sola
-                obj, was_created = PlanEstudios.objects.get_or_create(
-                    resolucion=resol or "", defaults=defaults
-                )
-
-            if was_created:
-                created += 1
-            else:
-                existed += 1
-
-            idmap[int(r["id"])] = obj
-
-        return rows, idmap, created, existed
+            sel.append(("resolucion", resol_col))
+        return sel
 
-    def _load_join(
-        self,
-        cursor,
-        table: str,
-        limit: int,
-        plan_idmap: dict[int, PlanEstudios],
-        materia_idmap: dict[int, Materia],
-    ) -> tuple[int, int, int]:
-        cols = self._show_columns(cursor, table)
+    def _columnas_join(self, cols: list[str], table: str) -> list[tuple[str, str]]:
         # Detectar columnas FK
         plan_fk = _first_present(
             cols, "plan_id", "planestudios_id", "plan_id_id", "plan_estudios_id"
@@ -296,43 +343,301 @@ class Command(BaseCommand):
         mat_fk = _first_present(
             cols, "materia_id", "espacio_id", "materia_id_id", "espacio_curricular_id"
         )
-
         if not plan_fk or not mat_fk:
             # En horarios.materiaenplan suelen ser "plan_id" y "materia_id"
             raise RuntimeError(f"No pude detectar FKs (plan/materia) en {table}. Columnas: {cols}")
+        sel = [("plan_id", plan_fk), ("materia_id", mat_fk)]
+        # id es opcional: sin él no hay reanudación, pero el lote es idempotente
+        opcionales = (("id", "id", "pk"), ("anio", "anio"), ("cuatrimestre", "cuatrimestre"))
+        for alias, *cands in opcionales:
+            col = _first_present(cols, *cands)
+            if col:
+                sel.append((alias, col))
+        return sel
+
+    # ----- carga por lote -------
+    # Cada `_lote_*` recibe las filas de un lote y devuelve (Conteo, {id legacy: pk}).
+
+    def _lote_carreras(self, filas: list[dict[str, Any]]) -> tuple[Conteo, dict[int, int]]:
+        res = Conteo()
+        abbr_por_nombre: dict[str, str] = {}
+        ids: list[tuple[int, str]] = []
+        for r in filas:
+            nombre = _fmt(r["nombre"] or "")
+            if not nombre:
+                res.saltadas += 1
+                continue
+            abbr = _fmt(r.get("abreviatura") or "").upper()[:12]
+            if abbr or nombre not in abbr_por_nombre:
+                abbr_por_nombre[nombre] = abbr
+            ids.append((int(r["id"]), nombre))
+
+        existentes = {
+            c.nombre: c
+            for c in Carrera.objects.filter(nombre__in=abbr_por_nombre).only(
+                "id", "nombre", "abreviatura"
+            )
+        }
+        nuevas = [
+            Carrera(nombre=n, abreviatura=a)
+            for n, a in abbr_por_nombre.items()
+            if n not in existentes
+        ]
+        cambiar = []
+        for c in existentes.values():
+            abbr = abbr_por_nombre[c.nombre]
+            if abbr and c.abreviatura != abbr:
+                c.abreviatura = abbr
+                cambiar.append(c)
+        Carrera.objects.bulk_create(nuevas, ignore_conflicts=True)
+        if cambiar:
+            Carrera.objects.bulk_update(cambiar, ["abreviatura"])
+
+        pks = dict(Carrera.objects.filter(nombre__in=abbr_por_nombre).values_list("nombre", "pk"))
+        vistas = set(existentes)
+        for _, nombre in ids:
+            if nombre in vistas:
+                res.existentes += 1
+            else:
+                res.nuevas += 1
+                vistas.add(nombre)
+        return res, {lid: pks[nombre] for lid, nombre in ids}
+
+    def _lote_materias(self, filas: list[dict[str, Any]]) -> tuple[Conteo, dict[int, int]]:
+        res = Conteo()
+        ids: list[tuple[int, str]] = []
+        for r in filas:
+            nombre = _fmt(r["nombre"] or "")
+            if not nombre:
+                res.saltadas += 1
+                continue
+            ids.append((int(r["id"]), nombre))
+        nombres = {n for _, n in ids}
+
+        def _pks() -> dict[str, int]:
+            # Materia.nombre no es único: ante duplicados, la más vieja
+            pks: dict[str, int] = {}
+            qs = Materia.objects.filter(nombre__in=nombres).order_by("pk")
+            for nombre, pk in qs.values_list("nombre", "pk"):
+                pks.setdefault(nombre, pk)
+            return pks
+
+        pks = _pks()
+        faltan = sorted(nombres - set(pks))
+        if faltan:
+            Materia.objects.bulk_create(Materia(nombre=n) for n in faltan)
+            pks = _pks()
+
+        vistas = nombres - set(faltan)
+        for _, nombre in ids:
+            if nombre in vistas:
+                res.existentes += 1
+            else:
+                res.nuevas += 1
+                vistas.add(nombre)
+        return res, {lid: pks[nombre] for lid, nombre in ids}
+
+    def _lote_planes(
+        self, filas: list[dict[str, Any]], carreras: dict[int, int]
+    ) -> tuple[Conteo, dict[int, int]]:
+        res = Conteo()
+        ids: list[tuple[int, tuple[int | None, str]]] = []
+        for r in filas:
+            resol = _fmt(str(r.get("resolucion") or ""))
+            carrera_id = None
+            if r.get("carrera_id") is not None:
+                carrera_id = carreras.get(int(r["carrera_id"]))
+            # sin carrera resoluble: fallback por resolución sola (carrera nula)
+            ids.append((int(r["id"]), (carrera_id, resol)))
+        claves = {k for _, k in ids}
+        resols = {resol for _, resol in claves}
+        carrera_ids = {c for c, _ in claves if c is not None}
+
+        def _pks() -> dict[tuple[int | None, str], int]:
+            pks: dict[tuple[int | None, str], int] = {}
+            for carrera_id, resol, pk in (
+                PlanEstudios.objects.filter(resolucion__in=resols)
+                .order_by("pk")
+                .values_list("carrera_id", "resolucion", "pk")
+            ):
+                pks.setdefault((carrera_id, resol), pk)
+            return pks
+
+        pks = _pks()
+        # Un solo plan vigente por carrera (constraint): el primero que llega
+        con_vigente = set(
+            PlanEstudios.objects.filter(carrera_id__in=carrera_ids, vigente=True).values_list(
+                "carrera_id", flat=True
+            )
+        )
+        nuevos = []
+        for carrera_id, resol in sorted(claves - set(pks), key=lambda k: (k[0] or 0, k[1])):
+            vigente = carrera_id is None or carrera_id not in con_vigente
+            if carrera_id is not None and vigente:
+                con_vigente.add(carrera_id)
+            nuevos.append(
+                PlanEstudios(
+                    carrera_id=carrera_id,
+                    resolucion=resol,
+                    # bulk_create no pasa por save()
+                    resolucion_slug=slugify(resol.replace("/", "-")),
+                    vigente=vigente,
+                )
+            )
+        if nuevos:
+            PlanEstudios.objects.bulk_create(nuevos, ignore_conflicts=True)
+            vistas = set(pks)
+            pks = _pks()
+        else:
+            vistas = set(pks)
+
+        for _, clave in ids:
+            if clave in vistas:
+                res.existentes += 1
+            else:
+                res.nuevas += 1
+                vistas.add(clave)
+        return res, {lid: pks[clave] for lid, clave in ids}
 
-        sql = f"SELECT `{plan_fk}` AS plan_id, `{mat_fk}` AS materia_id FROM `{table}`"
-        if limit > 0:
-            sql += f" LIMIT {limit}"
-
-        rows = self._fetchall(cursor, sql)
-        created = existed = skipped = 0
-
-        for r in rows:
+    def _lote_join(
+        self,
+        filas: list[dict[str, Any]],
+        planes: dict[int, int],
+        materias: dict[int, int],
+    ) -> tuple[Conteo, dict[int, int]]:
+        res = Conteo()
+        claves: list[tuple[int, int, str, str]] = []
+        for r in filas:
             pid = r.get("plan_id")
             mid = r.get("materia_id")
-            if pid is None or mid is None:
-                skipped += 1
-                continue
-            plan = plan_idmap.get(int(pid))
-            mat = materia_idmap.get(int(mid))
+            plan = planes.get(int(pid)) if pid is not None else None
+            mat = materias.get(int(mid)) if mid is not None else None
             if not plan or not mat:
-                skipped += 1
+                res.saltadas += 1
                 continue
-            obj, was_created = EspacioCurricular.objects.get_or_create(plan=plan, materia=mat)
-            if was_created:
-                created += 1
-            else:
-                existed += 1
+            anio = _fmt(str(r.get("anio") or ""))[:10]
+            cuatri = _fmt(str(r.get("cuatrimestre") or ""))[:1]
+            claves.append((plan, mat, anio, cuatri))
+
+        existentes = set(
+            EspacioCurricular.objects.filter(
+                plan_id__in={c[0] for c in claves}, materia_id__in={c[1] for c in claves}
+            )
+            .order_by()
+            .values_list("plan_id", "materia_id", "anio", "cuatrimestre")
+        )
+        nuevos = []
+        for clave in claves:
+            if clave in existentes:
+                res.existentes += 1
+                continue
+            existentes.add(clave)
+            res.nuevas += 1
+            plan, mat, anio, cuatri = clave
+            nuevos.append(
+                EspacioCurricular(plan_id=plan, materia_id=mat, anio=anio, cuatrimestre=cuatri)
+            )
+        EspacioCurricular.objects.bulk_create(nuevos, ignore_conflicts=True)
+        return res, {}
 
-        return created, existed, skipped
+    # ----- streaming + checkpoint -------
+
+    def _importar(
+        self,
+        rol: str,
+        etiqueta: str,
+        tabla: str,
+        columnas: list[tuple[str, str]],
+        cargar: Callable[[list[dict[str, Any]]], tuple[Conteo, dict[int, int]]],
+    ) -> Conteo:
+        id_col = dict(columnas).get("id")
+        desde = self.checkpoint.ultimo(rol, tabla) if id_col else None
+        if desde is not None:
+            self.stdout.write(cyan(f"{etiqueta}: reanudando desde id legacy > {desde}"))
+
+        total = Conteo()
+        t0 = time.perf_counter()
+        for filas in leer_por_lotes(tabla, columnas, id_col, desde, self.batch, self.limit):
+            with transaction.atomic():
+                res, mapa = cargar(filas)
+            ultimo = int(filas[-1]["id"]) if id_col else None
+            self.checkpoint.avanzar(rol, tabla, ultimo, mapa)
+            if self.commit:
+                self.checkpoint.guardar()
+
+            total.leidas += len(filas)
+            total.nuevas += res.nuevas
+            total.existentes += res.existentes
+            total.saltadas += res.saltadas
+            total.segundos = time.perf_counter() - t0
+            if self.verbosity >= 2:
+                self.stdout.write(
+                    f"  {etiqueta}: {total.leidas} filas ({total.por_segundo:.0f} filas/s)"
+                )
+        total.segundos = time.perf_counter() - t0
+        return total
+
+    def _migrar(self, tables: LegacyTables, skip_espacios: bool) -> dict[str, Conteo]:
+        with legacy_cursor() as cur:
+            cols = {
+                t: self._show_columns(cur, t)
+                for t in (tables.carrera, tables.materias, tables.planes)
+            }
+            if not skip_espacios and tables.join_plan_materia:
+                cols[tables.join_plan_materia] = self._show_columns(cur, tables.join_plan_materia)
+
+        cp = self.checkpoint
+        conteos = {}
+        conteos["Carreras"] = self._importar(
+            "carrera",
+            "Carreras",
+            tables.carrera,
+            self._columnas_carreras(cols[tables.carrera], tables.carrera),
+            self._lote_carreras,
+        )
+        conteos["Materias"] = self._importar(
+            "materias",
+            "Materias",
+            tables.materias,
+            self._columnas_materias(cols[tables.materias], tables.materias),
+            self._lote_materias,
+        )
+        carreras = cp.mapa("carrera", tables.carrera)
+        conteos["Planes"] = self._importar(
+            "planes",
+            "Planes",
+            tables.planes,
+            self._columnas_planes(cols[tables.planes], tables.planes),
+            lambda filas: self._lote_planes(filas, carreras),
+        )
+        if not skip_espacios and tables.join_plan_materia:
+            planes = cp.mapa("planes", tables.planes)
+            materias = cp.mapa("materias", tables.materias)
+            conteos["Espacios (join)"] = self._importar(
+                "espacios",
+                "Espacios (join)",
+                tables.join_plan_materia,
+                self._columnas_join(cols[tables.join_plan_materia], tables.join_plan_materia),
+                lambda filas: self._lote_join(filas, planes, materias),
+            )
+        return conteos
 
     # ----- main -------
 
     def handle(self, *args, **options):
-        commit: bool = options["commit"]
-        limit: int = int(options.get("limit") or 0)
+        self.commit: bool = options["commit"]
+        self.limit: int = int(options.get("limit") or 0)
+        self.batch: int = int(options.get("batch") or 1000)
+        self.verbosity: int = int(options.get("verbosity", 1))
         skip_espacios: bool = options.get("skip_espacios", False)
+        if self.batch < 1:
+            raise CommandError("--batch debe ser >= 1.")
+
+        ruta = options.get("checkpoint") or CHECKPOINT_DEFAULT
+        if options.get("reiniciar"):
+            self.checkpoint = Checkpoint(ruta)
+        else:
+            self.checkpoint = Checkpoint.cargar(ruta)
 
         forced = LegacyTables(
             carrera=options.get("carrera_table"),
@@ -343,76 +648,49 @@ class Command(BaseCommand):
 
         self.stdout.write(bold("== Migración legacy: inicio =="))
 
+        conn = _conexion_legacy()
+        self.stdout.write(f"Conectado a legacy DB = {green(repr(conn.settings_dict['NAME']))}")
         with legacy_cursor() as cur:
-            # Mostrar base y tablas
-            cur.execute("SELECT DATABASE()")
-            legacy_db = cur.fetchone()[0]
-            self.stdout.write(f"Conectado a legacy DB = {green(repr(legacy_db))}")
-
             all_tables = self._show_tables(cur)
-            self.stdout.write("Tablas detectadas: " + ", ".join(all_tables))
-
-            # Resolver tablas
-            tables = self._guess_tables(all_tables, forced)
+        self.stdout.write("Tablas detectadas: " + ", ".join(all_tables))
 
-            def chk(name, value):
-                if value:
-                    self.stdout.write(f"{name}: {green(value)}")
-                else:
-                    self.stdout.write(f"{name}: {red('NO ENCONTRADA')}")
+        # Resolver tablas
+        tables = self._guess_tables(all_tables, forced)
 
-            chk("Tabla carreras/profesorados", tables.carrera)
-            chk("Tabla planes", tables.planes)
-            chk("Tabla materias", tables.materias)
-            if not skip_espacios:
-                chk("Tabla join plan↔materia", tables.join_plan_materia)
-
-            if not all([tables.carrera, tables.planes, tables.materias]):
-                self.stdout.write(
-                    red("\nFaltan tablas mínimas (carrera/planes/materias). Abortando.\n")
-                )
-                return
-
-            def do_work():
-                rows_carreras, idmap_carr, c_new, c_old = self._load_carreras(
-                    cur, tables.carrera, limit
-                )
-                rows_mats, idmap_mat, m_new, m_old = self._load_materias(
-                    cur, tables.materias, limit
-                )
-                rows_plans, idmap_plan, p_new, p_old = self._load_planes(
-                    cur, tables.planes, limit, idmap_carr
-                )
-
-                e_new = e_old = e_skip = 0
-                if not skip_espacios and tables.join_plan_materia:
-                    e_new, e_old, e_skip = self._load_join(
-                        cur, tables.join_plan_materia, limit, idmap_plan, idmap_mat
-                    )
-
-                # Resumen
-                self.stdout.write("\n" + bold("== Resumen =="))
-                self.stdout.write(
-                    f"Carreras: {c_new} nuevas, {c_old} existentes (total legacy: {len(rows_carreras)})"
-                )
-                self.stdout.write(
-                    f"Planes:   {p_new} nuevas, {p_old} existentes (total legacy: {len(rows_plans)})"
-                )
-                self.stdout.write(
-                    f"Materias: {m_new} nuevas, {m_old} existentes (total legacy: {len(rows_mats)})"
-                )
-                if not skip_espacios and tables.join_plan_materia:
-                    self.stdout.write(
-                        f"Espacios (join): {e_new} nuevos, {e_old} existentes, {e_skip} saltados"
-                    )
-                self.stdout.write("")
-
-            if commit:
-                self.stdout.write(yellow("Commit: ON (se aplicarán cambios)\n"))
-                with transaction.atomic():
-                    do_work()
+        def chk(name, value):
+            if value:
+                self.stdout.write(f"{name}: {green(value)}")
             else:
-                self.stdout.write(yellow("Commit: OFF (dry-run)\n"))
-                do_work()
+                self.stdout.write(f"{name}: {red('NO ENCONTRADA')}")
 
+        chk("Tabla carreras/profesorados", tables.carrera)
+        chk("Tabla planes", tables.planes)
+        chk("Tabla materias", tables.materias)
+        if not skip_espacios:
+            chk("Tabla join plan↔materia", tables.join_plan_materia)
+
+        if not all([tables.carrera, tables.planes, tables.materias]):
+            self.stdout.write(
+                red("\nFaltan tablas mínimas (carrera/planes/materias). Abortando.\n")
+            )
+            return
+
+        if self.commit:
+            self.stdout.write(yellow(f"Commit: ON (checkpoint en {ruta})\n"))
+            conteos = self._migrar(tables, skip_espacios)
+        else:
+            self.stdout.write(yellow("Commit: OFF (dry-run)\n"))
+            # Se escribe igual para contar bien (claves naturales), pero se deshace
+            with transaction.atomic():
+                conteos = self._migrar(tables, skip_espacios)
+                transaction.set_rollback(True)
+
+        # Resumen
+        self.stdout.write("\n" + bold("== Resumen =="))
+        for etiqueta, c in conteos.items():
+            self.stdout.write(
+                f"{etiqueta}: {c.nuevas} nuevas, {c.existentes} existentes, {c.saltadas} saltadas"
+                f" ({c.leidas} filas legacy en {c.segundos:.1f}s, {c.por_segundo:.0f} filas/s)"
+            )
+        self.stdout.write("")
         self.stdout.write(bold("== Migración legacy: fin =="))
@@ -0,0 +1,87 @@
+import multiprocessing
+import signal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+def _proceso(opciones: dict) -> int:
+    # Punto de entrada de cada proceso hijo (fork o spawn)
+    import django
+
+    django.setup()
+    from academia_core import jobs
+
+    try:
+        return jobs.trabajar(**opciones)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Worker de la cola de trabajos (modelo Job). Toma trabajos pendientes con "
+        "SELECT … FOR UPDATE SKIP LOCKED: se pueden correr varios a la vez."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--procesos", type=int, default=1, help="Procesos worker en este host (default 1)."
+        )
+        parser.add_argument(
+            "--una-vez",
+            action="store_true",
+            help="Procesa lo pendiente y termina (útil en cron o CI).",
+        )
+        parser.add_argument(
+            "--intervalo", type=float, default=2.0, help="Segundos de espera si no hay trabajos."
+        )
+        parser.add_argument("--tipos", nargs="*", help="Sólo estos tipos de tarea.")
+        parser.add_argument("--max-jobs", type=int, help="Termina tras ejecutar N trabajos.")
+
+    def handle(self, *args, **opts):
+        from academia_core.jobs import TAREAS, trabajar
+
+        if opts["procesos"] < 1:
+            raise CommandError("--procesos debe ser >= 1.")
+        desconocidas = set(opts.get("tipos") or ()) - set(TAREAS)
+        if desconocidas:
+            raise CommandError(f"Tareas desconocidas: {', '.join(sorted(desconocidas))}")
+
+        opciones = {
+            "tipos": opts.get("tipos") or None,
+            "una_vez": opts["una_vez"],
+            "intervalo": opts["intervalo"],
+            "max_jobs": opts.get("max_jobs"),
+        }
+        if opts["procesos"] == 1:
+            hechos = trabajar(**opciones)
+            self.stdout.write(self.style.SUCCESS(f"Trabajos ejecutados: {hechos}"))
+            return
+
+        # Los hijos no deben heredar conexiones abiertas del padre
+        connections.close_all()
+        hijos = [
+            multiprocessing.Process(target=_proceso, args=(opciones,), daemon=False)
+            for _ in range(opts["procesos"])
+        ]
+        for p in hijos:
+            p.start()
+        self.stdout.write(f"{len(hijos)} workers iniciados (pids {[p.pid for p in hijos]}).")
+
+        def _terminar(signum, frame):
+            for p in hijos:
+                p.terminate()
+
+        signal.signal(signal.SIGTERM, _terminar)
+        try:
+            for p in hijos:
+                p.join()
+        except KeyboardInterrupt:
+            _terminar(None, None)
+            for p in hijos:
+                p.join()
+        fallidos = [p.pid for p in hijos if p.exitcode not in (0, None, -signal.SIGTERM)]
+        if fallidos:
+            raise CommandError(f"Workers terminados con error: {fallidos}")
+        self.stdout.write(self.style.SUCCESS("Workers terminados."))
@@ -0,0 +1,119 @@
+import json
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academia_core.mesas import TURNOS, guardar, programar
+from academia_core.models import Materia
+
+
+def _fecha(valor: str) -> date:
+    try:
+        return date.fromisoformat(valor)
+    except ValueError as exc:
+        raise CommandError(f"Fecha inválida: {valor} (usar AAAA-MM-DD).") from exc
+
+
+class Command(BaseCommand):
+    help = (
+        "Programa las mesas de final de un turno de exámenes: asigna a cada materia "
+        "una franja (fecha y turno) sin que un estudiante o docente tenga dos a la vez."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--desde", required=True, help="Primer día (AAAA-MM-DD).")
+        parser.add_argument("--hasta", required=True, help="Último día (AAAA-MM-DD).")
+        parser.add_argument("--turnos", nargs="+", default=list(TURNOS), help="Turnos por día.")
+        parser.add_argument(
+            "--plan", type=int, action="append", help="Limitar a planes (repetible)."
+        )
+        parser.add_argument("--capacidad", type=int, help="Máximo de mesas por franja.")
+        parser.add_argument("--sabados", action="store_true", help="Incluir sábados.")
+        parser.add_argument("--guardar", action="store_true", help="Crea las Mesa (si no, simula).")
+        parser.add_argument("--json", action="store_true", help="Salida JSON.")
+
+    def handle(self, *args, **opts):
+        desde, hasta = _fecha(opts["desde"]), _fecha(opts["hasta"])
+        if hasta < desde:
+            raise CommandError("--hasta es anterior a --desde.")
+        if opts.get("capacidad") is not None and opts["capacidad"] < 1:
+            raise CommandError("--capacidad debe ser >= 1.")
+
+        t0 = time.perf_counter()
+        prog = programar(
+            desde,
+            hasta,
+            turnos=opts["turnos"],
+            plan_ids=opts.get("plan"),
+            capacidad=opts.get("capacidad"),
+            sabados=opts["sabados"],
+        )
+        dt = time.perf_counter() - t0
+        if not prog.franjas:
+            raise CommandError("No hay franjas hábiles en el período.")
+
+        nombres = dict(
+            Materia.objects.filter(
+                pk__in=[*prog.asignacion, *prog.sin_lugar, *prog.fuera_de_franja]
+            ).values_list("pk", "nombre")
+        )
+        if opts["json"]:
+            mesas = [
+                {
+                    "materia_id": m,
+                    "materia": nombres.get(m, ""),
+                    "fecha": prog.franja(m)[0].isoformat(),
+                    "turno": prog.franja(m)[1],
+                    "estudiantes": prog.estudiantes.get(m, 0),
+                    "fija": m in prog.fijas,
+                }
+                for m in sorted(prog.asignacion, key=lambda m: (prog.asignacion[m], nombres.get(m)))
+            ]
+            sin_lugar = [{"materia_id": m, "materia": nombres.get(m, "")} for m in prog.sin_lugar]
+            fuera = [
+                {
+                    "materia_id": m,
+                    "materia": nombres.get(m, ""),
+                    "mesas": [{"fecha": f.isoformat(), "turno": t} for f, t in existentes],
+                }
+                for m, existentes in sorted(prog.fuera_de_franja.items())
+            ]
+            datos = {"mesas": mesas, "sin_lugar": sin_lugar, "fuera_de_franja": fuera}
+            self.stdout.write(json.dumps(datos, ensure_ascii=False, indent=2))
+        else:
+            por_franja: dict[int, list[int]] = {}
+            for m, i in prog.asignacion.items():
+                por_franja.setdefault(i, []).append(m)
+            for i in sorted(por_franja):
+                f, t = prog.franjas[i]
+                mesas = sorted(por_franja[i], key=lambda m: nombres.get(m, ""))
+                detalle = ", ".join(
+                    f"{nombres.get(m, m)} ({prog.estudiantes.get(m, 0)})" for m in mesas
+                )
+                self.stdout.write(f"{f:%d/%m/%Y} {t}: {detalle}")
+            self.stdout.write(
+                f"{len(prog.asignacion)} materias en {len(por_franja)} franjas "
+                f"({prog.conflictos} pares en conflicto, {dt:.2f}s)."
+            )
+
+        if prog.fuera_de_franja and not opts["json"]:
+            detalle = "; ".join(
+                f"{nombres.get(m, m)} ({', '.join(f'{f:%d/%m/%Y} {t}' for f, t in existentes)})"
+                for m, existentes in sorted(prog.fuera_de_franja.items())
+            )
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Mesas existentes fuera de las franjas (no se reprograman): {detalle}"
+                )
+            )
+        if prog.sin_lugar:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Sin franja: {', '.join(nombres.get(m, str(m)) for m in prog.sin_lugar)}"
+                    " (ampliar el período, los turnos o la capacidad)."
+                )
+            )
+        if opts["guardar"]:
+            creadas = guardar(prog)
+            self.stdout.write(self.style.SUCCESS(f"Mesas creadas: {creadas}."))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from academia_core import kpis
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye los KPIs materializados del panel (totales y desglose por "
+        "carrera/cohorte) e informa el desvío de los contadores incrementales."
+    )
+
+    def handle(self, *args, **opts):
+        desvio = kpis.reconstruir()
+        hubo_desvio = False
+        for metrica, (antes, ahora) in desvio.items():
+            if antes is None:
+                self.stdout.write(f"{metrica}: {ahora} (nuevo)")
+            elif antes != ahora:
+                hubo_desvio = True
+                self.stdout.write(
+                    self.style.WARNING(f"{metrica}: {antes} -> {ahora} (desvío {ahora - antes:+d})")
+                )
+            else:
+                self.stdout.write(f"{metrica}: {ahora}")
+        msg = "KPIs recalculados" + (" (se corrigió desvío)." if hubo_desvio else ".")
+        self.stdout.write(self.style.SUCCESS(msg))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from academia_core import kpis
+from academia_core.legajos import recalcular_legajos
+from academia_core.models import EstudianteProfesorado
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula en bloque legajo_estado y condicion_admin de las inscripciones "
+        "(p. ej. después de cambiar los requisitos de documentación)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--carrera", type=int, help="Limitar a una carrera (id).")
+        parser.add_argument("--cohorte", type=int, help="Limitar a una cohorte.")
+        parser.add_argument(
+            "--batch", type=int, default=5000, help="Filas por UPDATE (rango de pk)."
+        )
+
+    def handle(self, *args, **opts):
+        qs = EstudianteProfesorado.objects.all()
+        if opts.get("carrera"):
+            qs = qs.filter(carrera_id=opts["carrera"])
+        if opts.get("cohorte"):
+            qs = qs.filter(cohorte=opts["cohorte"])
+
+        actualizadas = recalcular_legajos(qs, batch_size=opts["batch"])
+        if actualizadas:
+            # queryset.update no dispara signals: el desglose del panel queda desactualizado
+            kpis.marcar_sucias(qs.values_list("carrera_id", flat=True).distinct())
+        self.stdout.write(self.style.SUCCESS(f"Inscripciones actualizadas: {actualizadas}"))
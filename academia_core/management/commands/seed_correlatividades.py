@@ -1,6 +1,8 @@
 from django.core.management.base import BaseCommand
 
-from academia_core.models import Correlatividad, EspacioCurricular, PlanEstudios
+from academia_core.carga_correlatividades import RefEspacio, RefPlan, ReglaFuente, importar
+from academia_core.models import EspacioCurricular, PlanEstudios
+from academia_core.plan_grafo import anio_numero
 
 
 class Command(BaseCommand):
@@ -8,56 +10,39 @@ class Command(BaseCommand):
 
     def handle(self, *args, **opts):
         # Elegí el plan vigente que quieras configurar
-        plan = (
-            PlanEstudios.objects.filter(vigente=True)
-            .select_related("profesorado")
-            .order_by("-id")
-            .first()
-        )
+        plan = PlanEstudios.objects.filter(vigente=True).order_by("-id").first()
         if not plan:
             self.stdout.write(self.style.ERROR("No hay PlanEstudios vigente."))
             return
 
-        # Limpio reglas previas para evitar duplicados
-        Correlatividad.objects.filter(plan=plan).delete()
-
-        esp = EspacioCurricular.objects.filter(plan=plan).order_by("anio", "cuatrimestre", "nombre")
-
-        # Helper por año
-        esp_por_anio = {}
-        for e in esp:
-            esp_por_anio.setdefault(e.anio, []).append(e)
-
-        # Regla tipo: para CURSAR 2º -> tener REGULARIZADA TODO 1º
-        for e in esp_por_anio.get("2°", []):
-            Correlatividad.objects.create(
-                plan=plan,
-                espacio=e,
-                tipo="CURSAR",
-                requisito="REGULARIZADA",
-                requiere_todos_hasta_anio=1,
-            )
-
-        # Para CURSAR 3º -> REGULARIZADA TODO 1º y 2º
-        for e in esp_por_anio.get("3°", []):
-            Correlatividad.objects.create(
-                plan=plan,
-                espacio=e,
-                tipo="CURSAR",
-                requisito="REGULARIZADA",
-                requiere_todos_hasta_anio=2,
-            )
-
-        # Para CURSAR 4º -> REGULARIZADA TODO 1º..3º
-        for e in esp_por_anio.get("4°", []):
-            Correlatividad.objects.create(
-                plan=plan,
-                espacio=e,
-                tipo="CURSAR",
-                requisito="REGULARIZADA",
-                requiere_todos_hasta_anio=3,
-            )
-
+        # Regla tipo: para CURSAR Nº -> tener REGULARIZADO TODO 1º..(N-1)º
+        reglas = []
+        for pk, anio in EspacioCurricular.objects.filter(plan=plan).values_list("id", "anio"):
+            n = anio_numero(anio)
+            if n and 2 <= n <= 4:
+                reglas.append(
+                    ReglaFuente(
+                        plan=RefPlan(plan_id=plan.pk),
+                        espacio=RefEspacio(espacio_id=pk),
+                        tipo="CURSAR",
+                        requisito="REGULARIZADA",
+                        hasta_anio=n - 1,
+                    )
+                )
+
+        # Reemplaza las reglas previas del plan (sin duplicados, en una transacción)
+        resultados = importar(reglas, reemplazar=True)
+        if not resultados:
+            self.stdout.write(self.style.WARNING("El plan no tiene espacios de 2º a 4º año."))
+            return
+        res = resultados[0]
+        if not res.aplicable:
+            detalle = " -> ".join(res.ciclo) if res.ciclo else "; ".join(res.errores)
+            self.stdout.write(self.style.ERROR(f"No se aplicó: {detalle}"))
+            return
         self.stdout.write(
-            self.style.SUCCESS("Correlatividades base cargadas. Ajustá y re-ejecutá si hace falta.")
+            self.style.SUCCESS(
+                f"Correlatividades base cargadas ({res.creadas} nuevas, {res.eliminadas} borradas)."
+                " Ajustá y re-ejecutá si hace falta."
+            )
         )
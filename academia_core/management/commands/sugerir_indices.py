@@ -0,0 +1,104 @@
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from academia_core.indices import indices_existentes, sugerir
+
+
+class Command(BaseCommand):
+    help = (
+        "Corre la suite (por defecto los benchmarks) capturando las consultas, "
+        "revisa sus planes y propone índices compuestos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "rutas", nargs="*", default=["benchmarks"], help="Qué correr con pytest."
+        )
+        parser.add_argument(
+            "--desde", nargs="+", help="Usar capturas ya guardadas (JSON) en vez de correr."
+        )
+        parser.add_argument("--guardar", help="Dónde dejar la captura (JSON).")
+        parser.add_argument("--min-veces", type=int, default=1)
+        parser.add_argument("--json", action="store_true", help="Salida en JSON.")
+
+    def handle(self, *args, **opts):
+        archivos = [Path(a) for a in opts.get("desde") or []]
+        if not archivos:
+            archivos = [self._capturar(opts["rutas"], opts.get("guardar"))]
+        capturas, vendors = {}, set()
+        for archivo in archivos:
+            if not archivo.exists():
+                raise CommandError(f"No existe {archivo}.")
+            datos = json.loads(archivo.read_text(encoding="utf-8"))
+            vendors.add(datos.get("vendor"))
+            for h, dato in datos["consultas"].items():
+                previo = capturas.setdefault(h, {**dato, "veces": 0, "ms": 0.0})
+                previo["veces"] += dato["veces"]
+                previo["ms"] += dato["ms"]
+
+        propuestas = [
+            p for p in sugerir(capturas, indices_existentes()) if p.veces >= opts["min_veces"]
+        ]
+        if opts["json"]:
+            salida = [
+                {
+                    "tabla": p.tabla,
+                    "columnas": list(p.columnas),
+                    "nombre": p.nombre(),
+                    "cubriente": p.cubriente,
+                    "motivo": p.motivo,
+                    "veces": p.veces,
+                    "ms": round(p.ms, 3),
+                    "consultas": p.huellas,
+                }
+                for p in propuestas
+            ]
+            self.stdout.write(json.dumps(salida, indent=2, ensure_ascii=False))
+            return
+
+        self.stdout.write(
+            f"{len(capturas)} consultas distintas ({', '.join(sorted(filter(None, vendors)))})."
+        )
+        if not propuestas:
+            self.stdout.write(self.style.SUCCESS("Sin índices para proponer."))
+            return
+        for p in propuestas:
+            tipo = " (cubriente)" if p.cubriente else ""
+            self.stdout.write(
+                f"\n{p.tabla}({', '.join(p.columnas)}){tipo}\n"
+                f"  {p.motivo}; {p.veces} ejecuciones, {p.ms:.1f} ms, "
+                f"{len(p.huellas)} consultas distintas\n"
+                f"  models.Index(fields={list(p.columnas)!r}, name={p.nombre()!r})"
+            )
+        self.stdout.write(
+            "\nLas columnas son de la base: en Meta.indexes van los nombres de campo "
+            "(sin el sufijo _id)."
+        )
+
+    def _capturar(self, rutas, guardar) -> Path:
+        destino = Path(guardar or tempfile.mkstemp(suffix=".json", prefix="consultas-")[1])
+        cmd = [
+            sys.executable,
+            "-m",
+            "pytest",
+            *rutas,
+            "-q",
+            "-n",
+            "0",
+            "--no-cov",
+            "-p",
+            "benchmarks.captura_consultas",
+            "--capturar-consultas",
+            str(destino),
+        ]
+        self.stdout.write(f"Corriendo: {' '.join(cmd[2:])}")
+        proc = subprocess.run(cmd, cwd=settings.BASE_DIR, capture_output=True, text=True)
+        if proc.returncode not in (0, 1):  # 1 = algún test falló; la captura sirve igual
+            raise CommandError(f"pytest terminó con {proc.returncode}:\n{proc.stdout[-2000:]}")
+        return destino
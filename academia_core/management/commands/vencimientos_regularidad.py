@@ -0,0 +1,53 @@
+import json
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academia_core.regularidades import marcar_vencidas, reconstruir, reporte_por_vencer
+
+
+class Command(BaseCommand):
+    help = (
+        "Proceso diario de regularidades: marca las vencidas y lista las que vencen "
+        "en los próximos días. Con --reconstruir rehace antes la proyección completa."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dias", type=int, default=30, help="Horizonte del reporte.")
+        parser.add_argument("--carrera", type=int, help="Limitar el reporte a una carrera.")
+        parser.add_argument("--hoy", help="Fecha de referencia (AAAA-MM-DD).")
+        parser.add_argument(
+            "--reconstruir", action="store_true", help="Rehace la tabla desde Movimiento."
+        )
+        parser.add_argument("--json", action="store_true", help="Salida JSON.")
+
+    def handle(self, *args, **opts):
+        hoy = None
+        if opts.get("hoy"):
+            try:
+                hoy = date.fromisoformat(opts["hoy"])
+            except ValueError as exc:
+                raise CommandError(f"Fecha inválida: {opts['hoy']} (usar AAAA-MM-DD).") from exc
+        if opts["dias"] < 0:
+            raise CommandError("--dias debe ser >= 0.")
+
+        filas = reconstruir() if opts["reconstruir"] else None
+        vencidas = marcar_vencidas(hoy)
+        items = reporte_por_vencer(opts["dias"], hoy, opts.get("carrera"))
+
+        if opts["json"]:
+            datos = {"vencidas": vencidas, "por_vencer": items}
+            if filas is not None:
+                datos["reconstruidas"] = filas
+            self.stdout.write(json.dumps(datos, ensure_ascii=False, indent=2))
+            return
+
+        if filas is not None:
+            self.stdout.write(f"Proyección reconstruida: {filas} regularidades.")
+        self.stdout.write(self.style.SUCCESS(f"Marcadas como vencidas: {vencidas}."))
+        for it in items:
+            self.stdout.write(
+                f"{date.fromisoformat(it['vence_el']):%d/%m/%Y}  {it['estudiante']} · "
+                f"{it['espacio']} ({it['intentos_final']} intentos)"
+            )
+        self.stdout.write(f"Vencen en los próximos {opts['dias']} días: {len(items)}.")
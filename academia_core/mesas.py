@@ -0,0 +1,299 @@
+# academia_core/mesas.py
+"""
+Programación de mesas de final sin superposiciones.
+
+Cada materia con candidatos a rendir es un vértice; dos materias chocan si
+comparten un estudiante (que podría rendir ambas) o un docente del tribunal
+(`DocenteEspacio` vigente en el período). Las franjas (fecha × turno,
+ordenadas) son los colores y se colorea con DSatur: siempre se ubica la
+materia con más franjas ya vedadas por sus vecinas (desempata el grado) en
+la primera franja libre. Con `capacidad` se limita cuántas mesas entran en
+una misma franja (aulas).
+
+Candidatos a rendir (mismo criterio que `Movimiento.clean`, en bloque):
+- regularidad vigente (`REGULAR` con menos de 2 años a la primera fecha), o
+- quedó libre en la cursada y el espacio tiene `libre_habilitado`;
+y en ambos casos sin el espacio aprobado.
+
+Las adyacencias se arman con bitsets (un int por materia) para que un turno
+completo, cientos de materias y miles de estudiantes, tarde segundos.
+Las mesas que ya existen en el período quedan fijas en su franja. Las que
+no caen en una franja generada (otro rótulo de turno, un sábado sin
+`sabados`) no se reprograman: su materia queda afuera y, como no sabemos a
+qué hora es, sus vecinas no toman ninguna franja de ese día.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from django.db import transaction
+
+from academia_core.utils_inscripciones import VIGENCIA_REGULARIDAD
+
+LIBRE_CODIGOS = {"LIBRE", "LIBRE-I", "LIBRE-AT"}
+TURNOS = ("Mañana", "Tarde")
+
+
+def franjas(
+    desde: date, hasta: date, turnos=TURNOS, sabados: bool = False
+) -> list[tuple[date, str]]:
+    """(fecha, turno) hábiles entre `desde` y `hasta`, en orden cronológico."""
+    out = []
+    dia = desde
+    while dia <= hasta:
+        if dia.weekday() < 5 or (sabados and dia.weekday() == 5):
+            out.extend((dia, t) for t in turnos)
+        dia += timedelta(days=1)
+    return out
+
+
+def colorear(
+    vecinos: dict[int, set[int]],
+    colores: int,
+    capacidad: int | None = None,
+    fijos: dict[int, int] | None = None,
+    vetados: dict[int, set[int]] | None = None,
+) -> tuple[dict[int, int], list[int]]:
+    """
+    DSatur: {vértice: color} y la lista de vértices que no entraron en
+    `colores` (o en la `capacidad` por color). `fijos` ya vienen coloreados;
+    `vetados` son colores que un vértice no puede tomar de entrada.
+    """
+    color: dict[int, int] = {}
+    vedados: dict[int, set[int]] = {v: set((vetados or {}).get(v, ())) for v in vecinos}
+    ocupacion: Counter = Counter()
+
+    def _pintar(v, c):
+        color[v] = c
+        ocupacion[c] += 1
+        for w in vecinos[v]:
+            vedados[w].add(c)
+
+    for v, c in (fijos or {}).items():
+        if v in vecinos:
+            _pintar(v, c)
+
+    heap = [(-len(vedados[v]), -len(vecinos[v]), v) for v in vecinos if v not in color]
+    heapq.heapify(heap)
+    sin_lugar: set[int] = set()
+    while heap:
+        sat, _, v = heapq.heappop(heap)
+        if v in color or v in sin_lugar or -sat != len(vedados[v]):
+            continue  # ya resuelto o entrada vieja (la saturación creció)
+        libre = next(
+            (
+                c
+                for c in range(colores)
+                if c not in vedados[v] and (capacidad is None or ocupacion[c] < capacidad)
+            ),
+            None,
+        )
+        if libre is None:
+            sin_lugar.add(v)
+            continue
+        _pintar(v, libre)
+        for w in vecinos[v]:
+            if w not in color:
+                heapq.heappush(heap, (-len(vedados[w]), -len(vecinos[w]), w))
+    return color, sorted(sin_lugar)
+
+
+def adyacencias(grupos) -> dict[int, set[int]]:
+    """
+    Grafo de conflictos a partir de `grupos` (iterable de conjuntos de vértices
+    que no pueden coincidir: las materias de un estudiante, las de un docente).
+    """
+    grupos = [g for g in grupos if g]
+    vertices = sorted(set().union(*grupos)) if grupos else []
+    indice = {v: i for i, v in enumerate(vertices)}
+    mascaras = [0] * len(vertices)
+    for g in grupos:
+        if len(g) < 2:
+            continue
+        m = 0
+        for v in g:
+            m |= 1 << indice[v]
+        for v in g:
+            mascaras[indice[v]] |= m
+    out: dict[int, set[int]] = {}
+    for i, v in enumerate(vertices):
+        m = mascaras[i] & ~(1 << i)
+        vs = set()
+        while m:
+            bajo = m & -m
+            vs.add(vertices[bajo.bit_length() - 1])
+            m ^= bajo
+        out[v] = vs
+    return out
+
+
+# ---------- datos ----------
+def rendibles(fecha: date, plan_ids=None):
+    """
+    ({(inscripcion_id, espacio_id): libre}, estados) de quienes podrían rendir
+    el final a `fecha`. `libre` indica que rinde en esa condición; `estados` es
+    el `estados_academicos` de esas inscripciones a `fecha`.
+    """
+    from academia_core.models import EspacioCurricular, Movimiento
+    from academia_core.utils_inscripciones import estados_academicos
+
+    espacios = EspacioCurricular.objects.all()
+    if plan_ids:
+        espacios = espacios.filter(plan_id__in=plan_ids)
+    libres_ok = set(espacios.filter(libre_habilitado=True).order_by().values_list("pk", flat=True))
+    regs = (
+        Movimiento.objects.filter(
+            tipo="REG",
+            espacio__in=espacios,
+            condicion_id__in={"REGULAR"} | LIBRE_CODIGOS,
+            fecha__lte=fecha,
+        )
+        .order_by()
+        .values_list("inscripcion_id", "espacio_id", "condicion_id", "fecha")
+    )
+    vigente, libre = set(), set()
+    for insc, esp, cond, f in regs.iterator(chunk_size=5000):
+        if cond == "REGULAR":
+            if f and f >= fecha - VIGENCIA_REGULARIDAD:
+                vigente.add((insc, esp))
+        elif esp in libres_ok:
+            libre.add((insc, esp))
+
+    pares = vigente | libre
+    estados = estados_academicos(sorted({i for i, _ in pares}), hasta_fecha=fecha)
+    out = {
+        (insc, esp): (insc, esp) not in vigente
+        for insc, esp in pares
+        if esp not in estados[insc][1]
+    }
+    return out, estados
+
+
+def candidatos_por_espacio(fecha: date, plan_ids=None) -> dict[int, set[int]]:
+    """{espacio_id: {inscripcion_id}} que podrían rendir el final a `fecha`."""
+    out: dict[int, set[int]] = {}
+    for insc, esp in rendibles(fecha, plan_ids)[0]:
+        out.setdefault(esp, set()).add(insc)
+    return out
+
+
+@dataclass
+class Programacion:
+    franjas: list[tuple[date, str]]
+    asignacion: dict[int, int] = field(default_factory=dict)  # materia_id -> franja
+    sin_lugar: list[int] = field(default_factory=list)  # materias que no entraron
+    fijas: dict[int, int] = field(default_factory=dict)  # ya tenían mesa en el período
+    # ya tenían mesa en el período, fuera de las franjas: no se programan
+    fuera_de_franja: dict[int, list[tuple[date, str]]] = field(default_factory=dict)
+    estudiantes: dict[int, int] = field(default_factory=dict)  # materia_id -> candidatos
+    conflictos: int = 0  # aristas del grafo
+
+    def franja(self, materia_id: int) -> tuple[date, str] | None:
+        i = self.asignacion.get(materia_id)
+        return None if i is None else self.franjas[i]
+
+    def nuevas(self) -> dict[int, tuple[date, str]]:
+        return {m: self.franjas[i] for m, i in self.asignacion.items() if m not in self.fijas}
+
+
+def programar(
+    desde: date,
+    hasta: date,
+    turnos=TURNOS,
+    plan_ids=None,
+    capacidad: int | None = None,
+    sabados: bool = False,
+) -> Programacion:
+    from academia_core.models import (
+        DocenteEspacio,
+        EspacioCurricular,
+        EstudianteProfesorado,
+        Mesa,
+    )
+
+    prog = Programacion(franjas(desde, hasta, turnos, sabados))
+    candidatos = candidatos_por_espacio(desde, plan_ids)
+    if not candidatos:
+        return prog
+
+    # Mesa es por materia: espacios de distintos planes con la misma materia rinden juntos
+    materia_de = dict(
+        EspacioCurricular.objects.filter(pk__in=candidatos)
+        .order_by()
+        .values_list("pk", "materia_id")
+    )
+    inscs = {i for s in candidatos.values() for i in s}
+    estudiante_de = dict(
+        EstudianteProfesorado.objects.filter(pk__in=inscs)
+        .order_by()
+        .values_list("pk", "estudiante_id")
+    )
+    por_estudiante: dict[int, set[int]] = {}
+    por_materia: dict[int, set[int]] = {}
+    for esp, insc_ids in candidatos.items():
+        m = materia_de.get(esp)
+        if m is None:
+            continue
+        for insc in insc_ids:
+            est = estudiante_de[insc]
+            por_estudiante.setdefault(est, set()).add(m)
+            por_materia.setdefault(m, set()).add(est)
+
+    tribunales = (
+        DocenteEspacio.objects.filter(espacio_id__in=candidatos)
+        .exclude(desde__gt=hasta)
+        .exclude(hasta__lt=desde)
+        .order_by()
+        .values_list("docente_id", "espacio_id")
+    )
+    por_docente: dict[int, set[int]] = {}
+    for doc, esp in tribunales:
+        if materia_de.get(esp) in por_materia:
+            por_docente.setdefault(doc, set()).add(materia_de[esp])
+
+    vecinos = adyacencias([*por_estudiante.values(), *por_docente.values()])
+    prog.conflictos = sum(len(v) for v in vecinos.values()) // 2
+    prog.estudiantes = {m: len(e) for m, e in por_materia.items()}
+
+    indice = {f: i for i, f in enumerate(prog.franjas)}
+    por_dia: dict[date, set[int]] = {}
+    for i, (f, _) in enumerate(prog.franjas):
+        por_dia.setdefault(f, set()).add(i)
+    existentes = Mesa.objects.filter(
+        materia_id__in=vecinos, fecha__gte=desde, fecha__lte=hasta
+    ).values_list("materia_id", "fecha", "turno")
+    ocupadas: dict[int, set[int]] = {}  # materia -> franjas que ya usa alguna de sus mesas
+    for m, f, t in existentes.order_by("fecha", "pk"):
+        if (f, t) in indice:
+            prog.fijas.setdefault(m, indice[(f, t)])
+            ocupadas.setdefault(m, set()).add(indice[(f, t)])
+        else:
+            prog.fuera_de_franja.setdefault(m, []).append((f, t))
+            ocupadas.setdefault(m, set()).update(por_dia.get(f, ()))
+
+    vetados: dict[int, set[int]] = {}
+    for m, usadas in ocupadas.items():
+        for w in vecinos[m]:
+            vetados.setdefault(w, set()).update(usadas)
+    for m in prog.fuera_de_franja:
+        if m not in prog.fijas:  # ya tiene su mesa: no se le busca otra
+            for w in vecinos.pop(m):
+                vecinos[w].discard(m)
+    prog.asignacion, prog.sin_lugar = colorear(
+        vecinos, len(prog.franjas), capacidad, prog.fijas, vetados
+    )
+    return prog
+
+
+def guardar(prog: Programacion) -> int:
+    """Crea las Mesa nuevas (las fijas ya existen). Devuelve cuántas se crearon."""
+    from academia_core.models import Mesa
+
+    nuevas = [Mesa(materia_id=m, fecha=f, turno=t) for m, (f, t) in sorted(prog.nuevas().items())]
+    with transaction.atomic():
+        Mesa.objects.bulk_create(nuevas, batch_size=500)
+    return len(nuevas)
@@ -0,0 +1,36 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("academia_core", "0003_alter_carrera_abreviatura"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="KpiSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("metrica", models.CharField(max_length=40)),
+                ("ambito", models.CharField(default="global", max_length=80)),
+                ("valor", models.BigIntegerField(default=0)),
+                ("datos", models.JSONField(blank=True, default=dict)),
+                ("sucio", models.BooleanField(default=False)),
+                ("actualizado", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "KPI (snapshot)",
+                "verbose_name_plural": "KPIs (snapshots)",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("metrica", "ambito"), name="uniq_kpi_metrica_ambito"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("academia_core", "0004_kpisnapshot"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SolicitudIdempotente",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("clave", models.CharField(max_length=64, unique=True)),
+                ("endpoint", models.CharField(max_length=60)),
+                ("status", models.PositiveSmallIntegerField(default=0)),
+                ("respuesta", models.JSONField(blank=True, default=dict)),
+                ("creado", models.DateTimeField(auto_now_add=True)),
+                (
+                    "usuario",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Solicitud idempotente",
+                "verbose_name_plural": "Solicitudes idempotentes",
+            },
+        ),
+    ]
@@ -0,0 +1,74 @@
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("academia_core", "0005_solicitudidempotente"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Job",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("tipo", models.CharField(max_length=60)),
+                ("parametros", models.JSONField(blank=True, default=dict)),
+                (
+                    "estado",
+                    models.CharField(
+                        choices=[
+                            ("PENDIENTE", "Pendiente"),
+                            ("EN_CURSO", "En curso"),
+                            ("OK", "Terminado"),
+                            ("ERROR", "Error"),
+                            ("CANCELADO", "Cancelado"),
+                        ],
+                        default="PENDIENTE",
+                        max_length=10,
+                    ),
+                ),
+                ("progreso", models.PositiveSmallIntegerField(default=0)),
+                ("mensaje", models.CharField(blank=True, max_length=255)),
+                ("resultado", models.JSONField(blank=True, null=True)),
+                ("error", models.TextField(blank=True)),
+                ("intentos", models.PositiveSmallIntegerField(default=0)),
+                ("max_intentos", models.PositiveSmallIntegerField(default=3)),
+                ("cancelar", models.BooleanField(default=False)),
+                ("disponible_desde", models.DateTimeField(default=django.utils.timezone.now)),
+                ("worker", models.CharField(blank=True, max_length=100)),
+                ("latido", models.DateTimeField(blank=True, null=True)),
+                ("iniciado", models.DateTimeField(blank=True, null=True)),
+                ("terminado", models.DateTimeField(blank=True, null=True)),
+                ("creado", models.DateTimeField(auto_now_add=True)),
+                (
+                    "creado_por",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="jobs",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Trabajo en segundo plano",
+                "verbose_name_plural": "Trabajos en segundo plano",
+                "ordering": ["-creado"],
+                "indexes": [
+                    models.Index(
+                        fields=["estado", "disponible_desde"], name="idx_job_estado_disp"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,126 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def deduplicar_inscripciones_mesa(apps, schema_editor):
+    """
+    Deja una InscripcionMesa por (estudiante, mesa) antes de la restricción:
+    la más vieja, completada con lo que traigan las repetidas (condición,
+    llamada y un estado distinto de "pendiente").
+    """
+    InscripcionMesa = apps.get_model("academia_core", "InscripcionMesa")
+    repetidas = (
+        InscripcionMesa.objects.values("estudiante_id", "mesa_id")
+        .annotate(n=Count("pk"))
+        .filter(n__gt=1)
+        .order_by()
+    )
+    for grupo in repetidas.iterator():
+        filas = list(
+            InscripcionMesa.objects.filter(
+                estudiante_id=grupo["estudiante_id"], mesa_id=grupo["mesa_id"]
+            ).order_by("pk")
+        )
+        queda, sobran = filas[0], filas[1:]
+        for otra in sobran:
+            queda.condicion = queda.condicion or otra.condicion
+            queda.llamada = queda.llamada or otra.llamada
+            if queda.estado == "pendiente":
+                queda.estado = otra.estado
+        queda.save(update_fields=["condicion", "llamada", "estado"])
+        InscripcionMesa.objects.filter(pk__in=[o.pk for o in sobran]).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("academia_core", "0006_job"),
+    ]
+
+    operations = [
+        migrations.RunPython(deduplicar_inscripciones_mesa, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="inscripcionmesa",
+            constraint=models.UniqueConstraint(
+                fields=("estudiante", "mesa"), name="uniq_insc_mesa_est_mesa"
+            ),
+        ),
+        migrations.CreateModel(
+            name="VentanaFinal",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("nombre", models.CharField(max_length=100)),
+                ("abre", models.DateField()),
+                ("cierra", models.DateField()),
+                ("mesas_desde", models.DateField()),
+                ("mesas_hasta", models.DateField()),
+                ("calculada", models.DateTimeField(blank=True, null=True)),
+                ("creado", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Ventana de inscripción a finales",
+                "verbose_name_plural": "Ventanas de inscripción a finales",
+                "ordering": ["-abre", "-pk"],
+            },
+        ),
+        migrations.CreateModel(
+            name="HabilitacionFinal",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("libre", models.BooleanField(default=False)),
+                ("intentos", models.PositiveSmallIntegerField(default=0)),
+                (
+                    "espacio",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="academia_core.espaciocurricular",
+                    ),
+                ),
+                (
+                    "inscripcion",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="academia_core.estudianteprofesorado",
+                    ),
+                ),
+                (
+                    "materia",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="academia_core.materia",
+                    ),
+                ),
+                (
+                    "ventana",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="habilitaciones",
+                        to="academia_core.ventanafinal",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Habilitación para final",
+                "verbose_name_plural": "Habilitaciones para final",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("ventana", "inscripcion", "materia"),
+                        name="uniq_habfinal_insc_materia",
+                    )
+                ],
+            },
+        ),
+    ]
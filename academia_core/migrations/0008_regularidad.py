@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+# Copia congelada de academia_core.regularidades (proyectar) al crear la tabla:
+# la migración no debe cambiar si ese módulo cambia.
+NOTA_APROBADO = 6
+VIGENCIA = timedelta(days=730)
+CAMPOS = ("fecha_regular", "vence_el", "intentos_final", "aprobada", "vencida")
+COLUMNAS = (
+    "inscripcion_id",
+    "espacio_id",
+    "tipo",
+    "condicion_id",
+    "fecha",
+    "nota_num",
+    "ausente",
+    "ausencia_justificada",
+)
+
+
+def _proyectar(filas, hoy):
+    out = {}
+    for insc, esp, tipo, cond, fecha, nota, ausente, justificada in filas:
+        if tipo == "REG":
+            if cond != "REGULAR" or fecha is None:
+                continue
+            r = out.setdefault((insc, esp), dict.fromkeys(CAMPOS))
+            if r["fecha_regular"] is None or fecha > r["fecha_regular"]:
+                r["fecha_regular"] = fecha
+        elif tipo == "FIN":
+            if ausente and justificada:
+                continue
+            r = out.setdefault((insc, esp), dict.fromkeys(CAMPOS))
+            r["intentos_final"] = (r["intentos_final"] or 0) + 1
+            if not ausente and (nota or 0) >= NOTA_APROBADO:
+                r["aprobada"] = True
+    for r in out.values():
+        r["intentos_final"] = r["intentos_final"] or 0
+        r["aprobada"] = bool(r["aprobada"])
+        if r["fecha_regular"] is not None:
+            r["vence_el"] = r["fecha_regular"] + VIGENCIA
+        r["vencida"] = r["vence_el"] is not None and r["vence_el"] < hoy
+    return out
+
+
+def poblar(apps, schema_editor):
+    Movimiento = apps.get_model("academia_core", "Movimiento")
+    Regularidad = apps.get_model("academia_core", "Regularidad")
+    filas = Movimiento.objects.order_by().values_list(*COLUMNAS)
+    proyeccion = _proyectar(filas.iterator(chunk_size=5000), timezone.localdate())
+    Regularidad.objects.bulk_create(
+        [
+            Regularidad(inscripcion_id=insc, espacio_id=esp, **datos)
+            for (insc, esp), datos in proyeccion.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("academia_core", "0007_ventanafinal"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Regularidad",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("fecha_regular", models.DateField(blank=True, null=True)),
+                ("vence_el", models.DateField(blank=True, null=True)),
+                ("intentos_final", models.PositiveSmallIntegerField(default=0)),
+                ("aprobada", models.BooleanField(default=False)),
+                ("vencida", models.BooleanField(default=False)),
+                (
+                    "espacio",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="academia_core.espaciocurricular",
+                    ),
+                ),
+                (
+                    "inscripcion",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="regularidades",
+                        to="academia_core.estudianteprofesorado",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Regularidad",
+                "verbose_name_plural": "Regularidades",
+                "indexes": [
+                    models.Index(fields=["aprobada", "vence_el"], name="idx_regularidad_vence")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("inscripcion", "espacio"), name="uniq_regularidad_insc_esp"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(poblar, migrations.RunPython.noop),
+    ]
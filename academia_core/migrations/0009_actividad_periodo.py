@@ -0,0 +1,60 @@
+import django.utils.timezone
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def completar_periodo(apps, schema_editor):
+    Actividad = apps.get_model("academia_core", "Actividad")
+    cambiar = []
+    for a in Actividad.objects.filter(periodo=0).only("pk", "creado").iterator(chunk_size=2000):
+        momento = timezone.localtime(a.creado) if timezone.is_aware(a.creado) else a.creado
+        a.periodo = momento.year * 100 + momento.month
+        cambiar.append(a)
+    Actividad.objects.bulk_update(cambiar, ["periodo"], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("academia_core", "0008_regularidad"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="actividad",
+            name="accion",
+            field=models.CharField(
+                choices=[
+                    ("MOV_ALTA", "Carga de movimiento"),
+                    ("INSC_PROF", "Inscripción a profesorado"),
+                    ("INSC_ESP", "Inscripción a materia"),
+                    ("INSC_MESA", "Inscripción a mesa de final"),
+                    ("LOGIN", "Ingreso"),
+                    ("LOGOUT", "Salida"),
+                ],
+                max_length=20,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="actividad",
+            name="creado",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name="actividad",
+            name="periodo",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(completar_periodo, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="actividad",
+            index=models.Index(fields=["periodo"], name="idx_actividad_periodo"),
+        ),
+        migrations.AddIndex(
+            model_name="actividad",
+            index=models.Index(fields=["user", "creado"], name="idx_actividad_user_creado"),
+        ),
+        migrations.AddIndex(
+            model_name="actividad",
+            index=models.Index(fields=["accion", "creado"], name="idx_actividad_accion_creado"),
+        ),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("academia_core", "0009_actividad_periodo"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="estudiante",
+            name="foto_hash",
+            field=models.CharField(blank=True, db_index=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="estudiante",
+            name="foto_miniatura",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+    ]
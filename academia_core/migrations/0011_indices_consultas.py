@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("academia_core", "0010_estudiante_foto_hash"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="correlatividad",
+            index=models.Index(fields=["espacio", "plan", "tipo"], name="idx_correl_esp_plan_tipo"),
+        ),
+        migrations.AddIndex(
+            model_name="movimiento",
+            index=models.Index(
+                fields=["inscripcion", "condicion", "tipo", "espacio"],
+                name="idx_mov_insc_cond_tipo_esp",
+            ),
+        ),
+    ]
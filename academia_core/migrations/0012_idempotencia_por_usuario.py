@@ -0,0 +1,29 @@
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("academia_core", "0011_indices_consultas"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="solicitudidempotente",
+            name="clave",
+            field=models.CharField(max_length=64),
+        ),
+        migrations.AddConstraint(
+            model_name="solicitudidempotente",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.comparison.Coalesce("usuario", models.Value(0)),
+                models.F("endpoint"),
+                models.F("clave"),
+                name="uniq_idem_usuario_endpoint_clave",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="solicitudidempotente",
+            index=models.Index(fields=["creado"], name="idx_idem_creado"),
+        ),
+    ]
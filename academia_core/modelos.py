@@ -0,0 +1,84 @@
+# academia_core/modelos.py
+"""
+Registro perezoso de modelos.
+
+Los módulos que necesitan un modelo "por nombre" (o adivinarlo recorriendo
+`apps.get_models()`) lo piden acá en lugar de resolverlo al importarse:
+
+- nada se resuelve hasta la primera llamada, así importar el módulo no exige
+  el registro de apps listo ni recorre modelos (arranque de workers y
+  comandos);
+- cada búsqueda se memoiza por proceso: la heurística de `buscar()` corre una
+  sola vez y no en cada request.
+
+    from academia_core.modelos import modelos
+
+    Docente = modelos.get("academia_core", "Docente")
+    ResultadoFinal = modelos.primero("academia_core", "ResultadoFinal", "ActaFinal")
+    Plan = modelos.buscar("plan", _buscar_plan)  # _buscar_plan recorre get_models()
+
+`limpiar()` vacía las memorias (tests que registran modelos al vuelo).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+
+from django.apps import apps
+from django.db.models import Model
+
+_FALTA = object()
+
+
+class RegistroModelos:
+    def __init__(self):
+        self._memo: dict[tuple, type[Model] | None] = {}
+        self._lock = threading.Lock()
+
+    def _memoizar(self, clave: tuple, resolver: Callable[[], type[Model] | None]):
+        modelo = self._memo.get(clave, _FALTA)
+        if modelo is _FALTA:
+            modelo = resolver()
+            with self._lock:
+                self._memo[clave] = modelo
+        return modelo
+
+    def get(self, app_label: str, nombre: str | None = None) -> type[Model] | None:
+        """Como `apps.get_model` ("app.Modelo" o app, Modelo), pero None si no existe."""
+        if nombre is None:
+            app_label, nombre = app_label.split(".", 1)
+
+        def _resolver():
+            try:
+                return apps.get_model(app_label, nombre)
+            except LookupError:
+                return None
+
+        return self._memoizar(("get", app_label, nombre.lower()), _resolver)
+
+    def primero(self, app_label: str, *candidatos: str) -> type[Model] | None:
+        """El primer modelo existente entre `candidatos` (nombres alternativos)."""
+
+        def _resolver():
+            for nombre in candidatos:
+                modelo = self.get(app_label, nombre)
+                if modelo is not None:
+                    return modelo
+            return None
+
+        return self._memoizar(("primero", app_label, candidatos), _resolver)
+
+    def buscar(self, clave: str, resolver: Callable[[], type[Model] | None]):
+        """
+        Resultado memoizado de una heurística que recorre `apps.get_models()`.
+        La clave identifica a la heurística: la misma clave, el mismo resolver.
+        """
+        return self._memoizar(("buscar", clave), resolver)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._memo.clear()
+
+
+modelos = RegistroModelos()
@@ -8,10 +8,19 @@ from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.db.models import F, Q
+from django.db.models.functions import Coalesce
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from django.urls import reverse
+from django.utils import timezone
 from django.utils.text import slugify
 
+from .legajos import (
+    REQUISITOS_BASE,
+    REQUISITOS_CERTIFICACION,
+    REQUISITOS_PROFESORADO,
+    es_certificacion_docente,
+)
 from .utils_inscripciones import (
     cumple_correlativas,
     tiene_aprobada,
@@ -33,8 +42,13 @@ class CondicionAdmin(models.TextChoices):
 # ---------- Helpers para archivos ----------
 def estudiante_foto_path(instance, filename):
     """
-    Guarda la foto en /media/estudiantes/<dni>/foto.<ext>
+    Guarda la foto en /media/estudiantes/fotos/<ab>/<sha256>.<ext> (ver
+    academia_core.fotos); sin hash calculado, en /media/estudiantes/<dni>/foto.<ext>
     """
+    if getattr(instance, "foto_hash", ""):
+        from .fotos import ruta_foto
+
+        return ruta_foto(instance.foto_hash, filename)
     base, ext = os.path.splitext(filename or "")
     safe_dni = (instance.dni or "sin_dni").strip()
     return f"estudiantes/{safe_dni}/foto{ext.lower()}"
@@ -106,6 +120,8 @@ class Estudiante(models.Model):
 
     # Foto del alumno
     foto = models.ImageField(upload_to=estudiante_foto_path, null=True, blank=True)
+    foto_hash = models.CharField(max_length=64, blank=True, default="", db_index=True)
+    foto_miniatura = models.CharField(max_length=255, blank=True, default="")
 
     # ### INICIO DE LA ACTUALIZACIÓN SOLICITADA ###
     contacto_emergencia_tel = models.CharField(
@@ -129,6 +145,13 @@ class Estudiante(models.Model):
         except Exception:
             return ""
 
+    @property
+    def foto_thumb_url(self):
+        """Miniatura (caché inmutable); mientras no se generó, la foto original."""
+        if self.foto_miniatura:
+            return reverse("academia_core:foto_miniatura", args=[self.foto_miniatura])
+        return self.foto_url
+
     # --- Accesos convenientes ---
     @property
     def cursadas_qs(self):
@@ -280,8 +303,7 @@ class EstudianteProfesorado(models.Model):
             return False
         if hasattr(carrera, "es_certificacion"):
             return bool(carrera.es_certificacion)
-        nombre = (getattr(carrera, "nombre", "") or "").lower()
-        return ("certificación docente" in nombre) or ("certificacion docente" in nombre)
+        return es_certificacion_docente(getattr(carrera, "nombre", ""))
 
     def curso_intro_aprobado(self) -> bool:
         val = getattr(self, "curso_introductorio", None)
@@ -290,19 +312,11 @@ class EstudianteProfesorado(models.Model):
 
     def requisitos_obligatorios(self):
         """Lista [(campo, requerido_bool)] según sea CD o no."""
-        base = [
-            ("doc_dni_legalizado", True),
-            ("doc_cert_medico", True),
-            ("doc_fotos_carnet", True),
-            ("doc_folios_oficio", True),
-        ]
+        base = [(campo, True) for campo in REQUISITOS_BASE]
         if self.carrera_es_certificacion_docente():
-            base += [
-                ("doc_titulo_terciario_legalizado", True),
-                ("doc_incumbencias", True),
-            ]
+            base += [(campo, True) for campo in REQUISITOS_CERTIFICACION]
         else:
-            base += [("doc_titulo_sec_legalizado", True)]
+            base += [(campo, True) for campo in REQUISITOS_PROFESORADO]
         return base
 
     # --------- Cálculos cacheados ---------
@@ -505,7 +519,10 @@ class Correlatividad(models.Model):
             "espacio__cuatrimestre",
             "espacio__materia__nombre",
         ]
-        # constraints y indexes pueden ir aquí si son necesarios
+        indexes = [
+            # correlativas de un espacio en su plan (elegibilidad, validaciones)
+            models.Index(fields=["espacio", "plan", "tipo"], name="idx_correl_esp_plan_tipo"),
+        ]
 
     def __str__(self):
         target = ""
@@ -599,6 +616,13 @@ class Movimiento(models.Model):
 
     class Meta:
         ordering = ["-fecha", "-creado"]
+        indexes = [
+            # historia de una inscripción en un espacio (correlativas, regularidad, finales)
+            models.Index(
+                fields=["inscripcion", "condicion", "tipo", "espacio"],
+                name="idx_mov_insc_cond_tipo_esp",
+            ),
+        ]
         constraints = [
             models.CheckConstraint(
                 name="nota_num_rango_valido",
@@ -617,6 +641,18 @@ class Movimiento(models.Model):
         qs = qs.exclude(ausente=True, ausencia_justificada=True)
         return qs.order_by("fecha", "id")
 
+    def _finales_previos(self) -> tuple[int, bool]:
+        """
+        (intentos, aprobado) de los finales ya cargados. En un alta sale de la
+        proyección `Regularidad`; al editar se excluye el propio movimiento.
+        """
+        if self.pk is None:
+            from academia_core.regularidades import finales_previos
+
+            return finales_previos(self.inscripcion_id, self.espacio_id)
+        prev = list(self._intentos_final_previos())
+        return len(prev), any((m.nota_num or 0) >= 6 and not m.ausente for m in prev)
+
     def clean(self):
         cond_codigo = self.condicion.codigo if self.condicion else None
         cond_tipo = self.condicion.tipo if self.condicion else None
@@ -673,7 +709,9 @@ class Movimiento(models.Model):
                     raise ValidationError(
                         "El espacio ya está aprobado; no corresponde rendir Libre."
                     )
-                if tiene_regularidad_vigente(self.inscripcion, self.espacio):
+                if tiene_regularidad_vigente(
+                    self.inscripcion, self.espacio, self.fecha or timezone.localdate()
+                ):
                     raise ValidationError(
                         "El estudiante está regular: no corresponde rendir Libre."
                     )
@@ -690,10 +728,10 @@ class Movimiento(models.Model):
                         f"No cumple correlatividades para RENDIR: faltan {', '.join(msgs)}."
                     )
 
-            prev = list(self._intentos_final_previos())
-            if any((m.nota_num or 0) >= 6 and not m.ausente for m in prev):
+            intentos, aprobado = self._finales_previos()
+            if aprobado:
                 raise ValidationError("El espacio ya fue aprobado por final anteriormente.")
-            if len(prev) >= 3:
+            if intentos >= 3:
                 raise ValidationError(
                     "Alcanzó las tres posibilidades de final: debe recursar el espacio."
                 )
@@ -717,6 +755,46 @@ class Movimiento(models.Model):
         return f"{self.inscripcion} · {self.espacio} · {self.condicion}"
 
 
+# ===================== Regularidades (proyección de Movimiento) =====================
+
+
+class Regularidad(models.Model):
+    """
+    Estado de una (inscripción, espacio) para rendir final, mantenido desde
+    los signals de Movimiento (ver academia_core/regularidades.py).
+
+    `fecha_regular` es la REG `REGULAR` más reciente y `vence_el` la fecha
+    hasta la que sigue vigente (2 años). `intentos_final` cuenta los finales
+    sin ausencia justificada y `aprobada` si alguno tuvo nota >= 6. `vencida`
+    la marca el proceso diario (`manage.py vencimientos_regularidad`).
+    """
+
+    inscripcion = models.ForeignKey(
+        EstudianteProfesorado, on_delete=models.CASCADE, related_name="regularidades"
+    )
+    espacio = models.ForeignKey(EspacioCurricular, on_delete=models.CASCADE, related_name="+")
+    fecha_regular = models.DateField(null=True, blank=True)
+    vence_el = models.DateField(null=True, blank=True)
+    intentos_final = models.PositiveSmallIntegerField(default=0)
+    aprobada = models.BooleanField(default=False)
+    vencida = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["inscripcion", "espacio"], name="uniq_regularidad_insc_esp"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["aprobada", "vence_el"], name="idx_regularidad_vence"),
+        ]
+        verbose_name = "Regularidad"
+        verbose_name_plural = "Regularidades"
+
+    def __str__(self):
+        return f"{self.inscripcion_id} · {self.espacio_id} vence {self.vence_el or '-'}"
+
+
 # ===================== Inscripción a espacios (cursada por año) =====================
 class EstadoInscripcion(models.TextChoices):
     EN_CURSO = "EN_CURSO", "En curso"
@@ -842,16 +920,6 @@ def _recalc_promedio_on_mov(sender, instance, **kwargs):
         pass
 
 
-@receiver(post_save, sender=EstudianteProfesorado)
-def _update_legajo_estado(sender, instance, **kwargs):
-    try:
-        estado = instance.calcular_legajo_estado()
-        if estado != instance.legajo_estado:
-            EstudianteProfesorado.objects.filter(pk=instance.pk).update(legajo_estado=estado)
-    except Exception:
-        pass
-
-
 # ===================== ROLES / USUARIOS =====================
 
 User = get_user_model()
@@ -940,6 +1008,7 @@ class Actividad(models.Model):
         ("MOV_ALTA", "Carga de movimiento"),
         ("INSC_PROF", "Inscripción a profesorado"),
         ("INSC_ESP", "Inscripción a materia"),
+        ("INSC_MESA", "Inscripción a mesa de final"),
         ("LOGIN", "Ingreso"),
         ("LOGOUT", "Salida"),
     ]
@@ -953,10 +1022,23 @@ class Actividad(models.Model):
     rol_cache = models.CharField(max_length=20, blank=True)
     accion = models.CharField(max_length=20, choices=ACCIONES)
     detalle = models.TextField(blank=True)
-    creado = models.DateTimeField(auto_now_add=True)
+    # hora del evento, no del volcado (ver academia_core/auditoria.py)
+    creado = models.DateTimeField(default=timezone.now)
+    periodo = models.PositiveIntegerField(default=0)  # AAAAMM: partición lógica por mes
 
     class Meta:
         ordering = ["-creado"]
+        indexes = [
+            models.Index(fields=["periodo"], name="idx_actividad_periodo"),
+            models.Index(fields=["user", "creado"], name="idx_actividad_user_creado"),
+            models.Index(fields=["accion", "creado"], name="idx_actividad_accion_creado"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self.periodo:
+            momento = timezone.localtime(self.creado or timezone.now())
+            self.periodo = momento.year * 100 + momento.month
+        super().save(*args, **kwargs)
 
     def __str__(self):
         u = self.user.username if self.user else "—"
@@ -1112,6 +1194,11 @@ class InscripcionMesa(models.Model):
     fecha_inscripcion = models.DateField(auto_now_add=True)
     estado = models.CharField(max_length=12, choices=ESTADOS, default="pendiente")
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["estudiante", "mesa"], name="uniq_insc_mesa_est_mesa")
+        ]
+
     def __str__(self):
         return f"{self.estudiante} → {self.mesa}"
 
@@ -1127,3 +1214,189 @@ class Aula(models.Model):
     class Meta:
         verbose_name = "Aula"
         verbose_name_plural = "Aulas"
+
+
+# ===================== KPIs materializados (panel) =====================
+
+
+class KpiSnapshot(models.Model):
+    """
+    Valor precalculado de un indicador del panel (ver academia_core/kpis.py).
+
+    `ambito` identifica el corte: "global", "carrera:<id>" o
+    "carrera:<id>/cohorte:<año>". `datos` guarda el desglose (regulares,
+    condicionales, distribución de promedios, ...). `sucio` marca que el
+    ámbito debe recalcularse antes de mostrarse.
+    """
+
+    metrica = models.CharField(max_length=40)
+    ambito = models.CharField(max_length=80, default="global")
+    valor = models.BigIntegerField(default=0)
+    datos = models.JSONField(default=dict, blank=True)
+    sucio = models.BooleanField(default=False)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["metrica", "ambito"], name="uniq_kpi_metrica_ambito")
+        ]
+        verbose_name = "KPI (snapshot)"
+        verbose_name_plural = "KPIs (snapshots)"
+
+    def __str__(self):
+        return f"{self.metrica}@{self.ambito} = {self.valor}"
+
+
+# ===================== Idempotencia de solicitudes (APIs de escritura) =====================
+
+
+class SolicitudIdempotente(models.Model):
+    """
+    Respuesta guardada por clave de idempotencia (header `Idempotency-Key`).
+
+    Un reintento del cliente con la misma clave recibe la misma respuesta
+    sin volver a ejecutar la operación. `status=0` = en proceso. La clave es
+    única por usuario y endpoint (las anónimas comparten el usuario 0).
+    """
+
+    clave = models.CharField(max_length=64)
+    endpoint = models.CharField(max_length=60)
+    usuario = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL)
+    status = models.PositiveSmallIntegerField(default=0)
+    respuesta = models.JSONField(default=dict, blank=True)
+    creado = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Solicitud idempotente"
+        verbose_name_plural = "Solicitudes idempotentes"
+        constraints = [
+            models.UniqueConstraint(
+                Coalesce("usuario", models.Value(0)),
+                "endpoint",
+                "clave",
+                name="uniq_idem_usuario_endpoint_clave",
+            )
+        ]
+        indexes = [models.Index(fields=["creado"], name="idx_idem_creado")]
+
+    def __str__(self):
+        return f"{self.endpoint} [{self.clave}] -> {self.status}"
+
+
+# ===================== Cola de trabajos en segundo plano =====================
+
+
+class EstadoJob(models.TextChoices):
+    PENDIENTE = "PENDIENTE", "Pendiente"
+    EN_CURSO = "EN_CURSO", "En curso"
+    OK = "OK", "Terminado"
+    ERROR = "ERROR", "Error"
+    CANCELADO = "CANCELADO", "Cancelado"
+
+
+class Job(models.Model):
+    """
+    Trabajo encolado para `manage.py procesar_jobs` (ver academia_core/jobs.py).
+
+    `tipo` es el nombre de una tarea registrada en academia_core/tareas.py y
+    `parametros` sus argumentos. `cancelar` pide la cancelación a un trabajo
+    en curso; la tarea la detecta al informar progreso.
+    """
+
+    tipo = models.CharField(max_length=60)
+    parametros = models.JSONField(default=dict, blank=True)
+    estado = models.CharField(max_length=10, choices=EstadoJob.choices, default=EstadoJob.PENDIENTE)
+    progreso = models.PositiveSmallIntegerField(default=0)  # 0..100
+    mensaje = models.CharField(max_length=255, blank=True)
+    resultado = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    intentos = models.PositiveSmallIntegerField(default=0)
+    max_intentos = models.PositiveSmallIntegerField(default=3)
+    cancelar = models.BooleanField(default=False)
+    disponible_desde = models.DateTimeField(default=timezone.now)
+    worker = models.CharField(max_length=100, blank=True)
+    latido = models.DateTimeField(null=True, blank=True)
+    iniciado = models.DateTimeField(null=True, blank=True)
+    terminado = models.DateTimeField(null=True, blank=True)
+    creado = models.DateTimeField(auto_now_add=True)
+    creado_por = models.ForeignKey(
+        User, null=True, blank=True, on_delete=models.SET_NULL, related_name="jobs"
+    )
+
+    class Meta:
+        ordering = ["-creado"]
+        indexes = [
+            models.Index(fields=["estado", "disponible_desde"], name="idx_job_estado_disp"),
+        ]
+        verbose_name = "Trabajo en segundo plano"
+        verbose_name_plural = "Trabajos en segundo plano"
+
+    def __str__(self):
+        return f"#{self.pk} {self.tipo} [{self.estado}]"
+
+
+# ===================== Ventanas de inscripción a finales =====================
+
+
+class VentanaFinal(models.Model):
+    """
+    Período de inscripción a las mesas de un turno de exámenes (ver
+    academia_core/finales.py).
+
+    Al abrirla se precalcula en `HabilitacionFinal` qué puede rendir cada
+    inscripción; `calculada` registra cuándo. Las mesas del turno son las
+    que caen entre `mesas_desde` y `mesas_hasta`.
+    """
+
+    nombre = models.CharField(max_length=100)
+    abre = models.DateField()
+    cierra = models.DateField()
+    mesas_desde = models.DateField()
+    mesas_hasta = models.DateField()
+    calculada = models.DateTimeField(null=True, blank=True)
+    creado = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-abre", "-pk"]
+        verbose_name = "Ventana de inscripción a finales"
+        verbose_name_plural = "Ventanas de inscripción a finales"
+
+    def __str__(self):
+        return f"{self.nombre} ({self.abre:%d/%m/%Y} - {self.cierra:%d/%m/%Y})"
+
+    def abierta(self, hoy=None) -> bool:
+        hoy = hoy or timezone.localdate()
+        return self.calculada is not None and self.abre <= hoy <= self.cierra
+
+
+class HabilitacionFinal(models.Model):
+    """
+    Espacio que una inscripción puede rendir en la ventana: regularidad
+    vigente (o libre habilitado), menos de tres intentos, sin aprobar y con
+    las correlativas para RENDIR. Se valida la inscripción a mesa contra esta
+    tabla; `materia` está copiada del espacio porque la Mesa es por materia.
+    """
+
+    ventana = models.ForeignKey(
+        VentanaFinal, on_delete=models.CASCADE, related_name="habilitaciones"
+    )
+    inscripcion = models.ForeignKey(
+        EstudianteProfesorado, on_delete=models.CASCADE, related_name="+"
+    )
+    espacio = models.ForeignKey(EspacioCurricular, on_delete=models.CASCADE, related_name="+")
+    materia = models.ForeignKey(Materia, on_delete=models.CASCADE, related_name="+")
+    libre = models.BooleanField(default=False)
+    intentos = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ventana", "inscripcion", "materia"], name="uniq_habfinal_insc_materia"
+            )
+        ]
+        verbose_name = "Habilitación para final"
+        verbose_name_plural = "Habilitaciones para final"
+
+    def __str__(self):
+        condicion = "libre" if self.libre else "regular"
+        return f"{self.inscripcion_id} · {self.espacio_id} ({condicion})"
@@ -0,0 +1,154 @@
+# academia_core/opciones.py
+"""
+Opciones (id, etiqueta) para los selects de los formularios.
+
+Los ModelChoiceField iteran su queryset al renderizar y llaman `__str__` en
+cada fila, que a su vez dispara consultas a estudiante/carrera/materia. Acá
+las opciones salen proyectadas de `referencia_cache` (cacheadas por versión)
+y se asignan con `field.choices`; el queryset del campo queda sólo para
+validar el valor elegido (un `get` por pk).
+
+Los selects que pueden ser enormes (inscripciones) no se llenan: se usa
+`SelectAutocompletar`, que sólo lleva la opción elegida y le indica al JS el
+endpoint de búsqueda.
+"""
+
+from __future__ import annotations
+
+from django import forms
+from django.urls import NoReverseMatch, reverse
+
+from academia_core import referencia_cache
+
+VACIO = "---------"
+LIMITE_AUTOCOMPLETAR = 20
+
+
+def con_vacio(opciones: list[tuple], etiqueta: str = VACIO) -> list[tuple]:
+    return [("", etiqueta), *opciones]
+
+
+def carreras() -> list[tuple[int, str]]:
+    return [(c["id"], c["nombre"]) for c in referencia_cache.get_carreras()]
+
+
+def planes(carrera_id) -> list[tuple[int, str]]:
+    if not carrera_id:
+        return []
+    return [(p["id"], p["label"]) for p in referencia_cache.get_planes(carrera_id)]
+
+
+def espacios_plan(plan_id, ids=None) -> list[tuple[int, str]]:
+    """Espacios del plan (con `label_utils.etiqueta`); `ids` restringe a esos espacios."""
+    if not plan_id:
+        return []
+    espacios = referencia_cache.get_plan_espacios(plan_id)
+    if ids is not None:
+        ids = set(ids)
+        espacios = [e for e in espacios if e["id"] in ids]
+    return [(e["id"], e["etiqueta"]) for e in espacios]
+
+
+def condiciones(tipo) -> list[tuple[str, str]]:
+    por_tipo = referencia_cache.get_condiciones_por_tipo()
+    return [(c["codigo"], c["nombre"]) for c in por_tipo.get(tipo, [])]
+
+
+# ---------- inscripciones (no se cachean: son miles y cambian seguido) ----------
+def _etiqueta_inscripcion(f: dict) -> str:
+    # mismo formato que EstudianteProfesorado.__str__
+    return (
+        f"{f['estudiante__apellido']}, {f['estudiante__nombre']} ({f['estudiante__dni']})"
+        f" → {f['carrera__nombre']}"
+    )
+
+
+def _filas_inscripcion(qs):
+    return qs.values(
+        "id",
+        "estudiante__apellido",
+        "estudiante__nombre",
+        "estudiante__dni",
+        "carrera__nombre",
+    )
+
+
+def inscripciones(ids) -> list[tuple[int, str]]:
+    """Etiquetas de las inscripciones `ids` (una consulta, sin instanciar modelos)."""
+    from academia_core.models import EstudianteProfesorado
+
+    ids = [int(i) for i in ids if str(i).isdigit()]
+    if not ids:
+        return []
+    filas = _filas_inscripcion(EstudianteProfesorado.objects.filter(pk__in=ids).order_by())
+    return [(f["id"], _etiqueta_inscripcion(f)) for f in filas]
+
+
+def buscar_inscripciones(q: str, limite: int = LIMITE_AUTOCOMPLETAR) -> list[tuple[int, str]]:
+    """DNI (prefijo) o apellido/nombre (todas las palabras); como mucho `limite` resultados."""
+    from django.db.models import Q
+
+    from academia_core.models import EstudianteProfesorado
+
+    q = (q or "").strip()
+    if not q:
+        return []
+    qs = EstudianteProfesorado.objects.all()
+    if q.isdigit():
+        qs = qs.filter(estudiante__dni__startswith=q)
+    else:
+        for palabra in q.split():
+            qs = qs.filter(
+                Q(estudiante__apellido__icontains=palabra)
+                | Q(estudiante__nombre__icontains=palabra)
+            )
+    qs = qs.order_by("estudiante__apellido", "estudiante__nombre", "id")[:limite]
+    return [(f["id"], _etiqueta_inscripcion(f)) for f in _filas_inscripcion(qs)]
+
+
+class SelectAutocompletar(forms.Select):
+    """
+    Select que sólo trae la opción elegida; el resto se busca contra `url`
+    (responde {"items": [{id, label}]}) desde el JS de la página.
+    """
+
+    def __init__(self, url_name: str, attrs=None):
+        super().__init__(attrs)
+        self.url_name = url_name
+
+    def get_context(self, name, value, attrs):
+        ctx = super().get_context(name, value, attrs)
+        try:
+            ctx["widget"]["attrs"]["data-autocompletar-url"] = reverse(self.url_name)
+        except NoReverseMatch:
+            pass
+        return ctx
+
+
+def autocompletar(field: forms.ModelChoiceField, url_name: str, valor, resolver) -> None:
+    """Convierte `field` en autocompletar con sólo `valor` (si hay) como opción."""
+    field.widget = SelectAutocompletar(url_name, attrs=field.widget.attrs)
+    field.widget.is_required = field.required
+    field.choices = con_vacio(resolver([valor]) if valor else [])
+
+
+def elegido(form: forms.BaseForm, nombre: str):
+    """Valor elegido para `nombre`: el enviado si el form está ligado; si no, initial/instancia."""
+    if form.is_bound:
+        return form.data.get(form.add_prefix(nombre)) or None
+    if form.initial.get(nombre):
+        valor = form.initial[nombre]
+        return getattr(valor, "pk", valor)
+    instancia = getattr(form, "instance", None)
+    if instancia is not None and instancia.pk:
+        return getattr(instancia, f"{nombre}_id", None) or getattr(instancia, nombre, None)
+    return None
+
+
+def plan_de_inscripcion(insc_id) -> int | None:
+    from academia_core.models import EstudianteProfesorado
+
+    if not str(insc_id or "").isdigit():
+        return None
+    qs = EstudianteProfesorado.objects.filter(pk=insc_id).order_by()
+    return qs.values_list("plan_id", flat=True).first()
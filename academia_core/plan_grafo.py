@@ -0,0 +1,249 @@
+# academia_core/plan_grafo.py
+"""
+Grafo de correlatividades de un plan, compilado en memoria.
+
+`cumple_correlativas()` resuelve las reglas de UN estudiante y UN espacio con
+varias consultas por regla. Para procesos masivos (inscribir una cohorte
+entera) compilamos el plan una vez (2 consultas): cada regla queda como el
+conjunto de ids de espacios que exige, con `requiere_todos_hasta_anio` ya
+expandido, y la elegibilidad pasa a ser una diferencia de conjuntos contra el
+estado académico del estudiante (`utils_inscripciones.estados_academicos`).
+
+Las reglas son las mismas que en `cumple_correlativas`.
+
+`analizar()` usa el mismo grafo para validar el plan: ciclos, requisitos
+transitivos (bitsets) y cantidad mínima de cuatrimestres (camino crítico).
+La versión cacheada para API/UI es `referencia_cache.get_plan_analisis()`.
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+
+_ANIO_RE = re.compile(r"\d+")
+
+
+def anio_numero(anio: str | None) -> int | None:
+    """'1°' -> 1, '2do' -> 2; None si no hay número."""
+    m = _ANIO_RE.search(anio or "")
+    return int(m.group()) if m else None
+
+
+def buscar_ciclo(aristas: Mapping[int, Iterable[int]]) -> list[int] | None:
+    """
+    Un ciclo `[a, b, …, a]` del grafo `espacio -> espacios que requiere`, o
+    None si es un DAG. DFS iterativo (los planes no tienen profundidad acotada).
+    """
+    gris, negro = 1, 2
+    color: dict[int, int] = {}
+    for inicio in sorted(aristas):
+        if inicio in color:
+            continue
+        camino = [inicio]
+        color[inicio] = gris
+        pila = [iter(sorted(aristas.get(inicio, ())))]
+        while pila:
+            sig = next(pila[-1], None)
+            if sig is None:
+                color[camino.pop()] = negro
+                pila.pop()
+            elif color.get(sig) == gris:
+                return camino[camino.index(sig) :] + [sig]
+            elif sig not in color:
+                color[sig] = gris
+                camino.append(sig)
+                pila.append(iter(sorted(aristas.get(sig, ()))))
+    return None
+
+
+@dataclass(frozen=True)
+class Regla:
+    tipo: str  # CURSAR / RENDIR
+    requisito: str  # REGULARIZADA / APROBADA
+    requiere: frozenset[int]
+
+
+@dataclass
+class PlanGrafo:
+    plan_id: int
+    anios: dict[int, int | None] = field(default_factory=dict)  # espacio_id -> año
+    reglas: dict[tuple[int, str], list[Regla]] = field(default_factory=dict)
+    cuatrimestres: dict[int, str] = field(default_factory=dict)  # espacio_id -> 1/2/A
+
+    def espacios_de_anio(self, anio: int) -> list[int]:
+        return sorted(e for e, a in self.anios.items() if a == anio)
+
+    def aristas(self, tipos: Iterable[str] = ("CURSAR", "RENDIR")) -> dict[int, set[int]]:
+        """espacio -> espacios que requiere directamente (reglas de `tipos`)."""
+        out: dict[int, set[int]] = {pk: set() for pk in self.anios}
+        for (esp, tipo), reglas in self.reglas.items():
+            if tipo in tipos:
+                for r in reglas:
+                    out.setdefault(esp, set()).update(r.requiere)
+        return out
+
+    def faltantes(
+        self, espacio_id: int, tipo: str, regularizadas: set[int], aprobadas: set[int]
+    ) -> list[tuple[Regla, int]]:
+        """Pares (regla, espacio requerido) que no se cumplen; vacío = habilitado."""
+        out = []
+        for r in self.reglas.get((espacio_id, tipo), ()):
+            tiene = regularizadas if r.requisito == "REGULARIZADA" else aprobadas
+            out.extend((r, req) for req in sorted(r.requiere - tiene))
+        return out
+
+
+def compilar_plan(plan_id: int) -> PlanGrafo:
+    from academia_core.models import Correlatividad, EspacioCurricular
+
+    espacios = EspacioCurricular.objects.filter(plan_id=plan_id).values_list(
+        "id", "anio", "cuatrimestre"
+    )
+    textos, cuatris = {}, {}
+    for pk, anio, cuatri in espacios:
+        textos[pk], cuatris[pk] = anio, cuatri
+    hasta_anio: dict[int, frozenset[int]] = {}
+
+    def _hasta(n: int) -> frozenset[int]:
+        # mismo criterio que cumple_correlativas: anio in ("1°", …, "n°")
+        if n not in hasta_anio:
+            validos = {f"{i}°" for i in range(1, n + 1)}
+            hasta_anio[n] = frozenset(pk for pk, txt in textos.items() if txt in validos)
+        return hasta_anio[n]
+
+    reglas: dict[tuple[int, str], list[Regla]] = defaultdict(list)
+    filas = (
+        Correlatividad.objects.filter(plan_id=plan_id)
+        .order_by("pk")
+        .values_list(
+            "espacio_id", "tipo", "requisito", "requiere_espacio_id", "requiere_todos_hasta_anio"
+        )
+    )
+    for esp, tipo, requisito, req_esp, req_anio in filas:
+        if req_esp:
+            requiere = frozenset([req_esp])
+        else:
+            requiere = _hasta(req_anio or 0)
+        reglas[(esp, tipo)].append(Regla(tipo, requisito, requiere))
+    anios = {pk: anio_numero(txt) for pk, txt in textos.items()}
+    return PlanGrafo(plan_id=plan_id, anios=anios, reglas=dict(reglas), cuatrimestres=cuatris)
+
+
+# --- análisis del plan ----------------------------------------------------------
+
+
+def orden_topologico(aristas: Mapping[int, Iterable[int]]) -> list[int] | None:
+    """Requeridos antes que quienes los requieren (Kahn); None si hay un ciclo."""
+    faltan: dict[int, int] = {}
+    dependientes: dict[int, list[int]] = defaultdict(list)
+    for nodo, reqs in aristas.items():
+        faltan.setdefault(nodo, 0)
+        for req in set(reqs):
+            faltan[nodo] += 1
+            faltan.setdefault(req, 0)
+            dependientes[req].append(nodo)
+    listos = [n for n, k in faltan.items() if k == 0]
+    heapq.heapify(listos)
+    orden = []
+    while listos:
+        nodo = heapq.heappop(listos)
+        orden.append(nodo)
+        for dep in dependientes[nodo]:
+            faltan[dep] -= 1
+            if faltan[dep] == 0:
+                heapq.heappush(listos, dep)
+    return orden if len(orden) == len(faltan) else None
+
+
+def clausura(aristas: Mapping[int, Iterable[int]], orden: list[int]) -> dict[int, int]:
+    """
+    Requisitos transitivos como bitsets: bit i prendido = requiere `orden[i]`.
+    Un recorrido en orden topológico alcanza (cada nodo hereda las máscaras
+    de sus requeridos, ya calculadas).
+    """
+    bit = {n: 1 << i for i, n in enumerate(orden)}
+    mascaras: dict[int, int] = {}
+    for nodo in orden:
+        m = 0
+        for req in aristas.get(nodo, ()):
+            m |= bit[req] | mascaras[req]
+        mascaras[nodo] = m
+    return mascaras
+
+
+def bits_a_nodos(mascara: int, orden: list[int]) -> list[int]:
+    out = []
+    while mascara:
+        menor = mascara & -mascara
+        out.append(orden[menor.bit_length() - 1])
+        mascara ^= menor
+    return sorted(out)
+
+
+def _primer_cuatrimestre(desde: int, cuatrimestre: str) -> int:
+    # cuatrimestres numerados desde 1: impares = 1º cuatr., pares = 2º
+    # (los anuales arrancan en el 1º)
+    if cuatrimestre in ("1", "A") and desde % 2 == 0:
+        return desde + 1
+    if cuatrimestre == "2" and desde % 2 == 1:
+        return desde + 1
+    return desde
+
+
+@dataclass
+class AnalisisPlan:
+    plan_id: int
+    ciclo: list[int] | None = None
+    requiere: dict[int, list[int]] = field(default_factory=dict)  # transitivos
+    inicio: dict[int, int] = field(default_factory=dict)  # 1er cuatrimestre cursable
+    cuatrimestres_minimos: int | None = None
+    camino_critico: list[int] = field(default_factory=list)
+
+
+def analizar(grafo: PlanGrafo) -> AnalisisPlan:
+    """
+    DAG de correlatividades (cualquier tipo) con su clausura transitiva; y,
+    con las reglas para CURSAR, el cursado más temprano posible de cada
+    espacio respetando el cuatrimestre en que se dicta: el máximo es la
+    cantidad mínima de cuatrimestres para recibirse y la cadena que lo fija
+    es el camino crítico. Con un ciclo sólo se informa el ciclo.
+    """
+    todas = grafo.aristas()
+    res = AnalisisPlan(plan_id=grafo.plan_id)
+    orden = orden_topologico(todas)
+    if orden is None:
+        res.ciclo = buscar_ciclo(todas)
+        return res
+
+    mascaras = clausura(todas, orden)
+    res.requiere = {n: bits_a_nodos(mascaras[n], orden) for n in orden}
+
+    cursar = grafo.aristas(("CURSAR",))
+    fin: dict[int, int] = {}
+    previo: dict[int, int | None] = {}
+    for nodo in orden:
+        desde, prev = 1, None
+        for req in sorted(cursar.get(nodo, ())):
+            if fin[req] + 1 > desde:
+                desde, prev = fin[req] + 1, req
+        cuatri = grafo.cuatrimestres.get(nodo, "")
+        res.inicio[nodo] = _primer_cuatrimestre(desde, cuatri)
+        fin[nodo] = res.inicio[nodo] + (1 if cuatri == "A" else 0)
+        previo[nodo] = prev
+
+    if fin:
+        ultimo = min(fin, key=lambda n: (-fin[n], n))
+        res.cuatrimestres_minimos = fin[ultimo]
+        camino: list[int] = []
+        nodo: int | None = ultimo
+        while nodo is not None:
+            camino.append(nodo)
+            nodo = previo[nodo]
+        res.camino_critico = camino[::-1]
+    else:
+        res.cuatrimestres_minimos = 0
+    return res
@@ -0,0 +1,173 @@
+# academia_core/planificador.py
+"""
+Planificador de egreso: "¿cuál es el camino más corto para recibirme?".
+
+Parte del estado académico del estudiante (`estados_academicos`) y del grafo
+del plan (`referencia_cache.get_plan_grafo`, cacheado por versión) y arma un
+cronograma cuatrimestre a cuatrimestre con las cursadas que le faltan:
+
+- una cursada sólo entra si se cumplen sus correlativas para CURSAR con lo que
+  ya tiene o con lo cursado en cuatrimestres anteriores (se asume que cada
+  final se rinde en la mesa inmediata, así que lo cursado cuenta como aprobado);
+- cada espacio se dicta en su cuatrimestre (1º, 2º o anual, que arranca en el
+  1º y ocupa los dos);
+- no más de `max_carga` cursadas por cuatrimestre.
+
+La búsqueda es list scheduling (prioridad = cadena de correlativas más larga
+que depende del espacio) refinado con branch and bound: el primer cronograma
+es el de la heurística y después se exploran otras elecciones mientras la cota
+inferior pueda mejorarlo, con un presupuesto de tiempo. `optimo` indica si la
+búsqueda terminó sin cortarse.
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import time
+from dataclasses import dataclass, field
+
+from academia_core.plan_grafo import PlanGrafo, orden_topologico
+
+PRESUPUESTO_MS = 150
+
+
+@dataclass
+class Cronograma:
+    primer_cuatrimestre: int  # 1 o 2: cuatrimestre del calendario del término 1
+    terminos: list[list[int]] = field(default_factory=list)  # espacios cursando en cada uno
+    bloqueados: list[int] = field(default_factory=list)  # nunca quedan habilitados
+    optimo: bool = True
+
+    @property
+    def cantidad(self) -> int:
+        return len(self.terminos)
+
+    def cuatrimestre(self, k: int) -> int:
+        """Cuatrimestre del calendario (1/2) del término `k` (desde 0)."""
+        return (self.primer_cuatrimestre - 1 + k) % 2 + 1
+
+
+def _se_dicta(cuatri: str, c: int) -> bool:
+    if cuatri == "2":
+        return c == 2
+    if cuatri in ("1", "A"):
+        return c == 1
+    return True  # sin dato: cualquier cuatrimestre
+
+
+def planificar(
+    grafo: PlanGrafo,
+    regularizadas: set[int],
+    aprobadas: set[int],
+    max_carga: int = 5,
+    primer_cuatrimestre: int = 1,
+    presupuesto_ms: int = PRESUPUESTO_MS,
+) -> Cronograma:
+    if max_carga < 1:
+        raise ValueError("max_carga debe ser >= 1")
+    if primer_cuatrimestre not in (1, 2):
+        raise ValueError("primer_cuatrimestre debe ser 1 o 2")
+
+    # los finales pendientes también se asumen rendidos en la mesa inmediata:
+    # una regularizada alcanza tanto para REGULARIZADA como para APROBADA
+    tiene = regularizadas | aprobadas
+    pendientes = sorted(set(grafo.anios) - tiene)
+    faltan = {
+        e: set().union(*(r.requiere for r in grafo.reglas.get((e, "CURSAR"), ()))) - tiene
+        for e in pendientes
+    }
+    dur = {e: 2 if grafo.cuatrimestres.get(e) == "A" else 1 for e in pendientes}
+
+    # Sin capacidad ni calendario: ¿qué se puede llegar a cursar alguna vez?
+    alcanzables: set[int] = set()
+    cambio = True
+    while cambio:
+        cambio = False
+        for e in pendientes:
+            if e not in alcanzables and faltan[e] <= alcanzables:
+                alcanzables.add(e)
+                cambio = True
+    res = Cronograma(primer_cuatrimestre, bloqueados=sorted(set(pendientes) - alcanzables))
+    pendientes = sorted(alcanzables)
+    if not pendientes:
+        return res
+
+    # altura = términos de la cadena más larga que arranca en el espacio
+    dependientes = {e: [d for d in pendientes if e in faltan[d]] for e in pendientes}
+    orden = orden_topologico({e: faltan[e] for e in pendientes}) or pendientes
+    altura: dict[int, int] = {}
+    for e in reversed(orden):
+        altura[e] = dur[e] + max((altura[d] for d in dependientes[e]), default=0)
+    prioridad = sorted(pendientes, key=lambda e: (-altura[e], -dur[e], e))
+
+    limite = time.perf_counter() + presupuesto_ms / 1000
+    horizonte = 2 * sum(dur.values()) + 2
+    mejor: list[list[int]] | None = None
+    cortado = False
+
+    def cota(restantes: list[int], arrastre: tuple[int, ...]) -> int:
+        carga = sum(dur[e] for e in restantes) + len(arrastre)
+        cadena = max((altura[e] for e in restantes), default=0) + (1 if arrastre else 0)
+        return max(math.ceil(carga / max_carga), cadena)
+
+    def buscar(k, hechos, arrastre, restantes, camino):
+        nonlocal mejor, cortado
+        if not restantes and not arrastre:
+            if mejor is None or len(camino) < len(mejor):
+                mejor = [list(t) for t in camino]
+            return
+        if mejor is not None and k + cota(restantes, arrastre) >= len(mejor):
+            return
+        if k >= horizonte:
+            return
+        if mejor is not None and time.perf_counter() > limite:
+            cortado = True
+            return
+
+        c = res.cuatrimestre(k)
+        libres = max_carga - len(arrastre)
+        candidatos = [
+            e
+            for e in restantes
+            if faltan[e] <= hechos and _se_dicta(grafo.cuatrimestres.get(e, ""), c)
+        ]
+        if len(candidatos) <= libres:
+            # dominancia: tomar todo lo disponible no atrasa (salvo rarezas con anuales)
+            opciones = [tuple(candidatos)]
+        else:
+            opciones = itertools.combinations(candidatos, libres)
+        for elegidos in opciones:
+            termina = set(arrastre) | {e for e in elegidos if dur[e] == 1}
+            sigue = tuple(e for e in elegidos if dur[e] == 2)
+            camino.append(sorted(arrastre + elegidos))
+            buscar(
+                k + 1,
+                hechos | termina,
+                sigue,
+                [e for e in restantes if e not in elegidos],
+                camino,
+            )
+            camino.pop()
+            if cortado:
+                return
+
+    buscar(0, frozenset(), (), prioridad, [])
+    if mejor is None:
+        res.bloqueados = sorted(set(res.bloqueados) | set(pendientes))
+    else:
+        res.terminos = mejor
+    res.optimo = not cortado
+    return res
+
+
+def planificar_inscripcion(
+    inscripcion, max_carga: int = 5, primer_cuatrimestre: int = 1, **kwargs
+) -> Cronograma:
+    """`planificar` para una EstudianteProfesorado (estado al día de hoy)."""
+    from academia_core import referencia_cache
+    from academia_core.utils_inscripciones import estados_academicos
+
+    regularizadas, aprobadas = estados_academicos([inscripcion.pk])[inscripcion.pk]
+    grafo = referencia_cache.get_plan_grafo(inscripcion.plan_id)
+    return planificar(grafo, regularizadas, aprobadas, max_carga, primer_cuatrimestre, **kwargs)
@@ -0,0 +1,234 @@
+# academia_core/promedios.py
+"""
+Auditoría masiva de notas y promedios (comando `auditar_datos`).
+
+Las mismas reglas que `Movimiento`/`EstudianteProfesorado.recalcular_promedio()`
+pero por lotes:
+
+1. `nota_texto` -> `nota_num` cuando es convertible (0..10), recorriendo
+   Movimiento por rangos de pk y guardando con `bulk_update` por lote.
+2. `promedio_general` con una consulta agregada (SUM/COUNT agrupado por
+   inscripción) por lote; sólo se escriben las filas que cambian.
+
+Cada rango de pk es independiente, así que se puede repartir entre procesos
+(`auditar(workers=N)`). Los modelos se importan dentro de las funciones para
+que los procesos hijos puedan importar este módulo antes de `django.setup()`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.db.models import Count, Max, Min, Q, Sum
+
+CODIGOS_APRUEBA_REG = ("PROMOCION", "APROBADO")
+MUESTRAS = 20
+
+
+def nota_desde_texto(texto: str | None) -> int | None:
+    """Dígitos de `nota_texto` como entero ("8 (ocho)" -> 8); None si no hay."""
+    digitos = "".join(ch for ch in (texto or "") if ch.isdigit())
+    return int(digitos) if digitos else None
+
+
+def q_aprueba_con_nota() -> Q:
+    """Movimientos que aprueban con `nota_num` (ver `_mov_aprueba`)."""
+    return Q(nota_num__gte=6) & (
+        Q(tipo="FIN", condicion_id="REGULAR") | Q(tipo="REG", condicion_id__in=CODIGOS_APRUEBA_REG)
+    )
+
+
+def q_aprueba_por_texto() -> Q:
+    """REG Promoción/Aprobado sin nota numérica aprobatoria: decide `nota_texto`."""
+    return (
+        Q(tipo="REG", condicion_id__in=CODIGOS_APRUEBA_REG)
+        & ~Q(nota_texto="")
+        & (Q(nota_num__isnull=True) | Q(nota_num__lt=6))
+    )
+
+
+def rangos_pk(qs, tam: int) -> list[tuple[int, int]]:
+    """[(desde, hasta)) que cubren los pks de `qs` en tramos de `tam`."""
+    lim = qs.order_by().aggregate(desde=Min("pk"), hasta=Max("pk"))
+    if lim["desde"] is None:
+        return []
+    return [(d, d + tam) for d in range(lim["desde"], lim["hasta"] + 1, tam)]
+
+
+def promedios_por_inscripcion(insc_ids) -> dict[int, Decimal | None]:
+    """Promedio general de cada inscripción (None si no aprobó nada)."""
+    from academia_core.models import Movimiento
+
+    ids = list(insc_ids)
+    sumas = {pk: (Decimal(0), 0) for pk in ids}
+    filas = (
+        Movimiento.objects.filter(inscripcion_id__in=ids)
+        .filter(q_aprueba_con_nota())
+        .order_by()
+        .values("inscripcion_id")
+        .annotate(suma=Sum("nota_num"), n=Count("id"))
+    )
+    for f in filas:
+        sumas[f["inscripcion_id"]] = (Decimal(f["suma"]), f["n"])
+
+    # Resto (raro después de normalizar): la nota sale del texto salvo que
+    # haya nota_num (< 6), que es la que se promedia.
+    resto = (
+        Movimiento.objects.filter(inscripcion_id__in=ids)
+        .filter(q_aprueba_por_texto())
+        .order_by()
+        .values_list("inscripcion_id", "nota_num", "nota_texto")
+    )
+    for insc_id, nota_num, texto in resto:
+        n = nota_desde_texto(texto)
+        # > 10 no es una nota (y desbordaría promedio_general)
+        if n is not None and 6 <= n <= 10:
+            suma, cant = sumas[insc_id]
+            sumas[insc_id] = (suma + Decimal(nota_num if nota_num is not None else n), cant + 1)
+
+    return {
+        pk: (suma / Decimal(cant)).quantize(Decimal("0.01")) if cant else None
+        for pk, (suma, cant) in sumas.items()
+    }
+
+
+@dataclass
+class ResultadoLote:
+    revisados: int = 0
+    cambios: int = 0
+    muestras: list = field(default_factory=list)
+    carreras: set = field(default_factory=set)
+
+    def sumar(self, otro: ResultadoLote) -> None:
+        self.revisados += otro.revisados
+        self.cambios += otro.cambios
+        self.muestras.extend(otro.muestras[: max(0, MUESTRAS - len(self.muestras))])
+        self.carreras |= otro.carreras
+
+
+def normalizar_notas(desde: int, hasta: int, simular: bool = False) -> ResultadoLote:
+    """Paso 1 sobre Movimiento con pk en [desde, hasta)."""
+    from academia_core.models import Movimiento
+
+    res = ResultadoLote()
+    cambiar = []
+    movs = Movimiento.objects.filter(pk__gte=desde, pk__lt=hasta, nota_num__isnull=True).exclude(
+        nota_texto=""
+    )
+    for m in movs.only("id", "inscripcion_id", "nota_texto", "nota_num").order_by():
+        res.revisados += 1
+        n = nota_desde_texto(m.nota_texto)
+        if n is not None and 0 <= n <= 10:
+            m.nota_num = Decimal(n)
+            cambiar.append(m)
+            if len(res.muestras) < MUESTRAS:
+                res.muestras.append((m.pk, m.nota_texto, n))
+    res.cambios = len(cambiar)
+    if cambiar and not simular:
+        from academia_core.regularidades import actualizar_inscripciones
+
+        Movimiento.objects.bulk_update(cambiar, ["nota_num"])
+        actualizar_inscripciones({m.inscripcion_id for m in cambiar})
+    return res
+
+
+def recalcular_promedios(desde: int, hasta: int, simular: bool = False) -> ResultadoLote:
+    """Paso 2 sobre EstudianteProfesorado con pk en [desde, hasta)."""
+    from academia_core.models import EstudianteProfesorado
+
+    res = ResultadoLote()
+    inscs = list(
+        EstudianteProfesorado.objects.filter(pk__gte=desde, pk__lt=hasta)
+        .order_by()
+        .only("id", "carrera_id", "promedio_general")
+    )
+    res.revisados = len(inscs)
+    nuevos = promedios_por_inscripcion(e.pk for e in inscs)
+    cambiar = []
+    for e in inscs:
+        nuevo = nuevos[e.pk]
+        if nuevo != e.promedio_general:
+            if len(res.muestras) < MUESTRAS:
+                res.muestras.append((e.pk, e.promedio_general, nuevo))
+            e.promedio_general = nuevo
+            cambiar.append(e)
+            res.carreras.add(e.carrera_id)
+    res.cambios = len(cambiar)
+    if cambiar and not simular:
+        EstudianteProfesorado.objects.bulk_update(cambiar, ["promedio_general"])
+    return res
+
+
+def _iniciar_proceso():
+    import django
+    from django.db import connections
+
+    django.setup()
+    connections.close_all()
+
+
+def _en_procesos(fn, rangos, simular, workers, avance=None) -> list[ResultadoLote]:
+    with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_proceso) as pool:
+        futuros = [pool.submit(fn, d, h, simular) for d, h in rangos]
+        parciales = []
+        for f in futuros:
+            parciales.append(f.result())
+            if avance:
+                avance(len(parciales))
+        return parciales
+
+
+@dataclass
+class ResumenAuditoria:
+    notas: ResultadoLote
+    promedios: ResultadoLote
+
+
+def auditar(
+    simular: bool = False,
+    batch_size: int = 5000,
+    workers: int = 1,
+    progreso: Callable[[str, int, int], None] | None = None,
+) -> ResumenAuditoria:
+    """
+    Corre los dos pasos por rangos de pk. `progreso(paso, hecho, total)` se
+    llama tras cada lote (también con `workers`). Con `simular` no escribe nada
+    (informe de diferencias).
+    """
+    from django.db import connections
+
+    from academia_core import kpis
+    from academia_core.models import EstudianteProfesorado, Movimiento
+
+    resumen = ResumenAuditoria(ResultadoLote(), ResultadoLote())
+    pasos = [
+        ("notas", normalizar_notas, Movimiento.objects.all(), resumen.notas),
+        ("promedios", recalcular_promedios, EstudianteProfesorado.objects.all(), resumen.promedios),
+    ]
+    for nombre, fn, qs, acumulado in pasos:
+        rangos = rangos_pk(qs, batch_size)
+        total = len(rangos)
+
+        def avance(hecho, nombre=nombre, total=total):
+            if progreso:
+                progreso(nombre, hecho, total)
+
+        if workers > 1 and len(rangos) > 1:
+            # los hijos abren sus propias conexiones
+            connections.close_all()
+            parciales = _en_procesos(fn, rangos, simular, workers, avance)
+        else:
+            parciales = []
+            for d, h in rangos:
+                parciales.append(fn(d, h, simular))
+                avance(len(parciales))
+        for p in parciales:
+            acumulado.sumar(p)
+
+    if not simular and resumen.promedios.carreras:
+        # bulk_update no dispara signals: el desglose del panel queda desactualizado
+        kpis.marcar_sucias(resumen.promedios.carreras)
+    return resumen
@@ -0,0 +1,326 @@
+# academia_core/referencia_cache.py
+"""
+Caché compartida de datos de referencia.
+
+Carreras, planes, espacios, condiciones, turnos y bloques cambian unas pocas
+veces al año pero se consultan en cada request de las APIs y del panel.
+Los getters de este módulo devuelven estructuras planas (dicts/listas, aptas
+para JSON y para pickle) y las guardan en la caché `REFERENCIA_CACHE_ALIAS`.
+
+Invalidación por versión: cada grupo tiene una clave `ref:v:<grupo>` que se
+incrementa desde post_save/post_delete y otra vez al commit (ver
+`conectar_signals`), y las claves de datos incluyen esa versión, así que
+nunca hace falta borrar en masa.
+Los `queryset.update()` no disparan signals: después de uno, llamar
+`invalidar("<grupo>")`.
+
+Con locmem (default) la caché es por proceso; con varios workers conviene
+configurar Redis (`REDIS_URL`) para que la invalidación se vea en todos.
+
+Lo que se guarda se calcula siempre contra `default`, aunque el getter se
+llame desde una vista con `usar_replica`: la réplica puede ir atrasada respecto
+de la versión que ya se incrementó.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from collections.abc import Callable
+from typing import Any
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from academia_core.conexiones import en_primario
+
+TIMEOUT = getattr(settings, "REFERENCIA_CACHE_TIMEOUT", 60 * 60)
+
+# grupo -> modelos que lo invalidan
+GRUPOS: dict[str, tuple[str, ...]] = {
+    "carreras": ("academia_core.Carrera",),
+    "planes": ("academia_core.PlanEstudios", "academia_core.Carrera"),
+    "espacios": ("academia_core.EspacioCurricular", "academia_core.Materia"),
+    "correlatividades": (
+        "academia_core.Correlatividad",
+        "academia_core.EspacioCurricular",
+        "academia_core.Materia",
+    ),
+    "condiciones": ("academia_core.Condicion",),
+    "turnos": ("academia_horarios.TurnoModel",),
+    "bloques": ("academia_horarios.Bloque", "academia_horarios.TurnoModel"),
+}
+
+_contadores: Counter = Counter()
+_lock = threading.Lock()
+
+
+def _cache():
+    return caches[getattr(settings, "REFERENCIA_CACHE_ALIAS", "default")]
+
+
+def _clave_version(grupo: str) -> str:
+    return f"ref:v:{grupo}"
+
+
+def version(grupo: str) -> int:
+    c = _cache()
+    v = c.get(_clave_version(grupo))
+    if v is None:
+        c.add(_clave_version(grupo), 1, None)
+        v = c.get(_clave_version(grupo)) or 1
+    return v
+
+
+def invalidar(*grupos: str) -> None:
+    c = _cache()
+    for g in grupos:
+        try:
+            c.incr(_clave_version(g))
+        except ValueError:
+            # la clave no existía (caché vacía/reiniciada): arrancamos en 2
+            c.set(_clave_version(g), 2, None)
+
+
+def _contar(grupo: str, evento: str) -> None:
+    with _lock:
+        _contadores[(grupo, evento)] += 1
+
+
+def _obtener(grupo: str, sufijo: str, calcular: Callable[[], Any]) -> Any:
+    c = _cache()
+    clave = f"ref:{grupo}:{version(grupo)}:{sufijo}"
+    valor = c.get(clave)
+    if valor is not None:
+        _contar(grupo, "hits")
+        return valor
+    _contar(grupo, "misses")
+    with en_primario():
+        valor = calcular()
+    c.set(clave, valor, TIMEOUT)
+    return valor
+
+
+# ---------- getters ----------
+def get_carreras() -> list[dict]:
+    """[{id, nombre, abreviatura}] ordenadas por nombre."""
+    Carrera = apps.get_model("academia_core", "Carrera")
+    return _obtener(
+        "carreras",
+        "todas",
+        lambda: list(Carrera.objects.order_by("nombre").values("id", "nombre", "abreviatura")),
+    )
+
+
+def get_planes(carrera_id: int | None = None, solo_vigentes: bool = False) -> list[dict]:
+    """[{id, carrera_id, nombre, resolucion, vigente, label}] ordenados por carrera y nombre."""
+    PlanEstudios = apps.get_model("academia_core", "PlanEstudios")
+
+    def calcular():
+        return [
+            {
+                "id": p.id,
+                "carrera_id": p.carrera_id,
+                "nombre": p.nombre,
+                "resolucion": p.resolucion,
+                "vigente": p.vigente,
+                "label": str(p),
+            }
+            for p in PlanEstudios.objects.select_related("carrera").order_by(
+                "carrera__nombre", "nombre", "id"
+            )
+        ]
+
+    planes = _obtener("planes", "todos", calcular)
+    if carrera_id is not None:
+        planes = [p for p in planes if str(p["carrera_id"]) == str(carrera_id)]
+    if solo_vigentes:
+        planes = [p for p in planes if p["vigente"]]
+    return planes
+
+
+def get_plan_espacios(plan_id: int) -> list[dict]:
+    """
+    Espacios del plan: [{id, nombre, etiqueta, anio, cuatrimestre, horas, formato,
+    libre_habilitado}] ordenados por año, cuatrimestre y nombre. `etiqueta` es la
+    de `label_utils.etiqueta`, calculada una vez por versión.
+    """
+    from academia_core.label_utils import etiqueta
+
+    EspacioCurricular = apps.get_model("academia_core", "EspacioCurricular")
+
+    def calcular():
+        filas = (
+            EspacioCurricular.objects.filter(plan_id=plan_id)
+            .order_by("anio", "cuatrimestre", "materia__nombre")
+            .values(
+                "id",
+                "materia__nombre",
+                "anio",
+                "cuatrimestre",
+                "horas",
+                "formato",
+                "libre_habilitado",
+            )
+        )
+        out = []
+        for f in filas:
+            f["nombre"] = f.pop("materia__nombre") or ""
+            f["etiqueta"] = etiqueta(f["anio"], f["cuatrimestre"], f["nombre"])
+            out.append(f)
+        return out
+
+    return _obtener("espacios", f"plan:{int(plan_id)}", calcular)
+
+
+def get_plan_etiquetas(plan_id: int) -> dict[int, str]:
+    """{espacio_id: etiqueta} del plan (derivado de `get_plan_espacios`, sin otra consulta)."""
+    return _obtener(
+        "espacios",
+        f"etiquetas:{int(plan_id)}",
+        lambda: {e["id"]: e["etiqueta"] for e in get_plan_espacios(plan_id)},
+    )
+
+
+def get_plan_grafo(plan_id: int):
+    """`plan_grafo.PlanGrafo` del plan (reglas con `requiere_todos_hasta_anio` expandido)."""
+    from academia_core.plan_grafo import compilar_plan
+
+    return _obtener("correlatividades", f"grafo:{int(plan_id)}", lambda: compilar_plan(plan_id))
+
+
+def get_plan_analisis(plan_id: int) -> dict:
+    """
+    Análisis de correlatividades del plan (ver `plan_grafo.analizar`):
+    {plan_id, ciclo, cuatrimestres_minimos, camino_critico, espacios: [{id, nombre,
+    anio, cuatrimestre, inicio, requiere}]}. `ciclo` y `camino_critico` son
+    listas de {id, nombre}; con ciclo, `inicio`/`requiere` quedan vacíos.
+    """
+    from academia_core.plan_grafo import analizar
+
+    def calcular():
+        a = analizar(get_plan_grafo(plan_id))
+        espacios = get_plan_espacios(plan_id)
+        nombres = {e["id"]: e["nombre"] for e in espacios}
+
+        def _ref(pk):
+            return {"id": pk, "nombre": nombres.get(pk, "")}
+
+        return {
+            "plan_id": int(plan_id),
+            "ciclo": [_ref(pk) for pk in a.ciclo] if a.ciclo else None,
+            "cuatrimestres_minimos": a.cuatrimestres_minimos,
+            "camino_critico": [_ref(pk) for pk in a.camino_critico],
+            "espacios": [
+                {
+                    "id": e["id"],
+                    "nombre": e["nombre"],
+                    "anio": e["anio"],
+                    "cuatrimestre": e["cuatrimestre"],
+                    "inicio": a.inicio.get(e["id"]),
+                    "requiere": a.requiere.get(e["id"], []),
+                }
+                for e in espacios
+            ],
+        }
+
+    return _obtener("correlatividades", f"analisis:{int(plan_id)}", calcular)
+
+
+def get_condiciones_por_tipo() -> dict[str, list[dict]]:
+    """{"REG": [{codigo, nombre}], "FIN": [...]} ordenadas por nombre."""
+    Condicion = apps.get_model("academia_core", "Condicion")
+
+    def calcular():
+        out: dict[str, list[dict]] = {}
+        for c in Condicion.objects.order_by("nombre").values("codigo", "nombre", "tipo"):
+            out.setdefault(c.pop("tipo"), []).append(c)
+        return out
+
+    return _obtener("condiciones", "por_tipo", calcular)
+
+
+def get_turnos() -> list[dict]:
+    """[{slug, nombre}] en el orden de carga."""
+    TurnoModel = apps.get_model("academia_horarios", "TurnoModel")
+    return _obtener(
+        "turnos",
+        "todos",
+        lambda: list(TurnoModel.objects.order_by("id").values("slug", "nombre")),
+    )
+
+
+def get_bloques(turno_slug: str | None) -> list[dict]:
+    """
+    Bloques de un turno ([{dia_semana, orden, inicio, fin, es_recreo}] por orden).
+    `turno_slug=None` devuelve los bloques sin turno (sábado).
+    """
+    Bloque = apps.get_model("academia_horarios", "Bloque")
+
+    def calcular():
+        qs = (
+            Bloque.objects.filter(turno__isnull=True)
+            if turno_slug is None
+            else Bloque.objects.filter(turno__slug=turno_slug)
+        )
+        return list(
+            qs.order_by("orden").values("dia_semana", "orden", "inicio", "fin", "es_recreo")
+        )
+
+    return _obtener("bloques", f"turno:{turno_slug or '-'}", calcular)
+
+
+# ---------- monitoreo ----------
+def estadisticas() -> dict[str, dict]:
+    """Hits/misses por grupo desde el arranque del proceso, más la versión vigente."""
+    with _lock:
+        snapshot = dict(_contadores)
+    out = {}
+    for g in GRUPOS:
+        hits = snapshot.get((g, "hits"), 0)
+        misses = snapshot.get((g, "misses"), 0)
+        total = hits + misses
+        out[g] = {
+            "hits": hits,
+            "misses": misses,
+            "ratio": round(hits / total, 3) if total else None,
+            "version": version(g),
+        }
+    return out
+
+
+def reiniciar_estadisticas() -> None:
+    with _lock:
+        _contadores.clear()
+
+
+# ---------- signals ----------
+def _grupos_por_modelo() -> dict[str, list[str]]:
+    out: dict[str, list[str]] = {}
+    for grupo, modelos in GRUPOS.items():
+        for label in modelos:
+            out.setdefault(label, []).append(grupo)
+    return out
+
+
+def conectar_signals() -> None:
+    """Conecta post_save/post_delete de los modelos de referencia (se llama desde AppConfig.ready)."""
+    for label, grupos in _grupos_por_modelo().items():
+        try:
+            modelo = apps.get_model(label)
+        except LookupError:
+            continue
+
+        def _receiver(sender, grupos=tuple(grupos), using=None, **kwargs):
+            # ya, para que la propia transacción no lea lo cacheado antes de escribir;
+            # y al commit, porque otra conexión pudo cachear mientras tanto la foto
+            # previa bajo la versión nueva y la dejaría fija hasta el TIMEOUT
+            invalidar(*grupos)
+            transaction.on_commit(lambda: invalidar(*grupos), using=using)
+
+        uid = f"referencia_cache:{label}"
+        post_save.connect(_receiver, sender=modelo, weak=False, dispatch_uid=f"{uid}:save")
+        post_delete.connect(_receiver, sender=modelo, weak=False, dispatch_uid=f"{uid}:delete")
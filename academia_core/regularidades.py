@@ -0,0 +1,204 @@
+# academia_core/regularidades.py
+"""
+Proyección `Regularidad`: una fila por (inscripción, espacio) con REG
+`REGULAR` fechada o algún final, con la vigencia y los intentos ya resueltos.
+
+- Los signals de Movimiento (alta, edición, baja) recalculan sólo su par con
+  una consulta y un upsert.
+- `bulk_create`/`queryset.update()` no disparan signals: quien escribe en
+  bloque llama a `actualizar_inscripciones(ids)`, y `reconstruir()` (comando
+  `vencimientos_regularidad --reconstruir`) rehace todo y corrige desvíos.
+- `marcar_vencidas()` es el proceso diario; `por_vencer()` es el reporte de
+  secretaría sobre el índice (aprobada, vence_el).
+
+Así `Movimiento.clean` resuelve "regularidad vigente" e "intentos previos"
+con una búsqueda por el índice único (inscripción, espacio).
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from academia_core.models import Movimiento, Regularidad
+from academia_core.utils_inscripciones import VIGENCIA_REGULARIDAD
+
+MAX_INTENTOS = 3
+NOTA_APROBADO = 6
+CAMPOS = ("fecha_regular", "vence_el", "intentos_final", "aprobada", "vencida")
+_COLUMNAS = (
+    "inscripcion_id",
+    "espacio_id",
+    "tipo",
+    "condicion_id",
+    "fecha",
+    "nota_num",
+    "ausente",
+    "ausencia_justificada",
+)
+
+
+def proyectar(filas, hoy=None) -> dict[tuple[int, int], dict]:
+    """
+    {(inscripción, espacio): campos de Regularidad} a partir de filas de
+    Movimiento con las columnas de `_COLUMNAS`.
+    """
+    hoy = hoy or timezone.localdate()
+    out: dict[tuple[int, int], dict] = {}
+    for insc, esp, tipo, cond, fecha, nota, ausente, justificada in filas:
+        if tipo == "REG":
+            if cond != "REGULAR" or fecha is None:
+                continue
+            r = out.setdefault((insc, esp), dict.fromkeys(CAMPOS))
+            if r["fecha_regular"] is None or fecha > r["fecha_regular"]:
+                r["fecha_regular"] = fecha
+        elif tipo == "FIN":
+            if ausente and justificada:
+                continue
+            r = out.setdefault((insc, esp), dict.fromkeys(CAMPOS))
+            r["intentos_final"] = (r["intentos_final"] or 0) + 1
+            if not ausente and (nota or 0) >= NOTA_APROBADO:
+                r["aprobada"] = True
+    for r in out.values():
+        r["intentos_final"] = r["intentos_final"] or 0
+        r["aprobada"] = bool(r["aprobada"])
+        if r["fecha_regular"] is not None:
+            r["vence_el"] = r["fecha_regular"] + VIGENCIA_REGULARIDAD
+        r["vencida"] = r["vence_el"] is not None and r["vence_el"] < hoy
+    return out
+
+
+# ---------- mantenimiento ----------
+def actualizar(inscripcion_id: int, espacio_id: int) -> None:
+    """Recalcula la fila de un par (la borra si ya no corresponde)."""
+    filas = (
+        Movimiento.objects.filter(inscripcion_id=inscripcion_id, espacio_id=espacio_id)
+        .order_by()
+        .values_list(*_COLUMNAS)
+    )
+    datos = proyectar(filas).get((inscripcion_id, espacio_id))
+    if datos is None:
+        Regularidad.objects.filter(inscripcion_id=inscripcion_id, espacio_id=espacio_id).delete()
+        return
+    Regularidad.objects.bulk_create(
+        [Regularidad(inscripcion_id=inscripcion_id, espacio_id=espacio_id, **datos)],
+        update_conflicts=True,
+        unique_fields=["inscripcion", "espacio"],
+        update_fields=list(CAMPOS),
+    )
+
+
+@transaction.atomic
+def actualizar_inscripciones(insc_ids, batch_size: int = 1000) -> int:
+    """Rehace las filas de esas inscripciones. Devuelve cuántas quedaron."""
+    ids = list(insc_ids)
+    total = 0
+    for i in range(0, len(ids), batch_size):
+        lote = ids[i : i + batch_size]
+        filas = Movimiento.objects.filter(inscripcion_id__in=lote).order_by()
+        nuevas = [
+            Regularidad(inscripcion_id=insc, espacio_id=esp, **datos)
+            for (insc, esp), datos in proyectar(filas.values_list(*_COLUMNAS)).items()
+        ]
+        Regularidad.objects.filter(inscripcion_id__in=lote).delete()
+        Regularidad.objects.bulk_create(nuevas, batch_size=batch_size)
+        total += len(nuevas)
+    return total
+
+
+def reconstruir(batch_size: int = 2000, progreso=None) -> int:
+    """Rehace toda la proyección por rangos de inscripción."""
+    from academia_core.models import EstudianteProfesorado
+    from academia_core.promedios import rangos_pk
+
+    qs = EstudianteProfesorado.objects.all()
+    rangos = rangos_pk(qs, batch_size)
+    total = 0
+    for n, (desde, hasta) in enumerate(rangos, start=1):
+        ids = qs.filter(pk__gte=desde, pk__lt=hasta).order_by().values_list("pk", flat=True)
+        total += actualizar_inscripciones(list(ids), batch_size)
+        if progreso:
+            progreso(n, len(rangos))
+    return total
+
+
+def marcar_vencidas(hoy=None) -> int:
+    """Proceso diario: marca las regularidades que vencieron. Devuelve cuántas."""
+    hoy = hoy or timezone.localdate()
+    return Regularidad.objects.filter(vencida=False, vence_el__lt=hoy).update(vencida=True)
+
+
+# ---------- consultas ----------
+def por_vencer(dias: int = 30, hoy=None, carrera_id=None):
+    """Regularidades sin aprobar ni agotar intentos que vencen en los próximos `dias`."""
+    hoy = hoy or timezone.localdate()
+    qs = Regularidad.objects.filter(
+        aprobada=False,
+        vence_el__gte=hoy,
+        vence_el__lte=hoy + timedelta(days=dias),
+        intentos_final__lt=MAX_INTENTOS,
+    )
+    if carrera_id:
+        qs = qs.filter(inscripcion__carrera_id=carrera_id)
+    return qs.order_by("vence_el", "inscripcion_id", "espacio_id")
+
+
+def reporte_por_vencer(dias: int = 30, hoy=None, carrera_id=None) -> list[dict]:
+    """`por_vencer` proyectado para listar (sin instanciar modelos)."""
+    filas = por_vencer(dias, hoy, carrera_id).values(
+        "inscripcion_id",
+        "espacio_id",
+        "vence_el",
+        "intentos_final",
+        "inscripcion__estudiante__apellido",
+        "inscripcion__estudiante__nombre",
+        "inscripcion__estudiante__dni",
+        "espacio__materia__nombre",
+    )
+    return [
+        {
+            "inscripcion_id": f["inscripcion_id"],
+            "estudiante": (
+                f"{f['inscripcion__estudiante__apellido']}, {f['inscripcion__estudiante__nombre']}"
+                f" ({f['inscripcion__estudiante__dni']})"
+            ),
+            "espacio_id": f["espacio_id"],
+            "espacio": f["espacio__materia__nombre"],
+            "vence_el": f["vence_el"].isoformat(),
+            "intentos_final": f["intentos_final"],
+        }
+        for f in filas
+    ]
+
+
+def vigente(inscripcion_id: int, espacio_id: int, a_fecha) -> bool:
+    vence = (
+        Regularidad.objects.filter(inscripcion_id=inscripcion_id, espacio_id=espacio_id)
+        .values_list("vence_el", flat=True)
+        .first()
+    )
+    return vence is not None and vence >= a_fecha
+
+
+def finales_previos(inscripcion_id: int, espacio_id: int) -> tuple[int, bool]:
+    """(intentos, aprobado) de los finales ya cargados del par."""
+    fila = (
+        Regularidad.objects.filter(inscripcion_id=inscripcion_id, espacio_id=espacio_id)
+        .values_list("intentos_final", "aprobada")
+        .first()
+    )
+    return fila or (0, False)
+
+
+# ---------- signals ----------
+def _on_movimiento(sender, instance, **kwargs):
+    actualizar(instance.inscripcion_id, instance.espacio_id)
+
+
+def conectar_signals() -> None:
+    """Conecta los receivers (se llama desde AppConfig.ready)."""
+    post_save.connect(_on_movimiento, sender=Movimiento, dispatch_uid="regularidades:save")
+    post_delete.connect(_on_movimiento, sender=Movimiento, dispatch_uid="regularidades:delete")
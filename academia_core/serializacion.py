@@ -0,0 +1,144 @@
+# academia_core/serializacion.py
+"""
+Serialización JSON de las APIs.
+
+- `RespuestaJSON` reemplaza a `JsonResponse`: codifica con orjson si está
+  instalado (extra opcional `orjson`) y con el `json` de la stdlib si no.
+  Las dos salidas son el mismo JSON compacto en UTF-8: fechas, horas y
+  datetimes en ISO 8601 (`isoformat()`), `Decimal` como string (igual que
+  el encoder de Django) y claves no string (p. ej. int) como string.
+
+- `Proyeccion` declara una vez la forma de los items de un listado y los
+  arma directo de las tuplas de `values_list` (sin instancias ni dicts
+  intermedios):
+
+      HORARIO = Proyeccion(
+          dia="dia",
+          inicio=("inicio", hhmm),
+          docente=(("docente__apellido", "docente__nombre"), nombre_completo),
+      )
+      items = HORARIO.items(qs)  # qs.values_list(*HORARIO.campos) -> [dict]
+
+  Cada clave sale de un campo del ORM (con `__` para relaciones), tal cual o
+  pasado por una conversión que recibe los valores de uno o más campos.
+  Las claves tal cual van primero en cada item; después, las convertidas.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import uuid
+from collections.abc import Callable, Iterable
+from decimal import Decimal
+
+from django.http import HttpResponse
+from django.utils.functional import Promise
+
+try:
+    import orjson
+except ImportError:  # extra opcional: sin orjson se usa la stdlib
+    orjson = None
+
+
+def _por_defecto(o):
+    """Tipos que ni orjson ni la stdlib codifican solos."""
+    if isinstance(o, Decimal):
+        return str(o)
+    if isinstance(o, datetime.date | datetime.time):
+        return o.isoformat()
+    if isinstance(o, uuid.UUID | Promise):
+        return str(o)
+    raise TypeError(f"{type(o).__name__} no es serializable a JSON")
+
+
+class _Encoder(json.JSONEncoder):
+    def default(self, o):
+        return _por_defecto(o)
+
+
+_encoder = _Encoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps(data) -> bytes:
+    """JSON compacto en UTF-8; mismo resultado con o sin orjson."""
+    if orjson is not None:
+        return orjson.dumps(data, default=_por_defecto, option=orjson.OPT_NON_STR_KEYS)
+    return _encoder.encode(data).encode("utf-8")
+
+
+class RespuestaJSON(HttpResponse):
+    """
+    Como `JsonResponse` (exige un dict salvo `safe=False`), pero codificada con
+    `dumps`.
+    """
+
+    def __init__(self, data, safe: bool = True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError("Para serializar algo que no es un dict, pasá safe=False.")
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=dumps(data), **kwargs)
+
+
+# ---------- conversiones ----------
+def hhmm(t: datetime.time | None) -> str | None:
+    """08:30 (sin segundos), como esperan las grillas de horarios."""
+    return None if t is None else f"{t.hour:02d}:{t.minute:02d}"
+
+
+def nombre_completo(apellido: str | None, nombre: str | None) -> str:
+    """'Apellido, Nombre' sin comas sobrantes si falta alguno."""
+    return f"{apellido or ''}, {nombre or ''}".strip(", ")
+
+
+def etiquetas(choices: Iterable[tuple]) -> Callable:
+    """Conversión valor -> etiqueta de unos `choices` (como `get_FOO_display`)."""
+    mapa = {valor: str(etiqueta) for valor, etiqueta in choices}
+    return lambda valor: mapa.get(valor, valor)
+
+
+# ---------- proyecciones ----------
+class Proyeccion:
+    def __init__(self, **forma):
+        self.forma = forma  # para extenderla: Proyeccion(**OTRA.forma, extra=...)
+        directas, convertidas = [], []
+        for clave, spec in forma.items():
+            if isinstance(spec, str):
+                directas.append((clave, spec))
+            else:
+                origen, conversion = spec
+                origenes = (origen,) if isinstance(origen, str) else tuple(origen)
+                convertidas.append((clave, origenes, conversion))
+
+        campos = [campo for _, campo in directas]
+        for _, origenes, _ in convertidas:
+            for campo in origenes:
+                if campo not in campos:
+                    campos.append(campo)
+        self.campos = tuple(campos)
+        self.claves = tuple(forma)
+        self._directas = tuple(clave for clave, _ in directas)
+        # una sola fuente (lo común) se llama sin armar una tupla de argumentos
+        self._simples = tuple(
+            (clave, campos.index(o[0]), conv) for clave, o, conv in convertidas if len(o) == 1
+        )
+        self._compuestas = tuple(
+            (clave, tuple(campos.index(c) for c in o), conv)
+            for clave, o, conv in convertidas
+            if len(o) > 1
+        )
+
+    def armar(self, fila: tuple) -> dict:
+        """Un item a partir de una tupla con los valores de `campos`, en orden."""
+        # las directas son las primeras columnas de `fila`; el resto alimenta conversiones
+        item = dict(zip(self._directas, fila, strict=False))
+        for clave, i, conversion in self._simples:
+            item[clave] = conversion(fila[i])
+        for clave, indices, conversion in self._compuestas:
+            item[clave] = conversion(*[fila[i] for i in indices])
+        return item
+
+    def items(self, qs) -> list[dict]:
+        """Los items de un queryset, con una sola consulta `values_list`."""
+        armar = self.armar
+        return [armar(fila) for fila in qs.values_list(*self.campos)]
@@ -1,49 +1,20 @@
 # academia_core/signals.py
 
-from django.apps import apps
-
-# ¡Importante! Faltaba importar las señales de autenticación
 from django.contrib.auth.signals import user_logged_in, user_logged_out
 from django.dispatch import receiver
 
-# No obtengas los modelos aquí arriba
-
+from academia_core import auditoria
 
-def _rol_de(user):
-    perfil = getattr(user, "perfil", None)
-    return getattr(perfil, "rol", "")
+# Los eventos van al buffer de auditoría (ver academia_core/auditoria.py):
+# el login/logout no espera un INSERT propio.
 
 
 @receiver(user_logged_in)
 def _on_login(sender, user, **kwargs):
-    # Obtén el modelo JUSTO cuando lo necesites
-    Actividad = apps.get_model("academia_core", "Actividad")
-
-    try:
-        Actividad.objects.create(
-            user=user,
-            rol_cache=_rol_de(user),
-            accion="LOGIN",
-            detalle="Ingreso al sistema",
-        )
-    except Exception:
-        # Es mejor registrar el error que dejar un 'pass' vacío
-        # import logging
-        # logging.exception("No se pudo crear la actividad de LOGIN")
-        pass
+    auditoria.registrar("LOGIN", user, "Ingreso al sistema")
 
 
 @receiver(user_logged_out)
 def _on_logout(sender, user, **kwargs):
-    # Obtén el modelo JUSTO cuando lo necesites
-    Actividad = apps.get_model("academia_core", "Actividad")
-
-    try:
-        Actividad.objects.create(
-            user=user,
-            rol_cache=_rol_de(user),
-            accion="LOGOUT",
-            detalle="Salida del sistema",
-        )
-    except Exception:
-        pass
+    if user is not None:
+        auditoria.registrar("LOGOUT", user, "Salida del sistema")
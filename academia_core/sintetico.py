@@ -0,0 +1,473 @@
+# academia_core/sintetico.py
+"""
+Generador de datos sintéticos de una institución grande.
+
+Arma una institución "de juguete" pero con forma realista:
+carreras → planes → espacios (4 años) con cadenas de correlatividades,
+cohortes de estudiantes con movimientos de varios años y grillas de horarios
+completas para un período. Es determinístico por `seed` y usa `bulk_create`
+en lotes, así que se puede escalar sin depender de signals ni de `full_clean()`.
+
+Lo usan el comando `generar_datos_sinteticos` y los benchmarks.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils.text import slugify
+
+from academia_core import regularidades
+from academia_core.models import (
+    Carrera,
+    Condicion,
+    Correlatividad,
+    Docente,
+    DocenteEspacio,
+    EspacioCurricular,
+    Estudiante,
+    EstudianteProfesorado,
+    Materia,
+    Movimiento,
+    PlanEstudios,
+)
+from academia_horarios.models import (
+    GRILLAS,
+    Comision,
+    Horario,
+    HorarioClase,
+    MateriaEnPlan,
+    Periodo,
+    TimeSlot,
+    TipoDictado,
+)
+
+TEMAS = [
+    "Pedagogía",
+    "Didáctica",
+    "Psicología",
+    "Filosofía",
+    "Sociología",
+    "Historia",
+    "Lengua",
+    "Matemática",
+    "Práctica",
+    "Taller",
+    "Ciencias",
+    "Arte",
+]
+ROMANOS = ["I", "II", "III", "IV"]
+DIAS_HORARIO = ["lu", "ma", "mi", "ju", "vi"]
+
+CONDICIONES = [
+    ("REGULAR", "Regular", "REG"),
+    ("PROMOCION", "Promoción", "REG"),
+    ("APROBADO", "Aprobado", "REG"),
+    ("DESAPROBADO", "Desaprobado", "REG"),
+    ("LIBRE-I", "Libre por inasistencias", "REG"),
+    ("FINAL_APROBADO", "Final aprobado", "FIN"),
+    ("LIBRE", "Libre", "FIN"),
+    ("EQUIVALENCIA", "Equivalencia", "FIN"),
+]
+
+# Tamaño de la institución con escala=1 (crece linealmente con la escala).
+CARRERAS_POR_ESCALA = 2
+ESTUDIANTES_POR_CARRERA = 150
+
+
+@dataclass
+class DatosSinteticos:
+    carreras: int = 0
+    planes: list[int] = field(default_factory=list)
+    espacios: int = 0
+    correlatividades: int = 0
+    estudiantes: int = 0
+    inscripciones: int = 0
+    movimientos: int = 0
+    comisiones: int = 0
+    horarios_clase: int = 0
+    horarios: int = 0
+    periodo_id: int | None = None
+
+
+def nombre_carrera(seed: int, i: int) -> str:
+    return f"Profesorado Sintético {seed}-{i + 1}"
+
+
+def _bulk(modelo, objs: list, batch_size: int, clave: tuple[str, ...]) -> list:
+    """
+    `bulk_create` que garantiza pks en los objetos devueltos.
+
+    En backends sin RETURNING (MySQL) Django no completa los pks: los
+    recuperamos releyendo las filas por su clave natural `clave` (nombres de
+    columna, p. ej. `("plan_id", "materia_id")`). No se puede suponer que los
+    autoincrementos sean consecutivos (inserciones concurrentes,
+    `innodb_autoinc_lock_mode=2`).
+    """
+    if not objs:
+        return objs
+    creados = modelo.objects.bulk_create(objs, batch_size=batch_size)
+    if creados[0].pk is not None:
+        return creados
+
+    def _clave(obj):
+        return tuple(getattr(obj, campo) for campo in clave)
+
+    primero = clave[0]
+    pks = {}
+    valores = sorted({getattr(obj, primero) for obj in creados})
+    for i in range(0, len(valores), batch_size):
+        filas = modelo.objects.filter(**{f"{primero}__in": valores[i : i + batch_size]})
+        for pk, *resto in filas.values_list("pk", *clave):
+            pks[tuple(resto)] = pk
+    for obj in creados:
+        obj.pk = pks[_clave(obj)]
+    return creados
+
+
+def _bloques(turno: str) -> list[tuple[time, time]]:
+    """Bloques de 40' de la grilla del turno, salteando recreos."""
+    g = GRILLAS[turno]
+    out = []
+    actual = g["start"]
+    fin_jornada = g["end"]
+    while True:
+        ini = actual
+        fin = (datetime.combine(date(2000, 1, 1), ini) + timedelta(minutes=40)).time()
+        if fin > fin_jornada:
+            break
+        if any(ini < b and fin > a for a, b in g["breaks"]):
+            # saltamos hasta el final del recreo
+            actual = next(b for a, b in g["breaks"] if ini < b and fin > a)
+            continue
+        out.append((ini, fin))
+        actual = fin
+    return out
+
+
+def _movimientos(rng, ep, por_plan_anio, cond, anio_base) -> list[Movimiento]:
+    """Trayectoria de una inscripción: una cursada por espacio y año, más finales."""
+    out = []
+    anios_cursados = min(4, anio_base - ep.cohorte + 1)
+    for anio in range(1, anios_cursados + 1):
+        ciclo = ep.cohorte + anio - 1
+        for e in por_plan_anio[(ep.plan_id, anio)]:
+            r = rng.random()
+            fecha_reg = date(ciclo, 7 if e.cuatrimestre == "1" else 11, rng.randint(1, 28))
+            if r < 0.15:
+                codigo, nota = "PROMOCION", Decimal(rng.randint(8, 10))
+            elif r < 0.85:
+                codigo, nota = "REGULAR", Decimal(rng.randint(6, 10))
+            elif r < 0.93:
+                codigo, nota = "DESAPROBADO", Decimal(rng.randint(1, 5))
+            else:
+                codigo, nota = "LIBRE-I", None
+            out.append(
+                Movimiento(
+                    inscripcion=ep,
+                    espacio=e,
+                    tipo="REG",
+                    fecha=fecha_reg,
+                    condicion=cond[codigo],
+                    nota_num=nota,
+                )
+            )
+            if codigo != "REGULAR":
+                continue
+            # Hasta 3 intentos de final por regularidad
+            fecha_fin = fecha_reg
+            for _ in range(3):
+                if rng.random() < 0.4:
+                    break
+                fecha_fin = fecha_fin + timedelta(days=rng.randint(30, 150))
+                nota_fin = Decimal(rng.randint(2, 10))
+                out.append(
+                    Movimiento(
+                        inscripcion=ep,
+                        espacio=e,
+                        tipo="FIN",
+                        fecha=fecha_fin,
+                        condicion=cond["REGULAR"],
+                        nota_num=nota_fin,
+                    )
+                )
+                if nota_fin >= 6:
+                    break
+    return out
+
+
+@transaction.atomic
+def generar(
+    escala: int = 1,
+    seed: int = 42,
+    batch_size: int = 1000,
+    anio_base: int = 2025,
+    espacios_por_anio: int = 8,
+    carreras: int | None = None,
+    estudiantes_por_carrera: int | None = None,
+) -> DatosSinteticos:
+    """
+    Genera la institución completa en una transacción.
+
+    `escala` multiplica la cantidad de carreras (y con ellas estudiantes,
+    movimientos y comisiones); `carreras` y `estudiantes_por_carrera`
+    permiten fijar los tamaños a mano. Con escala=1 salen ~300 estudiantes
+    y ~10k movimientos.
+    """
+    rng = random.Random(seed)
+    res = DatosSinteticos()
+    carreras = carreras if carreras is not None else CARRERAS_POR_ESCALA * escala
+    if estudiantes_por_carrera is None:
+        estudiantes_por_carrera = ESTUDIANTES_POR_CARRERA
+
+    # ---------- Condiciones (catálogo fijo) ----------
+    for codigo, nombre, tipo in CONDICIONES:
+        Condicion.objects.get_or_create(codigo=codigo, defaults={"nombre": nombre, "tipo": tipo})
+    cond = {c.codigo: c for c in Condicion.objects.all()}
+
+    # ---------- Carreras / planes ----------
+    carrera_objs = _bulk(
+        Carrera,
+        [
+            Carrera(nombre=nombre_carrera(seed, i), abreviatura=f"PS{i + 1}")
+            for i in range(carreras)
+        ],
+        batch_size,
+        ("nombre",),
+    )
+    plan_objs = _bulk(
+        PlanEstudios,
+        [
+            PlanEstudios(
+                carrera=c,
+                resolucion=f"{100 + i}/{anio_base % 100}",
+                resolucion_slug=slugify(f"{100 + i}-{anio_base % 100}"),
+                nombre=f"Plan {anio_base}",
+                vigente=True,
+            )
+            for i, c in enumerate(carrera_objs)
+        ],
+        batch_size,
+        ("carrera_id", "resolucion"),
+    )
+    res.carreras = len(carrera_objs)
+    res.planes = [p.id for p in plan_objs]
+
+    # ---------- Materias / espacios ----------
+    cuatris = ["1", "2", "A"]
+    materias = []
+    espacios = []
+    for p_idx, plan in enumerate(plan_objs):
+        for anio in range(1, 5):
+            for k in range(espacios_por_anio):
+                tema = TEMAS[(k + anio) % len(TEMAS)]
+                nombre = f"{tema} {ROMANOS[anio - 1]} ({seed}.{p_idx + 1}.{anio}.{k + 1})"
+                materias.append(Materia(nombre=nombre))
+                espacios.append(
+                    EspacioCurricular(
+                        plan=plan,
+                        anio=f"{anio}°",
+                        cuatrimestre=cuatris[k % len(cuatris)],
+                        horas=rng.choice([64, 96, 128]),
+                        formato=rng.choice(["Asignatura", "Taller", "Seminario"]),
+                        libre_habilitado=rng.random() < 0.3,
+                    )
+                )
+    materias = _bulk(Materia, materias, batch_size, ("nombre",))
+    for esp, mat in zip(espacios, materias, strict=True):
+        esp.materia = mat
+    espacios = _bulk(EspacioCurricular, espacios, batch_size, ("materia_id", "plan_id"))
+    res.espacios = len(espacios)
+
+    por_plan_anio: dict[tuple[int, int], list[EspacioCurricular]] = {}
+    for e in espacios:
+        por_plan_anio.setdefault((e.plan_id, int(e.anio[0])), []).append(e)
+
+    # ---------- Correlatividades (DAG año a año) ----------
+    correlatividades = []
+    for plan in plan_objs:
+        for anio in range(2, 5):
+            previos = por_plan_anio[(plan.id, anio - 1)]
+            for idx, e in enumerate(por_plan_anio[(plan.id, anio)]):
+                if anio == 4 and idx == 0:
+                    correlatividades.append(
+                        Correlatividad(
+                            plan=plan,
+                            espacio=e,
+                            tipo="CURSAR",
+                            requisito="REGULARIZADA",
+                            requiere_todos_hasta_anio=2,
+                        )
+                    )
+                    continue
+                for req in rng.sample(previos, k=min(len(previos), rng.choice([1, 2]))):
+                    correlatividades.append(
+                        Correlatividad(
+                            plan=plan,
+                            espacio=e,
+                            tipo="CURSAR",
+                            requisito="REGULARIZADA",
+                            requiere_espacio=req,
+                        )
+                    )
+                    correlatividades.append(
+                        Correlatividad(
+                            plan=plan,
+                            espacio=e,
+                            tipo="RENDIR",
+                            requisito="APROBADA",
+                            requiere_espacio=req,
+                        )
+                    )
+    Correlatividad.objects.bulk_create(correlatividades, batch_size=batch_size)
+    res.correlatividades = len(correlatividades)
+
+    # ---------- Estudiantes / inscripciones / movimientos (por lotes) ----------
+    total_est = carreras * estudiantes_por_carrera
+    for desde in range(0, total_est, batch_size):
+        hasta = min(total_est, desde + batch_size)
+        estudiantes = _bulk(
+            Estudiante,
+            [
+                Estudiante(
+                    dni=f"9{seed:03d}{i:06d}",
+                    apellido=f"Apellido{i:06d}",
+                    nombre=f"Nombre{i:06d}",
+                    email=f"est{seed}.{i}@example.com",
+                    activo=rng.random() > 0.05,
+                )
+                for i in range(desde, hasta)
+            ],
+            batch_size,
+            ("dni",),
+        )
+        inscripciones = []
+        for i, est in enumerate(estudiantes, start=desde):
+            docs = rng.random() > 0.3
+            ep = EstudianteProfesorado(
+                estudiante=est,
+                carrera=carrera_objs[i % len(carrera_objs)],
+                plan=plan_objs[i % len(plan_objs)],
+                cohorte=anio_base - rng.randint(0, 3),
+                doc_dni_legalizado=True,
+                doc_titulo_sec_legalizado=docs,
+                doc_cert_medico=docs,
+                doc_fotos_carnet=True,
+                doc_folios_oficio=True,
+                adeuda_materias=rng.random() < 0.1,
+            )
+            ep.legajo_estado = ep.calcular_legajo_estado()
+            ep.condicion_admin = ep.calcular_condicion_admin()
+            inscripciones.append(ep)
+        inscripciones = _bulk(
+            EstudianteProfesorado, inscripciones, batch_size, ("estudiante_id", "plan_id")
+        )
+
+        movimientos = []
+        for ep in inscripciones:
+            movimientos.extend(_movimientos(rng, ep, por_plan_anio, cond, anio_base))
+        Movimiento.objects.bulk_create(movimientos, batch_size=batch_size)
+        regularidades.actualizar_inscripciones([ep.pk for ep in inscripciones], batch_size)
+
+        res.estudiantes += len(estudiantes)
+        res.inscripciones += len(inscripciones)
+        res.movimientos += len(movimientos)
+
+    # ---------- Docentes ----------
+    docentes = _bulk(
+        Docente,
+        [
+            Docente(dni=f"8{seed:03d}{i:05d}", apellido=f"Docente{i:05d}", nombre="Sintético")
+            for i in range(max(1, len(espacios) // 3))
+        ],
+        batch_size,
+        ("dni",),
+    )
+    DocenteEspacio.objects.bulk_create(
+        [
+            DocenteEspacio(docente=docentes[i % len(docentes)], espacio=e)
+            for i, e in enumerate(espacios)
+        ],
+        batch_size=batch_size,
+    )
+
+    # ---------- Horarios del período (grilla completa) ----------
+    periodo, _ = Periodo.objects.get_or_create(ciclo_lectivo=anio_base, cuatrimestre=1)
+    res.periodo_id = periodo.id
+    timeslots = []
+    for dia in range(1, 6):
+        for ini, fin in _bloques("manana"):
+            ts, _ = TimeSlot.objects.get_or_create(
+                dia_semana=dia, inicio=ini, fin=fin, defaults={"turno": "manana"}
+            )
+            timeslots.append(ts)
+
+    meps = _bulk(
+        MateriaEnPlan,
+        [
+            MateriaEnPlan(
+                plan_id=e.plan_id,
+                materia=e,
+                anio=int(e.anio[0]),
+                tipo_dictado=TipoDictado.ANUAL
+                if e.cuatrimestre == "A"
+                else TipoDictado.CUATRIMESTRAL,
+                horas_catedra_semana_1c=4,
+                horas_catedra_semana_2c=4,
+            )
+            for e in espacios
+            if e.cuatrimestre in ("1", "A")
+        ],
+        batch_size,
+        ("materia_id", "plan_id"),
+    )
+    comisiones = _bulk(
+        Comision,
+        [
+            Comision(
+                materia_en_plan=m, periodo=periodo, turno="manana", nombre="Única", seccion="A"
+            )
+            for m in meps
+        ],
+        batch_size,
+        ("materia_en_plan_id", "periodo_id", "seccion"),
+    )
+    res.comisiones = len(comisiones)
+
+    espacio_por_id = {e.id: e for e in espacios}
+    carrera_por_plan = {p.id: p.carrera_id for p in plan_objs}
+    ocupados: dict[tuple[int, int], set[int]] = {}
+    horarios_clase = []
+    horarios = []
+    for com, mep in zip(comisiones, meps, strict=True):
+        key = (carrera_por_plan[mep.plan_id], mep.anio)
+        usados = ocupados.setdefault(key, set())
+        libres = [ts for ts in timeslots if ts.id not in usados]
+        elegidos = rng.sample(libres, k=min(len(libres), mep.horas_catedra_semana_1c))
+        esp = espacio_por_id[mep.materia_id]
+        for ts in elegidos:
+            usados.add(ts.id)
+            horarios_clase.append(HorarioClase(comision=com, timeslot=ts))
+            horarios.append(
+                Horario(
+                    materia=esp,
+                    plan_id=mep.plan_id,
+                    profesorado_id=carrera_por_plan[mep.plan_id],
+                    anio=mep.anio,
+                    comision=com.seccion,
+                    docente=docentes[esp.id % len(docentes)],
+                    dia=DIAS_HORARIO[ts.dia_semana - 1],
+                    inicio=ts.inicio,
+                    fin=ts.fin,
+                    turno="manana",
+                )
+            )
+    HorarioClase.objects.bulk_create(horarios_clase, batch_size=batch_size)
+    Horario.objects.bulk_create(horarios, batch_size=batch_size)
+    res.horarios_clase = len(horarios_clase)
+    res.horarios = len(horarios)
+    return res
@@ -0,0 +1,128 @@
+# academia_core/tareas.py
+"""
+Tareas encolables con `jobs.encolar(<nombre>, {parámetros})`.
+
+Se registran al cargar la app (AcademiaCoreConfig.ready). Cada tarea recibe
+un `jobs.Contexto` y devuelve un dict JSON con el resultado.
+"""
+
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+
+from academia_core import kpis, promedios
+from academia_core.jobs import tarea
+from academia_core.models import EstudianteProfesorado
+
+
+@tarea("recalcular_promedios")
+def recalcular_promedios(ctx, batch_size=5000):
+    rangos = promedios.rangos_pk(EstudianteProfesorado.objects.all(), batch_size)
+    revisados = cambios = 0
+    carreras = set()
+    for i, (desde, hasta) in enumerate(rangos, start=1):
+        res = promedios.recalcular_promedios(desde, hasta)
+        revisados, cambios = revisados + res.revisados, cambios + res.cambios
+        carreras |= res.carreras
+        ctx.progreso(i, len(rangos), f"{revisados} inscripciones")
+    kpis.marcar_sucias(carreras)
+    return {"recalculados": revisados, "cambiaron": cambios}
+
+
+@tarea("recalcular_legajos")
+def recalcular_legajos(ctx, carrera_id=None, cohorte=None):
+    from academia_core.legajos import recalcular_legajos as _recalcular
+
+    qs = EstudianteProfesorado.objects.all()
+    if carrera_id:
+        qs = qs.filter(carrera_id=carrera_id)
+    if cohorte:
+        qs = qs.filter(cohorte=cohorte)
+    actualizadas = _recalcular(qs)
+    if actualizadas:
+        kpis.marcar_sucias(qs.values_list("carrera_id", flat=True).distinct())
+    return {"actualizadas": actualizadas}
+
+
+@tarea("recalcular_kpis")
+def recalcular_kpis(ctx):
+    desvio = kpis.reconstruir()
+    return {m: {"antes": antes, "ahora": ahora} for m, (antes, ahora) in desvio.items()}
+
+
+@tarea("auditar_datos")
+def auditar_datos(ctx, simular=False):
+    def _progreso(paso, hecho, total):
+        ctx.progreso(hecho, total, f"{paso}: lote {hecho}/{total}")
+
+    res = promedios.auditar(simular=simular, progreso=_progreso)
+    return {
+        "notas_convertidas": res.notas.cambios,
+        "promedios_revisados": res.promedios.revisados,
+        "promedios_cambiados": res.promedios.cambios,
+    }
+
+
+@tarea("inscribir_cohorte")
+def inscribir_cohorte(ctx, plan_id, cohorte, anio, anio_academico, usuario_id=None):
+    from academia_core.inscripciones import inscribir_cohorte as _inscribir
+
+    usuario = get_user_model().objects.filter(pk=usuario_id).first() if usuario_id else None
+    ctx.progreso(0, mensaje=f"Inscribiendo cohorte {cohorte}…")
+    res = _inscribir(plan_id, cohorte, anio, anio_academico, usuario=usuario)
+    return {
+        "estudiantes": res.estudiantes,
+        "espacios": len(res.espacios),
+        "inscriptas": res.inscriptas,
+        "existentes": res.existentes,
+        "bloqueadas": {str(k): v for k, v in res.bloqueadas.items()},
+    }
+
+
+@tarea("precalcular_finales")
+def precalcular_finales(ctx, ventana_id, plan_ids=None):
+    from academia_core.finales import precalcular
+    from academia_core.models import VentanaFinal
+
+    ventana = VentanaFinal.objects.get(pk=ventana_id)
+    ctx.progreso(0, mensaje=f"Calculando habilitaciones de {ventana.nombre}…")
+    res = precalcular(
+        ventana,
+        plan_ids,
+        progreso=lambda hecho, total: ctx.progreso(hecho, total, f"lote {hecho}/{total}"),
+    )
+    return {
+        "habilitadas": res.habilitadas,
+        "inscripciones": res.inscripciones,
+        "descartadas": dict(res.descartadas),
+    }
+
+
+@tarea("vencimientos_regularidad")
+def vencimientos_regularidad(ctx, reconstruir=False):
+    from academia_core import regularidades
+
+    res = {}
+    if reconstruir:
+        res["reconstruidas"] = regularidades.reconstruir(
+            progreso=lambda hecho, total: ctx.progreso(hecho, total, f"lote {hecho}/{total}")
+        )
+    res["vencidas"] = regularidades.marcar_vencidas()
+    return res
+
+
+@tarea("depurar_auditoria")
+def depurar_auditoria(ctx, meses=None):
+    from academia_core.auditoria import depurar
+
+    return {"borrados": depurar(meses)}
+
+
+@tarea("generar_miniaturas")
+def generar_miniaturas(ctx, estudiante_ids=None):
+    from academia_core.fotos import generar_pendientes
+
+    return generar_pendientes(
+        estudiante_ids,
+        progreso=lambda hecho, total: ctx.progreso(hecho, total, f"foto {hecho}/{total}"),
+    )
@@ -1,19 +1,39 @@
 from django.urls import path
 
 from .views import (
+    cache_estadisticas_api,
     cargar_carrera_view,
     carrera_delete_api,
     carrera_get_api,
     carrera_list_api,
     carrera_save_api,
+    conexiones_estadisticas_api,
+    foto_miniatura,
+    job_cancelar_api,
+    job_encolar_api,
+    job_estado_api,
+    job_lista_api,
     plan_list_api,
     plan_save_api,
 )
+from .views_api import (
+    api_auditoria,
+    api_autocompletar_espacios,
+    api_autocompletar_inscripciones,
+    api_espacios_habilitados,
+    api_finales_habilitados,
+    api_inscribir_espacio,
+    api_inscribir_final,
+    api_plan_analisis,
+    api_plan_egreso,
+    api_regularidades_por_vencer,
+)
 
 app_name = "academia_core"
 
 urlpatterns = [
     path("administracion/carreras/", cargar_carrera_view, name="cargar_carrera"),
+    path("fotos/<path:nombre>", foto_miniatura, name="foto_miniatura"),
     # APIs
     path("api/carreras/lista/", carrera_list_api, name="carrera_list_api"),
     path("api/carreras/get/<int:pk>/", carrera_get_api, name="carrera_get_api"),
@@ -21,4 +41,40 @@ urlpatterns = [
     path("api/carreras/delete/<int:pk>/", carrera_delete_api, name="carrera_delete_api"),
     path("api/planes/lista/", plan_list_api, name="plan_list_api"),
     path("api/planes/guardar/", plan_save_api, name="plan_save_api"),
+    path("api/planes/<int:plan_id>/analisis/", api_plan_analisis, name="api_plan_analisis"),
+    path(
+        "api/inscripciones/espacios-habilitados/",
+        api_espacios_habilitados,
+        name="api_espacios_habilitados",
+    ),
+    path("api/inscripciones/espacio/", api_inscribir_espacio, name="api_inscribir_espacio"),
+    path("api/inscripciones/<int:insc_id>/plan-egreso/", api_plan_egreso, name="api_plan_egreso"),
+    path(
+        "api/autocompletar/inscripciones/",
+        api_autocompletar_inscripciones,
+        name="api_autocompletar_inscripciones",
+    ),
+    path(
+        "api/autocompletar/espacios/",
+        api_autocompletar_espacios,
+        name="api_autocompletar_espacios",
+    ),
+    path("api/finales/habilitados/", api_finales_habilitados, name="api_finales_habilitados"),
+    path("api/finales/inscribir/", api_inscribir_final, name="api_inscribir_final"),
+    path(
+        "api/regularidades/por-vencer/",
+        api_regularidades_por_vencer,
+        name="api_regularidades_por_vencer",
+    ),
+    path("api/auditoria/", api_auditoria, name="api_auditoria"),
+    path("api/cache/estadisticas/", cache_estadisticas_api, name="cache_estadisticas_api"),
+    path(
+        "api/conexiones/estadisticas/",
+        conexiones_estadisticas_api,
+        name="conexiones_estadisticas_api",
+    ),
+    path("api/jobs/", job_lista_api, name="job_lista_api"),
+    path("api/jobs/encolar/", job_encolar_api, name="job_encolar_api"),
+    path("api/jobs/<int:pk>/", job_estado_api, name="job_estado_api"),
+    path("api/jobs/<int:pk>/cancelar/", job_cancelar_api, name="job_cancelar_api"),
 ]
@@ -1,7 +1,7 @@
 # academia_core/utils.py
 from typing import Any
 
-from django.apps import apps
+from academia_core.modelos import modelos
 
 
 def get(obj: Any, key: str, default: Any = None) -> Any:
@@ -13,7 +13,4 @@ def get(obj: Any, key: str, default: Any = None) -> Any:
 
 
 def get_model(app_label: str, model_name: str):
-    try:
-        return apps.get_model(app_label, model_name)
-    except LookupError:
-        return None
+    return modelos.get(app_label, model_name)
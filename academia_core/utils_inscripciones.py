@@ -1,6 +1,8 @@
 from datetime import timedelta
 
 REG_OK_CODIGOS = {"PROMOCION", "APROBADO", "REGULAR"}
+VIGENCIA_REGULARIDAD = timedelta(days=730)
+APROB_REG_CODIGOS = {"PROMOCION", "APROBADO"}
 
 
 def tiene_regularizada(insc, esp, hasta_fecha=None) -> bool:
@@ -11,9 +13,7 @@ def tiene_regularizada(insc, esp, hasta_fecha=None) -> bool:
 
 
 def tiene_aprobada(insc, esp, hasta_fecha=None) -> bool:
-    qs1 = insc.movimientos.filter(
-        espacio=esp, tipo="REG", condicion__codigo__in={"PROMOCION", "APROBADO"}
-    )
+    qs1 = insc.movimientos.filter(espacio=esp, tipo="REG", condicion__codigo__in=APROB_REG_CODIGOS)
     qs2 = insc.movimientos.filter(
         espacio=esp, tipo="FIN", condicion__codigo="REGULAR", nota_num__gte=6
     )
@@ -30,6 +30,42 @@ def tiene_aprobada(insc, esp, hasta_fecha=None) -> bool:
     return qs1.exists() or qs2.exists() or qs3.exists()
 
 
+def estados_academicos(insc_ids, hasta_fecha=None, lote: int = 1000):
+    """
+    Versión masiva de tiene_regularizada/tiene_aprobada.
+
+    Devuelve {insc_id: (regularizadas, aprobadas)} con conjuntos de espacio_id,
+    leyendo los movimientos de todas las inscripciones en una consulta por lote.
+    """
+    from django.db.models import Q
+
+    from academia_core.models import Movimiento
+
+    out = {pk: (set(), set()) for pk in insc_ids}
+    ids = list(out)
+    relevantes = Q(tipo="REG", condicion_id__in=REG_OK_CODIGOS) | Q(
+        tipo="FIN", condicion_id__in={"REGULAR", "EQUIVALENCIA"}
+    )
+    for i in range(0, len(ids), lote):
+        qs = Movimiento.objects.filter(relevantes, inscripcion_id__in=ids[i : i + lote])
+        if hasta_fecha:
+            qs = qs.filter(fecha__lte=hasta_fecha)
+        filas = qs.order_by().values_list(
+            "inscripcion_id", "espacio_id", "tipo", "condicion_id", "nota_num", "nota_texto"
+        )
+        for insc_id, esp_id, tipo, cond, nota, texto in filas:
+            regularizadas, aprobadas = out[insc_id]
+            if tipo == "REG":
+                regularizadas.add(esp_id)
+                if cond in APROB_REG_CODIGOS:
+                    aprobadas.add(esp_id)
+            elif (cond == "REGULAR" and nota is not None and nota >= 6) or (
+                cond == "EQUIVALENCIA" and (texto or "").lower() == "equivalencia"
+            ):
+                aprobadas.add(esp_id)
+    return out
+
+
 def cumple_correlativas(insc, esp, tipo: str, fecha=None):
     from academia_core.models import Correlatividad, EspacioCurricular
 
@@ -55,7 +91,7 @@ def cumple_correlativas(insc, esp, tipo: str, fecha=None):
 
 
 def tiene_regularidad_vigente(insc, esp, a_fecha) -> bool:
-    limite = a_fecha - timedelta(days=730)
-    return insc.movimientos.filter(
-        espacio=esp, tipo="REG", condicion__codigo="REGULAR", fecha__gte=limite
-    ).exists()
+    """REG `REGULAR` de hace menos de 2 años a `a_fecha` (lee la proyección `Regularidad`)."""
+    from academia_core.regularidades import vigente
+
+    return vigente(getattr(insc, "pk", insc), getattr(esp, "pk", esp), a_fecha)
@@ -3,12 +3,13 @@ import logging
 
 from django.contrib.auth.decorators import login_required
 from django.db import transaction
-from django.http import JsonResponse
+from django.http import FileResponse, Http404, JsonResponse
 from django.shortcuts import get_object_or_404, render
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_GET, require_http_methods, require_POST
 
-from academia_core.models import Carrera, PlanEstudios
+from academia_core import conexiones, fotos, jobs, referencia_cache
+from academia_core.models import Carrera, Estudiante, Job, PlanEstudios
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +22,18 @@ def cargar_carrera_view(request):
     return render(request, "academia_core/cargar_carrera.html", {"planes": planes})
 
 
+@login_required
+@require_GET
+def foto_miniatura(request, nombre):
+    """Miniatura de una foto: el nombre es el hash, así que se cachea como inmutable."""
+    storage = Estudiante._meta.get_field("foto").storage
+    if not fotos.es_miniatura(nombre) or not storage.exists(nombre):
+        raise Http404
+    resp = FileResponse(storage.open(nombre, "rb"))
+    resp["Cache-Control"] = fotos.CACHE_CONTROL
+    return resp
+
+
 # ======== APIS ========
 @login_required
 @require_GET
@@ -135,3 +148,82 @@ def plan_save_api(request):
     except Exception:
         logger.exception("plan_save_api failed")
         return JsonResponse({"ok": False, "error": "Internal server error"}, status=500)
+
+
+@login_required
+@require_GET
+def cache_estadisticas_api(request):
+    """Hits/misses de la caché de datos de referencia (solo staff)."""
+    if not (request.user.is_staff or request.user.is_superuser):
+        return JsonResponse({"error": "Solo staff."}, status=403)
+    return JsonResponse({"grupos": referencia_cache.estadisticas()})
+
+
+@login_required
+@require_GET
+def conexiones_estadisticas_api(request):
+    """
+    Tiempos de adquisición de conexiones de este proceso, por alias, y uso de
+    la réplica de reportes (solo staff).
+    """
+    if not (request.user.is_staff or request.user.is_superuser):
+        return JsonResponse({"error": "Solo staff."}, status=403)
+    return JsonResponse(
+        {"alias": conexiones.estadisticas(), "replica": conexiones.estadisticas_replica()}
+    )
+
+
+# ======== COLA DE TRABAJOS ========
+def _es_staff(user) -> bool:
+    return bool(user.is_staff or user.is_superuser)
+
+
+@login_required
+@require_GET
+def job_lista_api(request):
+    """Últimos trabajos (staff: todos; resto: los propios)."""
+    qs = Job.objects.all()
+    if not _es_staff(request.user):
+        qs = qs.filter(creado_por=request.user)
+    return JsonResponse({"items": [jobs.resumen(j) for j in qs[:20]]})
+
+
+@login_required
+@require_POST
+def job_encolar_api(request):
+    """Encola una tarea. Body JSON: {"tipo": "...", "parametros": {...}}."""
+    if not _es_staff(request.user):
+        return JsonResponse({"ok": False, "error": "Solo staff."}, status=403)
+    try:
+        data = json.loads(request.body.decode("utf-8") or "{}")
+    except ValueError:
+        return JsonResponse({"ok": False, "error": "JSON inválido"}, status=400)
+    parametros = data.get("parametros") or {}
+    if not isinstance(parametros, dict):
+        return JsonResponse({"ok": False, "error": "parametros debe ser un objeto"}, status=400)
+    try:
+        job = jobs.encolar(data.get("tipo") or "", parametros, usuario=request.user)
+    except ValueError as exc:
+        return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+    return JsonResponse({"ok": True, **jobs.resumen(job)}, status=202)
+
+
+@login_required
+@require_GET
+def job_estado_api(request, pk):
+    job = get_object_or_404(Job, pk=pk)
+    if not (_es_staff(request.user) or job.creado_por_id == request.user.pk):
+        return JsonResponse({"error": "No autorizado."}, status=403)
+    return JsonResponse(jobs.resumen(job))
+
+
+@login_required
+@require_POST
+def job_cancelar_api(request, pk):
+    job = get_object_or_404(Job, pk=pk)
+    if not (_es_staff(request.user) or job.creado_por_id == request.user.pk):
+        return JsonResponse({"ok": False, "error": "No autorizado."}, status=403)
+    if not jobs.cancelar(job.pk):
+        return JsonResponse({"ok": False, "error": "El trabajo ya terminó."}, status=409)
+    job.refresh_from_db()
+    return JsonResponse({"ok": True, **jobs.resumen(job)})
@@ -1,80 +1,81 @@
-from django.apps import apps
+from django.contrib.auth.decorators import login_required
 from django.db.models import Q
-from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from django.views.decorators.http import require_GET, require_POST
 
+from academia_core import auditoria, opciones, referencia_cache
+from academia_core.conexiones import usar_replica
 from academia_core.eligibilidad import habilitado
+from academia_core.inscripciones import con_idempotencia, inscribir_espacio
 from academia_core.models import Carrera as Profesorado
 from academia_core.models import (  # Added Correlatividad
     Correlatividad,
     Docente,
     EspacioCurricular,
     Estudiante,
+    EstudianteProfesorado,
     Movimiento,
     PlanEstudios,
 )
+from academia_core.serializacion import Proyeccion, RespuestaJSON, etiquetas, nombre_completo
+
+PERSONA = Proyeccion(
+    id="id",
+    dni="dni",
+    email="email",
+    nombre_completo=(("apellido", "nombre"), nombre_completo),
+)
+PLAN = Proyeccion(id="id", nombre="nombre", resolucion="resolucion", profesorado_id="carrera_id")
+ESPACIO = Proyeccion(id="id", nombre="materia__nombre", anio="anio", cuatrimestre="cuatrimestre")
+MOVIMIENTO = Proyeccion(
+    id="id",
+    espacio="espacio__materia__nombre",
+    fecha="fecha",
+    condicion="condicion__nombre",
+    nota_num="nota_num",
+    nota_texto="nota_texto",
+    tipo=("tipo", etiquetas(Movimiento._meta.get_field("tipo").choices)),
+)
+ACTIVIDAD = Proyeccion(
+    id="id",
+    creado="creado",
+    rol="rol_cache",
+    accion="accion",
+    detalle="detalle",
+    usuario=("user__username", lambda u: u or ""),
+)
 
 
 @require_GET
+@usar_replica
 def api_listar_estudiantes(request):
     estudiantes = Estudiante.objects.filter(activo=True).order_by("apellido", "nombre")
-    data = [
-        {
-            "id": e.id,
-            "nombre_completo": f"{e.apellido}, {e.nombre}",
-            "dni": e.dni,
-            "email": e.email,
-        }
-        for e in estudiantes
-    ]
-    return JsonResponse({"items": data})
+    return RespuestaJSON({"items": PERSONA.items(estudiantes)})
 
 
 @require_GET
+@usar_replica
 def api_listar_docentes(request):
     docentes = Docente.objects.filter(activo=True).order_by("apellido", "nombre")
-    data = [
-        {
-            "id": d.id,
-            "nombre_completo": f"{d.apellido}, {d.nombre}",
-            "dni": d.dni,
-            "email": d.email,
-        }
-        for d in docentes
-    ]
-    return JsonResponse({"items": data})
+    return RespuestaJSON({"items": PERSONA.items(docentes)})
 
 
 @require_GET
+@usar_replica
 def api_listar_profesorados(request):
-    profesorados = Profesorado.objects.all().order_by("nombre")
-    data = [
-        {
-            "id": p.id,
-            "nombre": p.nombre,
-        }
-        for p in profesorados
-    ]
-    return JsonResponse({"items": data})
+    profesorados = Profesorado.objects.order_by("nombre").values("id", "nombre")
+    return RespuestaJSON({"items": list(profesorados)})
 
 
 @require_GET
+@usar_replica
 def api_listar_planes_estudios(request):
     profesorado_id = request.GET.get("profesorado_id")
     planes = PlanEstudios.objects.all().order_by("carrera__nombre", "nombre")
     if profesorado_id:
         planes = planes.filter(carrera_id=profesorado_id)
-    data = [
-        {
-            "id": p.id,
-            "nombre": p.nombre,
-            "resolucion": p.resolucion,
-            "profesorado_id": p.carrera_id,
-        }
-        for p in planes
-    ]
-    return JsonResponse({"items": data})
+    return RespuestaJSON({"items": PLAN.items(planes)})
 
 
 @require_GET
@@ -92,7 +93,7 @@ def api_get_estudiante_detalle(request, pk):
         "localidad": estudiante.localidad,
         "activo": estudiante.activo,
     }
-    return JsonResponse(data)
+    return RespuestaJSON(data)
 
 
 @require_GET
@@ -106,7 +107,7 @@ def api_get_docente_detalle(request, pk):
         "email": docente.email,
         "activo": docente.activo,
     }
-    return JsonResponse(data)
+    return RespuestaJSON(data)
 
 
 @require_GET
@@ -122,48 +123,43 @@ def api_get_espacio_curricular_detalle(request, pk):
         "formato": espacio.formato,
         "libre_habilitado": espacio.libre_habilitado,
     }
-    return JsonResponse(data)
+    return RespuestaJSON(data)
 
 
 # NUEVO: API para listar espacios curriculares (filtrado por plan)
 @require_GET
+@usar_replica
 def api_listar_espacios_curriculares(request):
     plan_id = request.GET.get("plan_id")
-    espacios = EspacioCurricular.objects.all().order_by("nombre")
     if plan_id:
-        espacios = espacios.filter(plan_id=plan_id)
+        if not plan_id.isdigit():
+            return RespuestaJSON({"items": []})
+        plan_ids = [int(plan_id)]
+    else:
+        plan_ids = [p["id"] for p in referencia_cache.get_planes()]
     data = [
         {
-            "id": e.id,
-            "nombre": e.nombre,
-            "anio": e.anio,
-            "cuatrimestre": e.cuatrimestre,
+            "id": e["id"],
+            "nombre": e["nombre"],
+            "etiqueta": e["etiqueta"],
+            "anio": e["anio"],
+            "cuatrimestre": e["cuatrimestre"],
         }
-        for e in espacios
+        for pk in plan_ids
+        for e in referencia_cache.get_plan_espacios(pk)
     ]
-    return JsonResponse({"items": data})
+    if not plan_id:
+        data.sort(key=lambda e: e["nombre"])
+    return RespuestaJSON({"items": data})
 
 
 @require_GET
+@usar_replica
 def api_get_movimientos_estudiante(request, estudiante_id):
-    movimientos = (
-        Movimiento.objects.filter(inscripcion__estudiante_id=estudiante_id)
-        .select_related("espacio", "condicion")
-        .order_by("-fecha")
+    movimientos = Movimiento.objects.filter(inscripcion__estudiante_id=estudiante_id).order_by(
+        "-fecha"
     )
-    data = [
-        {
-            "id": m.id,
-            "espacio": m.espacio.nombre,
-            "tipo": m.get_tipo_display(),
-            "fecha": m.fecha,
-            "condicion": m.condicion.nombre,
-            "nota_num": m.nota_num,
-            "nota_texto": m.nota_texto,
-        }
-        for m in movimientos
-    ]
-    return JsonResponse({"items": data})
+    return RespuestaJSON({"items": MOVIMIENTO.items(movimientos)})
 
 
 @require_GET
@@ -175,34 +171,20 @@ def api_get_correlatividades(request, espacio_id, insc_id=None):
 
     # Get all other spaces in the same plan, excluding the principal space
     all_other_spaces_in_plan = (
-        EspacioCurricular.objects.filter(plan=plan).exclude(pk=espacio_id).order_by("nombre")
+        EspacioCurricular.objects.filter(plan=plan)
+        .exclude(pk=espacio_id)
+        .order_by("materia__nombre")
     )
-
-    data = []
-    for esp in all_other_spaces_in_plan:
-        data.append(
-            {
-                "id": esp.id,
-                "nombre": esp.nombre,
-                "anio": esp.anio,
-                "cuatrimestre": esp.cuatrimestre,
-            }
-        )
-
-    return JsonResponse({"items": data})
-
-
-InscripcionEspacio = (
-    apps.get_model("academia_core", "InscripcionEspacio")
-    or apps.get_model("academia_core", "InscripcionCursada")
-    or apps.get_model("academia_core", "InscripcionMateria")
-)
+    return RespuestaJSON({"items": ESPACIO.items(all_other_spaces_in_plan)})
 
 
 @require_GET
 def api_espacios_habilitados(request):
-    est = int(request.GET["est"])
-    plan = int(request.GET["plan"])
+    est = request.GET.get("est") or ""
+    plan = request.GET.get("plan") or ""
+    if not (est.isdigit() and plan.isdigit()):
+        return RespuestaJSON({"error": "Faltan los parámetros est y plan"}, status=400)
+    est, plan = int(est), int(plan)
     para = (request.GET.get("para") or "PARA_CURSAR").upper()
     periodo = (request.GET.get("periodo") or "").upper()
     ciclo = request.GET.get("ciclo")
@@ -216,7 +198,7 @@ def api_espacios_habilitados(request):
             qs = qs.filter(Q(periodo=periodo) | Q(periodo="ANUAL"))
 
     items = []
-    for e in qs.order_by("anio", "nombre"):
+    for e in qs.select_related("materia").order_by("anio", "materia__nombre"):
         ok, info = habilitado(est, plan, e, para, ciclo)
         row = {
             "id": e.id,
@@ -227,68 +209,276 @@ def api_espacios_habilitados(request):
         if not ok:
             row["bloqueo"] = info
         items.append(row)
-    return JsonResponse({"items": items})
+    return RespuestaJSON({"items": items})
 
 
+@login_required
 @require_POST
 def api_inscribir_espacio(request):
-    if InscripcionEspacio is None:
-        return JsonResponse(
-            {"ok": False, "error": "No existe el modelo de inscripción a cursada."},
-            status=500,
+    """
+    Inscribe a cursada. Seguro ante doble click y reintentos: el alta es un
+    INSERT idempotente sobre `uniq_insc_est_esp_ciclo` y, si el cliente manda
+    `Idempotency-Key`, la misma clave devuelve siempre la misma respuesta.
+    """
+    params = {k: request.POST.get(k) or "" for k in ("estudiante_id", "plan_id", "espacio_id")}
+    if not all(v.isdigit() for v in params.values()):
+        return RespuestaJSON(
+            {"ok": False, "error": "Faltan estudiante_id, plan_id o espacio_id"}, status=400
+        )
+    ciclo = request.POST.get("ciclo") or ""
+    ciclo = int(ciclo) if ciclo.isdigit() else timezone.localdate().year
+    comision = request.POST.get("comision_id") or ""
+    comision = int(comision) if comision.isdigit() else None
+
+    insc = get_object_or_404(
+        EstudianteProfesorado.objects.select_related("carrera"),
+        estudiante_id=int(params["estudiante_id"]),
+        plan_id=int(params["plan_id"]),
+    )
+    esp = get_object_or_404(
+        EspacioCurricular.objects.select_related("plan"),
+        id=int(params["espacio_id"]),
+        plan_id=insc.plan_id,
+    )
+    res = con_idempotencia(
+        request.headers.get("Idempotency-Key"),
+        "inscribir_espacio",
+        request.user,
+        lambda: inscribir_espacio(insc, esp, ciclo, comision_id=comision),
+    )
+    if res.status == 201:
+        auditoria.registrar(
+            "INSC_ESP", request.user, f"Inscripción {insc.pk} espacio {esp.pk} ciclo {ciclo}"
         )
+    return RespuestaJSON(res.payload(), status=res.status)
+
+
+@login_required
+@require_GET
+def api_plan_analisis(request, plan_id):
+    """Ciclos, requisitos transitivos y camino crítico del plan (cacheado por versión)."""
+    get_object_or_404(PlanEstudios, pk=plan_id)
+    return RespuestaJSON(referencia_cache.get_plan_analisis(plan_id))
+
+
+def _es_personal(user) -> bool:
+    if user.is_staff or user.is_superuser:
+        return True
+    perfil = getattr(user, "perfil", None)
+    return perfil is not None and perfil.rol in ("BEDEL", "SECRETARIA", "TUTOR")
 
-    est = int(request.POST["estudiante_id"])
-    plan = int(request.POST["plan_id"])
-    esp = int(request.POST["espacio_id"])
-    ciclo = request.POST.get("ciclo")
-    ciclo = int(ciclo) if (ciclo and ciclo.isdigit()) else None
 
-    e = get_object_or_404(EspacioCurricular, id=esp, plan_id=plan)
-    ok, info = habilitado(est, plan, e, "PARA_CURSAR", ciclo)
-    if not ok:
-        return JsonResponse({"ok": False, "error": info}, status=400)
-
-    # obtener nombres de campos por introspección (estudiante/espacio/plan/ciclo)
-    def fk_name_to(model, related):
-        for f in model._meta.get_fields():
-            if (
-                getattr(f, "is_relation", False)
-                and getattr(f, "many_to_one", False)
-                and f.related_model is related
-            ):
-                return f.name
-        return None
-
-    fk_est = fk_name_to(InscripcionEspacio, Estudiante) or "estudiante"
-    fk_esp = fk_name_to(InscripcionEspacio, EspacioCurricular) or "espacio"
-    fk_plan = fk_name_to(InscripcionEspacio, PlanEstudios) or "plan"
-    f_ciclo = (
-        "ciclo" if "ciclo" in {f.name for f in InscripcionEspacio._meta.get_fields()} else None
+def _puede_ver_inscripcion(user, insc) -> bool:
+    if _es_personal(user):
+        return True
+    perfil = getattr(user, "perfil", None)
+    return perfil is not None and perfil.estudiante_id == insc.estudiante_id
+
+
+@login_required
+@require_GET
+def api_plan_egreso(request, insc_id):
+    """
+    Cronograma más corto hasta el egreso (ver `planificador`).
+    Parámetros: `carga` (cursadas por cuatrimestre, 1..10, default 5) y
+    `desde` (1/2: cuatrimestre en que arranca, default 1).
+    """
+    from academia_core.planificador import planificar_inscripcion
+
+    insc = get_object_or_404(EstudianteProfesorado, pk=insc_id)
+    if not _puede_ver_inscripcion(request.user, insc):
+        return RespuestaJSON({"error": "Sin permiso."}, status=403)
+    carga = request.GET.get("carga") or "5"
+    desde = request.GET.get("desde") or "1"
+    if not (carga.isdigit() and 1 <= int(carga) <= 10 and desde in ("1", "2")):
+        return RespuestaJSON({"error": "carga debe ser 1..10 y desde 1 o 2"}, status=400)
+
+    plan = planificar_inscripcion(insc, max_carga=int(carga), primer_cuatrimestre=int(desde))
+    nombres = {e["id"]: e["nombre"] for e in referencia_cache.get_plan_espacios(insc.plan_id)}
+
+    def _refs(ids):
+        return [{"id": pk, "nombre": nombres.get(pk, "")} for pk in ids]
+
+    return RespuestaJSON(
+        {
+            "inscripcion_id": insc.pk,
+            "cuatrimestres": plan.cantidad,
+            "optimo": plan.optimo,
+            "terminos": [
+                {"numero": k + 1, "cuatrimestre": plan.cuatrimestre(k), "espacios": _refs(ids)}
+                for k, ids in enumerate(plan.terminos)
+            ],
+            "bloqueados": _refs(plan.bloqueados),
+        }
     )
 
-    # evitar duplicado por servidor
-    create_kwargs = {
-        f"{fk_est}_id": est,
-        f"{fk_esp}_id": esp,
-        f"{fk_plan}_id": plan,
-    }
-    if f_ciclo and ciclo:
-        create_kwargs[f_ciclo] = ciclo
 
-    exists = InscripcionEspacio.objects.filter(**create_kwargs).exists()
-    if exists:
-        return JsonResponse({"ok": False, "error": "ya_inscripto"}, status=400)
+@login_required
+@require_GET
+@usar_replica
+def api_autocompletar_inscripciones(request):
+    """Búsqueda de inscripciones a carrera por DNI o apellido/nombre (`q`)."""
+    if not _es_personal(request.user):
+        return RespuestaJSON({"error": "Sin permiso."}, status=403)
+    items = opciones.buscar_inscripciones(request.GET.get("q", ""))
+    return RespuestaJSON({"items": [{"id": pk, "label": label} for pk, label in items]})
+
+
+@login_required
+@require_GET
+@usar_replica
+def api_autocompletar_espacios(request):
+    """Espacios de un plan (`plan_id` o el de la `inscripcion`), filtrados por `q`."""
+    plan_id = request.GET.get("plan_id")
+    if not str(plan_id or "").isdigit():
+        plan_id = opciones.plan_de_inscripcion(request.GET.get("inscripcion"))
+    items = opciones.espacios_plan(plan_id)
+    q = request.GET.get("q", "").strip().casefold()
+    if q:
+        items = [(pk, label) for pk, label in items if q in label.casefold()]
+        items = items[: opciones.LIMITE_AUTOCOMPLETAR]
+    return RespuestaJSON({"items": [{"id": pk, "label": label} for pk, label in items]})
+
+
+def _ventana_pedida(datos):
+    from academia_core.finales import ventana_abierta
+    from academia_core.models import VentanaFinal
+
+    pk = datos.get("ventana_id") or ""
+    if pk.isdigit():
+        return VentanaFinal.objects.filter(pk=int(pk)).first()
+    return ventana_abierta()
+
 
-    obj = InscripcionEspacio.objects.create(**create_kwargs)
-    return JsonResponse({"ok": True, "id": obj.id})
+@login_required
+@require_GET
+def api_finales_habilitados(request):
+    """
+    Espacios que la `inscripcion` puede rendir en la ventana (`ventana_id` o
+    la abierta), con las mesas del turno. Sale de `HabilitacionFinal`.
+    """
+    from academia_core.finales import habilitados
+
+    insc_id = request.GET.get("inscripcion") or ""
+    if not insc_id.isdigit():
+        return RespuestaJSON({"error": "Falta inscripcion"}, status=400)
+    insc = get_object_or_404(EstudianteProfesorado, pk=int(insc_id))
+    if not _puede_ver_inscripcion(request.user, insc):
+        return RespuestaJSON({"error": "Sin permiso."}, status=403)
+    ventana = _ventana_pedida(request.GET)
+    if ventana is None:
+        return RespuestaJSON({"ventana": None, "items": []})
+
+    etiquetas = referencia_cache.get_plan_etiquetas(insc.plan_id) if insc.plan_id else {}
+    items = [
+        {
+            "espacio_id": h["espacio_id"],
+            "etiqueta": etiquetas.get(h["espacio_id"], ""),
+            "condicion": "libre" if h["libre"] else "regular",
+            "intentos": h["intentos"],
+            "mesas": h["mesas"],
+        }
+        for h in habilitados(ventana, insc.pk)
+    ]
+    return RespuestaJSON(
+        {
+            "ventana": {"id": ventana.pk, "nombre": ventana.nombre, "abierta": ventana.abierta()},
+            "items": items,
+        }
+    )
+
+
+@login_required
+@require_POST
+def api_inscribir_final(request):
+    """
+    Inscribe a una mesa de final. Valida contra las habilitaciones precalculadas
+    de la ventana (ver `finales`); acepta `Idempotency-Key` como las demás altas.
+    """
+    from academia_core.finales import inscribir
+
+    insc_id = request.POST.get("inscripcion_id") or ""
+    mesa_id = request.POST.get("mesa_id") or ""
+    if not (insc_id.isdigit() and mesa_id.isdigit()):
+        return RespuestaJSON({"ok": False, "error": "Faltan inscripcion_id o mesa_id"}, status=400)
+    if not _es_personal(request.user):
+        insc = get_object_or_404(EstudianteProfesorado, pk=int(insc_id))
+        if not _puede_ver_inscripcion(request.user, insc):
+            return RespuestaJSON({"ok": False, "error": "Sin permiso."}, status=403)
+    ventana = _ventana_pedida(request.POST)
+    if ventana is None:
+        return RespuestaJSON({"ok": False, "error": "ventana_cerrada"}, status=409)
+
+    res = con_idempotencia(
+        request.headers.get("Idempotency-Key"),
+        "inscribir_final",
+        request.user,
+        lambda: inscribir(
+            ventana, int(insc_id), int(mesa_id), llamada=request.POST.get("llamada") or ""
+        ),
+    )
+    if res.status == 201:
+        auditoria.registrar("INSC_MESA", request.user, f"Inscripción {insc_id} mesa {mesa_id}")
+    return RespuestaJSON(res.payload(), status=res.status)
+
+
+@login_required
+@require_GET
+@usar_replica
+def api_regularidades_por_vencer(request):
+    """Regularidades sin aprobar que vencen en los próximos `dias` (default 30, máx. 365)."""
+    from academia_core.regularidades import reporte_por_vencer
+
+    if not _es_personal(request.user):
+        return RespuestaJSON({"error": "Sin permiso."}, status=403)
+    dias = request.GET.get("dias") or "30"
+    carrera = request.GET.get("carrera_id") or ""
+    if not (dias.isdigit() and int(dias) <= 365):
+        return RespuestaJSON({"error": "dias debe ser 0..365"}, status=400)
+    items = reporte_por_vencer(int(dias), carrera_id=int(carrera) if carrera.isdigit() else None)
+    return RespuestaJSON({"items": items})
+
+
+@login_required
+@require_GET
+@usar_replica
+def api_auditoria(request):
+    """
+    Actividad por `user_id`, `accion` y rango `desde`/`hasta` (AAAA-MM-DD),
+    más reciente primero; como mucho `limite` (default 100, máx. 500).
+    """
+    from datetime import date
+
+    from academia_core.auditoria import consultar
+
+    if not _es_personal(request.user):
+        return RespuestaJSON({"error": "Sin permiso."}, status=403)
+    user_id = request.GET.get("user_id") or ""
+    limite = request.GET.get("limite") or "100"
+    try:
+        desde, hasta = (
+            date.fromisoformat(request.GET[k]) if request.GET.get(k) else None
+            for k in ("desde", "hasta")
+        )
+    except ValueError:
+        return RespuestaJSON({"error": "Fechas en formato AAAA-MM-DD"}, status=400)
+    if not (limite.isdigit() and 1 <= int(limite) <= 500):
+        return RespuestaJSON({"error": "limite debe ser 1..500"}, status=400)
+
+    qs = consultar(
+        user_id=int(user_id) if user_id.isdigit() else None,
+        accion=request.GET.get("accion") or None,
+        desde=desde,
+        hasta=hasta,
+    )
+    return RespuestaJSON({"items": ACTIVIDAD.items(qs[: int(limite)])})
 
 
 @require_GET
 def api_get_planes_for_profesorado(request):
     profesorado_id = request.GET.get("profesorado_id")
     if not profesorado_id:
-        return JsonResponse({"items": []})
+        return RespuestaJSON({"items": []})
 
     planes = PlanEstudios.objects.filter(carrera_id=profesorado_id).order_by("resolucion")
     data = [
@@ -299,28 +489,25 @@ def api_get_planes_for_profesorado(request):
         }
         for p in planes
     ]
-    return JsonResponse({"items": data})
+    return RespuestaJSON({"items": data})
 
 
 @require_GET
 def api_get_espacios_for_plan(request):
     plan_id = request.GET.get("plan_id")
-    if not plan_id:
-        return JsonResponse({"items": []})
+    if not plan_id or not plan_id.isdigit():
+        return RespuestaJSON({"items": []})
 
-    espacios = EspacioCurricular.objects.filter(plan_id=plan_id).order_by(
-        "anio", "cuatrimestre", "nombre"
-    )
     data = [
         {
-            "id": e.id,
-            "nombre": str(e),
-            "anio": e.anio,
-            "cuatrimestre": e.cuatrimestre,
+            "id": e["id"],
+            "nombre": e["etiqueta"],
+            "anio": e["anio"],
+            "cuatrimestre": e["cuatrimestre"],
         }
-        for e in espacios
+        for e in referencia_cache.get_plan_espacios(plan_id)
     ]
-    return JsonResponse({"items": data})
+    return RespuestaJSON({"items": data})
 
 
 @require_GET
@@ -329,13 +516,13 @@ def api_correlatividades_por_materia(request):
     plan_id = request.GET.get("plan_id")
 
     if not materia_id or not plan_id:
-        return JsonResponse({"error": "materia_id and plan_id are required"}, status=400)
+        return RespuestaJSON({"error": "materia_id and plan_id are required"}, status=400)
 
     try:
         materia_principal = EspacioCurricular.objects.get(id=materia_id)
         plan = PlanEstudios.objects.get(id=plan_id)
     except (EspacioCurricular.DoesNotExist, PlanEstudios.DoesNotExist):
-        return JsonResponse({"error": "Materia or Plan not found"}, status=404)
+        return RespuestaJSON({"error": "Materia or Plan not found"}, status=404)
 
     regulares_ids = Correlatividad.objects.filter(
         plan=plan, espacio=materia_principal, requisito="REGULARIZADA"
@@ -345,4 +532,4 @@ def api_correlatividades_por_materia(request):
         plan=plan, espacio=materia_principal, requisito="APROBADA"
     ).values_list("requiere_espacio__id", flat=True)
 
-    return JsonResponse({"regulares": list(regulares_ids), "aprobadas": list(aprobadas_ids)})
+    return RespuestaJSON({"regulares": list(regulares_ids), "aprobadas": list(aprobadas_ids)})
@@ -9,17 +9,11 @@ from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import redirect, render
 from django.views.decorators.http import require_POST
 
+from . import auditoria, kpis, referencia_cache
 from .forms_admin import EstudianteCreateForm
 from .forms_carga import CargaNotaForm
 from .forms_correlativas import CorrelatividadForm
-from .models import (
-    Carrera,
-    Correlatividad,
-    EspacioCurricular,
-    Estudiante,
-    EstudianteProfesorado,
-    InscripcionEspacio,
-)
+from .models import Correlatividad, Estudiante
 
 
 @login_required
@@ -41,13 +35,16 @@ def panel(request: HttpRequest, **kwargs) -> HttpResponse:
     ctx = {"action": action, "can_admin": request.user.is_superuser}
 
     if action == "section_home":
+        resumen = kpis.resumen_panel()
+        totales = resumen["totales"]
         ctx.update(
             {
-                "total_estudiantes": Estudiante.objects.count(),
-                "total_profesorados": Carrera.objects.count(),
-                "total_espacios": EspacioCurricular.objects.count(),
-                "total_inscripciones_carrera": EstudianteProfesorado.objects.count(),
-                "total_inscripciones_materia": InscripcionEspacio.objects.count(),
+                "total_estudiantes": totales["estudiantes"],
+                "total_profesorados": totales["carreras"],
+                "total_espacios": totales["espacios"],
+                "total_inscripciones_carrera": totales["inscripciones_carrera"],
+                "total_inscripciones_materia": totales["inscripciones_materia"],
+                "kpis_carreras": resumen["carreras"],
             }
         )
     elif action == "add_est":
@@ -114,11 +111,14 @@ def panel(request: HttpRequest, **kwargs) -> HttpResponse:
                 "estudiantes": Estudiante.objects.filter(activo=True).order_by(
                     "apellido", "nombre"
                 ),
-                "profesorados": Carrera.objects.all().order_by("nombre"),
+                "profesorados": referencia_cache.get_carreras(),
                 "planes_map": json.dumps(
                     {
-                        p.id: [{"id": plan.id, "label": plan.resolucion} for plan in p.planes.all()]
-                        for p in Carrera.objects.prefetch_related("planes")
+                        c["id"]: [
+                            {"id": plan["id"], "label": plan["resolucion"]}
+                            for plan in referencia_cache.get_planes(c["id"])
+                        ]
+                        for c in referencia_cache.get_carreras()
                     }
                 ),
                 "base_checks": [
@@ -154,7 +154,13 @@ def cargar_nota(request: HttpRequest) -> HttpResponse:
     if request.method == "POST":
         form = CargaNotaForm(request.POST)
         if form.is_valid():
-            form.save()
+            mov = form.save()
+            auditoria.registrar(
+                "MOV_ALTA",
+                request.user,
+                f"Movimiento {mov.pk}: {mov.tipo} inscripción {mov.inscripcion_id}"
+                f" espacio {mov.espacio_id}",
+            )
             messages.success(request, "Nota guardada con éxito.")
             return redirect("cargar_nota")
     else:
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("academia_horarios", "0002_remove_docentes_from_horarioclase"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comision",
+            name="inscriptos",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
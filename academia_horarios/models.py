@@ -56,7 +56,9 @@ class Comision(models.Model):
     periodo = models.ForeignKey(Periodo, on_delete=models.PROTECT)
     turno = models.CharField(max_length=16, choices=Turno.choices)
     nombre = models.CharField(max_length=16, default="Única")
-    cupo = models.PositiveSmallIntegerField(default=0)
+    cupo = models.PositiveSmallIntegerField(default=0)  # 0 = sin límite
+    # Contador de inscriptos (se actualiza con F() al inscribir; ver academia_core.inscripciones)
+    inscriptos = models.PositiveIntegerField(default=0)
     # NUEVO:
     seccion = models.CharField(max_length=2, default="A")  # A, B, C...
 
@@ -4,7 +4,7 @@ from django.shortcuts import get_object_or_404, render
 from django.views.decorators.http import require_GET, require_POST
 from django.views.generic import DetailView
 
-from academia_core.models import Carrera
+from academia_core.referencia_cache import get_carreras
 from academia_horarios.forms import DocenteAsignacionForm, HorarioInlineForm
 from academia_horarios.models import (
     Catedra,
@@ -22,7 +22,7 @@ from ui.api import api_materias_por_plan, api_planes_por_carrera
 def cargar_horario(request):
     """Render del template con el layout del panel."""
     ctx = {
-        "carreras": Carrera.objects.order_by("nombre"),
+        "carreras": get_carreras(),
         "periodos": Periodo.objects.all().order_by("-ciclo_lectivo", "-cuatrimestre"),
         "turnos": [
             {"id": "maniana", "label": "Mañana"},
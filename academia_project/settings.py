@@ -176,6 +176,8 @@ MIDDLEWARE = [
     # 👇 Necesario para protección CSRF
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    # Lectura tras escritura: tras escribir, @usar_replica lee de default un rato
+    "academia_core.conexiones.PrimarioTrasEscrituraMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     # 👇 Cabecera X-Frame-Options
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
@@ -227,20 +229,36 @@ TEMPLATES = [
 # Base de datos (MySQL por defecto)
 # =============================================================================
 
+# Conexiones (academia_core.conexiones): el backend propio es el de Django más
+# métricas de adquisición. Sin pool, cada hilo conserva su conexión DB_CONN_MAX_AGE
+# segundos (0 = una por request) y se verifica antes de reusarla. Con DB_POOL=1
+# las conexiones vuelven a un pool por proceso al terminar el request.
+DB_POOL = getenv_bool("DB_POOL")
+DB_CONN_MAX_AGE = 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", 60))
+DB_CONN_HEALTH_CHECKS = getenv_bool("DB_CONN_HEALTH_CHECKS", True)
+DB_CONEXION_LENTA_MS = float(os.getenv("DB_CONEXION_LENTA_MS", 200))
+
 DATABASES = {
     "default": {
-        "ENGINE": os.getenv("DB_ENGINE", "django.db.backends.mysql"),
+        "ENGINE": os.getenv("DB_ENGINE", "academia_core.backends.mysql"),
         "NAME": os.getenv("DB_NAME", "academia"),
         "USER": os.getenv("DB_USER", "academia"),
         "PASSWORD": os.getenv("DB_PASSWORD", "TuClaveSegura123"),  # Cambiá en prod
         "HOST": os.getenv("DB_HOST", "127.0.0.1"),
         "PORT": os.getenv("DB_PORT", "3306"),
+        "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": DB_CONN_HEALTH_CHECKS,
         "OPTIONS": {
             "charset": "utf8mb4",
             "init_command": "SET sql_mode='STRICT_TRANS_TABLES'",
         },
     }
 }
+if DB_POOL:
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "max_size": int(os.getenv("DB_POOL_SIZE", 10)),
+        "reciclar": int(os.getenv("DB_POOL_RECICLAR", 1800)),
+    }
 
 # --- Solo para CI/local si queremos evitar MySQL en tests ---
 # Si USE_SQLITE_FOR_TESTS=1, usamos SQLite (en vez de MySQL) para pytest/CI
@@ -252,6 +270,69 @@ if os.getenv("USE_SQLITE_FOR_TESTS") == "1":
         }
     }
 
+# --- Réplica de lectura para reportes (alias "reporting", academia_core.conexiones) ---
+# Sólo la usan las vistas con @usar_replica y los bloques en_replica(). Con
+# DB_REPORTING_HOST toma las credenciales de default salvo lo que se pise; sin
+# host, DB_REPORTING_NAME apunta a una copia SQLite local (`manage.py copiar_reporting`).
+# Si atrasa más de DB_REPORTING_RETRASO_MAX segundos se lee de default; tras una
+# escritura, el navegador lee de default por DB_REPORTING_PEGADO segundos.
+if os.getenv("DB_REPORTING_HOST"):
+    DATABASES["reporting"] = {
+        **DATABASES["default"],
+        "HOST": os.getenv("DB_REPORTING_HOST"),
+        "PORT": os.getenv("DB_REPORTING_PORT", DATABASES["default"].get("PORT", "")),
+        "USER": os.getenv("DB_REPORTING_USER", DATABASES["default"].get("USER", "")),
+        "PASSWORD": os.getenv("DB_REPORTING_PASSWORD", DATABASES["default"].get("PASSWORD", "")),
+        "OPTIONS": dict(DATABASES["default"].get("OPTIONS", {})),
+    }
+elif os.getenv("DB_REPORTING_NAME"):
+    DATABASES["reporting"] = {
+        "ENGINE": "academia_core.backends.sqlite3",
+        "NAME": os.getenv("DB_REPORTING_NAME"),
+    }
+if "reporting" in DATABASES:
+    DATABASES["reporting"]["TEST"] = {"MIRROR": "default"}
+DATABASE_ROUTERS = ["academia_core.conexiones.RouterReplica"]
+DB_REPORTING_RETRASO_MAX = float(os.getenv("DB_REPORTING_RETRASO_MAX", 30))
+DB_REPORTING_RETRASO_CACHE = float(os.getenv("DB_REPORTING_RETRASO_CACHE", 5))
+DB_REPORTING_PEGADO = int(os.getenv("DB_REPORTING_PEGADO", 30))
+
+
+# =============================================================================
+# Caché (locmem por defecto; Redis si se define REDIS_URL)
+# =============================================================================
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "ipes-default",
+    }
+}
+if os.getenv("REDIS_URL"):
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("REDIS_URL"),
+        "KEY_PREFIX": os.getenv("CACHE_KEY_PREFIX", "ipes"),
+    }
+
+# Alias y TTL de la caché de datos de referencia (academia_core.referencia_cache)
+REFERENCIA_CACHE_ALIAS = os.getenv("REFERENCIA_CACHE_ALIAS", "default")
+REFERENCIA_CACHE_TIMEOUT = int(os.getenv("REFERENCIA_CACHE_TIMEOUT", 60 * 60))
+
+# Auditoría en lotes (academia_core.auditoria): tamaño/antigüedad del buffer y retención
+AUDITORIA_LOTE = int(os.getenv("AUDITORIA_LOTE", 200))
+AUDITORIA_INTERVALO = float(os.getenv("AUDITORIA_INTERVALO", 5))
+AUDITORIA_RETENCION_MESES = int(os.getenv("AUDITORIA_RETENCION_MESES", 24))
+
+# Claves de idempotencia (academia_core.inscripciones): segundos tras los que una
+# reserva sin respuesta se da por abandonada, y horas que se conservan las respuestas
+IDEMPOTENCIA_RESERVA_SEGUNDOS = int(os.getenv("IDEMPOTENCIA_RESERVA_SEGUNDOS", 120))
+IDEMPOTENCIA_RETENCION_HORAS = int(os.getenv("IDEMPOTENCIA_RETENCION_HORAS", 48))
+
+# Miniaturas de fotos de estudiantes (academia_core.fotos): lado en px y formato
+FOTO_MINIATURA_LADO = int(os.getenv("FOTO_MINIATURA_LADO", 160))
+FOTO_MINIATURA_FORMATO = os.getenv("FOTO_MINIATURA_FORMATO", "WEBP")
+
 
 # =============================================================================
 # Validadores de contraseña
@@ -4,8 +4,8 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.http import HttpResponse
 from django.urls import include, path
+from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import RedirectView
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
 from ui.auth_views import RoleAwareLoginView  # 👈
 
@@ -14,9 +14,38 @@ def healthz(_):
     return HttpResponse("ok")
 
 
+def _vista_perezosa(cargar):
+    """
+    Vista que importa su implementación en el primer request: drf_spectacular
+    (schema y docs) pesa más que el resto de las URLs juntas en el arranque.
+    """
+    vista = None
+
+    @csrf_exempt
+    def _vista(request, *args, **kwargs):
+        nonlocal vista
+        if vista is None:
+            vista = cargar()
+        return vista(request, *args, **kwargs)
+
+    return _vista
+
+
+def _schema():
+    from drf_spectacular.views import SpectacularAPIView
+
+    return SpectacularAPIView.as_view()
+
+
+def _docs():
+    from drf_spectacular.views import SpectacularSwaggerView
+
+    return SpectacularSwaggerView.as_view(url_name="schema")
+
+
 urlpatterns = [
-    path("schema/", SpectacularAPIView.as_view(), name="schema"),
-    path("docs/", SpectacularSwaggerView.as_view(url_name="schema"), name="docs"),
+    path("schema/", _vista_perezosa(_schema), name="schema"),
+    path("docs/", _vista_perezosa(_docs), name="docs"),
     path("admin/", admin.site.urls),
     path("accounts/login/", RoleAwareLoginView.as_view(), name="login"),  # 👈
     path(
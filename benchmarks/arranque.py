@@ -0,0 +1,133 @@
+"""
+Arranque en frío: del inicio del proceso a la primera respuesta.
+
+Cada medición corre en un intérprete nuevo (como un worker de gunicorn o un
+`manage.py` recién lanzado): `django.setup()`, carga de las URLs y un GET a
+`/healthz` con el cliente de pruebas (no toca la base). Con `--importtime`
+corre lo mismo bajo `python -X importtime` e informa qué módulos pesan más,
+sumados por paquete y los más caros uno por uno.
+
+Uso:
+
+    python -m benchmarks.arranque --rondas 5
+    python -m benchmarks.arranque --importtime --top 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+PAQUETES_PROPIOS = ("academia_core", "academia_horarios", "academia_project", "ui")
+
+
+def _hijo() -> None:
+    """Lo que corre el proceso medido: imprime un JSON con los tiempos internos."""
+    t0 = time.perf_counter()
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "academia_project.settings_test")
+    import django
+
+    django.setup()
+    t_setup = time.perf_counter()
+    from django.test import Client
+
+    resp = Client().get("/healthz")
+    t_resp = time.perf_counter()
+    print(
+        json.dumps(
+            {
+                "status": resp.status_code,
+                "setup_ms": round((t_setup - t0) * 1000, 3),
+                "primera_respuesta_ms": round((t_resp - t0) * 1000, 3),
+            }
+        )
+    )
+
+
+def _correr(*opciones: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": "academia_project.settings_test"}
+    return subprocess.run(
+        [sys.executable, *opciones, "-m", "benchmarks.arranque", "--hijo"],
+        cwd=RAIZ,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def medir() -> dict:
+    """Un arranque en frío. `total_ms` incluye levantar el intérprete."""
+    t0 = time.perf_counter()
+    proc = _correr()
+    total = (time.perf_counter() - t0) * 1000
+    datos = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {**datos, "total_ms": round(total, 3)}
+
+
+def perfil_importacion(top: int = 15) -> dict:
+    """
+    Tiempos de `-X importtime` del arranque: por paquete raíz (suma del tiempo
+    propio de sus módulos) y los `top` módulos más caros, en milisegundos, más
+    el conjunto de módulos importados.
+    """
+    proc = _correr("-X", "importtime")
+    propios: dict[str, float] = {}
+    for linea in proc.stderr.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, _acumulado, modulo = linea[len("import time:") :].split("|")
+        propios[modulo.strip()] = int(propio) / 1000
+    por_paquete: Counter[str] = Counter()
+    for modulo, ms in propios.items():
+        por_paquete[modulo.split(".")[0]] += ms
+    mas_caros = sorted(propios.items(), key=lambda x: x[1], reverse=True)[:top]
+    return {
+        "total_ms": round(sum(propios.values()), 3),
+        "propios_ms": round(sum(por_paquete[p] for p in PAQUETES_PROPIOS), 3),
+        "paquetes": {p: round(ms, 3) for p, ms in por_paquete.most_common(top)},
+        "modulos": {m: round(ms, 3) for m, ms in mas_caros},
+        "importados": set(propios),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rondas", type=int, default=5)
+    parser.add_argument("--importtime", action="store_true", help="Perfil de importación.")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--hijo", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.hijo:
+        _hijo()
+        return 0
+    if args.importtime:
+        perfil = perfil_importacion(args.top)
+        print(f"imports: {perfil['total_ms']:.1f} ms (propios: {perfil['propios_ms']:.1f} ms)")
+        for titulo in ("paquetes", "modulos"):
+            print(f"\n{titulo}:")
+            for nombre, ms in perfil[titulo].items():
+                print(f"  {nombre:<50} {ms:>8.1f} ms")
+        return 0
+
+    mediciones = [medir() for _ in range(max(1, args.rondas))]
+    for clave in ("setup_ms", "primera_respuesta_ms", "total_ms"):
+        valores = [m[clave] for m in mediciones]
+        print(
+            f"{clave:<22} mediana={statistics.median(valores):.1f}  "
+            f"min={min(valores):.1f}  max={max(valores):.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,87 @@
+# benchmarks/captura_consultas.py
+"""
+Plugin de pytest que captura las consultas de la suite para el asesor de
+índices (academia_core.indices / `manage.py sugerir_indices`).
+
+    pytest benchmarks -n 0 --no-cov -p benchmarks.captura_consultas \
+        --capturar-consultas consultas.json
+
+Durante cada test (no en los fixtures) cuenta las consultas por huella y
+guarda el plan de la primera ejecución de cada una. Con xdist cada worker
+escribe su propio archivo (`consultas.gw0.json`, …); conviene `-n 0`.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+import pytest
+from django.db import connections
+
+from academia_core import indices
+
+_capturas: dict[str, dict] = {}
+_vendor = {"nombre": ""}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--capturar-consultas",
+        default=None,
+        metavar="ARCHIVO",
+        help="Guarda huellas, tiempos y planes de las consultas en ARCHIVO (JSON).",
+    )
+
+
+def _registrar(execute, sql, params, many, context):
+    t0 = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        ms = (time.perf_counter() - t0) * 1000
+        h = indices.huella(sql)
+        dato = _capturas.get(h)
+        if dato is None:
+            conexion = context["connection"]
+            _vendor["nombre"] = conexion.vendor
+            plan = []
+            if not many and indices._es_candidata(sql):
+                try:
+                    plan = indices.explicar(conexion, sql, params)
+                except Exception as exc:  # el EXPLAIN nunca rompe el test
+                    plan = [{"error": str(exc)}]
+            dato = _capturas[h] = {"veces": 0, "ms": 0.0, "sql": sql, "plan": plan}
+        dato["veces"] += 1
+        dato["ms"] += ms
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    if not item.config.getoption("--capturar-consultas"):
+        yield
+        return
+    with ExitStack() as pila:
+        for conexion in connections.all(initialized_only=True):
+            pila.enter_context(conexion.execute_wrapper(_registrar))
+        yield
+
+
+def pytest_sessionfinish(session, exitstatus):
+    destino = session.config.getoption("--capturar-consultas")
+    if not destino or not _capturas:
+        return
+    ruta = Path(destino)
+    worker = getattr(session.config, "workerinput", {}).get("workerid")
+    if worker:
+        ruta = ruta.with_suffix(f".{worker}{ruta.suffix}")
+    for dato in _capturas.values():
+        dato["ms"] = round(dato["ms"], 3)
+    ruta.write_text(
+        json.dumps(
+            {"vendor": _vendor["nombre"], "consultas": _capturas}, indent=1, ensure_ascii=False
+        ),
+        encoding="utf-8",
+    )
@@ -0,0 +1,160 @@
+"""
+Prueba de carga de la inscripción a cursada (academia_core.inscripciones).
+
+Simula la apertura de inscripciones: N hilos disparan solicitudes concurrentes
+con duplicados (doble click) y reintentos con la misma Idempotency-Key contra
+la base configurada (SQLite en archivo o MySQL), y al final verifica:
+
+- no hay filas duplicadas por (inscripción, espacio, ciclo);
+- el contador `Comision.inscriptos` coincide con las altas y no supera el cupo;
+- cada clave de idempotencia devolvió siempre la misma respuesta.
+
+Uso (con la base migrada):
+
+    USE_SQLITE_FOR_TESTS=1 python -m benchmarks.carga_inscripciones --hilos 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "academia_project.settings")
+django.setup()
+
+from django.db import OperationalError, connection, connections  # noqa: E402
+from django.db.models import Count  # noqa: E402
+
+from academia_core.inscripciones import con_idempotencia, inscribir_espacio  # noqa: E402
+from academia_core.models import (  # noqa: E402
+    Carrera,
+    Correlatividad,
+    EspacioCurricular,
+    EstudianteProfesorado,
+    InscripcionEspacio,
+    SolicitudIdempotente,
+)
+from academia_core.sintetico import generar, nombre_carrera  # noqa: E402
+from academia_horarios.models import Comision  # noqa: E402
+
+
+def _preparar(seed: int, ciclo: int, cupo: int):
+    if not Carrera.objects.filter(nombre=nombre_carrera(seed, 0)).exists():
+        generar(escala=1, seed=seed)
+    carrera = Carrera.objects.get(nombre=nombre_carrera(seed, 0))
+    con_reglas = Correlatividad.objects.filter(tipo="CURSAR").values("espacio_id")
+    espacios = list(
+        EspacioCurricular.objects.filter(plan__carrera=carrera)
+        .exclude(pk__in=con_reglas)
+        .select_related("plan")[:8]
+    )
+    inscs = list(
+        EstudianteProfesorado.objects.filter(carrera=carrera, plan=espacios[0].plan).select_related(
+            "carrera"
+        )
+    )
+    espacios = [e for e in espacios if e.plan_id == espacios[0].plan_id]
+
+    # base limpia para el ciclo de la prueba
+    InscripcionEspacio.objects.filter(anio_academico=ciclo).delete()
+    SolicitudIdempotente.objects.filter(clave__startswith=f"carga-{ciclo}-").delete()
+    comision = Comision.objects.order_by("pk").first()
+    Comision.objects.filter(pk=comision.pk).update(cupo=cupo, inscriptos=0)
+    return inscs, espacios, comision.pk
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hilos", type=int, default=16)
+    parser.add_argument("--solicitudes", type=int, default=2000)
+    parser.add_argument("--duplicados", type=float, default=0.3, help="Fracción de repetidas.")
+    parser.add_argument("--cupo", type=int, default=0, help="Cupo de la comisión (0 = sin límite).")
+    parser.add_argument("--ciclo", type=int, default=2099)
+    parser.add_argument("--seed", type=int, default=4242)
+    args = parser.parse_args(argv)
+
+    inscs, espacios, comision_id = _preparar(args.seed, args.ciclo, args.cupo)
+    rnd = random.Random(args.seed)
+
+    # Cada solicitud: (clave, insc, espacio). Las repetidas reusan la clave
+    # (reintento del cliente) o usan otra (doble click desde otra pestaña).
+    solicitudes = []
+    for i in range(args.solicitudes):
+        if solicitudes and rnd.random() < args.duplicados:
+            clave, insc, esp = rnd.choice(solicitudes)
+            if rnd.random() < 0.5:
+                clave = f"carga-{args.ciclo}-{i}"
+        else:
+            clave, insc, esp = f"carga-{args.ciclo}-{i}", rnd.choice(inscs), rnd.choice(espacios)
+        solicitudes.append((clave, insc, esp))
+
+    def _una(sol):
+        clave, insc, esp = sol
+        t0 = time.perf_counter()
+        try:
+            res = con_idempotencia(
+                clave,
+                "inscribir_espacio",
+                None,
+                lambda: inscribir_espacio(insc, esp, args.ciclo, comision_id=comision_id),
+            )
+            salida = (res.status, res.payload().get("error"))
+        except OperationalError as exc:  # p. ej. "database is locked" en SQLite
+            salida = (500, str(exc))
+        finally:
+            connections.close_all()
+        return clave, salida, (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.hilos) as pool:
+        resultados = list(pool.map(_una, solicitudes))
+    total = time.perf_counter() - t0
+
+    # ---- verificación ----
+    estados = Counter(s for _, (s, _), _ in resultados)
+    errores = Counter(e for _, (_, e), _ in resultados if e)
+    por_clave = defaultdict(set)
+    for clave, salida, _ in resultados:
+        if salida[0] != 409 or salida[1] != "solicitud_en_curso":
+            por_clave[clave].add(salida)
+    inconsistentes = [c for c, v in por_clave.items() if len(v) > 1]
+    duplicadas = (
+        InscripcionEspacio.objects.filter(anio_academico=args.ciclo)
+        .values("inscripcion", "espacio")
+        .annotate(n=Count("id"))
+        .filter(n__gt=1)
+        .count()
+    )
+    filas = InscripcionEspacio.objects.filter(anio_academico=args.ciclo).count()
+    inscriptos = Comision.objects.values_list("inscriptos", flat=True).get(pk=comision_id)
+
+    ms = sorted(r[2] for r in resultados)
+    print(f"backend: {connection.vendor}  hilos: {args.hilos}  solicitudes: {len(solicitudes)}")
+    print(f"tiempo total: {total:.2f}s  ({len(solicitudes) / total:.0f} req/s)")
+    print(
+        f"latencia ms  p50={statistics.median(ms):.1f}  "
+        f"p95={ms[int(len(ms) * 0.95) - 1]:.1f}  max={ms[-1]:.1f}"
+    )
+    print(f"status: {dict(sorted(estados.items()))}  errores: {dict(errores)}")
+    print(f"filas: {filas}  duplicadas: {duplicadas}  comision.inscriptos: {inscriptos}")
+    print(f"claves con respuestas distintas: {len(inconsistentes)}")
+
+    ok = (
+        duplicadas == 0
+        and inscriptos == filas
+        and (args.cupo == 0 or inscriptos <= args.cupo)
+        and not inconsistentes
+    )
+    print("OK" if ok else "FALLÓ")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,182 @@
+# benchmarks/conftest.py
+"""
+Infraestructura de benchmarks (estilo pytest-benchmark, sin dependencias extra).
+
+Uso:
+    pytest benchmarks -n 0 --no-cov                  # corre y compara contra baseline.json
+    pytest benchmarks -n 0 --no-cov --bench-guardar  # regraba baseline.json
+
+Cada benchmark registra tiempos (min/mediana/máx en ms) y la cantidad de
+consultas SQL por llamada. Al final se escribe `resultados.json` y se compara
+contra `baseline.json`:
+- más consultas que en el baseline  -> el test falla (es determinístico);
+- mediana > baseline * tolerancia   -> se informa como LENTO
+  (falla sólo con --bench-estricto, porque depende de la máquina).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from academia_core.sintetico import generar
+
+BENCH_DIR = Path(__file__).resolve().parent
+BASELINE = BENCH_DIR / "baseline.json"
+RESULTADOS = BENCH_DIR / "resultados.json"
+
+_resultados: dict[str, dict] = {}
+_informes: dict[str, list[str]] = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("bench", "Benchmarks IPES")
+    group.addoption(
+        "--bench-guardar",
+        action="store_true",
+        default=False,
+        help="Guarda los resultados como nuevo baseline.json.",
+    )
+    group.addoption(
+        "--bench-estricto",
+        action="store_true",
+        default=False,
+        help="Falla también si la mediana supera baseline * tolerancia.",
+    )
+    group.addoption(
+        "--bench-tolerancia",
+        type=float,
+        default=3.0,
+        help="Factor de tolerancia de tiempo contra el baseline (default 3.0).",
+    )
+    group.addoption(
+        "--bench-rondas",
+        type=int,
+        default=int(os.getenv("BENCH_RONDAS", "5")),
+        help="Rondas por benchmark (default 5 o $BENCH_RONDAS).",
+    )
+
+
+def _cargar_baseline() -> dict:
+    if BASELINE.exists():
+        return json.loads(BASELINE.read_text(encoding="utf-8"))
+    return {}
+
+
+@pytest.fixture(scope="session")
+def datos(django_db_setup, django_db_blocker):
+    """Institución sintética compartida por todos los benchmarks de la sesión."""
+    escala = int(os.getenv("BENCH_ESCALA", "1"))
+    with django_db_blocker.unblock():
+        return generar(escala=escala)
+
+
+class Bench:
+    def __init__(self, request):
+        self.request = request
+        self.config = request.config
+        self.nombre = request.node.name
+
+    def __call__(self, fn, *args, **kwargs):
+        rondas = max(1, self.config.getoption("--bench-rondas"))
+
+        # Primera llamada (fría): cuenta consultas
+        with CaptureQueriesContext(connection) as ctx:
+            resultado = fn(*args, **kwargs)
+        consultas_primera = len(ctx.captured_queries)
+
+        tiempos = []
+        consultas = consultas_primera
+        for _ in range(rondas):
+            with CaptureQueriesContext(connection) as ctx:
+                t0 = time.perf_counter()
+                resultado = fn(*args, **kwargs)
+                tiempos.append((time.perf_counter() - t0) * 1000)
+            consultas = len(ctx.captured_queries)
+
+        medicion = {
+            "rondas": rondas,
+            "min_ms": round(min(tiempos), 3),
+            "mediana_ms": round(statistics.median(tiempos), 3),
+            "max_ms": round(max(tiempos), 3),
+            "consultas": consultas,
+            "consultas_primera": consultas_primera,
+        }
+        _resultados[self.nombre] = medicion
+        self._comparar(medicion)
+        return resultado
+
+    def _comparar(self, medicion: dict):
+        base = _cargar_baseline().get(self.nombre)
+        if not base or self.config.getoption("--bench-guardar"):
+            return
+        if medicion["consultas"] > base["consultas"]:
+            pytest.fail(
+                f"{self.nombre}: {medicion['consultas']} consultas (baseline {base['consultas']})"
+            )
+        limite = base["mediana_ms"] * self.config.getoption("--bench-tolerancia")
+        if medicion["mediana_ms"] > limite:
+            medicion["lento"] = True
+            if self.config.getoption("--bench-estricto"):
+                pytest.fail(
+                    f"{self.nombre}: mediana {medicion['mediana_ms']}ms "
+                    f"(baseline {base['mediana_ms']}ms)"
+                )
+
+
+@pytest.fixture
+def bench(request):
+    return Bench(request)
+
+
+@pytest.fixture
+def informe():
+    """`informe(titulo, lineas)`: sección de texto libre en el resumen final."""
+
+    def _agregar(titulo: str, lineas: list[str]) -> None:
+        _informes[titulo] = list(lineas)
+
+    return _agregar
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _resultados or hasattr(session.config, "workerinput"):
+        return
+    RESULTADOS.write_text(
+        json.dumps(_resultados, indent=2, sort_keys=True, ensure_ascii=False) + "\n",
+        encoding="utf-8",
+    )
+    if session.config.getoption("--bench-guardar"):
+        base = _cargar_baseline()
+        base.update(_resultados)
+        BASELINE.write_text(
+            json.dumps(base, indent=2, sort_keys=True, ensure_ascii=False) + "\n",
+            encoding="utf-8",
+        )
+
+
+def pytest_terminal_summary(terminalreporter):
+    tr = terminalreporter
+    for titulo, lineas in _informes.items():
+        tr.section(titulo)
+        for linea in lineas:
+            tr.write_line(linea)
+    if not _resultados:
+        return
+    base = _cargar_baseline()
+    tr.section("benchmarks")
+    tr.write_line(f"{'benchmark':<48} {'mediana':>10} {'base':>10} {'consultas':>10} {'base':>6}")
+    for nombre, m in sorted(_resultados.items()):
+        b = base.get(nombre, {})
+        marca = "  LENTO" if m.get("lento") else ""
+        tr.write_line(
+            f"{nombre:<48} {m['mediana_ms']:>8.2f}ms {b.get('mediana_ms', '-'):>10} "
+            f"{m['consultas']:>10} {b.get('consultas', '-'):>6}{marca}"
+        )
@@ -0,0 +1,34 @@
+# benchmarks/test_bench_apis.py
+import json
+
+import pytest
+from django.test import RequestFactory
+
+from academia_core.models import EstudianteProfesorado, PlanEstudios
+from academia_core.views_api import api_espacios_habilitados
+from ui.views_api import api_horarios_profesorado
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def rf():
+    return RequestFactory()
+
+
+def test_api_espacios_habilitados(bench, rf, datos):
+    ep = EstudianteProfesorado.objects.filter(plan_id=datos.planes[0]).order_by("id").first()
+    request = rf.get("/api/espacios-habilitados/", {"est": ep.estudiante_id, "plan": ep.plan_id})
+    resp = bench(api_espacios_habilitados, request)
+    assert resp.status_code == 200
+    assert json.loads(resp.content)["items"]
+
+
+def test_api_horarios_profesorado(bench, rf, datos):
+    plan = PlanEstudios.objects.get(pk=datos.planes[0])
+    request = rf.get(
+        "/ui/api/horarios/profesorado", {"profesorado_id": plan.carrera_id, "plan_id": plan.id}
+    )
+    resp = bench(api_horarios_profesorado, request)
+    assert resp.status_code == 200
+    assert any(json.loads(resp.content).values())
@@ -0,0 +1,27 @@
+# benchmarks/test_bench_arranque.py
+"""Arranque en frío de un proceso nuevo (ver benchmarks/arranque.py)."""
+
+import pytest
+
+from benchmarks import arranque
+
+
+@pytest.mark.django_db
+def test_arranque_primera_respuesta(bench):
+    medicion = bench(arranque.medir)
+    assert medicion["status"] == 200
+    assert medicion["setup_ms"] <= medicion["primera_respuesta_ms"] <= medicion["total_ms"]
+
+
+def test_perfil_importacion(informe):
+    perfil = arranque.perfil_importacion(top=15)
+    informe(
+        "perfil de importación (arranque)",
+        [f"total {perfil['total_ms']:.1f} ms, propios {perfil['propios_ms']:.1f} ms"]
+        + [f"  {nombre:<48} {ms:>8.1f} ms" for nombre, ms in perfil["paquetes"].items()]
+        + ["más caros:"]
+        + [f"  {nombre:<48} {ms:>8.1f} ms" for nombre, ms in perfil["modulos"].items()],
+    )
+    # el schema de la API se importa recién cuando alguien lo pide
+    assert "drf_spectacular.views" not in perfil["importados"]
+    assert "academia_core.eligibilidad" in perfil["importados"]
@@ -0,0 +1,60 @@
+# benchmarks/test_bench_eligibilidad.py
+import pytest
+
+from academia_core.eligibilidad import habilitado
+from academia_core.models import EspacioCurricular, EstudianteProfesorado
+from academia_core.utils_inscripciones import cumple_correlativas
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def avanzado(datos):
+    """Inscripción de la cohorte más vieja (ya cursó los 4 años)."""
+    return (
+        EstudianteProfesorado.objects.filter(plan_id=datos.planes[0])
+        .select_related("plan")
+        .order_by("cohorte", "id")
+        .first()
+    )
+
+
+def _espacios_4(plan_id):
+    return list(EspacioCurricular.objects.filter(plan_id=plan_id, anio="4°").order_by("id"))
+
+
+def test_habilitado_plan_completo(bench, datos, avanzado):
+    espacios = list(EspacioCurricular.objects.filter(plan_id=datos.planes[0]).order_by("id"))
+
+    def correr():
+        return [
+            habilitado(avanzado.estudiante_id, avanzado.plan_id, e, "PARA_CURSAR")[0]
+            for e in espacios
+        ]
+
+    assert len(bench(correr)) == len(espacios)
+
+
+def test_cumple_correlativas_cursar(bench, avanzado):
+    espacios = _espacios_4(avanzado.plan_id)
+
+    def correr():
+        return [cumple_correlativas(avanzado, e, "CURSAR")[0] for e in espacios]
+
+    assert len(bench(correr)) == len(espacios)
+
+
+def test_cumple_correlativas_rendir(bench, avanzado):
+    espacios = _espacios_4(avanzado.plan_id)
+
+    def correr():
+        return [cumple_correlativas(avanzado, e, "RENDIR")[0] for e in espacios]
+
+    assert len(bench(correr)) == len(espacios)
+
+
+def test_cumple_correlativas_hasta_anio(bench, avanzado):
+    # El primer espacio de 4° exige todos los de 1° y 2° regularizados.
+    espacio = _espacios_4(avanzado.plan_id)[0]
+    ok, faltan = bench(cumple_correlativas, avanzado, espacio, "CURSAR")
+    assert ok == (not faltan)
@@ -0,0 +1,23 @@
+# benchmarks/test_bench_inscripciones.py
+import pytest
+
+from academia_core.inscripciones import inscribir_cohorte
+from academia_core.models import EstudianteProfesorado
+from academia_core.plan_grafo import compilar_plan
+
+pytestmark = pytest.mark.django_db
+
+
+def test_compilar_plan(bench, datos):
+    grafo = bench(compilar_plan, datos.planes[0])
+    assert grafo.reglas
+
+
+def test_inscribir_cohorte_simulada(bench, datos):
+    # Cohorte más vieja en los espacios de 4°: el caso con más correlatividades.
+    plan_id = datos.planes[0]
+    cohorte = min(
+        EstudianteProfesorado.objects.filter(plan_id=plan_id).values_list("cohorte", flat=True)
+    )
+    res = bench(inscribir_cohorte, plan_id, cohorte, 4, 2099, simular=True)
+    assert res.estudiantes and res.espacios
@@ -0,0 +1,70 @@
+# benchmarks/test_bench_serializacion.py
+import json
+import statistics
+import time
+
+import pytest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse
+
+from academia_core import serializacion
+from academia_core.models import Movimiento
+from academia_core.serializacion import RespuestaJSON
+from academia_core.views_api import MOVIMIENTO
+from academia_horarios.models import Horario
+from ui.views_api import BLOQUE_PROFESORADO
+
+pytestmark = pytest.mark.django_db
+
+
+def _grilla():
+    """Todos los bloques de la institución, como los arma api_horarios_profesorado."""
+    qs = Horario.objects.order_by("profesorado_id", "anio", "dia", "inicio")
+    return {"items": BLOQUE_PROFESORADO.items(qs)}
+
+
+def _movimientos():
+    return {"items": MOVIMIENTO.items(Movimiento.objects.order_by("-fecha", "id"))}
+
+
+def test_serializar_grilla(bench, datos):
+    resp = bench(lambda: RespuestaJSON(_grilla()))
+    assert len(json.loads(resp.content)["items"]) == datos.horarios
+
+
+def test_serializar_movimientos(bench, datos):
+    resp = bench(lambda: RespuestaJSON(_movimientos()))
+    assert len(json.loads(resp.content)["items"]) == datos.movimientos
+
+
+def _mediana_ms(fn, rondas: int = 7) -> float:
+    tiempos = []
+    for _ in range(rondas):
+        t0 = time.perf_counter()
+        fn()
+        tiempos.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(tiempos)
+
+
+def test_comparar_codificadores(datos, informe, monkeypatch):
+    """Sólo la codificación (datos ya armados): JsonResponse vs dumps con y sin orjson."""
+    cargas = {"grilla": _grilla(), "movimientos": _movimientos()}
+    lineas = []
+    for nombre, data in cargas.items():
+        referencia = JsonResponse(data, encoder=DjangoJSONEncoder)
+        tiempos = {"JsonResponse": _mediana_ms(lambda data=data: JsonResponse(data))}
+        if serializacion.orjson is not None:
+            tiempos["orjson"] = _mediana_ms(lambda data=data: RespuestaJSON(data))
+        with monkeypatch.context() as m:
+            m.setattr(serializacion, "orjson", None)
+            tiempos["stdlib"] = _mediana_ms(lambda data=data: RespuestaJSON(data))
+            assert json.loads(RespuestaJSON(data).content) == json.loads(referencia.content)
+
+        base = tiempos["JsonResponse"]
+        detalle = ", ".join(
+            f"{k} {ms:.2f} ms ({base / ms:.1f}x)" if k != "JsonResponse" else f"{k} {ms:.2f} ms"
+            for k, ms in tiempos.items()
+        )
+        tamanio = f"{len(data['items'])} items, {len(referencia.content)} B"
+        lineas.append(f"{nombre} ({tamanio}): {detalle}")
+    informe("Serialización JSON", lineas)
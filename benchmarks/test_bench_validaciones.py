@@ -0,0 +1,61 @@
+# benchmarks/test_bench_validaciones.py
+import pytest
+from django.core.exceptions import ValidationError
+
+from academia_core.models import Condicion, EspacioCurricular, EstudianteProfesorado, Movimiento
+from academia_horarios.models import Comision, HorarioClase, TimeSlot
+
+pytestmark = pytest.mark.django_db
+
+
+def _validar(obj):
+    try:
+        obj.clean()
+    except ValidationError as e:
+        return e.messages
+    return []
+
+
+@pytest.fixture
+def inscripcion(datos):
+    return (
+        EstudianteProfesorado.objects.filter(plan_id=datos.planes[0], legajo_estado="COMPLETO")
+        .order_by("cohorte", "id")
+        .first()
+    )
+
+
+def test_movimiento_clean_reg(bench, inscripcion):
+    espacio = EspacioCurricular.objects.filter(plan=inscripcion.plan, anio="2°").first()
+    mov = Movimiento(
+        inscripcion=inscripcion,
+        espacio=espacio,
+        tipo="REG",
+        fecha=inscripcion.movimientos.latest("fecha").fecha,
+        condicion=Condicion.objects.get(codigo="LIBRE-I"),
+    )
+    bench(_validar, mov)
+
+
+def test_movimiento_clean_fin(bench, inscripcion):
+    espacio = EspacioCurricular.objects.filter(plan=inscripcion.plan, anio="4°").first()
+    mov = Movimiento(
+        inscripcion=inscripcion,
+        espacio=espacio,
+        tipo="FIN",
+        fecha=inscripcion.movimientos.latest("fecha").fecha,
+        condicion=Condicion.objects.get(codigo="FINAL_APROBADO"),
+        nota_num=8,
+    )
+    bench(_validar, mov)
+
+
+def test_horario_clase_clean(bench, datos):
+    comision = (
+        Comision.objects.filter(periodo_id=datos.periodo_id)
+        .select_related("materia_en_plan__plan", "periodo")
+        .order_by("id")
+        .first()
+    )
+    hc = HorarioClase(comision=comision, timeslot=TimeSlot.objects.order_by("id").first())
+    bench(_validar, hc)
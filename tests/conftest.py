@@ -1,9 +1,27 @@
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 
+from academia_core import auditoria
 from academia_core.models import Carrera, PlanEstudios
 
 
+@pytest.fixture(autouse=True)
+def _cache_limpia():
+    # El rollback de cada test no dispara signals: sin esto la caché de
+    # referencia arrastraría datos de un test al siguiente.
+    cache.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _auditoria_limpia():
+    # Eventos encolados por un test (p. ej. force_login) no deben volcarse en otro.
+    auditoria.descartar()
+    yield
+    auditoria.descartar()
+
+
 @pytest.fixture
 def admin_user(db):
     User = get_user_model()
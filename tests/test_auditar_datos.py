@@ -0,0 +1,95 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from model_bakery import baker
+
+from academia_core.models import (
+    Condicion,
+    EspacioCurricular,
+    Estudiante,
+    EstudianteProfesorado,
+    Materia,
+    Movimiento,
+)
+from academia_core.promedios import auditar
+
+HOY = datetime.date(2025, 3, 1)
+
+
+@pytest.fixture
+def movimientos(plan_estudios):
+    conds = {
+        codigo: Condicion.objects.create(codigo=codigo, nombre=codigo.title(), tipo=tipo)
+        for codigo, tipo in [("REGULAR", "REG"), ("PROMOCION", "REG"), ("APROBADO", "REG")]
+    }
+    espacios = [
+        EspacioCurricular.objects.create(
+            plan=plan_estudios,
+            materia=Materia.objects.create(nombre=f"Materia {i}"),
+            anio="1°",
+            cuatrimestre="1",
+        )
+        for i in range(4)
+    ]
+    casos = [
+        # (tipo, condición, nota_num, nota_texto)
+        [("FIN", "REGULAR", 7, ""), ("REG", "PROMOCION", None, "8 (ocho)")],
+        [("REG", "APROBADO", 5, "9"), ("FIN", "REGULAR", 4, ""), ("REG", "REGULAR", 9, "")],
+        [("REG", "PROMOCION", None, "6"), ("REG", "APROBADO", None, "sin nota")],
+        [],
+    ]
+    inscs = []
+    for i, movs in enumerate(casos):
+        est = baker.make(Estudiante, dni=f"3500000{i}")
+        insc = EstudianteProfesorado.objects.create(
+            estudiante=est, carrera=plan_estudios.carrera, plan=plan_estudios
+        )
+        Movimiento.objects.bulk_create(
+            Movimiento(
+                inscripcion=insc,
+                espacio=espacios[j],
+                tipo=tipo,
+                fecha=HOY,
+                condicion=conds[cond],
+                nota_num=nota,
+                nota_texto=texto,
+            )
+            for j, (tipo, cond, nota, texto) in enumerate(movs)
+        )
+        inscs.append(insc)
+    return inscs
+
+
+def _promedios():
+    return dict(EstudianteProfesorado.objects.values_list("pk", "promedio_general"))
+
+
+@pytest.mark.django_db
+def test_coincide_con_recalcular_promedio(movimientos):
+    for insc in movimientos:
+        insc.recalcular_promedio()
+    esperado = _promedios()
+    EstudianteProfesorado.objects.update(promedio_general=Decimal("1.00"))
+
+    res = auditar(batch_size=2, workers=1)
+
+    assert _promedios() == esperado
+    assert esperado[movimientos[0].pk] == Decimal("7.50")
+    assert res.notas.cambios == 2  # "8 (ocho)" y "6"
+    assert Movimiento.objects.filter(nota_texto="8 (ocho)", nota_num=8).exists()
+    assert res.promedios.cambios == len(movimientos)
+
+
+@pytest.mark.django_db
+def test_dry_run_no_escribe(movimientos, capsys):
+    call_command("auditar_datos", "--dry-run", "--batch", "1")
+    out = capsys.readouterr().out
+
+    assert "notas: lote 1/" in out and "promedios: lote 1/" in out
+    assert "Notas textuales a convertir -> num: 2" in out
+    assert "'8 (ocho)' -> 8" in out
+    assert "a cambiar: 3" in out
+    assert not Movimiento.objects.filter(nota_texto="8 (ocho)", nota_num__isnull=False).exists()
+    assert set(_promedios().values()) == {None}
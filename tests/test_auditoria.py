@@ -0,0 +1,78 @@
+import datetime
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from academia_core import auditoria
+from academia_core.models import Actividad
+
+
+@pytest.mark.django_db
+def test_registrar_encola_sin_escribir(admin_user, settings, django_assert_num_queries):
+    settings.AUDITORIA_LOTE = 3
+    settings.AUDITORIA_INTERVALO = 3600
+    with django_assert_num_queries(0):
+        for i in range(5):
+            auditoria.registrar("MOV_ALTA", admin_user, f"fila {i}", rol="BEDEL")
+    # dentro de una transacción no se vuelca aunque el lote esté lleno
+    assert auditoria.pendientes() == 5 and not Actividad.objects.exists()
+
+    antes = timezone.now()
+    assert auditoria.vaciar() == 5 and auditoria.pendientes() == 0
+    eventos = list(Actividad.objects.order_by("pk"))
+    assert [e.detalle for e in eventos] == [f"fila {i}" for i in range(5)]
+    assert all(e.creado <= antes for e in eventos)  # hora del evento, no del volcado
+    assert eventos[0].periodo == auditoria.periodo(timezone.localtime(eventos[0].creado))
+
+
+@pytest.mark.django_db(transaction=True)
+def test_vuelca_por_tamanio_y_al_terminar_el_request(admin_user, client, settings):
+    settings.AUDITORIA_LOTE = 3
+    settings.AUDITORIA_INTERVALO = 3600
+    auditoria.vaciar()
+    for i in range(3):
+        auditoria.registrar("MOV_ALTA", admin_user, f"fila {i}")
+    assert Actividad.objects.filter(accion="MOV_ALTA").count() == 3
+
+    client.login(username="admin", password="pass")
+    assert auditoria.pendientes() == 1
+    client.get(reverse("academia_core:api_auditoria"))
+    assert auditoria.pendientes() == 0
+    assert Actividad.objects.filter(accion="LOGIN", user=admin_user).exists()
+
+
+@pytest.mark.django_db
+def test_consultar_depurar_y_api(admin_user, client):
+    tz = timezone.get_current_timezone()
+
+    def _evento(accion, cuando):
+        creado = datetime.datetime.combine(cuando, datetime.time(12), tzinfo=tz)
+        return Actividad.objects.create(user=admin_user, accion=accion, creado=creado)
+
+    viejo = _evento("LOGIN", datetime.date(2023, 1, 15))
+    _evento("LOGIN", datetime.date(2025, 9, 1))
+    reciente = _evento("INSC_ESP", datetime.date(2025, 9, 20))
+    assert viejo.periodo == 202301
+
+    qs = auditoria.consultar(
+        user_id=admin_user.pk, desde=datetime.date(2025, 9, 1), hasta=datetime.date(2025, 9, 30)
+    )
+    assert qs.count() == 2 and qs.first() == reciente
+    assert list(auditoria.consultar(accion="INSC_ESP")) == [reciente]
+
+    assert auditoria.depurar(12, hoy=datetime.date(2025, 10, 1)) == 1
+    assert not Actividad.objects.filter(pk=viejo.pk).exists()
+
+    client.force_login(admin_user)
+    url = reverse("academia_core:api_auditoria")
+    items = client.get(url, {"accion": "INSC_ESP"}).json()["items"]
+    assert [(i["id"], i["usuario"]) for i in items] == [(reciente.pk, "admin")]
+    assert client.get(url, {"desde": "ayer"}).status_code == 400
+    assert len(client.get(url, {"limite": "1"}).json()["items"]) == 1
+
+    # sólo queda el mes actual (el LOGIN de force_login)
+    call_command("depurar_auditoria", "--meses", "0")
+    mes = auditoria.periodo(timezone.localdate())
+    assert set(Actividad.objects.values_list("periodo", flat=True)) == {mes}
@@ -0,0 +1,111 @@
+import pytest
+from django.conf import settings
+from django.db.utils import ConnectionHandler
+from django.urls import reverse
+from model_bakery import baker
+
+from academia_core import conexiones
+from academia_core.models import Estudiante
+
+
+@pytest.fixture
+def base(tmp_path):
+    """Handler aparte con el backend propio sobre un SQLite en disco, con pool."""
+    conexiones.reiniciar_estadisticas()
+    db = {
+        "ENGINE": "academia_core.backends.sqlite3",
+        "NAME": str(tmp_path / "pool.sqlite3"),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {"pool": {"max_size": 1}},
+    }
+    handler = ConnectionHandler({"default": db})
+    conn = handler["default"]
+    with conn.cursor() as c:
+        c.execute("CREATE TABLE t (x INTEGER)")
+    yield conn
+    handler.close_all()
+    conexiones.cerrar_pools()
+    conexiones.reiniciar_estadisticas()
+
+
+@pytest.mark.django_db
+def test_pool_reusa_la_conexion_fisica(base):
+    cruda = base.connection
+    base.close()
+    assert base.connection is None and base.pool.estado()["ociosas"] == 1
+
+    base.ensure_connection()
+    assert base.connection is cruda
+    stats = conexiones.estadisticas()["default"]
+    assert (stats["conexiones"], stats["nuevas"], stats["del_pool"]) == (2, 1, 1)
+    assert stats["ms_promedio"] >= 0 and stats["pool"] == {"ociosas": 0, "max_size": 1}
+
+
+@pytest.mark.django_db
+def test_pool_descarta_rotas_y_excedentes(base):
+    cruda = base.connection
+    base.close()
+    cruda.close()  # se cayó mientras estaba ociosa
+    base.ensure_connection()
+    assert base.connection is not cruda
+    assert conexiones.estadisticas()["default"]["nuevas"] == 2
+
+    extra = base.get_new_connection(base.get_connection_params())
+    base.pool.devolver(extra)
+    base.pool.devolver(base.connection)  # el pool ya está lleno: se cierra
+    assert base.pool.estado()["ociosas"] == 1
+
+
+@pytest.mark.django_db
+def test_backend_sin_verificacion_propia_reusa_del_pool(base, monkeypatch):
+    # un backend nuevo que no redefine cruda_usable usa el default del mixin
+    monkeypatch.setattr(
+        type(base), "cruda_usable", conexiones.ConexionMedida.cruda_usable, raising=True
+    )
+    cruda = base.connection
+    base.close()
+    base.ensure_connection()
+    assert base.connection is cruda
+
+
+@pytest.mark.django_db
+def test_pool_descarta_la_transaccion_abierta(base):
+    base.set_autocommit(False)
+    with base.cursor() as c:
+        c.execute("INSERT INTO t VALUES (1)")
+    base.close()
+
+    base.ensure_connection()
+    assert base.get_autocommit()
+    with base.cursor() as c:
+        c.execute("SELECT COUNT(*) FROM t")
+        assert c.fetchone() == (0,)
+
+
+@pytest.mark.django_db
+def test_router_replica(monkeypatch):
+    router = conexiones.RouterReplica()
+    with conexiones.en_replica():  # sin alias configurado: todo a default
+        assert router.db_for_read(Estudiante) is None
+
+    monkeypatch.setitem(settings.DATABASES, "reporting", settings.DATABASES["default"])
+    monkeypatch.setattr(conexiones, "retraso_replica", lambda alias: 0.0)
+    with conexiones.en_replica():
+        assert router.db_for_read(Estudiante) == "reporting"
+    assert router.db_for_read(Estudiante) is None
+
+    e = baker.make(Estudiante)
+    e._state.db = "reporting"
+    assert router.db_for_write(Estudiante, instance=e) == "default"
+    assert router.allow_migrate("reporting", "academia_core") is False
+    assert router.allow_migrate("default", "academia_core") is None
+
+
+@pytest.mark.django_db
+def test_estadisticas_api(client, admin_user, django_user_model):
+    url = reverse("academia_core:conexiones_estadisticas_api")
+    client.force_login(baker.make(django_user_model))
+    assert client.get(url).status_code == 403
+
+    client.force_login(admin_user)
+    assert "alias" in client.get(url).json()
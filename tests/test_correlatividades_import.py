@@ -0,0 +1,211 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from academia_core.models import Carrera, Correlatividad, EspacioCurricular, Materia, PlanEstudios
+from academia_core.plan_grafo import buscar_ciclo
+
+
+def _espacio(plan, anio, nombre):
+    materia = Materia.objects.create(nombre=nombre)
+    return EspacioCurricular.objects.create(plan=plan, materia=materia, anio=anio, cuatrimestre="1")
+
+
+@pytest.fixture
+def planes(plan_estudios):
+    otra = Carrera.objects.create(nombre="Profesorado de Historia")
+    historia = PlanEstudios.objects.create(carrera=otra, resolucion="1935/14")
+    esp = {
+        "pedagogia": _espacio(plan_estudios, "1°", "Pedagogía"),
+        "didactica": _espacio(plan_estudios, "1°", "Didáctica General"),
+        "practica": _espacio(plan_estudios, "2°", "Práctica II"),
+        "historia1": _espacio(historia, "1°", "Historia I"),
+        "historia2": _espacio(historia, "2°", "Historia II"),
+    }
+    return plan_estudios, historia, esp
+
+
+def _reglas(plan):
+    return set(
+        Correlatividad.objects.filter(plan=plan).values_list(
+            "espacio__materia__nombre",
+            "tipo",
+            "requisito",
+            "requiere_espacio__materia__nombre",
+            "requiere_todos_hasta_anio",
+        )
+    )
+
+
+def _json(tmp_path, datos):
+    ruta = tmp_path / "correlatividades.json"
+    ruta.write_text(json.dumps(datos), encoding="utf-8")
+    return str(ruta)
+
+
+@pytest.mark.django_db
+def test_importa_varios_planes_por_nombre(planes, tmp_path):
+    matematica, historia, _ = planes
+    ruta = _json(
+        tmp_path,
+        [
+            {
+                "profesorado": "Profesorado de Matemática",
+                "plan_resolucion": "1234/2025",
+                "years": [
+                    {
+                        "year_name": "Segundo Año",
+                        "espacios": [
+                            {
+                                "name": "Práctica II (T)",
+                                "correlativas_cursar": {
+                                    "aprobadas": [{"name": "Pedagogia (A)"}],
+                                    "regularizadas": [{"name": "didáctica general"}],
+                                },
+                            }
+                        ],
+                    }
+                ],
+            },
+            {
+                "carrera": "profesorado-de-historia",
+                "plan_resolucion": "1935/14",
+                "reglas": [
+                    {
+                        "espacio": "Historia II",
+                        "anio": "2°",
+                        "tipo": "rendir",
+                        "requisito": "aprobada",
+                        "requiere_todos_hasta_anio": 1,
+                    }
+                ],
+            },
+        ],
+    )
+
+    call_command("correlatividades", "import", ruta)
+
+    assert _reglas(matematica) == {
+        ("Práctica II", "CURSAR", "APROBADA", "Pedagogía", None),
+        ("Práctica II", "CURSAR", "REGULARIZADA", "Didáctica General", None),
+    }
+    assert _reglas(historia) == {("Historia II", "RENDIR", "APROBADA", None, 1)}
+
+
+@pytest.mark.django_db
+def test_csv_hace_upsert_con_diff(planes, tmp_path, capsys):
+    matematica, _, esp = planes
+    ruta = tmp_path / "reglas.csv"
+    ruta.write_text(
+        "plan_id;espacio_id;tipo;requisito;requiere_espacio_id;observaciones\n"
+        f"{matematica.pk};{esp['practica'].pk};CURSAR;REGULARIZADA;{esp['pedagogia'].pk};\n",
+        encoding="utf-8",
+    )
+    sobra = Correlatividad.objects.create(
+        plan=matematica,
+        espacio=esp["practica"],
+        tipo="RENDIR",
+        requisito="APROBADA",
+        requiere_espacio=esp["didactica"],
+    )
+
+    call_command("correlatividades", "import", str(ruta))
+    assert "creadas 1 | actualizadas 0 | eliminadas 0" in capsys.readouterr().out
+    call_command("correlatividades", "import", str(ruta))
+    assert "creadas 0 | actualizadas 0 | eliminadas 0 | sin cambios 1" in capsys.readouterr().out
+
+    texto = ruta.read_text(encoding="utf-8").replace(";\n", ";Res. 12/25\n")
+    ruta.write_text(texto, encoding="utf-8")
+    call_command("correlatividades", "import", str(ruta), "--reemplazar")
+    assert "creadas 0 | actualizadas 1 | eliminadas 1" in capsys.readouterr().out
+    assert not Correlatividad.objects.filter(pk=sobra.pk).exists()
+    assert Correlatividad.objects.get(plan=matematica).observaciones == "Res. 12/25"
+
+
+@pytest.mark.django_db
+def test_observaciones_demasiado_largas_se_informan_por_fila(planes, tmp_path):
+    matematica, _, esp = planes
+    ruta = tmp_path / "reglas.csv"
+    ruta.write_text(
+        "plan_id;espacio_id;tipo;requisito;requiere_espacio_id;observaciones\n"
+        f"{matematica.pk};{esp['practica'].pk};CURSAR;REGULARIZADA;{esp['pedagogia'].pk};ok\n"
+        f"{matematica.pk};{esp['practica'].pk};RENDIR;APROBADA;{esp['pedagogia'].pk};{'x' * 201}\n",
+        encoding="utf-8",
+    )
+
+    with pytest.raises(CommandError, match=r"reglas.csv:3: observaciones de 201 caracteres"):
+        call_command("correlatividades", "import", str(ruta))
+    assert not Correlatividad.objects.exists()
+
+
+@pytest.mark.django_db
+def test_ciclo_o_referencia_rota_no_tocan_el_plan(planes, tmp_path, capsys):
+    matematica, historia, esp = planes
+    Correlatividad.objects.create(
+        plan=matematica,
+        espacio=esp["pedagogia"],
+        tipo="CURSAR",
+        requisito="REGULARIZADA",
+        requiere_espacio=esp["didactica"],
+    )
+    ruta = _json(
+        tmp_path,
+        [
+            # Didáctica -> Pedagogía -> Didáctica (la segunda ya existe)
+            {
+                "plan_id": matematica.pk,
+                "espacio_id": esp["didactica"].pk,
+                "tipo": "CURSAR",
+                "requisito": "APROBADA",
+                "requiere_espacio_id": esp["pedagogia"].pk,
+            },
+            {
+                "plan_id": historia.pk,
+                "espacio": "Historia III",
+                "tipo": "CURSAR",
+                "requisito": "APROBADA",
+                "requiere_todos_hasta_anio": 1,
+            },
+        ],
+    )
+
+    with pytest.raises(CommandError, match="2 plan"):
+        call_command("correlatividades", "import", ruta)
+    out = capsys.readouterr().out
+    assert "ciclo Pedagogía -> Didáctica General -> Pedagogía" in out
+    assert "'historia iii' no existe en el plan" in out
+    assert Correlatividad.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_hasta_anio_incluye_al_propio_anio_es_ciclo(planes, tmp_path):
+    matematica, _, esp = planes
+    ruta = _json(
+        tmp_path,
+        {
+            "plan_id": matematica.pk,
+            "espacio_id": esp["practica"].pk,
+            "tipo": "CURSAR",
+            "requisito": "REGULARIZADA",
+            "requiere_todos_hasta_anio": 2,
+        },
+    )
+    with pytest.raises(CommandError):
+        call_command("correlatividades", "import", ruta, "--dry-run")
+    assert not Correlatividad.objects.exists()
+
+
+def test_buscar_ciclo():
+    assert buscar_ciclo({1: {2}, 2: {3}, 3: set()}) is None
+    assert buscar_ciclo({1: {2}, 2: {3}, 3: {1}}) == [1, 2, 3, 1]
+    assert buscar_ciclo({5: {5}}) == [5, 5]
+
+
+@pytest.mark.django_db
+def test_seed_correlatividades_reemplaza(planes):
+    _, historia, _ = planes  # el vigente más nuevo
+    call_command("seed_correlatividades")
+    call_command("seed_correlatividades")
+    assert _reglas(historia) == {("Historia II", "CURSAR", "REGULARIZADA", None, 1)}
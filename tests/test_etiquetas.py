@@ -0,0 +1,58 @@
+import pytest
+from django.template import Context, Template
+from django.urls import reverse
+
+from academia_core import referencia_cache
+from academia_core.label_utils import espacio_etiqueta, etiqueta, etiquetas_plan
+from academia_core.models import EspacioCurricular, Materia
+
+
+def _espacio(plan, anio, cuatrimestre, nombre):
+    materia = Materia.objects.create(nombre=nombre)
+    return EspacioCurricular.objects.create(
+        plan=plan, materia=materia, anio=anio, cuatrimestre=cuatrimestre
+    )
+
+
+def test_etiqueta():
+    assert etiqueta("1°", "1", "Pedagogía") == "1º, 1º C Pedagogía"
+    assert etiqueta("2°", "A", "Práctica II") == "2º, A Práctica II"
+    nombre = "Taller anual de Tercer año"
+    assert etiqueta(None, None, nombre) == f"3º, Anual {nombre}"
+    assert etiqueta("", "", "Libre") == "Libre"
+
+
+@pytest.mark.django_db
+def test_etiquetas_del_plan_en_una_consulta(plan_estudios, django_assert_num_queries):
+    a = _espacio(plan_estudios, "1°", "1", "Pedagogía")
+    b = _espacio(plan_estudios, "2°", "A", "Práctica II")
+
+    with django_assert_num_queries(1):
+        etiquetas = etiquetas_plan(plan_estudios.pk)
+    assert etiquetas == {a.pk: "1º, 1º C Pedagogía", b.pk: "2º, A Práctica II"}
+
+    # sin la materia cargada, la etiqueta sale precalculada: no hay consulta por fila
+    espacios = list(EspacioCurricular.objects.filter(plan=plan_estudios).order_by("pk"))
+    with django_assert_num_queries(0):
+        assert [espacio_etiqueta(e) for e in espacios] == list(etiquetas.values())
+
+    # cambiar la materia invalida por versión
+    Materia.objects.filter(pk=a.materia_id).update(nombre="Pedagogía I")
+    referencia_cache.invalidar("espacios")
+    assert etiquetas_plan(plan_estudios.pk)[a.pk] == "1º, 1º C Pedagogía I"
+    b.materia.nombre = "Práctica Docente"
+    b.materia.save()
+    assert etiquetas_plan(plan_estudios.pk)[b.pk] == "2º, A Práctica Docente"
+
+
+@pytest.mark.django_db
+def test_api_y_filtro_de_template(plan_estudios, client, admin_user):
+    a = _espacio(plan_estudios, "1°", "2", "Didáctica")
+    client.force_login(admin_user)
+    data = client.get(reverse("ui:api_materias_por_plan"), {"plan_id": plan_estudios.pk}).json()
+    assert data == {"items": [{"id": a.pk, "label": "1º, 2º C Didáctica"}]}
+
+    html = Template("{% load ui_extras %}{{ e|etiqueta_espacio }}").render(
+        Context({"e": EspacioCurricular.objects.get(pk=a.pk)})
+    )
+    assert html == "1º, 2º C Didáctica"
@@ -0,0 +1,198 @@
+import datetime
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from model_bakery import baker
+
+from academia_core.finales import abrir_ventana, inscribir, precalcular, ventana_abierta
+from academia_core.models import (
+    Condicion,
+    Correlatividad,
+    EspacioCurricular,
+    Estudiante,
+    EstudianteProfesorado,
+    HabilitacionFinal,
+    InscripcionMesa,
+    Materia,
+    Mesa,
+    Movimiento,
+    UserProfile,
+)
+
+HACE_UN_ANIO = datetime.date(2024, 11, 1)
+ABRE, CIERRA = datetime.date(2025, 11, 20), datetime.date(2025, 11, 28)
+MESAS = datetime.date(2025, 12, 1), datetime.date(2025, 12, 12)
+
+
+@pytest.fixture
+def turno(plan_estudios):
+    def _esp(nombre, libre=False):
+        return EspacioCurricular.objects.create(
+            plan=plan_estudios,
+            materia=Materia.objects.create(nombre=nombre),
+            anio="1°",
+            cuatrimestre="1",
+            libre_habilitado=libre,
+        )
+
+    a, b, c = _esp("Pedagogía"), _esp("Didáctica"), _esp("Filosofía", libre=True)
+    Correlatividad.objects.create(
+        plan=plan_estudios, espacio=b, tipo="RENDIR", requisito="APROBADA", requiere_espacio=a
+    )
+    regular = Condicion.objects.create(codigo="REGULAR", nombre="Regular", tipo="REG")
+    libre = Condicion.objects.create(codigo="LIBRE", nombre="Libre", tipo="REG")
+
+    def _insc(dni, completo=True):
+        insc = EstudianteProfesorado.objects.create(
+            estudiante=baker.make(Estudiante, dni=dni),
+            carrera=plan_estudios.carrera,
+            plan=plan_estudios,
+            cohorte=2022,
+        )
+        estado = "COMPLETO" if completo else "INCOMPLETO"
+        EstudianteProfesorado.objects.filter(pk=insc.pk).update(legajo_estado=estado)
+        return insc
+
+    uno, dos, tres, cuatro = _insc("1"), _insc("2"), _insc("3", completo=False), _insc("4")
+    for insc, esp, cond in [
+        (uno, a, regular),
+        (uno, b, regular),  # b pide a aprobada para rendir
+        (dos, a, regular),
+        (tres, a, regular),  # legajo incompleto
+        (cuatro, c, libre),
+    ]:
+        Movimiento.objects.create(
+            inscripcion=insc, espacio=esp, tipo="REG", fecha=HACE_UN_ANIO, condicion=cond
+        )
+    # dos ya usó sus tres intentos en a (la ausencia justificada no cuenta)
+    for i, ausente in enumerate([False, False, False, True]):
+        Movimiento.objects.create(
+            inscripcion=dos,
+            espacio=a,
+            tipo="FIN",
+            fecha=datetime.date(2025, 2 + i, 1),
+            condicion=regular,
+            nota_num=None if ausente else 2,
+            ausente=ausente,
+            ausencia_justificada=ausente,
+        )
+    return {"a": a, "b": b, "c": c, "inscs": (uno, dos, tres, cuatro)}
+
+
+@pytest.mark.django_db
+def test_precalcular_habilitaciones(turno):
+    uno, dos, tres, cuatro = turno["inscs"]
+    ventana, res = abrir_ventana("Diciembre", ABRE, CIERRA, *MESAS)
+
+    assert ventana.calculada is not None
+    assert res.habilitadas == 2 and res.inscripciones == 2
+    assert res.descartadas == {"correlativas": 1, "intentos": 1, "legajo": 1}
+    filas = HabilitacionFinal.objects.filter(ventana=ventana).values_list(
+        "inscripcion_id", "espacio_id", "libre", "intentos"
+    )
+    assert sorted(filas) == [(uno.pk, turno["a"].pk, False, 0), (cuatro.pk, turno["c"].pk, True, 0)]
+
+    # recalcular reemplaza: ahora uno aprobó a y puede rendir b
+    Movimiento.objects.create(
+        inscripcion=uno,
+        espacio=turno["a"],
+        tipo="FIN",
+        fecha=datetime.date(2025, 7, 1),
+        condicion_id="REGULAR",
+        nota_num=8,
+    )
+    res = precalcular(ventana)
+    assert res.habilitadas == 2
+    assert set(
+        HabilitacionFinal.objects.filter(inscripcion=uno).values_list("espacio_id", flat=True)
+    ) == {turno["b"].pk}
+
+
+@pytest.mark.django_db
+def test_inscribir_valida_contra_la_tabla(turno, django_assert_num_queries):
+    uno, dos, _, cuatro = turno["inscs"]
+    ventana, _ = abrir_ventana("Diciembre", ABRE, CIERRA, *MESAS)
+    mesa_a = Mesa.objects.create(materia=turno["a"].materia, fecha=MESAS[0], turno="Mañana")
+    mesa_c = Mesa.objects.create(materia=turno["c"].materia, fecha=MESAS[1], turno="Tarde")
+    fuera = Mesa.objects.create(materia=turno["a"].materia, fecha=datetime.date(2026, 2, 2))
+    hoy = ABRE + datetime.timedelta(days=1)
+
+    # mesa + habilitación (índice único) + INSERT + id
+    with django_assert_num_queries(4):
+        res = inscribir(ventana, uno.pk, mesa_a.pk, hoy=hoy)
+    assert res.status == 201 and res.datos["condicion"] == "regular"
+    assert inscribir(ventana, uno.pk, mesa_a.pk, hoy=hoy).datos["error"] == "ya_inscripto"
+    assert InscripcionMesa.objects.filter(mesa=mesa_a).count() == 1
+
+    assert inscribir(ventana, cuatro.pk, mesa_c.pk, hoy=hoy).datos["condicion"] == "libre"
+    assert inscribir(ventana, dos.pk, mesa_a.pk, hoy=hoy).datos["error"] == "no_habilitado"
+    assert inscribir(ventana, uno.pk, fuera.pk, hoy=hoy).status == 404
+    cerrada = inscribir(ventana, uno.pk, mesa_a.pk, hoy=CIERRA + datetime.timedelta(days=1))
+    assert cerrada.datos["error"] == "ventana_cerrada"
+
+    assert ventana_abierta(hoy) == ventana
+    assert ventana_abierta(CIERRA + datetime.timedelta(days=1)) is None
+
+
+@pytest.mark.django_db
+def test_api(turno, client, admin_user):
+    uno, dos, _, _ = turno["inscs"]
+    hoy = datetime.date.today()
+    ventana, _ = abrir_ventana("Actual", hoy, hoy + datetime.timedelta(days=5), *MESAS)
+    mesa = Mesa.objects.create(materia=turno["a"].materia, fecha=MESAS[0], turno="Mañana")
+
+    alumno = get_user_model().objects.create_user(username="alumno", password="x")
+    UserProfile.objects.update_or_create(
+        user=alumno, defaults={"rol": "ESTUDIANTE", "estudiante": uno.estudiante}
+    )
+    client.force_login(alumno)
+    url = reverse("academia_core:api_finales_habilitados")
+    data = client.get(url, {"inscripcion": uno.pk}).json()
+    assert data["ventana"] == {"id": ventana.pk, "nombre": "Actual", "abierta": True}
+    assert data["items"] == [
+        {
+            "espacio_id": turno["a"].pk,
+            "etiqueta": "1º, 1º C Pedagogía",
+            "condicion": "regular",
+            "intentos": 0,
+            "mesas": [{"id": mesa.pk, "fecha": "2025-12-01", "turno": "Mañana"}],
+        }
+    ]
+    assert client.get(url, {"inscripcion": dos.pk}).status_code == 403
+
+    url = reverse("academia_core:api_inscribir_final")
+    otra = client.post(url, {"inscripcion_id": dos.pk, "mesa_id": mesa.pk})
+    assert otra.status_code == 403
+    resp = client.post(url, {"inscripcion_id": uno.pk, "mesa_id": mesa.pk})
+    assert resp.status_code == 201 and resp.json()["ok"]
+
+    client.force_login(admin_user)
+    resp = client.post(url, {"inscripcion_id": dos.pk, "mesa_id": mesa.pk})
+    assert resp.status_code == 400 and resp.json()["error"] == "no_habilitado"
+    assert client.post(url, {"mesa_id": mesa.pk}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_comando(turno, capsys):
+    call_command(
+        "abrir_ventana_finales",
+        "--nombre",
+        "Diciembre",
+        "--abre",
+        ABRE.isoformat(),
+        "--cierra",
+        CIERRA.isoformat(),
+        "--mesas-desde",
+        MESAS[0].isoformat(),
+        "--mesas-hasta",
+        MESAS[1].isoformat(),
+    )
+    out = capsys.readouterr().out
+    assert "2 habilitaciones para 2 inscripciones" in out
+    assert "Descartadas por correlativas: 1, intentos: 1, legajo: 1." in out
+
+    ventana = HabilitacionFinal.objects.first().ventana
+    call_command("abrir_ventana_finales", "--ventana", str(ventana.pk))
+    assert "2 habilitaciones" in capsys.readouterr().out
@@ -0,0 +1,133 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from model_bakery import baker
+
+from academia_core.forms_carga import CargaNotaForm
+from academia_core.forms_correlativas import CorrelatividadForm
+from academia_core.models import (
+    Carrera,
+    Condicion,
+    Correlatividad,
+    EspacioCurricular,
+    Estudiante,
+    EstudianteProfesorado,
+    Materia,
+    PlanEstudios,
+)
+
+
+def _espacio(plan, anio, nombre):
+    materia = Materia.objects.create(nombre=nombre)
+    return EspacioCurricular.objects.create(plan=plan, materia=materia, anio=anio, cuatrimestre="1")
+
+
+@pytest.fixture
+def datos(plan_estudios):
+    a = _espacio(plan_estudios, "1°", "Pedagogía")
+    b = _espacio(plan_estudios, "2°", "Didáctica")
+    Condicion.objects.create(codigo="REGULAR", nombre="Regular", tipo="REG")
+    Condicion.objects.create(codigo="APROBADO", nombre="Aprobado", tipo="FIN")
+    inscs = [
+        EstudianteProfesorado.objects.create(
+            estudiante=baker.make(Estudiante, dni=f"3000000{i}", apellido=f"Gómez{i}"),
+            carrera=plan_estudios.carrera,
+            plan=plan_estudios,
+            cohorte=2024,
+        )
+        for i in range(5)
+    ]
+    return plan_estudios, a, b, inscs
+
+
+@pytest.mark.django_db
+def test_carga_nota_render_no_depende_de_las_inscripciones(datos, django_assert_num_queries):
+    str(CargaNotaForm())  # calienta la caché de condiciones
+    with django_assert_num_queries(0):
+        html = str(CargaNotaForm())
+    assert "Gómez" not in html
+    assert "data-autocompletar-url" in html
+
+
+@pytest.mark.django_db
+def test_carga_nota_ligado_proyecta_espacios_y_condiciones(datos, django_assert_num_queries):
+    plan, a, b, inscs = datos
+    data = {
+        "inscripcion": str(inscs[2].pk),
+        "espacio": str(b.pk),
+        "tipo": "REG",
+        "fecha": "2025-07-01",
+        "condicion": "REGULAR",
+        "nota_num": "",
+    }
+    CargaNotaForm(data)  # caché de espacios del plan
+    # etiqueta de la inscripción elegida + plan de la inscripción
+    with django_assert_num_queries(2):
+        form = CargaNotaForm(data)
+        campos = ("espacio", "inscripcion", "condicion")
+        html = "".join(form.fields[c].widget.render(c, data[c]) for c in campos)
+
+    assert [c[1] for c in form.fields["espacio"].choices][1:] == [
+        "1º, 1º C Pedagogía",
+        "2º, 1º C Didáctica",
+    ]
+    assert [c[0] for c in form.fields["condicion"].choices] == ["", "REGULAR"]
+    assert "Gómez2" in html and "Gómez3" not in html
+    assert form.is_valid(), form.errors
+    assert form.cleaned_data["espacio"] == b
+
+    # un espacio de otro plan no valida aunque exista
+    otro_plan = PlanEstudios.objects.create(carrera=baker.make(Carrera), resolucion="9/99")
+    otro = _espacio(otro_plan, "1°", "X")
+    with pytest.raises(ValidationError):
+        CargaNotaForm(data).fields["espacio"].clean(str(otro.pk))
+
+
+@pytest.mark.django_db
+def test_correlatividad_form_una_lista_para_los_tres_campos(datos, django_assert_num_queries):
+    plan, a, b, _ = datos
+    initial = {"profesorado": str(plan.carrera_id), "plan": str(plan.pk)}
+    CorrelatividadForm(initial=initial)
+    with django_assert_num_queries(0):
+        form = CorrelatividadForm(initial=initial)
+        str(form)
+
+    assert [c[1] for c in form.fields["correlativas_aprobadas"].choices] == [
+        "1º, 1º C Pedagogía",
+        "2º, 1º C Didáctica",
+    ]
+    assert form.fields["plan"].choices[1] == (plan.pk, str(plan))
+
+    form = CorrelatividadForm(
+        {
+            "profesorado": plan.carrera_id,
+            "plan": plan.pk,
+            "materia_principal": b.pk,
+            "correlativas_regulares": [a.pk],
+        }
+    )
+    assert form.is_valid(), form.errors
+    form.save()
+    assert Correlatividad.objects.get(espacio=b).requiere_espacio == a
+
+
+@pytest.mark.django_db
+def test_autocompletar(datos, client, admin_user):
+    plan, a, b, inscs = datos
+    url = reverse("academia_core:api_autocompletar_inscripciones")
+
+    alumno = get_user_model().objects.create_user(username="alumno", password="x")
+    client.force_login(alumno)
+    assert client.get(url, {"q": "3000"}).status_code == 403
+
+    client.force_login(admin_user)
+    assert len(client.get(url, {"q": "3000"}).json()["items"]) == 5
+    items = client.get(url, {"q": "gómez3"}).json()["items"]
+    assert items == [{"id": inscs[3].pk, "label": str(inscs[3])}]
+    assert client.get(url).json()["items"] == []
+
+    url = reverse("academia_core:api_autocompletar_espacios")
+    items = client.get(url, {"inscripcion": inscs[0].pk, "q": "DIDÁ"}).json()["items"]
+    assert items == [{"id": b.pk, "label": "2º, 1º C Didáctica"}]
+    assert len(client.get(url, {"plan_id": plan.pk}).json()["items"]) == 2
@@ -0,0 +1,87 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from model_bakery import baker
+from PIL import Image
+
+from academia_core import fotos
+from academia_core.models import Estudiante, Job
+
+
+def _png(color="red", size=(400, 300)):
+    buf = BytesIO()
+    Image.new("RGB", size, color).save(buf, "PNG")
+    return SimpleUploadedFile("foto.PNG", buf.getvalue(), content_type="image/png")
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.mark.django_db
+def test_foto_por_contenido_y_miniatura(media, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        uno = baker.make(Estudiante, dni="1", foto=_png())
+    digest = uno.foto_hash
+    assert uno.foto.name == f"estudiantes/fotos/{digest[:2]}/{digest}.png"
+    assert uno.foto_miniatura == "" and uno.foto_thumb_url == uno.foto.url
+    job = Job.objects.get(tipo="generar_miniaturas")
+    assert job.parametros == {"estudiante_ids": [uno.pk]}
+
+    assert fotos.generar_pendientes() == {"generadas": 1, "errores": 0}
+    uno.refresh_from_db()
+    assert uno.foto_miniatura.endswith(f"{digest}_160.webp")
+    with Image.open(media / uno.foto_miniatura) as mini:
+        assert mini.size == (160, 160) and mini.format == "WEBP"
+
+    # la misma foto otra vez: mismo archivo y miniatura, sin tarea nueva
+    with django_capture_on_commit_callbacks(execute=True):
+        dos = baker.make(Estudiante, dni="2", foto=_png())
+    assert dos.foto.name == uno.foto.name and dos.foto_miniatura == uno.foto_miniatura
+    assert Job.objects.count() == 1
+    assert len(list((media / "estudiantes" / "fotos").rglob("*"))) == 2  # carpeta + archivo
+
+    dos.foto = None
+    dos.save()
+    assert dos.foto_hash == "" and dos.foto_thumb_url == ""
+
+
+@pytest.mark.django_db
+def test_pendientes_de_fotos_viejas_y_errores(media, settings, capsys):
+    settings.FOTO_MINIATURA_FORMATO = "JPEG"
+    viejo = baker.make(Estudiante, dni="9")
+    viejo.foto.save("foto.png", _png("blue"), save=False)
+    Estudiante.objects.filter(pk=viejo.pk).update(foto=viejo.foto.name)
+    roto = baker.make(Estudiante, dni="8")
+    Estudiante.objects.filter(pk=roto.pk).update(foto="estudiantes/8/foto.png")
+
+    call_command("generar_miniaturas")
+    assert "Miniaturas generadas: 1. Con error: 1" in capsys.readouterr().out
+    viejo.refresh_from_db()
+    assert viejo.foto.name == "estudiantes/9/foto.png"  # no se mueve
+    assert viejo.foto_hash and viejo.foto_miniatura.endswith("_160.jpg")
+
+
+@pytest.mark.django_db
+def test_vista_y_listado(media, client, admin_user):
+    est = baker.make(Estudiante, dni="1", apellido="Pérez", foto=_png())
+    fotos.generar_miniatura(est)
+    url = est.foto_thumb_url
+    assert url == f"/fotos/{est.foto_miniatura}"
+
+    assert client.get(url).status_code == 302  # login
+    client.force_login(admin_user)
+    resp = client.get(url)
+    assert resp.status_code == 200
+    assert resp["Cache-Control"] == "private, max-age=31536000, immutable"
+    assert b"".join(resp.streaming_content)[:4] == b"RIFF"
+    assert client.get("/fotos/estudiantes/fotos/x.png").status_code == 404
+    assert client.get(url.replace(est.foto_hash, "0" * 64)).status_code == 404
+
+    html = client.get(reverse("ui:estudiantes_list")).content.decode()
+    assert f'src="{url}"' in html
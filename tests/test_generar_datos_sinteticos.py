@@ -0,0 +1,94 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.db.models import F
+
+from academia_core.models import Correlatividad, EstudianteProfesorado, Movimiento
+from academia_core.sintetico import generar
+from academia_horarios.models import Horario, HorarioClase
+
+TAMANIO = {"carreras": 1, "estudiantes_por_carrera": 20, "espacios_por_anio": 3}
+
+
+def _foto() -> dict:
+    """Contenido generado, por claves naturales (los ids pueden variar)."""
+    return {
+        "movimientos": list(
+            Movimiento.objects.order_by(
+                "inscripcion__estudiante__dni", "espacio__materia__nombre", "fecha", "tipo"
+            ).values_list(
+                "inscripcion__estudiante__dni",
+                "espacio__materia__nombre",
+                "tipo",
+                "fecha",
+                "condicion__codigo",
+                "nota_num",
+            )
+        ),
+        "correlatividades": sorted(
+            Correlatividad.objects.values_list(
+                "espacio__materia__nombre", "tipo", "requisito", "requiere_espacio__materia__nombre"
+            ),
+            key=str,
+        ),
+        "horarios": sorted(
+            Horario.objects.values_list(
+                "materia__materia__nombre", "dia", "inicio", "docente__dni"
+            ),
+            key=str,
+        ),
+    }
+
+
+def _generar_y_descartar(seed: int) -> dict:
+    with transaction.atomic():
+        generar(seed=seed, **TAMANIO)
+        foto = _foto()
+        transaction.set_rollback(True)
+    return foto
+
+
+@pytest.mark.django_db
+def test_generar_distinto_por_seed():
+    a = generar(seed=7, **TAMANIO)
+    notas_a = list(Movimiento.objects.order_by("id").values_list("tipo", "nota_num"))
+    assert a.inscripciones == EstudianteProfesorado.objects.count() == 20
+    assert a.movimientos == len(notas_a) > 0
+    assert Correlatividad.objects.count() == a.correlatividades
+    assert HorarioClase.objects.count() == a.horarios_clase
+
+    b = generar(seed=8, **TAMANIO)
+    notas_b = list(
+        Movimiento.objects.order_by("id").values_list("tipo", "nota_num")[len(notas_a) :]
+    )
+    assert b.movimientos != a.movimientos or notas_b != notas_a
+
+
+@pytest.mark.django_db
+def test_generar_misma_seed_mismo_resultado():
+    primera = _generar_y_descartar(7)
+    assert EstudianteProfesorado.objects.count() == 0
+    assert primera["movimientos"] and primera["horarios"]
+    assert _generar_y_descartar(7) == primera
+
+
+@pytest.mark.django_db
+def test_generar_sin_returning_recupera_pks_por_clave(monkeypatch):
+    # Como en MySQL: bulk_create no devuelve pks y _bulk los relee por clave natural
+    monkeypatch.setattr(type(connection.features), "can_return_rows_from_bulk_insert", False)
+    res = generar(seed=5, batch_size=7, **TAMANIO)
+    assert res.inscripciones == EstudianteProfesorado.objects.count() == 20
+    assert Movimiento.objects.count() == res.movimientos
+    assert HorarioClase.objects.count() == res.horarios_clase
+    # con pks mal asignados las relaciones cruzarían planes
+    assert not Movimiento.objects.exclude(espacio__plan=F("inscripcion__plan")).exists()
+    assert not Horario.objects.exclude(materia__plan=F("plan")).exists()
+    assert EstudianteProfesorado.objects.filter(estudiante__dni__startswith="9005").count() == 20
+
+
+@pytest.mark.django_db
+def test_comando_rechaza_seed_repetida():
+    call_command("generar_datos_sinteticos", "--seed", "3", "--batch", "50")
+    with pytest.raises(CommandError):
+        call_command("generar_datos_sinteticos", "--seed", "3")
@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.utils import timezone
+from model_bakery import baker
+
+from academia_core.inscripciones import (
+    Resultado,
+    con_idempotencia,
+    depurar_idempotencia,
+    insertar_ignorando_conflicto,
+)
+from academia_core.models import SolicitudIdempotente
+
+
+class Operacion:
+    def __init__(self, status=201):
+        self.status = status
+        self.llamadas = 0
+
+    def __call__(self):
+        self.llamadas += 1
+        return Resultado(True, self.status, {"n": self.llamadas})
+
+
+@pytest.mark.django_db
+def test_clave_por_usuario_y_endpoint(admin_user):
+    otro = baker.make("auth.User")
+    op = Operacion()
+
+    primera = con_idempotencia("k-1", "inscribir_espacio", admin_user, op)
+    repetida = con_idempotencia("k-1", "inscribir_espacio", admin_user, op)
+    de_otro = con_idempotencia("k-1", "inscribir_espacio", otro, op)
+    otro_endpoint = con_idempotencia("k-1", "inscribir_final", admin_user, op)
+
+    assert primera.datos == repetida.datos == {"n": 1}
+    # la misma clave de otro usuario (o para otro endpoint) no ve la respuesta ajena
+    assert de_otro.datos == {"n": 2} and otro_endpoint.datos == {"n": 3}
+    assert SolicitudIdempotente.objects.filter(clave="k-1").count() == 3
+
+
+@pytest.mark.django_db
+def test_clave_anonima_tambien_es_idempotente():
+    op = Operacion()
+    con_idempotencia("k-2", "inscribir_espacio", None, op)
+    con_idempotencia("k-2", "inscribir_espacio", None, op)
+    assert op.llamadas == 1
+
+
+@pytest.mark.django_db
+def test_reserva_en_curso_y_abandonada(admin_user, settings):
+    settings.IDEMPOTENCIA_RESERVA_SEGUNDOS = 60
+    reserva = SolicitudIdempotente.objects.create(
+        clave="k-3", endpoint="inscribir_espacio", usuario=admin_user, status=0
+    )
+    op = Operacion()
+
+    en_curso = con_idempotencia("k-3", "inscribir_espacio", admin_user, op)
+    assert en_curso.status == 409 and en_curso.datos == {"error": "solicitud_en_curso"}
+    assert op.llamadas == 0
+
+    # el proceso que reservó murió: pasado el plazo otra solicitud la toma
+    SolicitudIdempotente.objects.filter(pk=reserva.pk).update(
+        creado=timezone.now() - timedelta(seconds=61)
+    )
+    tomada = con_idempotencia("k-3", "inscribir_espacio", admin_user, op)
+    assert tomada.status == 201 and op.llamadas == 1
+    reserva.refresh_from_db()
+    assert reserva.status == 201 and reserva.respuesta == {"ok": True, "n": 1}
+
+
+@pytest.mark.django_db
+def test_depurar_idempotencia():
+    vieja = baker.make(SolicitudIdempotente, clave="vieja", endpoint="e", status=201)
+    nueva = baker.make(SolicitudIdempotente, clave="nueva", endpoint="e", status=201)
+    SolicitudIdempotente.objects.filter(pk=vieja.pk).update(
+        creado=timezone.now() - timedelta(hours=49)
+    )
+
+    assert depurar_idempotencia(48) == 1
+    assert list(SolicitudIdempotente.objects.values_list("pk", flat=True)) == [nueva.pk]
+    call_command("depurar_idempotencia", "--horas", "0")
+    assert not SolicitudIdempotente.objects.exists()
+
+
+@pytest.mark.django_db
+def test_insertar_en_mysql_no_se_traga_errores_que_no_son_duplicados(monkeypatch):
+    # sin INSERT IGNORE: un NOT NULL violado no puede pasar por "ya existía"
+    monkeypatch.setattr(connection, "vendor", "mysql")
+    valores = {
+        "clave": "k-4",
+        "endpoint": "e",
+        "usuario": None,
+        "status": 0,
+        "respuesta": {},
+        "creado": timezone.now(),
+    }
+    assert insertar_ignorando_conflicto(SolicitudIdempotente, valores) is True
+    with pytest.raises(IntegrityError):
+        insertar_ignorando_conflicto(SolicitudIdempotente, {**valores, "endpoint": None})
+    assert SolicitudIdempotente.objects.filter(clave="k-4").count() == 1
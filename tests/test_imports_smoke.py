@@ -11,6 +11,23 @@ MODULES = [
     "academia_core.forms_espacios",
     "academia_core.forms_student",
     "academia_core.kpis",
+    "academia_core.inscripciones",
+    "academia_core.plan_grafo",
+    "academia_core.jobs",
+    "academia_core.tareas",
+    "academia_core.promedios",
+    "academia_core.carga_correlatividades",
+    "academia_core.planificador",
+    "academia_core.opciones",
+    "academia_core.mesas",
+    "academia_core.finales",
+    "academia_core.regularidades",
+    "academia_core.auditoria",
+    "academia_core.fotos",
+    "academia_core.modelos",
+    "academia_core.indices",
+    "academia_core.conexiones",
+    "academia_core.serializacion",
     "academia_core.label_utils",
     "academia_core.utils",
     "academia_core.utils_inscripciones",
@@ -0,0 +1,102 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from academia_core import indices
+from academia_core.models import Estudiante, Movimiento
+
+
+def _sql(qs):
+    sql, params = qs.query.sql_with_params()
+    return sql, params
+
+
+def test_huella_y_columnas():
+    a = 'SELECT "t"."x" FROM "t" WHERE ("t"."a" = %s AND "t"."b" IN (%s, %s)) LIMIT 21'
+    b = 'SELECT "t"."x" FROM "t" WHERE ("t"."a" = \'z\' AND "t"."b" IN (%s)) LIMIT 5'
+    assert indices.huella(a) == indices.huella(b)
+    assert "IN (...)" in indices.huella(a)
+
+    sql = (
+        'SELECT "m"."id", "m"."nota" FROM "m" INNER JOIN "e" T3 ON ("m"."e_id" = T3."id") '
+        'WHERE ("m"."insc_id" = %s AND T3."plan_id" IN (%s) AND "m"."fecha" <= %s) '
+        'ORDER BY "m"."fecha" DESC'
+    )
+    usos = indices.columnas_por_tabla(sql)
+    assert usos["m"].igualdad == ["insc_id"] and usos["m"].rango == ["fecha"]
+    assert usos["e"].igualdad == ["plan_id"]
+    assert usos["m"].orden == ["fecha"] and usos["m"].leidas == ["id", "nota"]
+
+
+@pytest.mark.django_db
+def test_explicar_y_sugerir():
+    sql, params = _sql(
+        Movimiento.objects.filter(inscripcion_id=1, espacio_id=2, tipo="FIN", condicion_id="R")
+    )
+    plan = indices.explicar(connection, sql, params)
+    assert plan[0] == (
+        {
+            "tabla": "academia_core_movimiento",
+            "acceso": "indice",
+            "indice": "idx_mov_insc_cond_tipo_esp",
+            "columnas": 4,
+        }
+    )
+    assert plan[1]["acceso"] == "orden"  # Meta.ordering por fecha
+
+    # sin el ordering el índice compuesto resuelve todo: no hay nada que proponer
+    sql, params = _sql(
+        Movimiento.objects.filter(
+            inscripcion_id=1, espacio_id=2, tipo="FIN", condicion_id="R"
+        ).order_by()
+    )
+    nombre, nparams = _sql(
+        Estudiante.objects.filter(apellido="Pérez", nombre="Ana").values_list("dni", "email")
+    )
+    capturas = {
+        indices.huella(s): {
+            "veces": veces,
+            "ms": ms,
+            "sql": s,
+            "plan": indices.explicar(connection, s, p),
+        }
+        for s, p, veces, ms in [(nombre, nparams, 40, 12.0), (sql, params, 100, 30.0)]
+    }
+    assert capturas[indices.huella(nombre)]["plan"][0]["acceso"] == "scan"
+
+    propuestas = indices.sugerir(capturas, indices.indices_existentes())
+    assert [(p.tabla, p.columnas, p.cubriente, p.veces) for p in propuestas] == [
+        ("academia_core_estudiante", ("apellido", "nombre", "dni", "email"), True, 40)
+    ]
+    assert len(propuestas[0].nombre()) <= 30
+
+
+@pytest.mark.django_db
+def test_comando_desde_captura(tmp_path, capsys):
+    sql, params = _sql(Estudiante.objects.filter(localidad="Paraná", activo=True))
+    archivo = tmp_path / "consultas.json"
+    archivo.write_text(
+        json.dumps(
+            {
+                "vendor": "sqlite",
+                "consultas": {
+                    indices.huella(sql): {
+                        "veces": 5,
+                        "ms": 2.5,
+                        "sql": sql,
+                        "plan": indices.explicar(connection, sql, params),
+                    }
+                },
+            }
+        )
+    )
+    call_command("sugerir_indices", "--desde", str(archivo), "--json")
+    (propuesta,) = json.loads(capsys.readouterr().out)
+    # el booleano suelto no cuenta como igualdad; el ordering por defecto sí suma
+    assert propuesta["columnas"] == ["localidad", "apellido", "nombre"]
+    assert propuesta["motivo"] == "recorre la tabla" and propuesta["veces"] == 5
+
+    call_command("sugerir_indices", "--desde", str(archivo), "--min-veces", "10")
+    assert "Sin índices para proponer." in capsys.readouterr().out
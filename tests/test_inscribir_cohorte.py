@@ -0,0 +1,112 @@
+import datetime
+
+import pytest
+from django.core.management import call_command
+from model_bakery import baker
+
+from academia_core.inscripciones import inscribir_cohorte
+from academia_core.models import (
+    Condicion,
+    Correlatividad,
+    EspacioCurricular,
+    Estudiante,
+    EstudianteProfesorado,
+    InscripcionEspacio,
+    InscripcionEspacioEstadoLog,
+    Materia,
+    Movimiento,
+)
+from academia_core.utils_inscripciones import cumple_correlativas
+
+
+def _espacio(plan, anio, nombre):
+    materia = Materia.objects.create(nombre=nombre)
+    return EspacioCurricular.objects.create(plan=plan, materia=materia, anio=anio, cuatrimestre="1")
+
+
+@pytest.fixture
+def escenario(plan_estudios):
+    a = _espacio(plan_estudios, "1°", "Pedagogía")
+    b = _espacio(plan_estudios, "1°", "Psicología")
+    c = _espacio(plan_estudios, "2°", "Didáctica")
+    d = _espacio(plan_estudios, "2°", "Práctica II")
+    Correlatividad.objects.create(
+        plan=plan_estudios, espacio=c, tipo="CURSAR", requisito="REGULARIZADA", requiere_espacio=a
+    )
+    Correlatividad.objects.create(
+        plan=plan_estudios,
+        espacio=d,
+        tipo="CURSAR",
+        requisito="APROBADA",
+        requiere_todos_hasta_anio=1,
+    )
+    regular = Condicion.objects.create(codigo="REGULAR", nombre="Regular", tipo="REG")
+    promo = Condicion.objects.create(codigo="PROMOCION", nombre="Promoción", tipo="REG")
+
+    inscs = []
+    for i in range(3):
+        est = baker.make(Estudiante, dni=f"4000000{i}")
+        inscs.append(
+            EstudianteProfesorado.objects.create(
+                estudiante=est, carrera=plan_estudios.carrera, plan=plan_estudios, cohorte=2024
+            )
+        )
+    ayer = datetime.date.today() - datetime.timedelta(days=1)
+    # 0: regular en A (habilita C); 1: promocionó A y B (habilita C y D); 2: nada
+    Movimiento.objects.create(
+        inscripcion=inscs[0], espacio=a, tipo="REG", fecha=ayer, condicion=regular
+    )
+    for esp in (a, b):
+        Movimiento.objects.create(
+            inscripcion=inscs[1], espacio=esp, tipo="REG", fecha=ayer, condicion=promo
+        )
+    return {"plan": plan_estudios, "inscs": inscs, "espacios": (c, d)}
+
+
+@pytest.mark.django_db
+def test_coincide_con_cumple_correlativas(escenario, admin_user):
+    plan = escenario["plan"]
+    res = inscribir_cohorte(plan.pk, 2024, 2, 2025, usuario=admin_user, batch_size=2)
+
+    esperado = {
+        (i.pk, e.pk)
+        for i in escenario["inscs"]
+        for e in escenario["espacios"]
+        if cumple_correlativas(i, e, "CURSAR", fecha=datetime.date.today())[0]
+    }
+    obtenido = set(
+        InscripcionEspacio.objects.filter(anio_academico=2025).values_list(
+            "inscripcion_id", "espacio_id"
+        )
+    )
+    assert obtenido == esperado and len(esperado) == 3
+    assert res.inscriptas == 3 and sum(res.bloqueadas.values()) == 3
+    logs = InscripcionEspacioEstadoLog.objects.all()
+    assert logs.count() == 3
+    assert {lg.usuario_id for lg in logs} == {admin_user.pk}
+
+    # Reejecutar no duplica filas ni logs
+    otra = inscribir_cohorte(plan.pk, 2024, 2, 2025)
+    assert otra.inscriptas == 0 and otra.existentes == 3
+    assert InscripcionEspacioEstadoLog.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_comando_inscribir_cohorte_simular(escenario, capsys):
+    plan = escenario["plan"]
+    call_command(
+        "inscribir_cohorte",
+        "--plan",
+        str(plan.pk),
+        "--cohorte",
+        "2024",
+        "--anio",
+        "2",
+        "--anio-academico",
+        "2025",
+        "--simular",
+    )
+    out = capsys.readouterr().out
+    assert "Se inscribirían: 3" in out
+    assert "Práctica II: 2" in out
+    assert not InscripcionEspacio.objects.exists()
@@ -0,0 +1,127 @@
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+
+from academia_core.inscripciones import inscribir_espacio
+from academia_core.models import (
+    Condicion,
+    EspacioCurricular,
+    Estudiante,
+    EstudianteProfesorado,
+    InscripcionEspacio,
+    Materia,
+    Movimiento,
+    SolicitudIdempotente,
+)
+from academia_horarios.models import Comision
+
+URL = "academia_core:api_inscribir_espacio"
+
+
+@pytest.fixture
+def espacio(plan_estudios):
+    materia = Materia.objects.create(nombre="Didáctica General")
+    return EspacioCurricular.objects.create(
+        plan=plan_estudios, materia=materia, anio="1°", cuatrimestre="1"
+    )
+
+
+def _insc(plan, dni):
+    est = baker.make(Estudiante, dni=dni)
+    return EstudianteProfesorado.objects.create(estudiante=est, carrera=plan.carrera, plan=plan)
+
+
+@pytest.mark.django_db
+def test_segunda_inscripcion_no_duplica(plan_estudios, espacio):
+    insc = _insc(plan_estudios, "30111222")
+    primera = inscribir_espacio(insc, espacio, 2025)
+    segunda = inscribir_espacio(insc, espacio, 2025)
+
+    assert primera.ok and primera.status == 201
+    assert not segunda.ok and segunda.datos == {"error": "ya_inscripto", "id": primera.datos["id"]}
+    assert InscripcionEspacio.objects.filter(inscripcion=insc).count() == 1
+
+
+@pytest.mark.django_db
+def test_cupo_de_comision(plan_estudios, espacio):
+    com = baker.make(Comision, cupo=1)
+    a, b = _insc(plan_estudios, "30111223"), _insc(plan_estudios, "30111224")
+
+    assert inscribir_espacio(a, espacio, 2025, comision_id=com.pk).ok
+    lleno = inscribir_espacio(b, espacio, 2025, comision_id=com.pk)
+    # Repetir la inscripción no vuelve a descontar cupo
+    inscribir_espacio(a, espacio, 2025, comision_id=com.pk)
+
+    assert lleno.datos["error"] == "sin_cupo"
+    assert not InscripcionEspacio.objects.filter(inscripcion=b).exists()
+    com.refresh_from_db()
+    assert com.inscriptos == 1
+
+
+@pytest.mark.django_db
+def test_api_idempotency_key_repite_respuesta(client, admin_user, plan_estudios, espacio):
+    insc = _insc(plan_estudios, "30111225")
+    client.force_login(admin_user)
+    datos = {
+        "estudiante_id": insc.estudiante_id,
+        "plan_id": plan_estudios.pk,
+        "espacio_id": espacio.pk,
+        "ciclo": 2025,
+    }
+    r1 = client.post(reverse(URL), datos, headers={"Idempotency-Key": "abc-1"})
+    r2 = client.post(reverse(URL), datos, headers={"Idempotency-Key": "abc-1"})
+    # Sin clave, el reintento se informa como duplicado
+    r3 = client.post(reverse(URL), datos)
+
+    assert r1.status_code == r2.status_code == 201
+    assert r1.json() == r2.json()
+    assert r3.status_code == 409 and r3.json()["error"] == "ya_inscripto"
+    assert SolicitudIdempotente.objects.get(clave="abc-1").status == 201
+    assert InscripcionEspacio.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_api_otro_ciclo_no_reinscribe_lo_regularizado_o_aprobado(
+    client, admin_user, plan_estudios, espacio
+):
+    insc = _insc(plan_estudios, "30111226")
+    client.force_login(admin_user)
+    datos = {
+        "estudiante_id": insc.estudiante_id,
+        "plan_id": plan_estudios.pk,
+        "espacio_id": espacio.pk,
+        "ciclo": 2025,
+    }
+    assert client.post(reverse(URL), datos).status_code == 201
+    regular = Condicion.objects.create(codigo="REGULAR", nombre="Regular", tipo="REG")
+
+    def _mov(tipo, nota=None):
+        Movimiento.objects.bulk_create(
+            [
+                Movimiento(
+                    inscripcion=insc,
+                    espacio=espacio,
+                    tipo=tipo,
+                    fecha=timezone.localdate(),
+                    condicion=regular,
+                    nota_num=nota,
+                )
+            ]
+        )
+
+    _mov("REG", 7)
+    r = client.post(reverse(URL), {**datos, "ciclo": 2026})
+    assert r.status_code == 400 and r.json()["error"] == "ya_regular"
+
+    _mov("FIN", 8)
+    r = client.post(reverse(URL), {**datos, "ciclo": 2027})
+    assert r.status_code == 400 and r.json()["error"] == "ya_aprobado"
+    assert list(InscripcionEspacio.objects.values_list("anio_academico", flat=True)) == [2025]
+
+
+@pytest.mark.django_db
+def test_api_parametros_invalidos(client, admin_user):
+    client.force_login(admin_user)
+    assert client.post(reverse(URL), {"estudiante_id": "x"}).status_code == 400
+    assert client.get(reverse(URL)).status_code == 405
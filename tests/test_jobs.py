@@ -0,0 +1,127 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from academia_core import jobs
+from academia_core.models import EstadoJob, Job
+
+
+@pytest.fixture
+def tarea_prueba(monkeypatch):
+    """Registra una tarea de prueba configurable y la quita al terminar."""
+    llamadas = []
+
+    def _tarea(ctx, fallar=False, cancelar_en=None):
+        llamadas.append(ctx.job.pk)
+        if cancelar_en is not None:
+            jobs.cancelar(ctx.job.pk)
+        ctx.progreso(50, mensaje="a mitad")
+        if fallar:
+            raise RuntimeError("falló a propósito")
+        return {"ok": True}
+
+    monkeypatch.setitem(jobs.TAREAS, "prueba", _tarea)
+    return llamadas
+
+
+@pytest.mark.django_db
+def test_worker_ejecuta_y_registra_resultado():
+    job = jobs.encolar("recalcular_kpis")
+    assert call_command("procesar_jobs", "--una-vez") is None
+    job.refresh_from_db()
+    assert job.estado == EstadoJob.OK and job.progreso == 100
+    assert job.intentos == 1 and "estudiantes" in job.resultado
+
+
+@pytest.mark.django_db
+def test_tomar_no_entrega_dos_veces(tarea_prueba):
+    jobs.encolar("prueba")
+    assert jobs.tomar("w1") is not None
+    assert jobs.tomar("w2") is None
+
+
+@pytest.mark.django_db
+def test_reintentos_y_error_final(tarea_prueba):
+    job = jobs.encolar("prueba", {"fallar": True}, max_intentos=2)
+    jobs.trabajar(una_vez=True)
+    job.refresh_from_db()
+    assert job.estado == EstadoJob.PENDIENTE and job.disponible_desde > timezone.now()
+
+    Job.objects.filter(pk=job.pk).update(disponible_desde=timezone.now())
+    jobs.trabajar(una_vez=True)
+    job.refresh_from_db()
+    assert job.estado == EstadoJob.ERROR and job.intentos == 2
+    assert "falló a propósito" in job.error
+    assert len(tarea_prueba) == 2
+
+
+@pytest.mark.django_db
+def test_cancelacion(tarea_prueba):
+    pendiente = jobs.encolar("prueba")
+    assert jobs.cancelar(pendiente.pk)
+    en_curso = jobs.encolar("prueba", {"cancelar_en": 50})
+    jobs.trabajar(una_vez=True)
+
+    estados = dict(Job.objects.values_list("pk", "estado"))
+    assert estados == {pendiente.pk: EstadoJob.CANCELADO, en_curso.pk: EstadoJob.CANCELADO}
+    assert tarea_prueba == [en_curso.pk]
+
+
+@pytest.mark.django_db
+def test_recupera_jobs_de_worker_caido(tarea_prueba):
+    job = jobs.encolar("prueba")
+    jobs.tomar("caido")
+    Job.objects.filter(pk=job.pk).update(latido=timezone.now() - timedelta(hours=1))
+    assert jobs.recuperar_colgados() == 1
+    assert jobs.trabajar(una_vez=True) == 1
+
+
+@pytest.mark.django_db
+def test_worker_caido_en_el_ultimo_intento_no_se_reintenta(tarea_prueba):
+    job = jobs.encolar("prueba", max_intentos=2)
+    for intento in range(2):
+        assert jobs.tomar(f"caido-{intento}").pk == job.pk
+        Job.objects.filter(pk=job.pk).update(latido=timezone.now() - timedelta(hours=1))
+        assert jobs.recuperar_colgados() == 1
+
+    job.refresh_from_db()
+    assert job.estado == EstadoJob.ERROR and job.intentos == 2
+    assert job.error == jobs.SIN_LATIDO and job.terminado
+    assert jobs.trabajar(una_vez=True) == 0
+
+
+@pytest.mark.django_db
+def test_encolar_valida_parametros():
+    with pytest.raises(ValueError):
+        jobs.encolar("no_existe")
+    with pytest.raises(ValueError):
+        jobs.encolar("recalcular_kpis", {"sobra": 1})
+
+
+@pytest.mark.django_db
+def test_api_jobs(client, admin_user):
+    comun = get_user_model().objects.create_user(username="bedel", password="x")
+    url = reverse("academia_core:job_encolar_api")
+    cuerpo = json.dumps({"tipo": "recalcular_legajos", "parametros": {"cohorte": 2025}})
+
+    client.force_login(comun)
+    assert client.post(url, cuerpo, content_type="application/json").status_code == 403
+
+    client.force_login(admin_user)
+    r = client.post(url, cuerpo, content_type="application/json")
+    assert r.status_code == 202 and r.json()["estado"] == EstadoJob.PENDIENTE
+    job_id = r.json()["id"]
+
+    r = client.post(url, json.dumps({"tipo": "x"}), content_type="application/json")
+    assert r.status_code == 400
+
+    estado = client.get(reverse("academia_core:job_estado_api", args=[job_id])).json()
+    assert estado["tipo"] == "recalcular_legajos"
+    r = client.post(reverse("academia_core:job_cancelar_api", args=[job_id]))
+    assert r.json()["estado"] == EstadoJob.CANCELADO
+    assert client.get(reverse("ui:tareas_segundo_plano")).status_code == 200
@@ -0,0 +1,55 @@
+import pytest
+from django.core.management import call_command
+from model_bakery import baker
+
+from academia_core import kpis
+from academia_core.models import Estudiante, EstudianteProfesorado, KpiSnapshot
+
+
+def _total(metrica):
+    return KpiSnapshot.objects.get(metrica=metrica, ambito=kpis.GLOBAL).valor
+
+
+@pytest.mark.django_db
+def test_totales_incrementales_por_signal(carrera):
+    kpis.reconstruir()
+    assert _total("carreras") == 1
+
+    est = baker.make(Estudiante, dni="30111222")
+    assert _total("estudiantes") == 1
+    est.delete()
+    assert _total("estudiantes") == 0
+
+
+@pytest.mark.django_db
+def test_desglose_por_cohorte_se_recalcula_si_esta_sucio(carrera, plan_estudios):
+    est = baker.make(Estudiante, dni="30111223", activo=True)
+    ep = EstudianteProfesorado.objects.create(
+        estudiante=est, carrera=carrera, plan=plan_estudios, cohorte=2024
+    )
+    resumen = kpis.resumen_panel()
+    fila = resumen["carreras"][0]
+    assert fila["inscriptos"] == 1
+    assert fila["condicionales"] == 1
+    assert fila["cohortes"][0]["cohorte"] == 2024
+
+    ep.delete()
+    assert KpiSnapshot.objects.get(ambito=kpis.ambito_carrera(carrera.id)).sucio
+    assert kpis.resumen_panel()["carreras"][0]["inscriptos"] == 0
+
+
+@pytest.mark.django_db
+def test_recalcular_kpis_corrige_desvio(carrera, capsys):
+    kpis.reconstruir()
+    KpiSnapshot.objects.filter(metrica="carreras").update(valor=7)
+    call_command("recalcular_kpis")
+    assert "desvío" in capsys.readouterr().out
+    assert _total("carreras") == 1
+
+
+@pytest.mark.django_db
+def test_resumen_panel_es_una_consulta(carrera, django_assert_num_queries):
+    kpis.resumen_panel()  # primera lectura: materializa
+    with django_assert_num_queries(1):
+        resumen = kpis.resumen_panel()
+    assert resumen["totales"]["carreras"] == 1
@@ -0,0 +1,168 @@
+import datetime
+import json
+import random
+import time
+
+import pytest
+from django.core.management import call_command
+from model_bakery import baker
+
+from academia_core.mesas import adyacencias, colorear, franjas, guardar, programar
+from academia_core.models import (
+    Condicion,
+    Docente,
+    DocenteEspacio,
+    EspacioCurricular,
+    Estudiante,
+    EstudianteProfesorado,
+    Materia,
+    Mesa,
+    Movimiento,
+)
+
+
+def test_colorear_dsatur():
+    vecinos = adyacencias([{1, 2}, {2, 3}, {1, 3}, {4}])
+    assert vecinos == {1: {2, 3}, 2: {1, 3}, 3: {1, 2}, 4: set()}
+
+    color, sin_lugar = colorear(vecinos, 3)
+    assert len({color[1], color[2], color[3]}) == 3 and color[4] == 0 and not sin_lugar
+
+    color, sin_lugar = colorear(vecinos, 2)
+    assert len(sin_lugar) == 1 and 4 in color
+
+    # capacidad 1 por franja: cuatro mesas necesitan cuatro franjas
+    color, _ = colorear(vecinos, 4, capacidad=1)
+    assert sorted(color.values()) == [0, 1, 2, 3]
+
+    color, _ = colorear(vecinos, 3, fijos={3: 0})
+    assert color[3] == 0 and 0 not in (color[1], color[2])
+
+
+def test_turno_completo_en_segundos():
+    rnd = random.Random(3)
+    materias = range(400)
+    grupos = [set(rnd.sample(materias, 6)) for _ in range(3000)]
+    grupos += [set(rnd.sample(materias, 4)) for _ in range(120)]  # tribunales
+
+    t0 = time.perf_counter()
+    vecinos = adyacencias(grupos)
+    color, sin_lugar = colorear(vecinos, 60)
+    assert time.perf_counter() - t0 < 3
+    assert not sin_lugar
+    assert all(color[v] != color[w] for v in vecinos for w in vecinos[v])
+
+
+def test_franjas_saltea_fin_de_semana():
+    viernes = datetime.date(2025, 12, 5)
+    lunes = datetime.date(2025, 12, 8)
+    assert franjas(viernes, lunes, ("M",)) == [(viernes, "M"), (lunes, "M")]
+    assert len(franjas(viernes, lunes, ("M", "T"), sabados=True)) == 6
+
+
+@pytest.fixture
+def turno(plan_estudios):
+    def _esp(nombre, libre=False):
+        return EspacioCurricular.objects.create(
+            plan=plan_estudios,
+            materia=Materia.objects.create(nombre=nombre),
+            anio="1°",
+            cuatrimestre="1",
+            libre_habilitado=libre,
+        )
+
+    a, b, d = _esp("Pedagogía"), _esp("Didáctica"), _esp("Arte")
+    c = _esp("Filosofía", libre=True)
+    regular = Condicion.objects.create(codigo="REGULAR", nombre="Regular", tipo="REG")
+    libre = Condicion.objects.create(codigo="LIBRE", nombre="Libre", tipo="REG")
+
+    def _insc(dni):
+        return EstudianteProfesorado.objects.create(
+            estudiante=baker.make(Estudiante, dni=dni),
+            carrera=plan_estudios.carrera,
+            plan=plan_estudios,
+            cohorte=2022,
+        )
+
+    uno, dos, tres = _insc("1"), _insc("2"), _insc("3")
+    hace_un_anio = datetime.date(2024, 11, 1)
+    for insc, esp, cond, fecha in [
+        (uno, a, regular, hace_un_anio),
+        (uno, b, regular, hace_un_anio),
+        (dos, c, regular, datetime.date(2021, 11, 1)),  # vencida
+        (tres, c, libre, hace_un_anio),  # libre en espacio que lo habilita
+        (dos, d, libre, hace_un_anio),  # d no habilita libre
+        (tres, b, regular, hace_un_anio),
+    ]:
+        Movimiento.objects.create(
+            inscripcion=insc, espacio=esp, tipo="REG", fecha=fecha, condicion=cond
+        )
+    # tres ya aprobó el final de b: no es candidato
+    Movimiento.objects.create(
+        inscripcion=tres,
+        espacio=b,
+        tipo="FIN",
+        fecha=datetime.date(2025, 3, 1),
+        condicion=regular,
+        nota_num=8,
+    )
+    docente = baker.make(Docente)
+    DocenteEspacio.objects.create(docente=docente, espacio=a)
+    DocenteEspacio.objects.create(docente=docente, espacio=c)
+    return {"a": a, "b": b, "c": c, "d": d}
+
+
+@pytest.mark.django_db
+def test_programar_sin_choques_y_guardar(turno):
+    a, b, c = (turno[k].materia_id for k in "abc")
+    lunes = datetime.date(2025, 12, 1)
+
+    prog = programar(lunes, lunes, turnos=("Mañana", "Tarde"))
+    assert set(prog.asignacion) == {a, b, c}  # d sin candidatos
+    assert prog.franja(a) != prog.franja(b)  # mismo estudiante
+    assert prog.franja(a) != prog.franja(c)  # mismo docente
+    assert prog.conflictos == 2 and not prog.sin_lugar
+    assert prog.estudiantes == {a: 1, b: 1, c: 1}
+
+    # un solo turno no alcanza: lo que choca queda sin franja
+    corto = programar(lunes, lunes, turnos=("Mañana",))
+    assert corto.sin_lugar and a not in corto.sin_lugar
+
+    assert guardar(prog) == 3
+    de_nuevo = programar(lunes, lunes, turnos=("Mañana", "Tarde"))
+    assert de_nuevo.fijas == prog.asignacion and guardar(de_nuevo) == 0
+    assert Mesa.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_comando(turno, capsys):
+    call_command("programar_mesas", "--desde", "2025-12-01", "--hasta", "2025-12-02", "--json")
+    datos = json.loads(capsys.readouterr().out)
+    assert {m["materia"] for m in datos["mesas"]} == {"Pedagogía", "Didáctica", "Filosofía"}
+    assert not Mesa.objects.exists()
+
+    call_command("programar_mesas", "--desde", "2025-12-01", "--hasta", "2025-12-01", "--guardar")
+    assert "Mesas creadas: 3." in capsys.readouterr().out
+
+
+@pytest.mark.django_db
+def test_mesas_existentes_fuera_de_franja_no_se_reprograman(turno, capsys):
+    a, b, c = (turno[k].materia_id for k in "abc")
+    lunes, martes = datetime.date(2025, 12, 1), datetime.date(2025, 12, 2)
+    Mesa.objects.create(materia_id=a, fecha=lunes, turno="1ra")
+
+    prog = programar(lunes, martes, turnos=("Mañana", "Tarde"))
+    assert prog.fuera_de_franja == {a: [(lunes, "1ra")]}
+    assert a not in prog.asignacion and a not in prog.sin_lugar
+    # no sabemos a qué hora es "1ra": las que chocan con a no usan el lunes
+    assert prog.franja(b)[0] == prog.franja(c)[0] == martes
+    assert guardar(prog) == 2
+    assert Mesa.objects.filter(materia_id=a).count() == 1
+
+    # un sábado sin --sabados tampoco es franja: la materia no recibe otra mesa
+    sabado = datetime.date(2025, 12, 13)
+    Mesa.objects.create(materia_id=turno["c"].materia_id, fecha=sabado, turno="Mañana")
+    call_command("programar_mesas", "--desde", "2025-12-08", "--hasta", "2025-12-13")
+    out = capsys.readouterr().out
+    assert "fuera de las franjas" in out and "Filosofía (13/12/2025 Mañana)" in out
+    assert "Pedagogía (01/12/2025 1ra)" not in out  # fuera del período pedido
@@ -0,0 +1,117 @@
+import json
+import sqlite3
+
+import pytest
+from django.core.management import call_command
+from django.db.utils import ConnectionHandler
+
+from academia_core.management.commands import migrate_legacy
+from academia_core.models import Carrera, EspacioCurricular, Materia, PlanEstudios
+
+
+@pytest.fixture
+def legacy(tmp_path, monkeypatch):
+    """DB legacy en un SQLite aparte, con la forma de las tablas viejas."""
+    ruta = tmp_path / "legacy.sqlite3"
+    with sqlite3.connect(ruta) as db:
+        db.executescript(
+            """
+            CREATE TABLE profesorado (id INTEGER PRIMARY KEY, nombre TEXT, abreviatura TEXT);
+            CREATE TABLE plan_estudios (
+                id INTEGER PRIMARY KEY, profesorado_id INT, resolucion TEXT
+            );
+            CREATE TABLE materia (id INTEGER PRIMARY KEY, nombre TEXT);
+            CREATE TABLE espaciocurricular (
+                id INTEGER PRIMARY KEY, plan_id INT, materia_id INT, anio TEXT, cuatrimestre TEXT
+            );
+            INSERT INTO profesorado VALUES (1, 'Prof. Historia', 'ph'), (2, 'Prof. Lengua', NULL),
+                (3, '  ', NULL);
+            INSERT INTO plan_estudios VALUES (10, 1, '1935/14'), (11, 1, '2020/22'),
+                (12, 2, '100/19');
+            INSERT INTO materia VALUES (1, 'Didáctica'), (2, 'Historia I'), (3, 'Lengua I'),
+                (4, 'Didáctica'), (5, 'Filosofía');
+            INSERT INTO espaciocurricular VALUES (1, 10, 1, '1°', '1'), (2, 10, 2, '1°', 'A'),
+                (3, 12, 3, '1°', '2'), (4, 12, 4, '2°', '1'), (5, 99, 5, '1°', '1');
+            """
+        )
+    legacy_db = {"ENGINE": "django.db.backends.sqlite3", "NAME": str(ruta)}
+    # ConnectionHandler exige 'default'; sólo se usa el alias 'legacy'
+    conexiones = ConnectionHandler({"default": legacy_db, "legacy": legacy_db})
+    monkeypatch.setattr(migrate_legacy, "_conexion_legacy", lambda: conexiones["legacy"])
+    yield tmp_path / "checkpoint.json"
+    conexiones.close_all()
+
+
+def _migrar(checkpoint, *extra):
+    call_command(
+        "migrate_legacy", "--commit", "--batch", "2", "--checkpoint", str(checkpoint), *extra
+    )
+
+
+@pytest.mark.django_db
+def test_importa_por_lotes_resolviendo_fks(legacy, capsys):
+    _migrar(legacy)
+    out = capsys.readouterr().out
+
+    assert set(Carrera.objects.values_list("nombre", "abreviatura")) == {
+        ("Prof. Historia", "PH"),
+        ("Prof. Lengua", ""),
+    }
+    assert Materia.objects.count() == 4  # 'Didáctica' se repite en legacy
+    historia = PlanEstudios.objects.filter(carrera__nombre="Prof. Historia")
+    assert historia.count() == 2 and historia.filter(vigente=True).count() == 1
+    assert historia.get(resolucion="1935/14").resolucion_slug == "1935-14"
+    espacios = set(
+        EspacioCurricular.objects.values_list("plan__resolucion", "materia__nombre", "anio")
+    )
+    assert espacios == {
+        ("1935/14", "Didáctica", "1°"),
+        ("1935/14", "Historia I", "1°"),
+        ("100/19", "Lengua I", "1°"),
+        ("100/19", "Didáctica", "2°"),
+    }
+    assert "Espacios (join): 4 nuevas, 0 existentes, 1 saltadas" in out
+    assert "filas/s" in out
+
+    avance = json.loads(legacy.read_text())["tablas"]
+    assert avance["materias"]["ultimo"] == 5 and avance["espacios"]["ultimo"] == 5
+
+
+@pytest.mark.django_db
+def test_reanuda_desde_el_checkpoint(legacy, monkeypatch, capsys):
+    original = migrate_legacy.Command._lote_materias
+    lotes = []
+
+    def _cae_en_el_segundo_lote(self, filas):
+        lotes.append(filas)
+        if len(lotes) == 2:
+            raise RuntimeError("se cortó la conexión")
+        return original(self, filas)
+
+    monkeypatch.setattr(migrate_legacy.Command, "_lote_materias", _cae_en_el_segundo_lote)
+    with pytest.raises(RuntimeError):
+        _migrar(legacy)
+    assert json.loads(legacy.read_text())["tablas"]["materias"]["ultimo"] == 2
+    assert Materia.objects.count() == 2
+
+    monkeypatch.setattr(migrate_legacy.Command, "_lote_materias", original)
+    _migrar(legacy)
+    out = capsys.readouterr().out
+    assert "Materias: reanudando desde id legacy > 2" in out
+    assert "Materias: 2 nuevas, 1 existentes" in out
+    assert Materia.objects.count() == 4
+    assert EspacioCurricular.objects.count() == 4
+
+    # Una tercera corrida no tiene nada pendiente
+    _migrar(legacy)
+    assert "Carreras: 0 nuevas, 0 existentes, 0 saltadas (0 filas" in capsys.readouterr().out
+    assert EspacioCurricular.objects.count() == 4
+
+
+@pytest.mark.django_db
+def test_dry_run_no_escribe_ni_guarda_checkpoint(legacy, capsys):
+    call_command("migrate_legacy", "--checkpoint", str(legacy))
+
+    assert "Materias: 4 nuevas, 1 existentes" in capsys.readouterr().out
+    assert not Carrera.objects.exists() and not Materia.objects.exists()
+    assert not legacy.exists()
@@ -0,0 +1,46 @@
+import pytest
+from django.apps import apps
+
+from academia_core.modelos import RegistroModelos
+from academia_core.models import Docente, EspacioCurricular, Regularidad
+
+
+def test_get_primero_y_memoria(monkeypatch):
+    registro = RegistroModelos()
+    assert registro.get("academia_core", "Docente") is Docente
+    assert registro.get("academia_core.docente") is Docente
+    assert registro.get("academico", "Correlatividad") is None
+    assert registro.primero("academia_core", "ResultadoFinal", "Regularidad") is Regularidad
+
+    # ya resuelto: no vuelve a consultar el registro de apps
+    def _no(*args, **kwargs):
+        raise AssertionError("no debería consultar apps")
+
+    monkeypatch.setattr(apps, "get_model", _no)
+    assert registro.get("academia_core", "Docente") is Docente
+    assert registro.get("academico", "Correlatividad") is None
+    registro.limpiar()
+    with pytest.raises(AssertionError):
+        registro.get("academia_core", "Docente")
+
+
+def test_buscar_corre_la_heuristica_una_vez():
+    registro = RegistroModelos()
+    llamadas = []
+
+    def _espacio():
+        llamadas.append(1)
+        return next(m for m in apps.get_models() if m.__name__ == "EspacioCurricular")
+
+    assert registro.buscar("espacio", _espacio) is EspacioCurricular
+    assert registro.buscar("espacio", _espacio) is EspacioCurricular
+    assert llamadas == [1]
+
+
+def test_heuristicas_de_ui_memoizadas():
+    from ui import api
+
+    plan = api._find_plan_model()
+    assert plan is not None and plan.__name__ == "PlanEstudios"
+    assert api._find_espacio_model() is EspacioCurricular
+    assert api._find_plan_model() is plan
@@ -0,0 +1,113 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+
+from academia_core import referencia_cache
+from academia_core.models import Correlatividad, EspacioCurricular, Materia
+from academia_core.plan_grafo import analizar, bits_a_nodos, clausura, compilar_plan
+
+
+def _espacio(plan, anio, cuatrimestre, nombre):
+    materia = Materia.objects.create(nombre=nombre)
+    return EspacioCurricular.objects.create(
+        plan=plan, materia=materia, anio=anio, cuatrimestre=cuatrimestre
+    )
+
+
+def _regla(plan, espacio, requiere=None, tipo="CURSAR", hasta_anio=None):
+    return Correlatividad.objects.create(
+        plan=plan,
+        espacio=espacio,
+        tipo=tipo,
+        requisito="REGULARIZADA",
+        requiere_espacio=requiere,
+        requiere_todos_hasta_anio=hasta_anio,
+    )
+
+
+@pytest.fixture
+def plan(plan_estudios):
+    a = _espacio(plan_estudios, "1°", "1", "Pedagogía")
+    b = _espacio(plan_estudios, "1°", "1", "Psicología")
+    c = _espacio(plan_estudios, "1°", "2", "Didáctica")
+    d = _espacio(plan_estudios, "2°", "A", "Práctica II")
+    e = _espacio(plan_estudios, "2°", "1", "Filosofía")
+    _regla(plan_estudios, c, a)
+    _regla(plan_estudios, d, c)
+    _regla(plan_estudios, e, d, tipo="RENDIR")
+    return plan_estudios, {"a": a, "b": b, "c": c, "d": d, "e": e}
+
+
+@pytest.mark.django_db
+def test_clausura_y_camino_critico(plan):
+    plan, esp = plan
+    pk = {k: v.pk for k, v in esp.items()}
+
+    res = analizar(compilar_plan(plan.pk))
+
+    assert res.ciclo is None
+    assert res.requiere[pk["d"]] == sorted([pk["a"], pk["c"]])
+    # RENDIR también cuenta para "requiere en última instancia"
+    assert res.requiere[pk["e"]] == sorted([pk["a"], pk["c"], pk["d"]])
+    # Pedagogía (1º c.) -> Didáctica (2º c.) -> Práctica II (anual, 3º y 4º)
+    assert res.inicio[pk["d"]] == 3 and res.inicio[pk["e"]] == 1
+    assert res.cuatrimestres_minimos == 4
+    assert res.camino_critico == [pk["a"], pk["c"], pk["d"]]
+
+
+@pytest.mark.django_db
+def test_hasta_anio_se_expande_y_detecta_ciclos(plan):
+    plan, esp = plan
+    _regla(plan, esp["e"], hasta_anio=1)
+    assert analizar(compilar_plan(plan.pk)).inicio[esp["e"].pk] == 3
+
+    _regla(plan, esp["a"], esp["d"], tipo="RENDIR")
+    res = analizar(compilar_plan(plan.pk))
+    assert res.ciclo == [esp["a"].pk, esp["d"].pk, esp["c"].pk, esp["a"].pk]
+    assert res.cuatrimestres_minimos is None
+
+
+def test_clausura_bitsets_cadena_larga():
+    n = 300
+    aristas = {i: {i - 1} if i else set() for i in range(n)}
+    orden = list(range(n))
+    mascaras = clausura(aristas, orden)
+    assert bits_a_nodos(mascaras[n - 1], orden) == list(range(n - 1))
+    assert mascaras[0] == 0
+
+
+@pytest.mark.django_db
+def test_cache_por_version(plan):
+    plan, esp = plan
+    referencia_cache.reiniciar_estadisticas()
+    primero = referencia_cache.get_plan_analisis(plan.pk)
+    assert referencia_cache.get_plan_analisis(plan.pk) == primero
+    assert referencia_cache.estadisticas()["correlatividades"]["hits"] == 1
+
+    _regla(plan, esp["b"], esp["d"])  # post_save -> nueva versión
+    nuevo = referencia_cache.get_plan_analisis(plan.pk)
+    assert nuevo["cuatrimestres_minimos"] == 5
+    assert [e["nombre"] for e in nuevo["camino_critico"]][-1] == "Psicología"
+
+
+@pytest.mark.django_db
+def test_api_y_comando(plan, client, admin_user, capsys):
+    plan, esp = plan
+    url = reverse("academia_core:api_plan_analisis", args=[plan.pk])
+    assert client.get(url).status_code == 302
+
+    client.force_login(admin_user)
+    data = client.get(url).json()
+    assert data["cuatrimestres_minimos"] == 4
+    camino = [e["nombre"] for e in data["camino_critico"]]
+    assert camino == ["Pedagogía", "Didáctica", "Práctica II"]
+    assert client.get(reverse("academia_core:api_plan_analisis", args=[999])).status_code == 404
+
+    call_command("correlatividades", "analizar", "--plan", str(plan.pk))
+    assert "mínimo 4 cuatrimestres" in capsys.readouterr().out
+
+    _regla(plan, esp["a"], esp["c"])
+    with pytest.raises(CommandError):
+        call_command("correlatividades", "analizar")
+    assert "ciclo Pedagogía -> Didáctica -> Pedagogía" in capsys.readouterr().out
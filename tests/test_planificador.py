@@ -0,0 +1,131 @@
+import datetime
+import random
+import time
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from model_bakery import baker
+
+from academia_core.models import (
+    Condicion,
+    Correlatividad,
+    EspacioCurricular,
+    Estudiante,
+    EstudianteProfesorado,
+    Materia,
+    Movimiento,
+    UserProfile,
+)
+from academia_core.plan_grafo import PlanGrafo, Regla
+from academia_core.planificador import planificar
+
+
+def _grafo(cuatrimestres, requiere=None):
+    reglas = {
+        (e, "CURSAR"): [Regla("CURSAR", "REGULARIZADA", frozenset(reqs))]
+        for e, reqs in (requiere or {}).items()
+    }
+    return PlanGrafo(1, {e: 1 for e in cuatrimestres}, reglas, dict(cuatrimestres))
+
+
+def test_respeta_correlativas_y_cuatrimestre():
+    # 1 (1º) -> 3 (2º) -> 4 (anual); 2 (1º) suelta
+    grafo = _grafo({1: "1", 2: "1", 3: "2", 4: "A"}, {3: {1}, 4: {3}})
+
+    plan = planificar(grafo, set(), set())
+    assert plan.terminos == [[1, 2], [3], [4], [4]]
+    assert plan.optimo and plan.bloqueados == []
+
+    # arrancando en el 2º cuatrimestre el primer término queda vacío
+    assert planificar(grafo, set(), set(), primer_cuatrimestre=2).cantidad == 5
+    # con 1 y 3 regularizadas sólo falta lo que se puede cursar ya
+    assert planificar(grafo, {1, 3}, set()).terminos == [[2, 4], [4]]
+
+
+def test_carga_maxima_prioriza_la_cadena_mas_larga():
+    # 2 habilita a 3: conviene cursarla antes que 1 aunque tenga id mayor
+    grafo = _grafo({1: "1", 2: "1", 3: "2"}, {3: {2}})
+    plan = planificar(grafo, set(), set(), max_carga=1)
+    assert plan.terminos == [[2], [3], [1]]
+
+    with pytest.raises(ValueError):
+        planificar(grafo, set(), set(), max_carga=0)
+
+
+def test_bloqueados_y_aprobadas():
+    # 3 pide un espacio que no está en el plan; 4 depende de 3
+    grafo = _grafo({1: "1", 2: "1", 3: "1", 4: "2"}, {3: {99}, 4: {3}})
+    plan = planificar(grafo, set(), {1})
+    assert plan.terminos == [[2]]
+    assert plan.bloqueados == [3, 4]
+
+
+def test_plan_grande_dentro_del_presupuesto():
+    rnd = random.Random(7)
+    cuatri = {e: rnd.choice("12A") if e % 9 else "A" for e in range(1, 61)}
+    requiere = {e: set(rnd.sample(range(max(1, e - 12), e), k=min(2, e - 1))) for e in range(2, 61)}
+    grafo = _grafo(cuatri, requiere)
+
+    inicio = time.perf_counter()
+    plan = planificar(grafo, set(), set(), max_carga=4)
+    assert (time.perf_counter() - inicio) < 0.2
+    assert sorted({e for t in plan.terminos for e in t}) == list(range(1, 61))
+    assert all(len(t) <= 4 for t in plan.terminos)
+
+
+@pytest.fixture
+def inscripcion(plan_estudios):
+    def _esp(anio, cuatrimestre, nombre):
+        materia = Materia.objects.create(nombre=nombre)
+        return EspacioCurricular.objects.create(
+            plan=plan_estudios, materia=materia, anio=anio, cuatrimestre=cuatrimestre
+        )
+
+    a = _esp("1°", "1", "Pedagogía")
+    b = _esp("1°", "2", "Didáctica")
+    c = _esp("2°", "1", "Práctica II")
+    Correlatividad.objects.create(
+        plan=plan_estudios, espacio=c, tipo="CURSAR", requisito="REGULARIZADA", requiere_espacio=b
+    )
+    regular = Condicion.objects.create(codigo="REGULAR", nombre="Regular", tipo="REG")
+    est = baker.make(Estudiante, dni="41000000")
+    insc = EstudianteProfesorado.objects.create(
+        estudiante=est, carrera=plan_estudios.carrera, plan=plan_estudios, cohorte=2024
+    )
+    ayer = datetime.date.today() - datetime.timedelta(days=1)
+    Movimiento.objects.create(
+        inscripcion=insc, espacio=a, tipo="REG", fecha=ayer, condicion=regular
+    )
+    return insc
+
+
+@pytest.mark.django_db
+def test_api_plan_egreso(inscripcion, client, admin_user):
+    url = reverse("academia_core:api_plan_egreso", args=[inscripcion.pk])
+    assert client.get(url).status_code == 302
+
+    User = get_user_model()
+    otro = User.objects.create_user(username="otro", password="x")
+    UserProfile.objects.update_or_create(
+        user=otro, defaults={"rol": "ESTUDIANTE", "estudiante": baker.make(Estudiante)}
+    )
+    client.force_login(otro)
+    assert client.get(url).status_code == 403
+
+    propio = User.objects.create_user(username="propio", password="x")
+    UserProfile.objects.update_or_create(
+        user=propio, defaults={"rol": "ESTUDIANTE", "estudiante": inscripcion.estudiante}
+    )
+    client.force_login(propio)
+    data = client.get(url, {"desde": "2"}).json()
+    assert data["cuatrimestres"] == 2 and data["optimo"]
+    assert [[e["nombre"] for e in t["espacios"]] for t in data["terminos"]] == [
+        ["Didáctica"],
+        ["Práctica II"],
+    ]
+    assert [t["cuatrimestre"] for t in data["terminos"]] == [2, 1]
+
+    client.force_login(admin_user)
+    assert client.get(url, {"carga": "0"}).status_code == 400
+    assert client.get(url).json()["cuatrimestres"] == 3
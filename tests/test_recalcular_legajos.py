@@ -0,0 +1,55 @@
+import pytest
+from django.core.management import call_command
+from model_bakery import baker
+
+from academia_core.legajos import recalcular_legajos
+from academia_core.models import Carrera, Estudiante, EstudianteProfesorado
+
+DOCS_BASE = {
+    "doc_dni_legalizado": True,
+    "doc_cert_medico": True,
+    "doc_fotos_carnet": True,
+    "doc_folios_oficio": True,
+}
+
+
+def _insc(carrera, dni, **campos):
+    est = baker.make(Estudiante, dni=dni)
+    return EstudianteProfesorado.objects.create(estudiante=est, carrera=carrera, **campos)
+
+
+@pytest.mark.django_db
+def test_sql_coincide_con_reglas_del_modelo(carrera):
+    cert = Carrera.objects.create(nombre="Certificación Docente para Profesionales")
+    casos = [
+        _insc(carrera, "1", **DOCS_BASE, doc_titulo_sec_legalizado=True),
+        _insc(carrera, "2", **DOCS_BASE, doc_titulo_sec_legalizado=True, adeuda_materias=True),
+        _insc(carrera, "3", **DOCS_BASE, doc_titulo_sec_legalizado=True, titulo_en_tramite=True),
+        _insc(carrera, "4", **DOCS_BASE),
+        _insc(cert, "5", **DOCS_BASE, doc_titulo_terciario_legalizado=True, doc_incumbencias=True),
+        _insc(cert, "6", **DOCS_BASE, doc_titulo_sec_legalizado=True),
+    ]
+    esperado = {e.pk: (e.calcular_legajo_estado(), e.calcular_condicion_admin()) for e in casos}
+    # Desordenamos el estado cacheado y recalculamos en SQL
+    EstudianteProfesorado.objects.update(legajo_estado="INCOMPLETO", condicion_admin="REGULAR")
+
+    assert recalcular_legajos(batch_size=2) == len(casos)
+    obtenido = {
+        pk: (le, ca)
+        for pk, le, ca in EstudianteProfesorado.objects.values_list(
+            "pk", "legajo_estado", "condicion_admin"
+        )
+    }
+    assert obtenido == esperado
+    # Idempotente: una segunda pasada no toca nada
+    assert recalcular_legajos() == 0
+
+
+@pytest.mark.django_db
+def test_comando_recalcular_legajos(carrera, capsys):
+    ep = _insc(carrera, "7", **DOCS_BASE, doc_titulo_sec_legalizado=True)
+    EstudianteProfesorado.objects.filter(pk=ep.pk).update(legajo_estado="INCOMPLETO")
+    call_command("recalcular_legajos", "--carrera", str(carrera.pk))
+    assert "actualizadas: 1" in capsys.readouterr().out
+    ep.refresh_from_db()
+    assert ep.legajo_estado == "COMPLETO"
@@ -0,0 +1,77 @@
+import pytest
+from django.db import transaction
+from django.urls import reverse
+
+from academia_core import referencia_cache
+from academia_core.models import Carrera, Condicion, EspacioCurricular, Materia
+from academia_horarios.models import Bloque, TurnoModel
+
+
+@pytest.mark.django_db
+def test_get_carreras_cachea_e_invalida_por_signal(carrera, django_assert_num_queries):
+    assert [c["nombre"] for c in referencia_cache.get_carreras()] == [carrera.nombre]
+    with django_assert_num_queries(0):
+        referencia_cache.get_carreras()
+
+    Carrera.objects.create(nombre="Profesorado de Historia")
+    assert len(referencia_cache.get_carreras()) == 2
+
+    carrera.delete()
+    assert [c["nombre"] for c in referencia_cache.get_carreras()] == ["Profesorado de Historia"]
+
+
+@pytest.mark.django_db
+def test_lectura_concurrente_antes_del_commit_no_queda_fija(
+    carrera, django_capture_on_commit_callbacks
+):
+    referencia_cache.get_carreras()
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            Carrera.objects.create(nombre="Profesorado de Historia")
+            # otra conexión, que todavía no ve la fila, cachea bajo la versión nueva
+            clave = f"ref:carreras:{referencia_cache.version('carreras')}:todas"
+            referencia_cache._cache().set(clave, [{"nombre": carrera.nombre}])
+            assert len(referencia_cache.get_carreras()) == 1
+
+    assert len(referencia_cache.get_carreras()) == 2
+
+
+@pytest.mark.django_db
+def test_get_plan_espacios_se_invalida_al_renombrar_materia(plan_estudios):
+    materia = Materia.objects.create(nombre="Didáctica I")
+    EspacioCurricular.objects.create(
+        plan=plan_estudios, materia=materia, anio="1°", cuatrimestre="1"
+    )
+
+    assert referencia_cache.get_plan_espacios(plan_estudios.id)[0]["nombre"] == "Didáctica I"
+    materia.nombre = "Didáctica General"
+    materia.save()
+    assert referencia_cache.get_plan_espacios(plan_estudios.id)[0]["nombre"] == "Didáctica General"
+
+
+@pytest.mark.django_db
+def test_condiciones_turnos_y_bloques():
+    Condicion.objects.create(codigo="REGULAR", nombre="Regular", tipo="REG")
+    Condicion.objects.create(codigo="LIBRE", nombre="Libre", tipo="FIN")
+    turno = TurnoModel.objects.create(nombre="Mañana", slug="manana")
+    Bloque.objects.create(turno=turno, dia_semana=0, orden=1, inicio="07:45", fin="08:25")
+
+    por_tipo = referencia_cache.get_condiciones_por_tipo()
+    assert [c["codigo"] for c in por_tipo["REG"]] == ["REGULAR"]
+    assert [c["codigo"] for c in por_tipo["FIN"]] == ["LIBRE"]
+    assert referencia_cache.get_turnos() == [{"slug": "manana", "nombre": "Mañana"}]
+    assert len(referencia_cache.get_bloques("manana")) == 1
+    assert referencia_cache.get_bloques(None) == []
+
+
+@pytest.mark.django_db
+def test_estadisticas_endpoint(client, admin_user, carrera):
+    referencia_cache.reiniciar_estadisticas()
+    referencia_cache.get_carreras()
+    referencia_cache.get_carreras()
+
+    client.force_login(admin_user)
+    resp = client.get(reverse("academia_core:cache_estadisticas_api"))
+    assert resp.status_code == 200
+    carreras = resp.json()["grupos"]["carreras"]
+    assert (carreras["hits"], carreras["misses"]) == (1, 1)
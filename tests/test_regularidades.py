@@ -0,0 +1,194 @@
+import datetime
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+
+from academia_core import regularidades
+from academia_core.legajos import REQUISITOS_BASE, REQUISITOS_PROFESORADO
+from academia_core.models import (
+    Condicion,
+    EspacioCurricular,
+    Estudiante,
+    EstudianteProfesorado,
+    Materia,
+    Movimiento,
+    Regularidad,
+)
+from academia_core.utils_inscripciones import tiene_regularidad_vigente
+
+HOY = datetime.date(2025, 10, 1)
+
+
+def test_proyectar():
+    d = datetime.date
+    filas = [
+        (1, 10, "REG", "REGULAR", d(2023, 3, 1), None, False, False),
+        (1, 10, "REG", "REGULAR", d(2024, 3, 1), None, False, False),
+        (1, 10, "FIN", "REGULAR", d(2024, 7, 1), 2, False, False),
+        (1, 10, "FIN", "REGULAR", d(2024, 12, 1), None, True, True),  # justificada
+        (1, 11, "REG", "LIBRE", d(2024, 3, 1), None, False, False),
+        (2, 10, "FIN", "LIBRE", d(2024, 7, 1), 7, False, False),
+    ]
+    out = regularidades.proyectar(filas, hoy=HOY)
+    assert out == {
+        (1, 10): {
+            "fecha_regular": d(2024, 3, 1),
+            "vence_el": d(2026, 3, 1),
+            "intentos_final": 1,
+            "aprobada": False,
+            "vencida": False,
+        },
+        (2, 10): {
+            "fecha_regular": None,
+            "vence_el": None,
+            "intentos_final": 1,
+            "aprobada": True,
+            "vencida": False,
+        },
+    }
+
+
+@pytest.fixture
+def datos(plan_estudios):
+    esp = EspacioCurricular.objects.create(
+        plan=plan_estudios,
+        materia=Materia.objects.create(nombre="Pedagogía"),
+        anio="1°",
+        cuatrimestre="1",
+    )
+    insc = EstudianteProfesorado.objects.create(
+        estudiante=baker.make(Estudiante, dni="1", apellido="Pérez", nombre="Ana"),
+        carrera=plan_estudios.carrera,
+        plan=plan_estudios,
+        cohorte=2022,
+    )
+    regular = Condicion.objects.create(codigo="REGULAR", nombre="Regular", tipo="REG")
+    return insc, esp, regular
+
+
+def _regular(insc, esp, regular, fecha):
+    return Movimiento.objects.create(
+        inscripcion=insc, espacio=esp, tipo="REG", fecha=fecha, condicion=regular
+    )
+
+
+def _final(insc, esp, fecha, nota=None, ausente=False, justificada=False):
+    return Movimiento.objects.create(
+        inscripcion=insc,
+        espacio=esp,
+        tipo="FIN",
+        fecha=fecha,
+        condicion_id="REGULAR",
+        nota_num=nota,
+        ausente=ausente,
+        ausencia_justificada=justificada,
+    )
+
+
+@pytest.mark.django_db
+def test_signals_mantienen_la_proyeccion(datos, django_assert_num_queries):
+    insc, esp, regular = datos
+    _regular(insc, esp, regular, datetime.date(2024, 3, 1))
+    fila = Regularidad.objects.get(inscripcion=insc, espacio=esp)
+    assert fila.vence_el == datetime.date(2026, 3, 1) and fila.intentos_final == 0
+
+    uno = _final(insc, esp, datetime.date(2024, 7, 1), nota=2)
+    _final(insc, esp, datetime.date(2024, 12, 1), ausente=True, justificada=True)
+    assert regularidades.finales_previos(insc.pk, esp.pk) == (1, False)
+    uno.delete()
+    assert regularidades.finales_previos(insc.pk, esp.pk) == (0, False)
+
+    with django_assert_num_queries(1):
+        assert tiene_regularidad_vigente(insc, esp, datetime.date(2026, 3, 1))
+    assert not tiene_regularidad_vigente(insc, esp, datetime.date(2026, 3, 2))
+
+    Movimiento.objects.filter(inscripcion=insc).delete()
+    assert not Regularidad.objects.exists()
+
+
+@pytest.mark.django_db
+def test_clean_usa_la_proyeccion(datos):
+    insc, esp, regular = datos
+    EstudianteProfesorado.objects.filter(pk=insc.pk).update(
+        **{c: True for c in (*REQUISITOS_BASE, *REQUISITOS_PROFESORADO)}
+    )
+    _regular(insc, esp, regular, datetime.date(2024, 3, 1))
+    for mes in (5, 7, 9):
+        _final(insc, esp, datetime.date(2024, mes, 1), nota=2)
+    insc.refresh_from_db()
+    cuarto = Movimiento(
+        inscripcion=insc,
+        espacio=esp,
+        tipo="FIN",
+        fecha=datetime.date(2024, 12, 1),
+        condicion=Condicion(codigo="REGULAR", nombre="Regular", tipo="FIN"),
+        nota_num=8,
+    )
+    with pytest.raises(ValidationError, match="tres posibilidades"):
+        cuarto.clean()
+
+    # libre con la regularidad vigente (antes rompía: faltaba la fecha)
+    libre = Condicion.objects.create(codigo="LIBRE", nombre="Libre", tipo="FIN")
+    Movimiento.objects.filter(tipo="FIN").delete()
+    intento = Movimiento(
+        inscripcion=insc,
+        espacio=esp,
+        tipo="FIN",
+        fecha=datetime.date(2025, 2, 1),
+        condicion=libre,
+        nota_num=7,
+    )
+    esp.libre_habilitado = True
+    with pytest.raises(ValidationError, match="está regular"):
+        intento.clean()
+
+
+@pytest.mark.django_db
+def test_vencimientos_reporte_y_comando(datos, client, admin_user, capsys):
+    insc, esp, regular = datos
+    otro = EspacioCurricular.objects.create(
+        plan=esp.plan, materia=Materia.objects.create(nombre="Didáctica"), anio="1°"
+    )
+    hoy = timezone.localdate()
+    vigencia = regularidades.VIGENCIA_REGULARIDAD
+    for e, fecha in ((esp, hoy - vigencia + timedelta(days=19)), (otro, hoy - vigencia)):
+        _regular(insc, e, regular, fecha)
+    # la proyección se puede perder (bulk) y se rehace
+    Regularidad.objects.all().delete()
+    assert regularidades.reconstruir() == 2
+
+    # otro vence hoy: mañana la marca el proceso diario
+    manana = hoy + timedelta(days=1)
+    assert regularidades.marcar_vencidas(hoy) == 0
+    assert regularidades.marcar_vencidas(manana) == 1
+    assert regularidades.marcar_vencidas(manana) == 0
+    items = regularidades.reporte_por_vencer(30, manana)
+    assert items == [
+        {
+            "inscripcion_id": insc.pk,
+            "estudiante": "Pérez, Ana (1)",
+            "espacio_id": esp.pk,
+            "espacio": "Pedagogía",
+            "vence_el": (hoy + timedelta(days=19)).isoformat(),
+            "intentos_final": 0,
+        }
+    ]
+    assert regularidades.reporte_por_vencer(10, manana) == []
+
+    call_command("vencimientos_regularidad", "--reconstruir", "--json")
+    datos_json = json.loads(capsys.readouterr().out)
+    assert datos_json["reconstruidas"] == 2 and len(datos_json["por_vencer"]) == 2
+
+    call_command("vencimientos_regularidad", "--dias", "5")
+    assert "Vencen en los próximos 5 días: 1." in capsys.readouterr().out
+
+    client.force_login(admin_user)
+    url = reverse("academia_core:api_regularidades_por_vencer")
+    assert client.get(url, {"dias": "400"}).status_code == 400
+    assert [i["espacio"] for i in client.get(url).json()["items"]] == ["Didáctica", "Pedagogía"]
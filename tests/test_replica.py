@@ -0,0 +1,163 @@
+import sqlite3
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connections, router
+from django.http import HttpResponse, StreamingHttpResponse
+from django.template import engines
+from django.template.response import SimpleTemplateResponse
+from django.test import RequestFactory
+from model_bakery import baker
+
+from academia_core import conexiones, referencia_cache
+from academia_core.models import Estudiante
+
+
+def _alias_lectura():
+    return router.db_for_read(Estudiante)
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    """Alias 'reporting' configurado (sin conexión real) y atraso controlado."""
+    conexiones.reiniciar_estadisticas()
+    monkeypatch.setitem(settings.DATABASES, "reporting", settings.DATABASES["default"])
+    retraso = {"valor": 0.0, "consultas": 0}
+
+    def _retraso(alias):
+        retraso["consultas"] += 1
+        return retraso["valor"]
+
+    monkeypatch.setattr(conexiones, "retraso_replica", _retraso)
+    yield retraso
+    conexiones.reiniciar_estadisticas()
+
+
+@conexiones.usar_replica
+def _vista(request):
+    return HttpResponse(_alias_lectura())
+
+
+def test_usar_replica_solo_en_lecturas(replica):
+    rf = RequestFactory()
+    assert _vista(rf.get("/")).content == b"reporting"
+    assert _vista(rf.post("/")).content == b"default"
+
+    pegado = rf.get("/")
+    pegado.COOKIES[conexiones.COOKIE_PRIMARIO] = "1"
+    assert _vista(pegado).content == b"default"
+    assert _alias_lectura() == "default"  # fuera de la vista, como siempre
+
+
+def test_usar_replica_respeta_el_atraso(replica, settings):
+    settings.DB_REPORTING_RETRASO_MAX = 10
+    settings.DB_REPORTING_RETRASO_CACHE = 0
+    rf = RequestFactory()
+    for valor, esperado in [(5, b"reporting"), (60, b"default"), (None, b"default")]:
+        replica["valor"] = valor
+        assert _vista(rf.get("/")).content == esperado
+
+    settings.DB_REPORTING_RETRASO_CACHE = 60
+    replica["valor"] = 0
+    conexiones.reiniciar_estadisticas()
+    for _ in range(3):
+        _vista(rf.get("/"))
+    assert replica["consultas"] == 3 + 1
+    assert conexiones.estadisticas_replica()["replica"] == 3
+
+
+def test_usar_replica_cubre_render_y_streaming(replica):
+    plantilla = engines["django"].from_string("{{ alias }}")
+
+    @conexiones.usar_replica
+    def lista(request):
+        return SimpleTemplateResponse(plantilla, {"alias": _alias_lectura})
+
+    @conexiones.usar_replica
+    def exportar(request):
+        return StreamingHttpResponse(_alias_lectura() for _ in range(2))
+
+    rf = RequestFactory()
+    assert lista(rf.get("/")).content == b"reporting"
+    assert b"".join(exportar(rf.get("/")).streaming_content) == b"reportingreporting"
+
+
+@pytest.mark.django_db
+def test_lectura_tras_escritura(replica):
+    with conexiones.en_replica():
+        assert _alias_lectura() == "reporting"
+        baker.make(Estudiante)
+        assert _alias_lectura() == "default"
+
+    @conexiones.usar_replica
+    def escribe(request):
+        baker.make(Estudiante)
+        return HttpResponse(_alias_lectura())
+
+    middleware = conexiones.PrimarioTrasEscrituraMiddleware(escribe)
+    respuesta = middleware(RequestFactory().get("/"))
+    assert respuesta.content == b"default"
+    assert respuesta.cookies[conexiones.COOKIE_PRIMARIO]["max-age"] == settings.DB_REPORTING_PEGADO
+
+    respuesta = conexiones.PrimarioTrasEscrituraMiddleware(_vista)(RequestFactory().get("/"))
+    assert conexiones.COOKIE_PRIMARIO not in respuesta.cookies
+
+
+def test_retraso_mysql(monkeypatch):
+    class Cursor:
+        description = [("Replica_IO_State",), ("Seconds_Behind_Source",)]
+
+        def __init__(self, fila):
+            self.fila = fila
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, sql):
+            pass
+
+        def fetchone(self):
+            return self.fila
+
+    class Conexion:
+        vendor = "mysql"
+
+        def __init__(self, fila):
+            self.fila = fila
+
+        def cursor(self):
+            return Cursor(self.fila)
+
+    for fila, esperado in [(("Waiting", 3), 3.0), (("", None), None), (None, 0.0)]:
+        monkeypatch.setattr(conexiones, "connections", {"reporting": Conexion(fila)})
+        assert conexiones.retraso_replica() == esperado
+
+
+@pytest.mark.django_db(transaction=True)
+def test_copiar_reporting(tmp_path, monkeypatch):
+    destino = tmp_path / "reporting.sqlite3"
+    monkeypatch.setitem(
+        settings.DATABASES,
+        "reporting",
+        {**connections["default"].settings_dict, "NAME": str(destino)},
+    )
+    baker.make(Estudiante, _quantity=3)
+    try:
+        call_command("copiar_reporting")
+    finally:
+        connections["reporting"].close()
+        del connections["reporting"]
+    with sqlite3.connect(destino) as copia:
+        assert copia.execute("SELECT COUNT(*) FROM academia_core_estudiante").fetchone() == (3,)
+
+
+@pytest.mark.django_db
+def test_referencia_cache_se_calcula_en_el_primario(replica):
+    with conexiones.en_replica():
+        # lo cacheado no puede salir de una réplica atrasada
+        assert referencia_cache._obtener("carreras", "alias", _alias_lectura) == "default"
+        assert _alias_lectura() == "reporting"
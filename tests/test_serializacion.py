@@ -0,0 +1,124 @@
+import datetime
+import json
+from decimal import Decimal
+
+import pytest
+from django.test import RequestFactory
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from model_bakery import baker
+
+from academia_core import serializacion
+from academia_core.models import (
+    Condicion,
+    EspacioCurricular,
+    Estudiante,
+    EstudianteProfesorado,
+    Materia,
+    Movimiento,
+)
+from academia_core.serializacion import Proyeccion, RespuestaJSON, dumps, hhmm, nombre_completo
+from academia_core.views_api import api_get_movimientos_estudiante
+
+DATOS = {
+    "fecha": datetime.date(2025, 3, 1),
+    "creado": datetime.datetime(2025, 3, 1, 12, 30, 5, 120000, tzinfo=datetime.UTC),
+    "hora": datetime.time(8, 15),
+    "nota": Decimal("7.50"),
+    "lazy": gettext_lazy("Final"),
+    "texto": "Ñandú",
+    1: [None, True, 2.5],
+}
+
+
+def test_dumps_igual_con_y_sin_orjson(monkeypatch):
+    esperado = {
+        "fecha": "2025-03-01",
+        "creado": "2025-03-01T12:30:05.120000+00:00",
+        "hora": "08:15:00",
+        "nota": "7.50",
+        "lazy": "Final",
+        "texto": "Ñandú",
+        "1": [None, True, 2.5],
+    }
+    con = dumps(DATOS)
+    monkeypatch.setattr(serializacion, "orjson", None)
+    sin = dumps(DATOS)
+    assert con == sin
+    assert json.loads(sin) == esperado and "Ñandú".encode() in sin
+
+
+def test_respuesta_json():
+    resp = RespuestaJSON({"ok": True}, status=201)
+    assert resp.status_code == 201 and resp["Content-Type"] == "application/json"
+    assert json.loads(resp.content) == {"ok": True}
+    assert json.loads(RespuestaJSON([1, 2], safe=False).content) == [1, 2]
+    with pytest.raises(TypeError):
+        RespuestaJSON([1, 2])
+
+
+def test_conversiones():
+    assert hhmm(datetime.time(7, 5, 59)) == "07:05" and hhmm(None) is None
+    assert nombre_completo("Pérez", "Ana") == "Pérez, Ana"
+    assert nombre_completo("Pérez", None) == "Pérez" and nombre_completo(None, None) == ""
+
+
+@pytest.mark.django_db
+def test_proyeccion_desde_values_list(django_assert_num_queries):
+    persona = Proyeccion(
+        id="id",
+        nombre=(("apellido", "nombre"), nombre_completo),
+        dni="dni",
+        inicial=("apellido", lambda ap: ap[0]),
+    )
+    assert persona.campos == ("id", "dni", "apellido", "nombre")
+    assert persona.armar((1, "30111222", "Pérez", "Ana")) == {
+        "id": 1,
+        "dni": "30111222",
+        "nombre": "Pérez, Ana",
+        "inicial": "P",
+    }
+
+    baker.make(Estudiante, apellido="Gómez", nombre="Luis", dni="1", _quantity=1)
+    with django_assert_num_queries(1):
+        (item,) = persona.items(Estudiante.objects.all())
+    assert item["nombre"] == "Gómez, Luis" and item["inicial"] == "G"
+
+    extendida = Proyeccion(**persona.forma, email="email")
+    assert extendida.claves == persona.claves + ("email",)
+
+
+@pytest.mark.django_db
+def test_movimientos_estudiante_serializados(plan_estudios):
+    insc = EstudianteProfesorado.objects.create(
+        estudiante=baker.make(Estudiante), carrera=plan_estudios.carrera, plan=plan_estudios
+    )
+    espacio = EspacioCurricular.objects.create(
+        plan=plan_estudios, materia=Materia.objects.create(nombre="Didáctica"), anio="1°"
+    )
+    condicion = Condicion.objects.create(codigo="REGULAR", nombre="Regular", tipo="FIN")
+    (mov,) = Movimiento.objects.bulk_create(
+        [
+            Movimiento(
+                inscripcion=insc,
+                espacio=espacio,
+                tipo="FIN",
+                fecha=timezone.localdate(),
+                condicion=condicion,
+                nota_num=Decimal("8.5"),
+                nota_texto="Ocho",
+            )
+        ]
+    )
+    resp = api_get_movimientos_estudiante(RequestFactory().get("/"), insc.estudiante_id)
+    assert json.loads(resp.content)["items"] == [
+        {
+            "id": mov.pk,
+            "espacio": "Didáctica",
+            "fecha": mov.fecha.isoformat(),
+            "condicion": "Regular",
+            "nota_num": "8.5",
+            "nota_texto": "Ocho",
+            "tipo": "Final",
+        }
+    ]
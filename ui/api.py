@@ -1,14 +1,20 @@
 # ui/api.py
 import json
 import logging
+from functools import cache
 
 from django.apps import apps
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponseBadRequest, JsonResponse
+from django.http import HttpResponseBadRequest
 from django.utils import timezone
 from django.views.decorators.http import require_GET, require_POST
 
+from academia_core import label_utils
+from academia_core.conexiones import usar_replica
+from academia_core.modelos import modelos
+from academia_core.serializacion import RespuestaJSON
+
 from .forms import InscripcionProfesoradoForm
 
 logger = logging.getLogger(__name__)
@@ -36,6 +42,16 @@ def _best_label(obj):
 
 
 def _find_plan_model():
+    """Modelo de Plan inferido; la búsqueda corre una vez por proceso."""
+    return modelos.buscar("ui.api:plan", _buscar_plan_model)
+
+
+def _find_espacio_model():
+    """Modelo de Espacio/Materia inferido; la búsqueda corre una vez por proceso."""
+    return modelos.buscar("ui.api:espacio", _buscar_espacio_model)
+
+
+def _buscar_plan_model():
     """
     Busca un modelo que represente 'Plan' (PlanEstudio/Plan/etc.) con un FK a Profesorado/Carrera.
     """
@@ -61,7 +77,7 @@ def _find_plan_model():
     return candidates[0] if candidates else None
 
 
-def _find_espacio_model():
+def _buscar_espacio_model():
     """
     Busca un modelo de 'materias/espacios/asignaturas' asociado a Plan.
     """
@@ -82,6 +98,7 @@ def _find_espacio_model():
     return None
 
 
+@cache
 def _first_matching_fk_name(model, *candidates):
     """
     Devuelve el nombre de FK del 'model' cuyo nombre coincida con alguno de 'candidates'.
@@ -112,6 +129,7 @@ def _first_matching_fk_name(model, *candidates):
 
 @login_required
 @require_GET
+@usar_replica
 def api_planes_por_carrera(request):
     """
     GET /ui/api/planes?profesorado=<id> o ?prof=<id>
@@ -154,11 +172,12 @@ def api_planes_por_carrera(request):
         # No necesitamos resol ni anio para este endpoint, solo id y nombre
         planes_data.append({"id": p.id, "nombre": nombre})
 
-    return JsonResponse({"planes": planes_data})
+    return RespuestaJSON({"planes": planes_data})
 
 
 @login_required
 @require_GET
+@usar_replica
 def api_materias_por_plan(request):
     """
     GET /ui/api/materias?plan_id=<id>
@@ -174,6 +193,15 @@ def api_materias_por_plan(request):
         logger.error("No se pudieron inferir modelos de Espacio/Materia o Plan.")
         return HttpResponseBadRequest("No se pudieron inferir modelos (Materias/Plan).")
 
+    if EspacioModel is modelos.get("academia_core", "EspacioCurricular"):
+        if not str(plan_id).isdigit():
+            return HttpResponseBadRequest("plan_id debe ser un número")
+        # etiquetas precalculadas por plan (una consulta, cacheadas por versión)
+        etiquetas = label_utils.etiquetas_plan(int(plan_id))
+        return RespuestaJSON(
+            {"items": [{"id": pk, "label": etiquetas[pk]} for pk in sorted(etiquetas)]}
+        )
+
     fk_name = _first_matching_fk_name(EspacioModel, "plan", "plan_estudio", "planestudio")
     logger.debug("EspacioModel=%s, FK a plan=%s", EspacioModel.__name__, fk_name)
 
@@ -187,11 +215,12 @@ def api_materias_por_plan(request):
         qs = qs.filter(is_active=True)
 
     items = [{"id": obj.pk, "label": _best_label(obj)} for obj in qs.order_by("pk")]
-    return JsonResponse({"items": items})
+    return RespuestaJSON({"items": items})
 
 
 @login_required
 @require_GET
+@usar_replica
 def api_cohortes_por_plan(request):
     """
     GET /ui/api/cohortes?plan_id=<ID>&start=<YYYY>&end=<YYYY>&order=asc|desc
@@ -218,7 +247,7 @@ def api_cohortes_por_plan(request):
         years.reverse()
 
     items = [{"id": y, "label": str(y)} for y in years]
-    return JsonResponse({"items": items})
+    return RespuestaJSON({"items": items})
 
 
 @login_required
@@ -243,16 +272,14 @@ def api_correlatividades_por_espacio(request):
     # Buscamos el modelo Correlatividad en posibles apps
     Cor = None
     for app_label in ("academico", "ui", "academia_core"):
-        try:
-            Cor = apps.get_model(app_label, "Correlatividad")
+        Cor = modelos.get(app_label, "Correlatividad")
+        if Cor is not None:
             break
-        except LookupError:
-            continue
 
     if Cor is None:
         # Aún no creaste el modelo → devolvemos vacío para que el JS no falle
         logger.warning("api_correlatividades_por_espacio: No se encontró el modelo Correlatividad.")
-        return JsonResponse({"regular": [], "aprobada": []})
+        return RespuestaJSON({"regular": [], "aprobada": []})
 
     try:
         # Tipos admitidos (por si en DB usás abreviaturas)
@@ -275,7 +302,7 @@ def api_correlatividades_por_espacio(request):
             len(reg),
             len(apr),
         )
-        return JsonResponse({"regular": reg, "aprobada": apr})
+        return RespuestaJSON({"regular": reg, "aprobada": apr})
 
     except Exception as e:
         logger.exception(f"api_correlatividades_por_espacio: error para espacio_id={esp_id}")
@@ -299,7 +326,7 @@ def api_calcular_estado_administrativo(request):
     form = InscripcionProfesoradoForm()
     estado, is_cert_docente = form._calculate_estado_from_data(data)
 
-    return JsonResponse(
+    return RespuestaJSON(
         {
             "estado": estado,
             "is_cert_docente": is_cert_docente,
@@ -84,6 +84,13 @@ BEDEL_MENU = [
                 "path": "/administracion/comisiones/",
                 "icon": "copy",
             },
+            {
+                "label": "Tareas en segundo plano",
+                "url_name": "ui:tareas_segundo_plano",
+                "path": "/administracion/tareas/",
+                "icon": "clock",
+                "roles": ["Secretaría", "Admin"],
+            },
         ],
     },
     {
@@ -0,0 +1,82 @@
+// ui/static/ui/js/tareas.js
+// Encola tareas y consulta su estado (api/jobs/) mientras haya trabajos activos.
+
+function getCookie(name) {
+    const m = document.cookie.match(new RegExp("(^|;\\s*)" + name + "=([^;]*)"));
+    return m ? decodeURIComponent(m[2]) : null;
+}
+
+document.addEventListener("DOMContentLoaded", () => {
+    const tbody = document.getElementById("jobs-body");
+    const ACTIVOS = new Set(["PENDIENTE", "EN_CURSO"]);
+    let timer = null;
+
+    async function post(url, payload) {
+        const res = await fetch(url, {
+            method: "POST",
+            credentials: "same-origin",
+            headers: {
+                "Content-Type": "application/json",
+                "X-CSRFToken": getCookie("csrftoken"),
+                "X-Requested-With": "XMLHttpRequest",
+            },
+            body: JSON.stringify(payload || {}),
+        });
+        return res.json();
+    }
+
+    function fila(j) {
+        const tr = document.createElement("tr");
+        const celdas = [j.id, j.tipo, j.estado, `${j.progreso}%`, j.error || j.mensaje || ""];
+        for (const c of celdas) {
+            const td = document.createElement("td");
+            td.textContent = c;
+            tr.appendChild(td);
+        }
+        const td = document.createElement("td");
+        if (ACTIVOS.has(j.estado)) {
+            const btn = document.createElement("button");
+            btn.type = "button";
+            btn.className = "btn";
+            btn.textContent = "Cancelar";
+            btn.addEventListener("click", async () => {
+                await post(`/api/jobs/${j.id}/cancelar/`);
+                refrescar();
+            });
+            td.appendChild(btn);
+        }
+        tr.appendChild(td);
+        return tr;
+    }
+
+    async function refrescar() {
+        clearTimeout(timer);
+        try {
+            const res = await fetch("/api/jobs/", { credentials: "same-origin" });
+            const data = await res.json();
+            const items = data.items || [];
+            tbody.replaceChildren(...items.map(fila));
+            if (!items.length) {
+                tbody.innerHTML = '<tr><td colspan="6" class="muted">No hay trabajos.</td></tr>';
+            }
+            if (items.some((j) => ACTIVOS.has(j.estado))) {
+                timer = setTimeout(refrescar, 2000);
+            }
+        } catch (e) {
+            console.error("Error al consultar trabajos:", e);
+            timer = setTimeout(refrescar, 5000);
+        }
+    }
+
+    document.querySelectorAll("[data-encolar]").forEach((btn) => {
+        btn.addEventListener("click", async () => {
+            const data = await post("/api/jobs/encolar/", { tipo: btn.dataset.encolar });
+            if (!data.ok) {
+                alert(`No se pudo encolar: ${data.error}`);
+            }
+            refrescar();
+        });
+    });
+
+    refrescar();
+});
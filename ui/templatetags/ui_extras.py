@@ -1,8 +1,16 @@
 from django import template
 
+from academia_core.label_utils import espacio_etiqueta
+
 register = template.Library()
 
 
 @register.filter
 def classname(obj):
     return type(obj).__name__
+
+
+@register.filter
+def etiqueta_espacio(espacio):
+    """`{{ espacio|etiqueta_espacio }}`: etiqueta precalculada del plan, sin cargar la materia."""
+    return espacio_etiqueta(espacio)
@@ -115,6 +115,11 @@ urlpatterns = [
         views_panel.gestionar_comisiones,
         name="gestionar_comisiones",
     ),
+    path(
+        "administracion/tareas/",
+        views_panel.tareas_segundo_plano,
+        name="tareas_segundo_plano",
+    ),
     # Horarios
     path(
         "horarios/profesorado/",
@@ -3,29 +3,46 @@
 import json
 import logging
 
-from django.apps import apps
 from django.db import transaction
 from django.db.models import CharField, F, Value
 from django.db.models.functions import Coalesce, Concat
-from django.http import JsonResponse
 from django.views.decorators.http import require_GET, require_POST
 
-from academia_horarios.models import Bloque, Horario, MateriaEnPlan, TurnoModel
-
-PlanEstudios = apps.get_model("academia_core", "PlanEstudios")
-EspacioCurricular = apps.get_model("academia_core", "EspacioCurricular")
-Docente = apps.get_model("academia_core", "Docente")
-Carrera = apps.get_model("academia_core", "Carrera")
+from academia_core import referencia_cache
+from academia_core.conexiones import usar_replica
+from academia_core.modelos import modelos
+from academia_core.serializacion import Proyeccion, RespuestaJSON, hhmm, nombre_completo
+from academia_horarios.models import Horario, MateriaEnPlan
 
 logger = logging.getLogger(__name__)
 
+OPCION_DOCENTE = Proyeccion(id="id", nombre="display")
+
+# Bloque de horario tal como lo consumen las grillas (horas en HH:MM)
+BLOQUE = Proyeccion(
+    dia="dia",
+    turno="turno",
+    anio="anio",
+    comision="comision",
+    aula="aula",
+    inicio=("inicio", hhmm),
+    fin=("fin", hhmm),
+)
+BLOQUE_DOCENTE = Proyeccion(**BLOQUE.forma, materia="materia__materia__nombre")
+BLOQUE_PROFESORADO = Proyeccion(
+    **BLOQUE_DOCENTE.forma,
+    docente=(
+        ("docente__apellido", "docente__nombre"),
+        lambda ap, no: nombre_completo(ap, no) or "Sin Docente",
+    ),
+)
+
 
 @require_GET
 def api_carreras(request):
-    qs = Carrera.objects.order_by("nombre").values("id", "nombre")
-    results = list(qs)
+    results = [{"id": c["id"], "nombre": c["nombre"]} for c in referencia_cache.get_carreras()]
     logger.info("api_carreras -> %s items", len(results))
-    return JsonResponse({"results": results}, status=200)
+    return RespuestaJSON({"results": results}, status=200)
 
 
 @require_GET
@@ -34,16 +51,16 @@ def api_planes(request):
     carrera_id = request.GET.get("carrera") or request.GET.get("carrera_id")
     qs = []
     if carrera_id:
-        qs = (
-            PlanEstudios.objects.filter(carrera_id=carrera_id, vigente=True)
-            .order_by("nombre")
-            .values("id", "nombre")
-        )
+        qs = [
+            {"id": p["id"], "nombre": p["nombre"]}
+            for p in referencia_cache.get_planes(carrera_id, solo_vigentes=True)
+        ]
     logger.info("api_planes -> %s items", len(qs))
-    return JsonResponse({"results": list(qs)}, status=200)
+    return RespuestaJSON({"results": qs}, status=200)
 
 
 @require_GET
+@usar_replica
 def api_materias(request):
     logger.info("api_materias hit")
 
@@ -51,27 +68,30 @@ def api_materias(request):
     periodo_id = request.GET.get("periodo_id")
 
     if not plan_id:
-        return JsonResponse({"error": "Falta parámetro plan_id"}, status=400)
+        return RespuestaJSON({"error": "Falta parámetro plan_id"}, status=400)
+
+    if not str(plan_id).isdigit():
+        return RespuestaJSON({"error": "plan_id inválido"}, status=400)
 
     try:
-        qs = EspacioCurricular.objects.filter(plan_id=plan_id)
+        espacios = referencia_cache.get_plan_espacios(int(plan_id))
 
         if periodo_id:
-            Periodo = apps.get_model("academia_horarios", "Periodo")
+            Periodo = modelos.get("academia_horarios", "Periodo")
             periodo = Periodo.objects.filter(id=periodo_id).first()
-            if periodo:
-                if periodo.cuatrimestre == 1:
-                    qs = qs.filter(cuatrimestre__in=["1", "A"])
-                elif periodo.cuatrimestre == 2:
-                    qs = qs.filter(cuatrimestre__in=["2", "A"])
-
-        qs = qs.order_by("anio", "cuatrimestre", "materia__nombre")
-        data = [{"id": m.id, "nombre": m.nombre, "horas": m.horas} for m in qs]
+            if periodo and periodo.cuatrimestre in (1, 2):
+                cuatris = {str(periodo.cuatrimestre), "A"}
+                espacios = [e for e in espacios if e["cuatrimestre"] in cuatris]
+
+        data = [
+            {"id": e["id"], "nombre": e["nombre"], "etiqueta": e["etiqueta"], "horas": e["horas"]}
+            for e in espacios
+        ]
         logger.info("api_materias OK plan=%s count=%s", plan_id, len(data))
-        return JsonResponse({"results": data})
+        return RespuestaJSON({"results": data})
     except Exception:
         logger.exception("api_materias error")
-        return JsonResponse({"results": [], "error": "Ocurrió un error interno."}, status=500)
+        return RespuestaJSON({"results": [], "error": "Ocurrió un error interno."}, status=500)
 
 
 def _get(request, *names):
@@ -83,11 +103,12 @@ def _get(request, *names):
 
 
 @require_GET
+@usar_replica
 def api_docentes(request):
     carrera_id = _get(request, "carrera", "carrera_id")
     materia_id = _get(request, "materia")
 
-    qs = Docente.objects.all()
+    qs = modelos.get("academia_core", "Docente").objects.all()
 
     if carrera_id and materia_id:
         qs = qs.filter(
@@ -103,11 +124,8 @@ def api_docentes(request):
         )
         .annotate(display=Concat(F("ap"), Value(", "), F("no"), output_field=CharField()))
         .order_by("apellido", "nombre")
-        .values("id", "display")
     )
-
-    data = [{"id": d["id"], "nombre": d["display"]} for d in qs]
-    return JsonResponse({"results": data}, status=200)
+    return RespuestaJSON({"results": OPCION_DOCENTE.items(qs)}, status=200)
 
 
 @require_GET
@@ -117,12 +135,11 @@ def api_turnos(request):
     Obtiene los turnos disponibles desde la base de datos.
     """
     try:
-        turnos_qs = TurnoModel.objects.order_by("id").values("slug", "nombre")
-        turnos = [{"value": t["slug"], "label": t["nombre"]} for t in turnos_qs]
-        return JsonResponse({"turnos": turnos}, status=200)
+        turnos = [{"value": t["slug"], "label": t["nombre"]} for t in referencia_cache.get_turnos()]
+        return RespuestaJSON({"turnos": turnos}, status=200)
     except Exception:
         logger.exception("api_turnos error")
-        return JsonResponse({"error": "Error al obtener los turnos."}, status=500)
+        return RespuestaJSON({"error": "Error al obtener los turnos."}, status=500)
 
 
 @require_GET
@@ -143,7 +160,7 @@ def api_horarios_ocupados(request):
         if aula_id:
             ocupados.extend(list(qs.filter(aula_id=aula_id).values("dia", "inicio", "fin")))
 
-    return JsonResponse({"ocupados": ocupados})
+    return RespuestaJSON({"ocupados": ocupados})
 
 
 def _validate_draft_overlaps(draft):
@@ -186,7 +203,7 @@ def api_horario_save(request):
     try:
         payload = json.loads(request.body.decode("utf-8"))
     except Exception:
-        return JsonResponse({"ok": False, "error": "JSON inválido"}, status=400)
+        return RespuestaJSON({"ok": False, "error": "JSON inválido"}, status=400)
 
     materia_id = payload.get("materia_id")
     plan_id = payload.get("plan_id")
@@ -197,10 +214,10 @@ def api_horario_save(request):
     items = payload.get("items", [])
 
     if not all([materia_id, plan_id, profesorado_id, turno, comision_id, periodo_id]):
-        return JsonResponse({"ok": False, "error": "Faltan parámetros obligatorios"}, status=400)
+        return RespuestaJSON({"ok": False, "error": "Faltan parámetros obligatorios"}, status=400)
 
     # Obtener la seccion de la comision (ej. 'A', 'B')
-    Comision = apps.get_model("academia_horarios", "Comision")
+    Comision = modelos.get("academia_horarios", "Comision")
     comision_seccion = ""
     if comision_id == "default":
         # Si es la comisión por defecto, puede que no exista. La creamos si es necesario.
@@ -215,7 +232,7 @@ def api_horario_save(request):
     else:
         comision_obj = Comision.objects.filter(id=comision_id).first()
         if not comision_obj:
-            return JsonResponse(
+            return RespuestaJSON(
                 {"ok": False, "error": "La comisión seleccionada no existe."},
                 status=404,
             )
@@ -229,7 +246,7 @@ def api_horario_save(request):
 
     err = _validate_draft_overlaps(items)
     if err:
-        return JsonResponse({"ok": False, "error": err}, status=400)
+        return RespuestaJSON({"ok": False, "error": err}, status=400)
 
     with transaction.atomic():
         # El borrado ahora es específico para la comisión
@@ -258,109 +275,50 @@ def api_horario_save(request):
         ]
         Horario.objects.bulk_create(nuevos)
 
-    return JsonResponse({"ok": True, "count": len(nuevos)})
+    return RespuestaJSON({"ok": True, "count": len(nuevos)})
 
 
 @require_GET
+@usar_replica
 def api_horarios_profesorado(request):
     logger.info("api_horarios_profesorado hit")
     carrera_id = request.GET.get("profesorado_id") or request.GET.get("carrera_id")
     plan_id = request.GET.get("plan_id")
     if not carrera_id:
-        return JsonResponse({"error": "Falta carrera_id"}, status=400)
+        return RespuestaJSON({"error": "Falta carrera_id"}, status=400)
 
     qs = Horario.objects.filter(profesorado_id=carrera_id)
     if plan_id:
         qs = qs.filter(plan_id=plan_id)
 
-    qs = (
-        qs.order_by("anio", "dia", "inicio")
-        .select_related("materia", "docente")
-        .values(
-            "dia",
-            "inicio",
-            "fin",
-            "turno",
-            "anio",
-            "comision",
-            "aula",
-            "materia__materia__nombre",
-            "docente__apellido",
-            "docente__nombre",
-        )
-    )
-
     items_por_anio = {1: [], 2: [], 3: [], 4: [], 0: []}
-    for r in qs:
-        nombre_doc = ""
-        ap = r.get("docente__apellido") or ""
-        no = r.get("docente__nombre") or ""
-        if ap or no:
-            nombre_doc = f"{ap}, {no}".strip(", ")
-        else:
-            nombre_doc = "Sin Docente"
-
-        bucket = r.get("anio") or 0
-        items_por_anio.setdefault(bucket, []).append(
-            {
-                "dia": r["dia"],
-                "inicio": r["inicio"].strftime("%H:%M"),
-                "fin": r["fin"].strftime("%H:%M"),
-                "turno": r["turno"],
-                "anio": r["anio"],
-                "comision": r["comision"],
-                "aula": r["aula"],
-                "materia": r["materia__nombre"],
-                "docente": nombre_doc,
-            }
-        )
-    return JsonResponse(items_por_anio)
+    for item in BLOQUE_PROFESORADO.items(qs.order_by("anio", "dia", "inicio")):
+        items_por_anio.setdefault(item["anio"] or 0, []).append(item)
+    return RespuestaJSON(items_por_anio)
 
 
 @require_GET
+@usar_replica
 def api_horarios_docente(request):
     logger.info("api_horarios_docente hit")
     docente_id = request.GET.get("docente_id")
     if not docente_id:
-        return JsonResponse({"error": "Falta el parámetro docente_id"}, status=400)
+        return RespuestaJSON({"error": "Falta el parámetro docente_id"}, status=400)
 
-    qs = (
-        Horario.objects.filter(docente_id=docente_id)
-        .order_by("turno", "dia", "inicio")
-        .values(
-            "dia",
-            "inicio",
-            "fin",
-            "turno",
-            "anio",
-            "comision",
-            "aula",
-            "materia__materia__nombre",
-        )
-    )
+    qs = Horario.objects.filter(
+        docente_id=docente_id, turno__in=("manana", "tarde", "vespertino")
+    ).order_by("turno", "dia", "inicio")
 
     # Agrupar resultados por turno
     items_por_turno = {"manana": [], "tarde": [], "vespertino": []}
-    for r in qs:
-        turno = r.get("turno")
-        if turno in items_por_turno:
-            items_por_turno[turno].append(
-                {
-                    "dia": r["dia"],
-                    "inicio": r["inicio"].strftime("%H:%M"),
-                    "fin": r["fin"].strftime("%H:%M"),
-                    "turno": r["turno"],
-                    "anio": r["anio"],
-                    "comision": r["comision"],
-                    "aula": r["aula"],
-                    "materia": r["materia__materia__nombre"],
-                }
-            )
+    for item in BLOQUE_DOCENTE.items(qs):
+        items_por_turno[item["turno"]].append(item)
 
-    return JsonResponse(items_por_turno)
+    return RespuestaJSON(items_por_turno)
 
 
 @require_GET
+@usar_replica
 def api_horarios_materia_plan(request):
     logger.info("api_horarios_materia_plan hit")
     materia_id = request.GET.get("materia_id")
@@ -370,33 +328,19 @@ def api_horarios_materia_plan(request):
     comision = request.GET.get("comision", "")
 
     if not (materia_id and plan_id and carrera_id):
-        return JsonResponse(
+        return RespuestaJSON(
             {"error": "Faltan parámetros materia_id, plan_id o carrera_id"}, status=400
         )
 
-    qs = Horario.objects.filter(
-        materia_id=materia_id, plan_id=plan_id, carrera_id=carrera_id
-    ).values("dia", "inicio", "fin", "turno", "anio", "comision", "aula")
+    qs = Horario.objects.filter(materia_id=materia_id, plan_id=plan_id, carrera_id=carrera_id)
 
     if anio:
         qs = qs.filter(anio=anio)
     if comision:
         qs = qs.filter(comision=comision)
 
-    items = []
-    for r in qs:
-        items.append(
-            {
-                "dia": r["dia"],
-                "inicio": r["inicio"].strftime("%H:%M"),
-                "fin": r["fin"].strftime("%H:%M"),
-                "turno": r["turno"],
-                "anio": r["anio"],
-                "comision": r["comision"],
-                "aula": r["aula"],
-            }
-        )
-    return JsonResponse({"items": items})
+    items = BLOQUE.items(qs)
+    return RespuestaJSON({"items": items})
 
 
 @require_GET
@@ -405,23 +349,14 @@ def api_grilla_config(request):
     # normaliza tildes si hace falta
 
     try:
-        if turno == "sabado":
-            qs = Bloque.objects.filter(turno__isnull=True).order_by("orden")
-        else:
-            qs = Bloque.objects.filter(turno__slug=turno).order_by("orden")
-
-        bloques = list(qs.values("dia_semana", "inicio", "fin", "es_recreo"))
-
-        for b in bloques:
-            b["inicio_str"] = b["inicio"].strftime("%H:%M")
-            b["fin_str"] = b["fin"].strftime("%H:%M")
+        bloques = referencia_cache.get_bloques(None if turno == "sabado" else turno)
 
-        return JsonResponse(
+        return RespuestaJSON(
             {
                 "rows": [
                     {
-                        "ini": b["inicio_str"],
-                        "fin": b["fin_str"],
+                        "ini": hhmm(b["inicio"]),
+                        "fin": hhmm(b["fin"]),
                         "recreo": b["es_recreo"],
                     }
                     for b in bloques
@@ -431,7 +366,7 @@ def api_grilla_config(request):
 
     except Exception:
         logger.exception(f"api_grilla_config error para turno={turno}")
-        return JsonResponse(
+        return RespuestaJSON(
             {"error": "Error al obtener la configuración de la grilla."},
             status=500,
         )
@@ -448,7 +383,7 @@ def api_get_horarios_materia(request):
     turno = request.GET.get("turno")
 
     if not all([profesorado_id, plan_id, materia_id, turno]):
-        return JsonResponse({"error": "Faltan parámetros"}, status=400)
+        return RespuestaJSON({"error": "Faltan parámetros"}, status=400)
 
     qs = Horario.objects.filter(
         profesorado_id=profesorado_id,
@@ -457,7 +392,7 @@ def api_get_horarios_materia(request):
         turno=turno,
     ).values("dia", "inicio", "fin")
 
-    return JsonResponse({"horarios": list(qs)})
+    return RespuestaJSON({"horarios": list(qs)})
 
 
 @require_GET
@@ -470,22 +405,24 @@ def api_get_comisiones_materia(request):
     periodo_id = request.GET.get("periodo_id")
 
     if not all([plan_id, materia_id, periodo_id]):
-        return JsonResponse({"error": "Faltan parámetros"}, status=400)
+        return RespuestaJSON({"error": "Faltan parámetros"}, status=400)
 
     # Comision se relaciona con MateriaEnPlan. Hay que encontrar el MateriaEnPlan
     # que corresponde a este EspacioCurricular en este Plan.
     mep = MateriaEnPlan.objects.filter(plan_id=plan_id, materia_id=materia_id).first()
     if not mep:
-        return JsonResponse({"comisiones": []})  # No hay materia en plan, no puede haber comisiones
+        return RespuestaJSON(
+            {"comisiones": []}
+        )  # No hay materia en plan, no puede haber comisiones
 
-    Comision = apps.get_model("academia_horarios", "Comision")
+    Comision = modelos.get("academia_horarios", "Comision")
     qs = (
         Comision.objects.filter(materia_en_plan=mep, periodo_id=periodo_id)
         .order_by("seccion")
         .values("id", "seccion", "nombre")
     )
 
-    return JsonResponse({"comisiones": list(qs)})
+    return RespuestaJSON({"comisiones": list(qs)})
 
 
 @require_POST
@@ -499,16 +436,16 @@ def api_add_comision(request):
         materia_id = payload.get("materia_id")
         periodo_id = payload.get("periodo_id")
     except Exception:
-        return JsonResponse({"ok": False, "error": "JSON inválido"}, status=400)
+        return RespuestaJSON({"ok": False, "error": "JSON inválido"}, status=400)
 
     if not all([plan_id, materia_id, periodo_id]):
-        return JsonResponse({"ok": False, "error": "Faltan parámetros"}, status=400)
+        return RespuestaJSON({"ok": False, "error": "Faltan parámetros"}, status=400)
 
     mep = MateriaEnPlan.objects.filter(plan_id=plan_id, materia_id=materia_id).first()
     if not mep:
-        return JsonResponse({"ok": False, "error": "Materia en Plan no encontrada"}, status=404)
+        return RespuestaJSON({"ok": False, "error": "Materia en Plan no encontrada"}, status=404)
 
-    Comision = apps.get_model("academia_horarios", "Comision")
+    Comision = modelos.get("academia_horarios", "Comision")
     existentes = Comision.objects.filter(materia_en_plan=mep, periodo_id=periodo_id).order_by(
         "seccion"
     )
@@ -530,11 +467,11 @@ def api_add_comision(request):
             nombre=f"Comisión {nueva_seccion}",
             turno=turno_base,
         )
-        return JsonResponse(
+        return RespuestaJSON(
             {"ok": True, "id": nueva_comision.id, "seccion": nueva_comision.seccion}
         )
     except Exception:
         logger.exception("Error al crear nueva comisión")
-        return JsonResponse(
+        return RespuestaJSON(
             {"ok": False, "error": "Ocurrió un error interno del servidor"}, status=500
         )
@@ -1,6 +1,8 @@
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
 from django.shortcuts import render
 
-from academia_core.models import Carrera
+from academia_core.referencia_cache import get_carreras
 from academia_horarios.models import Periodo
 
 
@@ -8,7 +10,7 @@ def horarios_profesorado(request):
     return render(
         request,
         "ui/horarios_profesorado.html",
-        {"profesorados": Carrera.objects.all().order_by("nombre")},
+        {"profesorados": get_carreras()},
     )
 
 
@@ -22,7 +24,27 @@ def horarios_docente(request):
 def gestionar_comisiones(request):
     ctx = {
         "page_title": "Gestionar Comisiones",
-        "carreras": Carrera.objects.all().order_by("nombre"),
+        "carreras": get_carreras(),
         "periodos": Periodo.objects.all().order_by("-ciclo_lectivo", "-cuatrimestre"),
     }
     return render(request, "ui/gestionar_comisiones.html", ctx)
+
+
+# Tareas que el panel ofrece encolar (ver academia_core/tareas.py)
+TAREAS_PANEL = [
+    ("recalcular_promedios", "Recalcular promedios"),
+    ("recalcular_legajos", "Recalcular legajos"),
+    ("recalcular_kpis", "Recalcular indicadores"),
+    ("auditar_datos", "Auditar datos"),
+]
+
+
+@login_required
+def tareas_segundo_plano(request):
+    if not (request.user.is_staff or request.user.is_superuser):
+        raise PermissionDenied
+    ctx = {
+        "page_title": "Tareas en segundo plano",
+        "tareas": [{"tipo": t, "label": label} for t, label in TAREAS_PANEL],
+    }
+    return render(request, "ui/tareas.html", ctx)